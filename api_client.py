@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Shared DOPAMAS API Client
+=========================
+
+Replaces bare requests.get(...) calls in the ETLs with one process-wide client.
+
+This module provides:
+- Keep-alive connection pooling (one TCP/TLS handshake per connection, not per call),
+  with a per-host connection limit shared by all worker threads
+- Token-bucket rate limiting that halves its rate on 429 and honours Retry-After
+  for every worker, then recovers gradually on success
+- A circuit breaker: after repeated connection failures / 5xx responses all workers
+  wait on the same breaker instead of each thread sleeping and retrying on its own
+
+Usage (drop-in for requests.get inside an ETL's existing retry loop):
+
+    from api_client import get_api_client
+
+    response = get_api_client().get(url, params=params, headers=headers, timeout=API_CONFIG['timeout'])
+
+Status handling (200 / 404 / status=false ...) stays with the caller. 429 responses are
+absorbed by the client; other responses and exceptions are returned/raised unchanged.
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from env_utils import get_float_env, get_int_env
+
+logger = logging.getLogger(__name__)
+
+# Responses that count against the circuit breaker (the API itself is unhealthy)
+BREAKER_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised when the API circuit stays open longer than the caller is willing to wait."""
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD rate adaptation.
+
+    - throttle(): multiplicative decrease (rate / 2, floored at min_rate) and an
+      optional shared pause (Retry-After) that applies to every caller
+    - recover(): additive increase back towards the configured max_rate
+    A max_rate of 0 disables limiting (Retry-After pauses are still honoured).
+    """
+
+    def __init__(self, max_rate: float, capacity: int, min_rate: float = 0.5):
+        self.max_rate = max(0.0, float(max_rate))
+        self.min_rate = max(0.01, float(min_rate))
+        self.capacity = max(1, int(capacity))
+        self.rate = self.max_rate
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Server pushed back (429): slow down every caller."""
+        with self._lock:
+            now = time.monotonic()
+            if self.max_rate > 0:
+                self.rate = max(self.min_rate, (self.rate or self.max_rate) / 2)
+            self._tokens = 0.0
+            self._updated = now
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def recover(self) -> None:
+        """Successful call: creep back towards the configured rate."""
+        if self.max_rate <= 0 or self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Shared closed -> open -> half-open breaker.
+
+    closed:    requests flow; consecutive failures are counted
+    open:      every caller waits until reset_timeout has passed
+    half-open: exactly one probe request goes out; success closes the circuit,
+               failure re-opens it. Other callers keep waiting meanwhile.
+    Callers that wait longer than max_wait get CircuitOpenError.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_wait: float = 600.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = max(0.0, float(reset_timeout))
+        self.max_wait = max(0.0, float(max_wait))
+        self.state = self.CLOSED
+        self.times_opened = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._cond = threading.Condition()
+
+    def before_request(self) -> None:
+        """Block while the circuit is open; raise CircuitOpenError after max_wait."""
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            while True:
+                if self.state == self.CLOSED:
+                    return
+                now = time.monotonic()
+                if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                    self.state = self.HALF_OPEN
+                    logger.info("🔌 API circuit half-open: sending probe request")
+                    return
+                if now >= deadline:
+                    raise CircuitOpenError(f"API circuit open for more than {self.max_wait:.0f}s")
+                if self.state == self.OPEN:
+                    wait = min(self._opened_at + self.reset_timeout, deadline) - now
+                else:
+                    wait = min(1.0, deadline - now)
+                self._cond.wait(timeout=max(0.01, wait))
+
+    def record_success(self) -> None:
+        with self._cond:
+            self._failures = 0
+            if self.state != self.CLOSED:
+                logger.info("✅ API circuit closed: API is responding again")
+                self.state = self.CLOSED
+                self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        with self._cond:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+                logger.warning(
+                    f"⚠️  API circuit opened after {self._failures} consecutive failure(s); "
+                    f"pausing all API workers for {self.reset_timeout:.0f}s"
+                )
+                self._cond.notify_all()
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header -> seconds (accepts delta-seconds or an HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class DopamasAPIClient:
+    """
+    Thread-safe HTTP client shared by every worker thread in the process.
+
+    Each thread gets its own requests.Session (Session objects are not thread-safe),
+    but all sessions mount the same HTTPAdapter, so the keep-alive connection pool
+    and its per-host limit (pool_maxsize, blocking when exhausted) are shared.
+    """
+
+    def __init__(self, rate_limit: float = 20.0, burst: int = 20, pool_maxsize: int = 16,
+                 pool_hosts: int = 10, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_circuit_wait: float = 600.0, throttle_retries: int = 5,
+                 backoff_cap: float = 60.0):
+        self.pool_maxsize = pool_maxsize
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=0,
+        )
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, max_circuit_wait)
+        self.throttle_retries = max(0, int(throttle_retries))
+        self.backoff_cap = max(1.0, float(backoff_cap))
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'throttled': 0, 'failures': 0}
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return session
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send one logical request through the breaker, rate limiter and pooled session.
+
+        429 responses are retried here (up to throttle_retries, honouring Retry-After)
+        and slow the shared bucket down; any other response is returned as-is.
+        Connection errors / timeouts are recorded on the breaker and re-raised.
+        """
+        for throttle_attempt in range(self.throttle_retries + 1):
+            self.breaker.before_request()
+            self.bucket.acquire()
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                self._count('failures')
+                self.breaker.record_failure()
+                raise
+
+            if response.status_code == 429:
+                # The API is alive, it just wants us to slow down
+                self.breaker.record_success()
+                self._count('throttled')
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is None:
+                    retry_after = self.backoff_delay(throttle_attempt)
+                self.bucket.throttle(retry_after)
+                logger.warning(
+                    f"⚠️  API rate limited (429); rate lowered to {self.bucket.rate:.2f} req/s, "
+                    f"pausing {retry_after:.1f}s"
+                )
+                if throttle_attempt < self.throttle_retries:
+                    continue
+                return response
+
+            if response.status_code in BREAKER_FAILURE_STATUSES:
+                self._count('failures')
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+                self.bucket.recover()
+            return response
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Drop-in replacement for requests.get(url, **kwargs)."""
+        return self.request('GET', url, **kwargs)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the caller's retry loop."""
+        delay = min(self.backoff_cap, 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def backoff(self, attempt: int) -> None:
+        time.sleep(self.backoff_delay(attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'rate_limit': round(self.bucket.rate, 2),
+            'circuit_state': self.breaker.state,
+            'circuit_opened': self.breaker.times_opened,
+        })
+        return stats
+
+
+_client: Optional[DopamasAPIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_api_client() -> DopamasAPIClient:
+    """Process-wide client, configured from the environment on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DopamasAPIClient(
+                    rate_limit=get_float_env('API_RATE_LIMIT_RPS', 20.0),
+                    burst=get_int_env('API_RATE_LIMIT_BURST', 20),
+                    pool_maxsize=get_int_env('API_POOL_MAXSIZE', 16),
+                    failure_threshold=get_int_env('API_CIRCUIT_FAILURES', 5),
+                    reset_timeout=get_float_env('API_CIRCUIT_RESET_SECONDS', 30.0),
+                    max_circuit_wait=get_float_env('API_CIRCUIT_MAX_WAIT_SECONDS', 600.0),
+                    throttle_retries=get_int_env('API_THROTTLE_RETRIES', 5),
+                )
+                logger.info(
+                    f"API client initialized: {_client.bucket.max_rate:g} req/s, "
+                    f"{_client.pool_maxsize} connections/host"
+                )
+    return _client
@@ -0,0 +1,137 @@
+"""
+Micro-benchmark: per-keyword substring scans vs. the compiled DrugKeywordIndex.
+
+Pulls real brief_facts samples and the verified drug KB from the database, runs the
+three keyword-matching steps of the drug pipeline both ways, checks that the results
+are identical, and prints timings:
+
+  relevance   _score_drug_relevance() over every FIR section of every sample
+  kb-resolve  resolve_primary_drug_name() Tier 2 over drug-name-like phrases
+  non-drug    filter_non_drug_entries() safety net over the same phrases
+
+Usage (from brief_facts_ai/):
+    python bench_drug_keywords.py --samples 500 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from psycopg2.extras import RealDictCursor
+
+import db as db_module
+from extractor_drugs import (
+    _FIR_BOUNDARY_RE,
+    DrugExtraction,
+    DrugKeywordIndex,
+    _score_drug_relevance,
+    build_drug_keywords,
+    filter_non_drug_entries,
+    resolve_primary_drug_name,
+)
+
+
+def fetch_samples(conn, limit):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute("""
+            SELECT brief_facts FROM crimes
+            WHERE brief_facts IS NOT NULL AND length(brief_facts) > 200
+            ORDER BY random()
+            LIMIT %s
+        """, (limit,))
+        return [row['brief_facts'] for row in cur.fetchall()]
+
+
+def candidate_phrases(samples, kb_lookup, count, rng):
+    """Drug-name-like phrases: KB names, KB names with noise, and 1-4 word windows of real text."""
+    phrases = []
+    kb_keys = list(kb_lookup)
+    for _ in range(count):
+        pick = rng.random()
+        if pick < 0.3 and kb_keys:
+            phrases.append(rng.choice(kb_keys))
+        elif pick < 0.5 and kb_keys:
+            phrases.append(f"{rng.randint(1, 500)} grams of {rng.choice(kb_keys)} packets")
+        else:
+            words = rng.choice(samples).lower().split()
+            start = rng.randrange(max(1, len(words)))
+            phrases.append(" ".join(words[start:start + rng.randint(1, 4)]))
+    return phrases
+
+
+def timed(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=500, help='brief_facts rows to sample')
+    parser.add_argument('--phrases', type=int, default=5000, help='drug-name-like phrases for KB/non-drug steps')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant; best time is reported')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    conn = db_module.get_db_connection()
+    try:
+        samples = fetch_samples(conn, args.samples)
+        drug_categories = db_module.fetch_drug_categories(conn)
+    finally:
+        db_module.return_db_connection(conn)
+    if not samples:
+        print("No brief_facts samples found.")
+        return 1
+
+    kb_lookup = {row['raw_name'].lower().strip(): row['standard_name'] for row in drug_categories}
+    keywords = build_drug_keywords(drug_categories)
+    sections = [s for text in samples for s in _FIR_BOUNDARY_RE.split(text) if s and s.strip()]
+    phrases = candidate_phrases(samples, kb_lookup, args.phrases, random.Random(args.seed))
+
+    t0 = time.perf_counter()
+    index = DrugKeywordIndex(keywords, kb_lookup)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    def make_drugs():
+        return [DrugExtraction(raw_drug_name=p, primary_drug_name=p) for p in phrases]
+
+    rows = []
+    legacy, t_legacy = timed(args.repeat, lambda: [_score_drug_relevance(s, keywords) for s in sections])
+    fast, t_fast = timed(args.repeat, lambda: [_score_drug_relevance(s, keywords, index) for s in sections])
+    rows.append(('relevance', len(sections), t_legacy, t_fast, legacy == fast))
+
+    legacy, t_legacy = timed(args.repeat,
+                             lambda: [d.primary_drug_name for d in resolve_primary_drug_name(make_drugs(), kb_lookup)])
+    fast, t_fast = timed(args.repeat,
+                         lambda: [d.primary_drug_name for d in resolve_primary_drug_name(make_drugs(), index.kb_lookup, keyword_index=index)])
+    rows.append(('kb-resolve', len(phrases), t_legacy, t_fast, legacy == fast))
+
+    legacy, t_legacy = timed(args.repeat,
+                             lambda: [d.raw_drug_name for d in filter_non_drug_entries(make_drugs(), set())])
+    fast, t_fast = timed(args.repeat,
+                         lambda: [d.raw_drug_name for d in filter_non_drug_entries(make_drugs(), set(), keyword_index=index)])
+    rows.append(('non-drug', len(phrases), t_legacy, t_fast, legacy == fast))
+
+    total_chars = sum(len(s) for s in sections)
+    print(f"samples={len(samples)} sections={len(sections)} chars={total_chars} "
+          f"keywords={len(keywords)} kb_keys={len(kb_lookup)}")
+    print(f"automaton: {len(index.matcher.patterns)} patterns, backend={index.matcher.backend}, built in {build_ms:.1f} ms")
+    print(f"{'step':<12}{'items':>8}{'scan (ms)':>12}{'automaton (ms)':>16}{'speedup':>10}  identical")
+    for step, items, t_legacy, t_fast, same in rows:
+        print(f"{step:<12}{items:>8}{t_legacy * 1000:>12.1f}{t_fast * 1000:>16.1f}{t_legacy / t_fast:>9.1f}x  {same}")
+    return 0 if all(r[4] for r in rows) else 2
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+    sys.exit(main())
@@ -192,6 +192,13 @@ def update_sentinel_role(conn, crime_id, old_role, new_role):
             WHERE crime_id = %s AND role_in_crime = %s
         """, (new_role, crime_id, old_role))
 
+def delete_sentinel_rows(conn, crime_id, role):
+    with conn.cursor() as cur:
+        cur.execute(
+            "DELETE FROM public.brief_facts_ai WHERE crime_id = %s AND role_in_crime = %s AND accused_id IS NULL",
+            (crime_id, role),
+        )
+
 def start_crime_processing_run(conn, crime_id, branch=None):
     with conn.cursor() as cur:
         cur.execute("""
@@ -201,13 +208,56 @@ def start_crime_processing_run(conn, crime_id, branch=None):
         """, (crime_id, branch))
         return str(cur.fetchone()[0])
 
-def complete_crime_processing_run(conn, run_id, accused_count_written):
+def complete_crime_processing_run(conn, run_id, accused_count_written, input_fingerprint=None):
     with conn.cursor() as cur:
         cur.execute("""
             UPDATE public.etl_crime_processing_log
-            SET status = 'complete', accused_count_written = %s, completed_at = CURRENT_TIMESTAMP, error_detail = NULL
+            SET status = 'complete', accused_count_written = %s, completed_at = CURRENT_TIMESTAMP, error_detail = NULL,
+                input_fingerprint = %s
             WHERE run_id = %s
-        """, (accused_count_written, run_id))
+        """, (accused_count_written, input_fingerprint, run_id))
+
+def ensure_input_fingerprint_column(conn):
+    """Idempotent: etl_crime_processing_log.input_fingerprint (see migrations/2026-10-16_*)."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = %s AND column_name = 'input_fingerprint'
+        """, (PROCESSING_LOG_TABLE,))
+        if cur.fetchone():
+            return
+        cur.execute("ALTER TABLE public.etl_crime_processing_log ADD COLUMN IF NOT EXISTS input_fingerprint TEXT")
+    conn.commit()
+
+def fetch_last_input_fingerprints(conn, crime_ids):
+    """{crime_id: input_fingerprint} of each crime's latest 'complete' run."""
+    if not crime_ids: return {}
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT ON (crime_id) crime_id, input_fingerprint
+            FROM public.etl_crime_processing_log
+            WHERE crime_id = ANY(%s) AND status = 'complete'
+            ORDER BY crime_id, completed_at DESC NULLS LAST
+        """, (list(crime_ids),))
+        return {row[0]: row[1] for row in cur.fetchall() if row[1]}
+
+def record_unchanged_crime_run(conn, crime_id, input_fingerprint):
+    """
+    Log a 'complete' run for a crime skipped because its extraction inputs are unchanged,
+    carrying over the branch/row count of the previous run. Without this row the crime
+    stays "modified after last completion" and incremental mode would fetch it forever.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO public.etl_crime_processing_log
+                (crime_id, status, branch, accused_count_written, completed_at, error_detail, input_fingerprint)
+            SELECT crime_id, 'complete', branch, accused_count_written, CURRENT_TIMESTAMP,
+                   'skipped: extraction inputs unchanged', %s
+            FROM public.etl_crime_processing_log
+            WHERE crime_id = %s AND status = 'complete'
+            ORDER BY completed_at DESC NULLS LAST
+            LIMIT 1
+        """, (input_fingerprint, crime_id))
 
 def fail_crime_processing_run(conn, run_id, error_detail):
     with conn.cursor() as cur:
@@ -664,3 +714,39 @@ def bulk_upsert_brief_facts_ai(conn, items):
 def insert_accused_facts(conn, item_data):
     """Wrapper to insert a single accused fact record. Uses bulk_upsert_brief_facts_ai internally."""
     bulk_upsert_brief_facts_ai(conn, [item_data])
+
+
+class CrimeWriteBuffer:
+    """
+    brief_facts_ai writes for one crime, recorded while the branch/drug LLM passes run and
+    replayed in the same order by flush(). The crime's DELETE/UPSERT row locks are then held
+    only for the short write phase at the end, not across LLM waits.
+    """
+
+    def __init__(self):
+        self.ops = []
+
+    def delete_brief_facts_for_crime(self, crime_id):
+        self.ops.append((delete_brief_facts_for_crime, (crime_id,)))
+
+    def replaces_crime(self, crime_id):
+        """True if the crime's existing rows are deleted when the buffer is flushed"""
+        return any(func is delete_brief_facts_for_crime and args[0] == crime_id for func, args in self.ops)
+
+    def insert_accused_facts(self, item_data):
+        self.ops.append((insert_accused_facts, (item_data,)))
+
+    def bulk_upsert_brief_facts_ai(self, items):
+        self.ops.append((bulk_upsert_brief_facts_ai, (items,)))
+
+    def update_sentinel_role(self, crime_id, old_role, new_role):
+        self.ops.append((update_sentinel_role, (crime_id, old_role, new_role)))
+
+    def delete_sentinel(self, crime_id, role):
+        self.ops.append((delete_sentinel_rows, (crime_id, role)))
+
+    def flush(self, conn):
+        ops, self.ops = self.ops, []
+        for func, args in ops:
+            func(conn, *args)
+        return len(ops)
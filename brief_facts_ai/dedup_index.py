@@ -0,0 +1,236 @@
+"""
+In-memory candidate index for brief_facts_ai identity dedup.
+
+fetch_dedup_candidates() evaluates SOUNDEX()/dmetaphone() over every brief_facts_ai row
+(joined to crimes, OR'd with a ps_code match), which no index can serve, once per
+extracted accused. This module loads brief_facts_ai once per run with both phonetic keys
+computed by PostgreSQL itself, so candidate sets match the SQL exactly, and answers:
+
+  candidates()            soundex / dmetaphone / ps_code buckets -> dict probes
+  canonical_by_accused()  Layer-0 accused_id lookup
+  associate_codes()       per-crime normalized person codes (was one query per candidate crime)
+
+Within a tier, candidates sharing more name tokens with the probe come first, so the
+200-row cap keeps the most relevant rows of large ps_code buckets instead of arbitrary ones.
+replace_crime() refreshes a crime's rows after its writes commit, so rows written during
+the run are visible to later crimes.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+DEDUP_INDEX_ENABLED = os.environ.get('BFAI_DEDUP_INDEX', 'true').strip().lower() not in ('0', 'false', 'no', 'off')
+LOAD_FETCH_SIZE = 5000
+
+_ROW_COLUMNS = (
+    'bf_accused_id', 'canonical_person_id', 'accused_id', 'person_code', 'full_name',
+    'alias_name', 'age', 'gender', 'address', 'source_accused_fields', 'crime_id',
+)
+_CRIME_COLUMNS = ('major_head', 'minor_head', 'crime_type', 'acts_sections')
+
+_ROWS_SQL = """
+    SELECT bfa.bf_accused_id, bfa.canonical_person_id, bfa.accused_id, bfa.person_code, bfa.full_name,
+           bfa.alias_name, bfa.age, bfa.gender, bfa.address, bfa.source_accused_fields, bfa.crime_id,
+           SOUNDEX(bfa.full_name) AS sx, dmetaphone(COALESCE(bfa.full_name, '')) AS dm
+    FROM public.brief_facts_ai bfa
+"""
+_CRIMES_SQL = """
+    SELECT c.crime_id, c.major_head, c.minor_head, c.crime_type, c.acts_sections
+    FROM public.crimes c
+    WHERE c.crime_id = ANY(%s)
+"""
+_CODE_RE = re.compile(r'A\s*[-.]?\s*(\d+)', flags=re.IGNORECASE)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def _norm_code(code):
+    match = _CODE_RE.search(str(code)) if code else None
+    return f"A-{int(match.group(1))}" if match else None
+
+
+def _name_tokens(name):
+    return set(_TOKEN_RE.findall((name or '').lower()))
+
+
+class DedupCandidateIndex:
+    """Thread-safe; shared by all crime workers of a run."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: Dict[str, dict] = {}                   # bf_accused_id -> row (+ _sx/_dm/_ps/_tokens)
+        self._by_crime: Dict[str, Set[str]] = defaultdict(set)
+        self._by_sx: Dict[str, Set[str]] = defaultdict(set)
+        self._by_dm: Dict[str, Set[str]] = defaultdict(set)
+        self._by_ps: Dict[str, Set[str]] = defaultdict(set)
+        self._by_accused: Dict[str, Set[str]] = defaultdict(set)
+        self._crimes: Dict[str, dict] = {}
+        self._keys: Dict[str, tuple] = {}                 # probe name -> (soundex, dmetaphone)
+
+    # ------------------------------------------------------------------ load
+
+    def load(self, conn):
+        """Full load: one server-side cursor pass over brief_facts_ai + the crimes it references."""
+        with conn.cursor(name='bfai_dedup_index', cursor_factory=RealDictCursor) as cur:
+            cur.itersize = LOAD_FETCH_SIZE
+            cur.execute(_ROWS_SQL)
+            with self._lock:
+                for row in cur:
+                    self._add(row)
+        self._load_crimes(conn, list(self._by_crime))
+        conn.commit()
+        logger.info(f"🔎 Dedup index loaded: {len(self._rows)} rows across {len(self._by_crime)} crimes")
+        return self
+
+    def _load_crimes(self, conn, crime_ids):
+        missing = [cid for cid in crime_ids if cid not in self._crimes]
+        for start in range(0, len(missing), LOAD_FETCH_SIZE):
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(_CRIMES_SQL, (missing[start:start + LOAD_FETCH_SIZE],))
+                fetched = {r['crime_id']: {k: r.get(k) for k in _CRIME_COLUMNS} for r in cur.fetchall()}
+            with self._lock:
+                for cid in missing[start:start + LOAD_FETCH_SIZE]:
+                    # LEFT JOIN semantics: crime columns are NULL when the crime row is missing
+                    self._crimes[cid] = fetched.get(cid) or dict.fromkeys(_CRIME_COLUMNS)
+
+    def _add(self, row):
+        bf_id = str(row['bf_accused_id'])
+        entry = {k: row.get(k) for k in _ROW_COLUMNS}
+        saf = entry.get('source_accused_fields')
+        ps = saf.get('ps_code') if isinstance(saf, dict) else None
+        entry['_ps'] = str(ps) if ps is not None else None
+        entry['_sx'] = row.get('sx')
+        entry['_dm'] = row.get('dm')
+        entry['_tokens'] = _name_tokens(entry.get('full_name'))
+        self._rows[bf_id] = entry
+        self._by_crime[entry['crime_id']].add(bf_id)
+        if entry.get('accused_id') is not None:
+            self._by_accused[str(entry['accused_id'])].add(bf_id)
+        if entry.get('full_name') is None:
+            return   # not a dedup candidate; still counted for associate codes / accused_id
+        if entry['_sx'] is not None:
+            self._by_sx[entry['_sx']].add(bf_id)
+        if entry['_dm'] is not None:
+            self._by_dm[entry['_dm']].add(bf_id)
+        if entry['_ps'] is not None:
+            self._by_ps[entry['_ps']].add(bf_id)
+
+    def _remove(self, bf_id):
+        entry = self._rows.pop(bf_id, None)
+        if entry is None:
+            return
+        self._by_crime[entry['crime_id']].discard(bf_id)
+        if entry.get('accused_id') is not None:
+            self._by_accused[str(entry['accused_id'])].discard(bf_id)
+        for bucket, key in ((self._by_sx, entry['_sx']), (self._by_dm, entry['_dm']), (self._by_ps, entry['_ps'])):
+            if key is not None:
+                bucket[key].discard(bf_id)
+
+    def replace_crime(self, conn, crime_id):
+        """Re-read one crime's rows (index scan on crime_id) after its writes committed."""
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(_ROWS_SQL + " WHERE bfa.crime_id = %s", (crime_id,))
+            rows = cur.fetchall()
+        with self._lock:
+            for bf_id in list(self._by_crime.get(crime_id, ())):
+                self._remove(bf_id)
+            for row in rows:
+                self._add(row)
+        if rows:
+            self._load_crimes(conn, [crime_id])
+
+    # ---------------------------------------------------------------- lookups
+
+    def phonetic_keys(self, conn, full_name):
+        """(SOUNDEX, dmetaphone) of a probe name, computed by PostgreSQL and memoized."""
+        name = full_name or ''
+        keys = self._keys.get(name)
+        if keys is None:
+            with conn.cursor() as cur:
+                cur.execute("SELECT SOUNDEX(%s), dmetaphone(%s)", (name, name))
+                keys = tuple(cur.fetchone())
+            self._keys[name] = keys
+        return keys
+
+    def candidates(self, conn, current_crime_id, full_name, ps_code=None, limit=200) -> List[dict]:
+        """Same rows/tiering as db.fetch_dedup_candidates(), without scanning brief_facts_ai."""
+        sx, dm = self.phonetic_keys(conn, full_name)
+        probe_tokens = _name_tokens(full_name)
+        ps_key = str(ps_code) if ps_code is not None else None
+        with self._lock:
+            sx_ids = self._by_sx.get(sx, set()) if sx is not None else set()
+            dm_ids = self._by_dm.get(dm, set()) if dm is not None else set()
+            ps_ids = self._by_ps.get(ps_key, set()) if ps_key is not None else set()
+            ranked = []
+            for bf_id in sx_ids | dm_ids | ps_ids:
+                entry = self._rows[bf_id]
+                if entry['crime_id'] == current_crime_id:
+                    continue
+                tier = 0 if bf_id in sx_ids else (1 if bf_id in dm_ids else 2)
+                ranked.append((tier, -len(probe_tokens & entry['_tokens']), bf_id, entry))
+            ranked.sort(key=lambda item: item[:3])
+            out = []
+            for _, _, _, entry in ranked[:limit]:
+                cand = {k: entry.get(k) for k in _ROW_COLUMNS}
+                cand.update(self._crimes.get(entry['crime_id']) or dict.fromkeys(_CRIME_COLUMNS))
+                out.append(cand)
+        return out
+
+    def canonical_by_accused(self, accused_id, current_crime_id) -> Optional[dict]:
+        """Same as db.fetch_canonical_by_accused_id()."""
+        with self._lock:
+            for bf_id in self._by_accused.get(str(accused_id), ()):
+                entry = self._rows[bf_id]
+                if entry['crime_id'] != current_crime_id and entry.get('canonical_person_id') is not None:
+                    return {'canonical_person_id': entry['canonical_person_id']}
+        return None
+
+    def associate_codes(self, crime_id) -> Set[str]:
+        """Same as db.fetch_crime_associate_person_codes()."""
+        codes = set()
+        with self._lock:
+            for bf_id in self._by_crime.get(crime_id, ()):
+                entry = self._rows[bf_id]
+                if entry.get('accused_id') is not None:
+                    code = _norm_code(entry.get('person_code'))
+                    if code:
+                        codes.add(code)
+        return codes
+
+
+_index: Optional[DedupCandidateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index(conn) -> Optional[DedupCandidateIndex]:
+    """
+    Run-wide index, loaded through `conn` on first use (call before workers start so the
+    load does not need an extra pooled connection). None when BFAI_DEDUP_INDEX=false or
+    loading failed; callers then use the per-accused SQL lookups.
+    """
+    global _index, DEDUP_INDEX_ENABLED
+    if not DEDUP_INDEX_ENABLED:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = DedupCandidateIndex().load(conn)
+                except Exception as e:
+                    conn.rollback()
+                    logger.warning(f"Dedup index load failed ({e}); falling back to per-accused SQL lookups")
+                    DEDUP_INDEX_ENABLED = False
+                    return None
+    return _index
+
+
+def current_dedup_index() -> Optional[DedupCandidateIndex]:
+    """The index if it has been built, without triggering a load."""
+    return _index
@@ -7,7 +7,7 @@ import os
 
 # Ensure core is accessible
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core.llm_service import get_llm, invoke_extraction_with_retry, RobustJsonOutputParser
+from core.llm_service import get_llm, invoke_extraction_cached, RobustJsonOutputParser
 
 import config
 import logging
@@ -722,12 +722,14 @@ def extract_accused_names_pass1(text: str) -> Optional[List[str]]:
         logger.info(f"Pass 1: Invoking LLM with model {config.LLM_MODEL}...")
         logger.info(f"Pass 1 Prompt Length: {len(text)} chars")
 
-        response = invoke_extraction_with_retry(
+        response = invoke_extraction_cached(
             chain,
             {
                 "text": text,
                 "format_instructions": parser.get_format_instructions()
             },
+            template=PASS1_PROMPT,
+            llm_service=get_llm('extraction'),
             max_retries=1
         )
 
@@ -761,13 +763,15 @@ def extract_details_pass2(text: str, accused_names: List[str]) -> Optional[List[
         start_time = time.time()
         logger.info("Pass 2: Invoking LLM for details...")
 
-        response = invoke_extraction_with_retry(
+        response = invoke_extraction_cached(
             chain,
             {
                 "text": text,
                 "accused_names": str(accused_names),
                 "format_instructions": parser.get_format_instructions()
             },
+            template=PASS2_PROMPT,
+            llm_service=get_llm('extraction'),
             max_retries=1
         )
 
@@ -1128,13 +1132,15 @@ def extract_roles_for_known_accused(
             f"(missing_fields={len(missing_fields_map)}, needs_code={len(needs_person_code)})"
         )
 
-        response = invoke_extraction_with_retry(
+        response = invoke_extraction_cached(
             chain,
             {
                 "text": text,
                 "accused_list": accused_list_str,
                 "format_instructions": parser.get_format_instructions()
             },
+            template=PASS2_KNOWN_ACCUSED_PROMPT,
+            llm_service=get_llm('extraction'),
             max_retries=2
         )
 
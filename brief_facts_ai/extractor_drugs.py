@@ -8,6 +8,7 @@ from langchain_core.output_parsers import JsonOutputParser  # noqa: F401  (kept
 import sys
 import os
 import re
+import bisect
 import httpx
 
 def _safe_prompt_template(template: str) -> str:
@@ -22,8 +23,10 @@ logger = logging.getLogger(__name__)
 
 # Ensure core is accessible
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from core.llm_service import get_llm, invoke_extraction_with_retry, RobustJsonOutputParser
+from core.llm_service import get_llm, invoke_extraction_cached, RobustJsonOutputParser
 import config
+from keyword_matcher import KeywordMatcher
+from trigram_index import DrugTrigramIndex
 
 # =============================================================================
 # Thread-safe LLM instances
@@ -156,23 +159,113 @@ def build_drug_keywords(drug_categories: List[dict]) -> Set[str]:
     return keywords
 
 
+# Items that are NEVER drugs under NDPS Act — safety net in filter_non_drug_entries()
+SEIZED_NON_DRUG_ITEMS = {
+    'motorcycle', 'motor cycle', 'motorbike', 'scooter', 'moped',
+    'car', 'truck', 'lorry', 'tractor', 'auto', 'vehicle', 'two-wheeler',
+    'mobile', 'mobile phone', 'cell phone', 'smartphone', 'sim card', 'sim',
+    'cash', 'currency', 'rupees', 'money', 'notes',
+    'weighing scale', 'weighing machine', 'digital scale', 'balance',
+    'kite string', 'manja', 'chinese manja',
+}
+
+
+class DrugKeywordIndex:
+    """
+    One compiled Aho–Corasick automaton (keyword_matcher.py) over every term the drug
+    pipeline substring-matches: Tier-1 relevance keywords, Tier-2 context words, KB raw
+    names and the non-drug safety net. Each text is scanned once, replacing the
+    per-keyword `kw in text` loops of _score_drug_relevance(), resolve_primary_drug_name()
+    Tier 2 and filter_non_drug_entries(). Results are identical to those loops.
+
+    Built once per KB version in main.py and shared read-only across worker threads.
+    """
+
+    def __init__(self, dynamic_drug_keywords: Set[str] = None, kb_lookup: Dict[str, str] = None):
+        tier1 = dynamic_drug_keywords if dynamic_drug_keywords else _DRUG_KEYWORDS_TIER1_FALLBACK
+        self.kb_lookup = dict(kb_lookup or {})
+        self._kb_keys = list(self.kb_lookup)
+        self.matcher = KeywordMatcher(
+            list(tier1) + list(_DRUG_KEYWORDS_TIER2) + self._kb_keys + list(SEIZED_NON_DRUG_ITEMS)
+        )
+        index_of = {p: i for i, p in enumerate(self.matcher.patterns)}
+        self._tier1 = frozenset(index_of[k] for k in tier1 if k)
+        self._tier2 = frozenset(index_of[k] for k in _DRUG_KEYWORDS_TIER2)
+        self._non_drug = frozenset(index_of[k] for k in SEIZED_NON_DRUG_ITEMS)
+        # KB key order matters: Tier 2 returns the FIRST kb_lookup key that matches.
+        self._kb_rank = {}
+        for rank, key in enumerate(self._kb_keys):
+            if key:
+                self._kb_rank.setdefault(index_of[key], rank)
+        self._kb_empty_rank = self._kb_keys.index('') if '' in self.kb_lookup else None
+        # raw-in-kb: one str.find over all keys joined in order → first containing key
+        self._kb_joined = '\x00'.join(self._kb_keys)
+        self._kb_offsets = []
+        offset = 0
+        for key in self._kb_keys:
+            self._kb_offsets.append(offset)
+            offset += len(key) + 1
+
+    def scan(self, text: str) -> List[Tuple[int, str]]:
+        """All keyword hits in lowercased text as (start, keyword), in one pass."""
+        return self.matcher.hits((text or '').lower())
+
+    def relevance_hits(self, section: str) -> Tuple[bool, int]:
+        """(any Tier-1 keyword present, number of distinct Tier-2 keywords present)."""
+        found = self.matcher.found_indices(section.lower())
+        return not self._tier1.isdisjoint(found), len(found & self._tier2)
+
+    def kb_key_in(self, raw: str) -> Optional[str]:
+        """First kb_lookup key (in dict order) that is a substring of raw."""
+        ranks = [self._kb_rank[i] for i in self.matcher.found_indices(raw) if i in self._kb_rank]
+        if self._kb_empty_rank is not None:
+            ranks.append(self._kb_empty_rank)
+        return self._kb_keys[min(ranks)] if ranks else None
+
+    def kb_key_containing(self, raw: str) -> Optional[str]:
+        """First kb_lookup key (in dict order) that contains raw."""
+        if '\x00' in raw:
+            return next((k for k in self._kb_keys if raw in k), None)
+        pos = self._kb_joined.find(raw)
+        if pos < 0:
+            return None
+        return self._kb_keys[bisect.bisect_right(self._kb_offsets, pos) - 1]
+
+    def non_drug_term(self, *texts: str) -> Optional[str]:
+        """A SEIZED_NON_DRUG_ITEMS term contained in any of texts, else None."""
+        for text in texts:
+            for i in self.matcher.found_indices(text):
+                if i in self._non_drug:
+                    return self.matcher.patterns[i]
+        return None
+
+
 def _estimate_tokens(text: str) -> int:
     """Rough token estimate: ~1 token per 4 characters for English text."""
     return len(text) // 4
 
 
-def _score_drug_relevance(section: str, dynamic_drug_keywords: Set[str] = None) -> int:
+def _score_drug_relevance(section: str, dynamic_drug_keywords: Set[str] = None,
+                          keyword_index: DrugKeywordIndex = None) -> int:
     """
     Score a text section for drug-relevance.
 
     Uses dynamic_drug_keywords (from KB) when provided, otherwise falls back
-    to the static _DRUG_KEYWORDS_TIER1_FALLBACK.
+    to the static _DRUG_KEYWORDS_TIER1_FALLBACK. With keyword_index (built from
+    the same keywords) both tiers come from a single automaton pass.
 
     Returns:
       100+ : Definitive drug content (tier-1 keyword found)
       50-99: Probable drug content (NDPS section ref or multiple tier-2 keywords)
       0-49 : Unlikely drug content
     """
+    if keyword_index is not None:
+        tier1_hit, t2_hits = keyword_index.relevance_hits(section)
+        score = 100 if tier1_hit else 0
+        if _NDPS_SECTION_RE.search(section):
+            score += 80
+        return score + t2_hits * 15
+
     tier1 = dynamic_drug_keywords if dynamic_drug_keywords else _DRUG_KEYWORDS_TIER1_FALLBACK
     lower = section.lower()
     score = 0
@@ -198,6 +291,7 @@ def preprocess_brief_facts(
     text: str,
     relevance_threshold: int = 50,
     dynamic_drug_keywords: Set[str] = None,
+    keyword_index: DrugKeywordIndex = None,
 ) -> Tuple[str, dict]:
     """
     Pre-process brief_facts text before sending to LLM.
@@ -213,6 +307,8 @@ def preprocess_brief_facts(
         dynamic_drug_keywords:  KB-derived keyword set from build_drug_keywords().
                                 When provided, ALL drugs in drug_categories are
                                 detectable — not just the 25 static ones.
+        keyword_index:          Optional DrugKeywordIndex built from the same keywords;
+                                scores each section in one automaton pass.
 
     Returns:
         (filtered_text, metadata_dict)
@@ -241,7 +337,7 @@ def preprocess_brief_facts(
     # Score each section
     scored = []
     for i, section in enumerate(sections):
-        score = _score_drug_relevance(section, dynamic_drug_keywords)
+        score = _score_drug_relevance(section, dynamic_drug_keywords, keyword_index)
         kept = score >= relevance_threshold
         scored.append((i, section, score, kept))
 
@@ -505,6 +601,8 @@ def resolve_primary_drug_name(
     drugs: List[DrugExtraction],
     kb_lookup: Dict[str, str],
     conn=None,
+    keyword_index: DrugKeywordIndex = None,
+    trigram_index: DrugTrigramIndex = None,
 ) -> List[DrugExtraction]:
     """
     Three-tier KB name resolution — runs AFTER LLM extraction.
@@ -524,9 +622,10 @@ def resolve_primary_drug_name(
         e.g. "60 Grams floating and flowering dry Ganja" contains "dry ganja"
         e.g. "nitravet" is contained in "nitravet 10 mg tablets"
 
-    Tier 3 — pg_trgm fuzzy match via DB (only when conn provided, only on miss)
-        Calls fuzzy_match_drug_name(conn, raw_drug_name, threshold=0.35)
-        Uses the GIN index on drug_categories(raw_name) — fast single lookup
+    Tier 3 — pg_trgm fuzzy match (only on miss)
+        trigram_index.best_match(raw_drug_name) when a DrugTrigramIndex is given —
+        in-memory, same scores/threshold as pg_trgm; otherwise (conn provided)
+        fuzzy_match_drug_name(conn, raw_drug_name, threshold=0.35) via the GIN index
         Catches misspellings and transliterations the LLM got right but KB
         doesn't have as exact text: "ganza"→"Ganja", "heroien"→"Heroin",
         "kokain"→"Cocaine", "smak"→"Heroin", "alprazolam tab"→"Alprazolam"
@@ -540,16 +639,23 @@ def resolve_primary_drug_name(
         kb_lookup:  {raw_name_lower: standard_name} dict — read-only, thread-safe.
         conn:       Optional DB connection for Tier 3 pg_trgm fallback.
                     Pass None to skip Tier 3 (name stays as LLM output).
+        keyword_index: Optional DrugKeywordIndex whose kb_lookup IS this kb_lookup
+                    (identity, not equality, so the check costs nothing); Tier 2
+                    then costs one automaton pass instead of two scans of the KB.
+        trigram_index: Optional DrugTrigramIndex over the verified KB; Tier 3 then
+                    needs no connection (conn is ignored).
 
     Thread-safety: kb_lookup is read-only. conn is per-thread (from thread-local
     pool or passed explicitly) — do not share across threads.
     """
-    if not kb_lookup and conn is None:
+    if not kb_lookup and conn is None and trigram_index is None:
         return drugs
 
     # Import here to avoid circular import — db.py imports from extractor indirectly
     fuzzy_fn = None
-    if conn is not None:
+    if trigram_index is not None:
+        fuzzy_fn = lambda _conn, raw_drug_name: trigram_index.best_match(raw_drug_name)
+    elif conn is not None:
         try:
             from db import fuzzy_match_drug_name
             fuzzy_fn = fuzzy_match_drug_name
@@ -570,7 +676,17 @@ def resolve_primary_drug_name(
             tier_used = "exact"
 
         # ── Tier 2: Substring match ──
-        if not resolved and kb_lookup:
+        if not resolved and kb_lookup and keyword_index is not None and keyword_index.kb_lookup is kb_lookup:
+            kb_raw = keyword_index.kb_key_in(raw)
+            if kb_raw is not None:
+                resolved = kb_lookup[kb_raw]
+                tier_used = "substring(kb-in-raw)"
+            elif len(raw) >= 4:
+                kb_raw = keyword_index.kb_key_containing(raw)
+                if kb_raw is not None:
+                    resolved = kb_lookup[kb_raw]
+                    tier_used = "substring(raw-in-kb)"
+        elif not resolved and kb_lookup:
             # KB key inside raw name (e.g. "dry ganja" in "floating dry ganja 60g")
             for kb_raw, kb_std in kb_lookup.items():
                 if kb_raw in raw:
@@ -615,6 +731,7 @@ def resolve_primary_drug_name(
 def filter_non_drug_entries(
     drugs: List[DrugExtraction],
     ignore_set: Set[str],
+    keyword_index: DrugKeywordIndex = None,
 ) -> List[DrugExtraction]:
     """
     Drop entries whose primary_drug_name exactly matches a term in ignore_set.
@@ -636,16 +753,6 @@ def filter_non_drug_entries(
     - Checked via substring against primary_drug_name to catch composed names
       (e.g. "Hero HF Deluxe Motorcycle" contains "motorcycle")
     """
-    # Hardcoded safety net — items that are NEVER drugs under NDPS Act
-    SEIZED_NON_DRUG_ITEMS = {
-        'motorcycle', 'motor cycle', 'motorbike', 'scooter', 'moped',
-        'car', 'truck', 'lorry', 'tractor', 'auto', 'vehicle', 'two-wheeler',
-        'mobile', 'mobile phone', 'cell phone', 'smartphone', 'sim card', 'sim',
-        'cash', 'currency', 'rupees', 'money', 'notes',
-        'weighing scale', 'weighing machine', 'digital scale', 'balance',
-        'kite string', 'manja', 'chinese manja',
-    }
-
     kept = []
     for drug in drugs:
         primary = (drug.primary_drug_name or '').lower().strip()
@@ -660,10 +767,13 @@ def filter_non_drug_entries(
             continue
 
         # Check 2: substring match against hardcoded non-drug safety net
-        matched_safetynet = next(
-            (item for item in SEIZED_NON_DRUG_ITEMS if item in primary or item in (drug.raw_drug_name or '').lower()),
-            None
-        )
+        if keyword_index is not None:
+            matched_safetynet = keyword_index.non_drug_term(primary, (drug.raw_drug_name or '').lower())
+        else:
+            matched_safetynet = next(
+                (item for item in SEIZED_NON_DRUG_ITEMS if item in primary or item in (drug.raw_drug_name or '').lower()),
+                None
+            )
         if matched_safetynet:
             logger.info(
                 f"[IgnoreFilter] Dropped '{drug.raw_drug_name}' "
@@ -1087,6 +1197,8 @@ def extract_drug_info(
     kb_lookup: Dict[str, str] = None,
     dynamic_drug_keywords: Set[str] = None,
     conn=None,
+    keyword_index: DrugKeywordIndex = None,
+    trigram_index: DrugTrigramIndex = None,
 ) -> List[DrugExtraction]:
     """
     Extracts a list of drug information objects from the given text.
@@ -1118,6 +1230,10 @@ def extract_drug_info(
         dynamic_drug_keywords:  KB-derived token set for preprocessor scoring (Step 0).
         conn:                   Optional DB connection for Step 4 Tier 3 pg_trgm fallback.
                                 Pass per-thread connection — not shared across threads.
+        keyword_index:          Optional DrugKeywordIndex (built once per KB version) used
+                                by Steps 0, 4 and 5 instead of per-keyword scans.
+        trigram_index:          Optional DrugTrigramIndex (built once per KB version); Step 4
+                                Tier 3 then runs in memory and conn is not used.
 
     Returns:
         List of DrugExtraction objects. Empty list if no drugs found or error.
@@ -1133,6 +1249,7 @@ def extract_drug_info(
     filtered_text, preprocess_meta = preprocess_brief_facts(
         text,
         dynamic_drug_keywords=dynamic_drug_keywords,
+        keyword_index=keyword_index,
     )
 
     if not filtered_text or not filtered_text.strip():
@@ -1170,7 +1287,14 @@ def extract_drug_info(
         chain = prompt | llm | parser
 
         input_data = {"text": filtered_text}
-        response   = invoke_extraction_with_retry(chain, input_data, max_retries=1)
+        # Parsed response is cached by (model, prompt + schema, text); post-processing
+        # below still runs on every call so KB changes apply to cached extractions too.
+        response   = invoke_extraction_cached(
+            chain, input_data,
+            template=EXTRACTION_PROMPT + parser.get_format_instructions(),
+            llm_service=get_llm('extraction'),
+            max_retries=1,
+        )
 
         if not response:
             logger.warning("LLM returned empty response (all retries failed). Returning empty.")
@@ -1227,10 +1351,13 @@ def extract_drug_info(
                 logger.warning(f"Skipping invalid drug entry: {e} | data: {d}")
 
         # ── Step 4: Deterministic KB name resolution ──
-        kb_resolved = resolve_primary_drug_name(valid_drugs, kb_lookup, conn=conn)
+        kb_resolved = resolve_primary_drug_name(
+            valid_drugs, kb_lookup, conn=conn,
+            keyword_index=keyword_index, trigram_index=trigram_index,
+        )
 
         # ── Step 5: Drop non-drug entries (ignore list + safety net) ──
-        filtered = filter_non_drug_entries(kb_resolved, ignore_set)
+        filtered = filter_non_drug_entries(kb_resolved, ignore_set, keyword_index=keyword_index)
 
         # ── Steps 6-9: Unit standardization → Worth distribution → Commercial check → Dedup ──
         standardized       = standardize_units(filtered)
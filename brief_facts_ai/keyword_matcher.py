@@ -0,0 +1,123 @@
+"""
+Multi-pattern substring matcher (Aho–Corasick).
+
+One left-to-right pass over the text reports every occurrence of every pattern,
+including overlapping ones ("packet" and "packets", "ganja" and "dry ganja"), which
+is exactly the semantics of checking `pattern in text` for each pattern — at a cost
+proportional to the text length instead of (patterns x text).
+
+Uses the C `pyahocorasick` package when installed; otherwise a pure-Python automaton
+compiled to a full transition table (one dict lookup per character).
+Patterns and texts are matched as given — callers lowercase both.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick as _ahocorasick
+except Exception:  # pragma: no cover - optional dependency fallback
+    _ahocorasick = None
+
+
+class KeywordMatcher:
+    """Compiled automaton over a fixed pattern set. Read-only after __init__ — thread-safe."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        seen = set()
+        for pattern in patterns:
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self.patterns.append(pattern)
+
+        self._automaton = None
+        if _ahocorasick is not None and self.patterns:
+            automaton = _ahocorasick.Automaton()
+            for idx, pattern in enumerate(self.patterns):
+                automaton.add_word(pattern, idx)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            self._build_table()
+
+    @property
+    def backend(self) -> str:
+        return "pyahocorasick" if self._automaton is not None else "python"
+
+    def _build_table(self):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for idx, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (idx,)
+
+        # BFS: failure links folded into a complete transition table (DFA), so matching
+        # never walks failure chains.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            trans = dict(fallback)
+            for ch, nxt in goto[state].items():
+                fail[nxt] = fallback.get(ch, 0) if state else 0
+                trans[ch] = nxt
+                queue.append(nxt)
+            delta[state] = trans
+            out[state] = out[state] + out[fail[state]]
+        self._delta = delta
+        self._out = out
+
+    def iter_hits(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_index) for every occurrence; end_index is inclusive."""
+        if not text or not self.patterns:
+            return
+        if self._automaton is not None:
+            yield from self._automaton.iter(text)
+            return
+        delta, out = self._delta, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for idx in out[state]:
+                    yield pos, idx
+
+    def hits(self, text: str) -> List[Tuple[int, str]]:
+        """All (start_index, pattern) occurrences, in order of their end position."""
+        patterns = self.patterns
+        return [(end - len(patterns[idx]) + 1, patterns[idx]) for end, idx in self.iter_hits(text)]
+
+    def found(self, text: str) -> Set[str]:
+        """Distinct patterns occurring in text (== {p for p in patterns if p in text})."""
+        return {self.patterns[idx] for _, idx in self.iter_hits(text)}
+
+    def found_indices(self, text: str) -> Set[int]:
+        if self._automaton is not None or not text or not self.patterns:
+            return {idx for _, idx in self.iter_hits(text)}
+        # Hot path of the pure-Python backend: no generator, no positions
+        delta, out = self._delta, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def first_found(self, text: str) -> Optional[str]:
+        """Any one pattern occurring in text, stopping at the first hit."""
+        for _, idx in self.iter_hits(text):
+            return self.patterns[idx]
+        return None
@@ -4,8 +4,11 @@ import logging
 import threading
 import uuid
 import os
+import json
+import hashlib
 import unicodedata
 from difflib import SequenceMatcher
+from functools import lru_cache
 # Allow imports from sibling ETL modules (e.g., env_utils from parent)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -33,6 +36,9 @@ from db import (
     start_crime_processing_run,
     complete_crime_processing_run,
     fail_crime_processing_run,
+    ensure_input_fingerprint_column,
+    fetch_last_input_fingerprints,
+    record_unchanged_crime_run,
     normalize_accused_status,
     resolve_status_for_insert,
     strip_alias_name,
@@ -41,9 +47,10 @@ from db import (
     fetch_canonical_by_accused_id,
     fetch_crime_profile,
     fetch_crime_associate_person_codes,
-    delete_brief_facts_for_crime,
-    update_sentinel_role, bulk_upsert_brief_facts_ai, write_drugs_by_accused_in_memory, insert_accused_facts,
+    bulk_upsert_brief_facts_ai, write_drugs_by_accused_in_memory,
+    CrimeWriteBuffer,
 )
+from dedup_index import get_dedup_index, current_dedup_index
 from extractor_accused import (
     extract_accused_info,
     extract_accused_names_pass1,
@@ -68,6 +75,14 @@ logger = logging.getLogger(__name__)
 
 UNIFIED_TABLE_NAME = "brief_facts_ai"
 
+# Bump when extraction/post-processing logic changes so every crime is re-extracted once.
+INPUT_FINGERPRINT_VERSION = "1"
+SKIP_UNCHANGED = os.environ.get('BFAI_SKIP_UNCHANGED', 'true').strip().lower() not in ('0', 'false', 'no', 'off')
+# Compiled drug keyword automaton, rebuilt only when the drug KB version changes
+_DRUG_KEYWORD_INDEX = {}
+# In-memory pg_trgm equivalent for drug-name Tier 3, same lifetime as the automaton
+_DRUG_TRIGRAM_INDEX = {}
+
 
 def _synthetic_accused_id(crime_id, full_name, seq_num):
     base = f"{crime_id}|{(full_name or '').strip().lower()}|{(seq_num or '').strip().lower()}"
@@ -133,6 +148,7 @@ def _transliterate_indic_approx(value):
     return translit if translit.strip() else str(value)
 
 
+@lru_cache(maxsize=65536)
 def _normalize_name(value):
     if not value:
         return ''
@@ -300,6 +316,15 @@ def _dedup_score(current, candidate, ps_code, current_crime_profile, current_ass
     return round(min(score, 1.0), 2)
 
 
+def _new_assoc_cache(crime_id, writes):
+    """
+    Associate-codes cache for one crime's _resolve_canonical_identity calls.
+    When this run replaces the crime's brief_facts_ai rows (deleted at flush), the stale
+    rows from the previous run are not the crime's associates, so it starts out empty.
+    """
+    return {crime_id: set()} if writes.replaces_crime(crime_id) else {}
+
+
 def _resolve_canonical_identity(conn, current_crime_id, payload, ps_code,
                                 _crime_profile_cache=None, _assoc_cache=None):
     """
@@ -327,16 +352,25 @@ def _resolve_canonical_identity(conn, current_crime_id, payload, ps_code,
         _assoc_cache[current_crime_id] = fetch_crime_associate_person_codes(conn, current_crime_id)
     current_assoc_codes = _assoc_cache[current_crime_id]
 
+    # Run-wide in-memory candidate index (dedup_index.py); None → per-accused SQL lookups.
+    index = current_dedup_index()
+
     # Layer 0: direct accused_id lookup — bypasses candidate pool entirely.
     # person_code (A1, A2...) is crime-relative sequence, NOT a cross-crime identifier.
     # Only accused_id (DB UUID from public.accused) is person-specific and safe to match across crimes.
     if current_accused_id:
-        row = fetch_canonical_by_accused_id(conn, current_accused_id, current_crime_id)
+        if index is not None:
+            row = index.canonical_by_accused(current_accused_id, current_crime_id)
+        else:
+            row = fetch_canonical_by_accused_id(conn, current_accused_id, current_crime_id)
         if row and row.get('canonical_person_id'):
             return row['canonical_person_id'], None, 0, False
 
     # Layer 1: exact accused_id match within candidate pool (phonetic neighbours)
-    candidates = fetch_dedup_candidates(conn, current_crime_id, full_name, ps_code)
+    if index is not None:
+        candidates = index.candidates(conn, current_crime_id, full_name, ps_code)
+    else:
+        candidates = fetch_dedup_candidates(conn, current_crime_id, full_name, ps_code)
     for cand in candidates:
         if current_accused_id and cand.get('accused_id') and str(current_accused_id) == str(cand.get('accused_id')):
             return cand.get('canonical_person_id') or fallback_canonical, None, 1, False
@@ -347,7 +381,10 @@ def _resolve_canonical_identity(conn, current_crime_id, payload, ps_code,
     for cand in candidates:
         cand_crime_id = cand.get('crime_id')
         if cand_crime_id not in _assoc_cache:
-            _assoc_cache[cand_crime_id] = fetch_crime_associate_person_codes(conn, cand_crime_id)
+            _assoc_cache[cand_crime_id] = (
+                index.associate_codes(cand_crime_id) if index is not None
+                else fetch_crime_associate_person_codes(conn, cand_crime_id)
+            )
         candidate_assoc_codes = _assoc_cache.get(cand_crime_id, set())
         score = _dedup_score(
             payload,
@@ -573,6 +610,50 @@ def _inject_accused_roster(facts_text, rows):
     return roster_block + (facts_text or '')
 
 
+def _predict_branch_a_roster(db_accused):
+    """
+    Drug-attribution roster a Branch A crime will end up with, when it is fully determined
+    by the DB: every accused is of a direct-code type (person_code = accused_code) and the
+    LLM-added extra accused never carry a person_code. Returns None when the roster depends
+    on LLM output (Known/Respondent/Suspect rows get LLM-assigned codes).
+    """
+    roster = []
+    for row in db_accused:
+        if (row.get('accused_type_db') or 'Accused').strip() not in ('Accused', 'CCL'):
+            return None
+        if row.get('accused_code'):
+            roster.append(tuple([None, None, row.get('accused_code'), row.get('full_name')]))
+    return roster
+
+
+def _drug_kb_version(drug_categories, ignore_dict):
+    """Hash of the verified drug KB + ignore list the drug extractor runs against."""
+    payload = json.dumps(
+        [sorted((r['raw_name'] or '', r['standard_name'] or '') for r in drug_categories), sorted(ignore_dict)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _input_fingerprint(facts_text, db_accused, kb_version):
+    """
+    Fingerprint of everything extraction reads for a crime: brief_facts text, the accused
+    roster from fetch_existing_accused_for_crime, the drug KB version and the model.
+    Crime columns that do not feed extraction (case_status, io_name, ...) are not part of it.
+    """
+    roster = sorted(
+        (json.dumps(dict(row), sort_keys=True, default=str, ensure_ascii=False) for row in db_accused or []),
+    )
+    payload = json.dumps({
+        'v': INPUT_FINGERPRINT_VERSION,
+        'model': config.LLM_MODEL,
+        'text': unicodedata.normalize('NFC', facts_text or ''),
+        'accused': roster,
+        'kb': kb_version,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 
 
 
@@ -606,7 +687,7 @@ def main():
         if crime_ids:
             logging.info(f"Read {len(crime_ids)} IDs from {input_file}.")
             crimes = fetch_crimes_by_ids(conn, crime_ids)
-            process_crimes_parallel(crimes)
+            process_crimes_parallel(crimes, skip_unchanged=False)
         else:
             # ---------------------------------------------------------------
             # Determine processing mode:
@@ -683,6 +764,11 @@ def main():
 
             logging.info("Total crimes processed this run: %d", total_processed)
 
+            from core.llm_cache import get_llm_cache
+            llm_cache = get_llm_cache()
+            if llm_cache is not None:
+                logging.info(f"LLM response cache: {llm_cache.stats()}")
+
     except KeyboardInterrupt:
         logging.info("Process interrupted by user.")
     except Exception as e:
@@ -699,27 +785,85 @@ def main():
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
-def process_crimes_parallel(crimes):
-    """Processes a list of crimes in parallel using thread pool and connection pool."""
-    max_workers = int(os.environ.get('PARALLEL_LLM_WORKERS', '6'))
-    logging.info(f"🚀 Scaling accused extraction with {max_workers} parallel workers")
+def process_crimes_parallel(crimes, skip_unchanged=None):
+    """
+    Processes a list of crimes in parallel using thread pool and connection pool.
+
+    With skip_unchanged (default BFAI_SKIP_UNCHANGED=true), crimes whose input fingerprint
+    matches their last completed run are logged as complete without any LLM or
+    brief_facts_ai write work.
+    """
+    if skip_unchanged is None:
+        skip_unchanged = SKIP_UNCHANGED
+    # LLM requests from all crime workers go through one dispatcher that keeps at most
+    # OLLAMA_NUM_PARALLEL in flight. Run twice as many crime workers by default so the
+    # queue stays fed while other workers are in DB reads/writes.
+    from core.llm_dispatcher import get_llm_dispatcher
+    from db_pooling import PostgreSQLConnectionPool as _Pool
+    dispatcher = get_llm_dispatcher()
+    max_workers = int(os.environ.get('PARALLEL_LLM_WORKERS', str(2 * dispatcher.max_in_flight)))
+    pool_limit = max(1, (getattr(_Pool(), 'maxconn', None) or 20) - 1)   # main() holds one
+    if max_workers > pool_limit:
+        logging.warning(f"PARALLEL_LLM_WORKERS={max_workers} exceeds DB pool capacity; using {pool_limit}")
+        max_workers = pool_limit
+    logging.info(
+        f"🚀 Scaling accused extraction with {max_workers} parallel workers "
+        f"({dispatcher.max_in_flight} LLM requests in flight)"
+    )
 
     # Fetch drug KB once — shared read-only across all worker threads.
     # Previously fetched+rebuilt inside every worker (3 DB queries + 379KB parse per crime).
-    from extractor_drugs import build_drug_keywords, extract_drug_info
+    from extractor_drugs import build_drug_keywords, extract_drug_info, DrugKeywordIndex
+    from trigram_index import DrugTrigramIndex
     import db as db_module
-    from db_pooling import PostgreSQLConnectionPool as _Pool
     _bootstrap_conn = _Pool().get_connection()
+    unified_mode = (config.ACCUSED_TABLE_NAME or "").lower() == UNIFIED_TABLE_NAME
     try:
         _drug_categories = db_module.fetch_drug_categories(_bootstrap_conn)
         _ignore_dict     = db_module.fetch_drug_ignore_list(_bootstrap_conn)
+        _last_fingerprints = {}
+        get_dedup_index(_bootstrap_conn)
+        if unified_mode:
+            ensure_input_fingerprint_column(_bootstrap_conn)
+            if skip_unchanged:
+                _last_fingerprints = fetch_last_input_fingerprints(
+                    _bootstrap_conn, [c['crime_id'] for c in crimes]
+                )
     finally:
         _Pool().return_connection(_bootstrap_conn)
     _ignore_set      = set(_ignore_dict.keys())
-    _kb_lookup       = {row['raw_name'].lower().strip(): row['standard_name'] for row in _drug_categories}
     _dynamic_keywords = build_drug_keywords(_drug_categories)
+    _kb_version      = _drug_kb_version(_drug_categories, _ignore_dict)
+    _keyword_index   = _DRUG_KEYWORD_INDEX.get(_kb_version)
+    if _keyword_index is None:
+        _keyword_index = DrugKeywordIndex(
+            _dynamic_keywords,
+            {row['raw_name'].lower().strip(): row['standard_name'] for row in _drug_categories},
+        )
+        _DRUG_KEYWORD_INDEX.clear()
+        _DRUG_KEYWORD_INDEX[_kb_version] = _keyword_index
+    # The index's own dict (same KB version): resolve_primary_drug_name checks identity
+    _kb_lookup       = _keyword_index.kb_lookup
+    _trigram_index   = _DRUG_TRIGRAM_INDEX.get(_kb_version)
+    if _trigram_index is None:
+        _trigram_index = DrugTrigramIndex(_drug_categories)
+        _DRUG_TRIGRAM_INDEX.clear()
+        _DRUG_TRIGRAM_INDEX[_kb_version] = _trigram_index
     logging.info(f"Drug KB loaded once: {len(_dynamic_keywords)} keywords, {len(_drug_categories)} categories")
 
+    # Tier 3 fuzzy matching runs on _trigram_index, so the drug pass needs no DB connection
+    def _extract_drugs(text):
+        return extract_drug_info(
+            text, _drug_categories,
+            ignore_set=_ignore_set, kb_lookup=_kb_lookup,
+            dynamic_drug_keywords=_dynamic_keywords, conn=None,
+            keyword_index=_keyword_index, trigram_index=_trigram_index,
+        )
+
+    # Drug pass for crimes whose roster is known before the accused LLM pass; runs
+    # alongside the accused pass (both queue on the same dispatcher).
+    drug_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bfai-drugs")
+
     def worker(crime):
         crime_id = crime['crime_id']
         ps_code = crime.get('ps_code')
@@ -732,36 +876,54 @@ def process_crimes_parallel(crimes):
         with pool.get_connection_context() as conn:
             run_id = None
             rows_written = 0
-            unified_mode = (config.ACCUSED_TABLE_NAME or "").lower() == UNIFIED_TABLE_NAME
+            writes = CrimeWriteBuffer()
+            drug_future = None
+            drug_roster = None
             try:
                 db_accused = fetch_existing_accused_for_crime(conn, crime_id)
+                input_fingerprint = _input_fingerprint(facts_text, db_accused, _kb_version)
+                if unified_mode and _last_fingerprints.get(crime_id) == input_fingerprint:
+                    record_unchanged_crime_run(conn, crime_id, input_fingerprint)
+                    conn.commit()
+                    return True, crime_id, 'unchanged'
+
                 branch = _classify_db_accused(db_accused)
 
                 if unified_mode:
                     # Record branch in the log so Branch C entries can be
-                    # invalidated later when accused records arrive.
+                    # invalidated later when accused records arrive. Committed
+                    # right away: brief_facts_ai writes are buffered in `writes`
+                    # and applied after the LLM passes, so no row locks are held
+                    # while waiting on the LLM.
                     run_id = start_crime_processing_run(conn, crime_id, branch=branch)
-                    delete_brief_facts_for_crime(conn, crime_id)
+                    conn.commit()
+                    writes.delete_brief_facts_for_crime(crime_id)
+
+                    drug_roster = _predict_branch_a_roster(db_accused) if branch == 'A' else None
+                    if drug_roster is not None:
+                        drug_future = drug_executor.submit(
+                            _extract_drugs, _inject_accused_roster(facts_text, drug_roster)
+                        )
 
-                
                 if branch == 'A':
-                    rows_written, branch_records = _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id)
+                    rows_written, branch_records = _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id, writes)
                 elif branch == 'B':
-                    rows_written, branch_records = _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id)
+                    rows_written, branch_records = _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id, writes)
                 else:
-                    rows_written, branch_records = _process_branch_c(conn, crime_id, ps_code, facts_text, run_id)
+                    rows_written, branch_records = _process_branch_c(conn, crime_id, ps_code, facts_text, run_id, writes)
 
                 if unified_mode:
-                    augmented_text = _inject_accused_roster(
-                        facts_text,
-                        [tuple([None, None, r.get('person_code'), r.get('full_name')])
-                         for r in branch_records if r.get('person_code')]
-                    )
-                    extractions = extract_drug_info(
-                        augmented_text, _drug_categories,
-                        ignore_set=_ignore_set, kb_lookup=_kb_lookup,
-                        dynamic_drug_keywords=_dynamic_keywords, conn=conn,
-                    )
+                    roster = [tuple([None, None, r.get('person_code'), r.get('full_name')])
+                              for r in branch_records if r.get('person_code')]
+                    extractions = None
+                    if drug_future is not None:
+                        extractions = drug_future.result()
+                        drug_future = None
+                        if roster != drug_roster:
+                            logging.warning(f"Crime {crime_id}: accused roster differs from prediction; re-running drug pass")
+                            extractions = None
+                    if extractions is None:
+                        extractions = _extract_drugs(_inject_accused_roster(facts_text, roster))
 
                     if not extractions and branch_records:
                         # Accused exist but no drugs found — stamp NO_DRUGS_DETECTED on each accused row
@@ -769,8 +931,8 @@ def process_crimes_parallel(crimes):
 
                     if not branch_records and extractions:
                         # Drugs found but no accused — upgrade sentinel and attach each drug individually
-                        update_sentinel_role(conn, crime_id, 'NO_ACCUSED_IN_TEXT', 'NO_ACCUSED_DRUGS_ONLY')
-                        update_sentinel_role(conn, crime_id, 'LLM_EXTRACTION_FAILED', 'NO_ACCUSED_DRUGS_ONLY')
+                        writes.update_sentinel_role(crime_id, 'NO_ACCUSED_IN_TEXT', 'NO_ACCUSED_DRUGS_ONLY')
+                        writes.update_sentinel_role(crime_id, 'LLM_EXTRACTION_FAILED', 'NO_ACCUSED_DRUGS_ONLY')
                         orphan_row = {
                             'crime_id'             : crime_id,
                             'accused_id'           : None,
@@ -804,15 +966,31 @@ def process_crimes_parallel(crimes):
                     else:
                         enriched_rows = db_module.write_drugs_by_accused_in_memory(branch_records, extractions)
 
-                    db_module.bulk_upsert_brief_facts_ai(conn, enriched_rows)
+                    writes.bulk_upsert_brief_facts_ai(enriched_rows)
 
+                writes.flush(conn)
                 if unified_mode and run_id:
-                    complete_crime_processing_run(conn, run_id, rows_written)
+                    complete_crime_processing_run(conn, run_id, rows_written, input_fingerprint)
 
 
                 conn.commit()
+                dedup_index = current_dedup_index()
+                if dedup_index is not None:
+                    # Committed rows become dedup candidates for the rest of the run
+                    try:
+                        dedup_index.replace_crime(conn, crime_id)
+                        conn.commit()
+                    except Exception as idx_err:
+                        conn.rollback()
+                        logging.warning(f"Dedup index refresh failed for Crime {crime_id}: {idx_err}")
                 return True, crime_id, branch
             except Exception as e:
+                if drug_future is not None:
+                    # Never hand the connection back to the pool while the drug pass may still use it
+                    try:
+                        drug_future.result()
+                    except Exception:
+                        pass
                 try:
                     if unified_mode and run_id:
                         fail_crime_processing_run(conn, run_id, str(e))
@@ -824,21 +1002,30 @@ def process_crimes_parallel(crimes):
                 return False, crime_id, None
             # Connection automatically returned to pool via context manager
 
+    skipped = 0
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_crime = {executor.submit(worker, crime): crime['crime_id'] for crime in crimes}
         for future in as_completed(future_to_crime):
             success, cid, branch = future.result()
-            if success:
+            if success and branch == 'unchanged':
+                skipped += 1
+                logging.info(f"⏭️  Crime {cid} skipped (extraction inputs unchanged).")
+            elif success:
                 logging.info(f"✅ Crime {cid} processed successfully (branch={branch}).")
             else:
                 logging.error(f"❌ Crime {cid} processing failed (branch={branch}).")
+    drug_executor.shutdown(wait=True)
+    logging.info(f"LLM dispatch: {dispatcher.stats()}")
+    logging.info(f"Drug trigram index: {_trigram_index.stats()}")
+    if skipped:
+        logging.info(f"Skipped {skipped}/{len(crimes)} crimes with unchanged extraction inputs.")
 
 
 # ---------------------------------------------------------------------------
 # Branch A — DB has accused rows, at least one person_id IS NOT NULL
 # ---------------------------------------------------------------------------
 
-def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id):
+def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id, writes):
     """
     DB is authoritative for identity. LLM extracts roles + fills missing fields.
     Skips accused rows where person_id IS NULL (spec SKIP RULE).
@@ -906,7 +1093,7 @@ def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id):
     branch_records = []
     count = 0
     _cp_cache: dict = {}   # crime_profile cache — shared across all accused in this crime
-    _ac_cache: dict = {}   # associate codes cache — shared across all accused in this crime
+    _ac_cache: dict = _new_assoc_cache(crime_id, writes)   # associate codes cache — shared across all accused in this crime
     for i, row in enumerate(valid_accused, start=1):
         accused_id    = row.get('accused_id')
         person_id     = row.get('person_id')
@@ -1060,7 +1247,7 @@ def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id):
             'etl_run_id'           : run_id,
         }
         branch_records.append(row_data)
-        insert_accused_facts(conn, row_data)
+        writes.insert_accused_facts(row_data)
         count += 1
 
     # ── Branch A gap-fill: text-only accused not in DB ──────────────────────
@@ -1212,7 +1399,7 @@ def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id):
                         ] if v is not None
                     }
                     branch_records.append(extra_row)
-                    insert_accused_facts(conn, extra_row)
+                    writes.insert_accused_facts(extra_row)
                     count += 1
     except Exception as gap_err:
         logging.warning(f"Branch A gap-fill failed for Crime {crime_id}: {gap_err}", exc_info=True)
@@ -1225,20 +1412,20 @@ def _process_branch_a(conn, crime_id, ps_code, facts_text, db_accused, run_id):
 # Branch B — ALL person_id IS NULL. Full LLM + pair accused_id from DB.
 # ---------------------------------------------------------------------------
 
-def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id):
+def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id, writes):
     """Full LLM pipeline + accused_id recovery from DB by code matching."""
     logging.info(
         f"Branch B: crime {crime_id} has {len(db_accused)} stub accused rows "
         f"(person_id IS NULL). Running full LLM extraction."
     )
     _cp_cache: dict = {}
-    _ac_cache: dict = {}
+    _ac_cache: dict = _new_assoc_cache(crime_id, writes)
 
     extractions = extract_accused_info(facts_text)
 
     if extractions is None:
         logging.error(f"Branch B: LLM extraction failed for Crime {crime_id}.")
-        insert_accused_facts(conn, {
+        writes.insert_accused_facts({
             'crime_id'        : crime_id,
             'full_name'       : None,
             'accused_type'    : None,
@@ -1255,7 +1442,7 @@ def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id):
 
     if not extractions:
         logging.info(f"Branch B: No accused found by LLM for Crime {crime_id}.")
-        insert_accused_facts(conn, {
+        writes.insert_accused_facts({
             'crime_id'        : crime_id,
             'full_name'       : None,
             'accused_type'    : None,
@@ -1325,7 +1512,7 @@ def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id):
             data['etl_run_id'] = run_id
 
             branch_records.append(data)
-            insert_accused_facts(conn, data)
+            writes.insert_accused_facts(data)
             count += 1
 
     # ── Branch B gap-fill: DB stubs LLM didn't extract ──────────────────────
@@ -1462,19 +1649,14 @@ def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id):
                     'etl_run_id'           : run_id,
                 }
                 branch_records.append(stub_row)
-                insert_accused_facts(conn, stub_row)
+                writes.insert_accused_facts(stub_row)
                 count += 1
 
         # Gap-fill wrote real accused — delete stale NO_ACCUSED_IN_TEXT sentinel
         # that was inserted earlier when LLM returned empty. Leaving it causes
         # a ghost row with no identity alongside real accused rows.
         if unmatched_stubs and branch_records:
-            with conn.cursor() as _cur:
-                _cur.execute(
-                    "DELETE FROM public.brief_facts_ai "
-                    "WHERE crime_id = %s AND role_in_crime = 'NO_ACCUSED_IN_TEXT' AND accused_id IS NULL",
-                    (crime_id,),
-                )
+            writes.delete_sentinel(crime_id, 'NO_ACCUSED_IN_TEXT')
             count = max(0, count - 1)  # sentinel no longer in final count
 
     except Exception as gap_b_err:
@@ -1491,13 +1673,13 @@ def _process_branch_b(conn, crime_id, ps_code, facts_text, db_accused, run_id):
 # Branch C — No accused rows in DB. Full LLM only.
 # ---------------------------------------------------------------------------
 
-def _process_branch_c(conn, crime_id, ps_code, facts_text, run_id):
+def _process_branch_c(conn, crime_id, ps_code, facts_text, run_id, writes):
     """Original full LLM flow. No DB reference at all."""
     extractions = extract_accused_info(facts_text)
 
     if extractions is None:
         logging.error(f"Branch C: Extraction failed for Crime {crime_id}.")
-        insert_accused_facts(conn, {
+        writes.insert_accused_facts({
             'crime_id'        : crime_id,
             'full_name'       : None,
             'accused_type'    : None,
@@ -1512,11 +1694,11 @@ def _process_branch_c(conn, crime_id, ps_code, facts_text, run_id):
     branch_records = []
     count = 0
     _cp_cache: dict = {}
-    _ac_cache: dict = {}
+    _ac_cache: dict = _new_assoc_cache(crime_id, writes)
 
     if not extractions:
         logging.info(f"Branch C: No accused found for Crime {crime_id}.")
-        insert_accused_facts(conn, {
+        writes.insert_accused_facts({
             'crime_id'        : crime_id,
             'full_name'       : None,
             'accused_type'    : None,
@@ -1565,7 +1747,7 @@ def _process_branch_c(conn, crime_id, ps_code, facts_text, run_id):
             data['dedup_review_flag'] = dedup_review_flag
 
             branch_records.append(data)
-            insert_accused_facts(conn, data)
+            writes.insert_accused_facts(data)
             count += 1
 
     logging.info(f"Branch C processed Crime {crime_id}. row_count={count}")
@@ -0,0 +1,21 @@
+-- Migration: Store a fingerprint of each crime's extraction inputs in etl_crime_processing_log
+-- Date: 2026-10-16
+-- Purpose:
+--   fetch_unprocessed_crimes_since() returns every crime whose row changed after its last
+--   completed run, including changes to columns extraction never reads (case_status,
+--   io_name, ...). brief_facts_ai now records sha256(brief_facts text, accused roster,
+--   drug KB version, model) per completed run and skips crimes whose fingerprint is unchanged,
+--   logging a 'complete' row with error_detail = 'skipped: extraction inputs unchanged'.
+--
+--   main.py also adds the column at startup (ensure_input_fingerprint_column), so applying
+--   this file by hand is optional.
+
+ALTER TABLE public.etl_crime_processing_log
+    ADD COLUMN IF NOT EXISTS input_fingerprint TEXT;
+
+-- Verify:
+-- SELECT crime_id, completed_at, input_fingerprint, error_detail
+-- FROM public.etl_crime_processing_log
+-- WHERE status = 'complete'
+-- ORDER BY completed_at DESC
+-- LIMIT 20;
@@ -0,0 +1,96 @@
+"""
+In-process equivalent of pg_trgm similarity() over the verified drug_categories KB.
+
+db.fuzzy_match_drug_name() runs one similarity() query per unresolved drug mention.
+DrugTrigramIndex answers the same question from memory: it reproduces pg_trgm's trigram
+extraction (lowercase; words = runs of alphanumerics; each word padded as "  word ";
+unique trigrams) and its score, count / (len1 + len2 - count) rounded to float4 before
+the threshold comparison, so the same KB row passes or fails at 0.35. Candidates come
+from trigram postings, and results are memoized per raw name (LRU).
+"""
+
+import re
+import struct
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
+
+# pg_trgm (KEEPONLYALNUM): word characters are alphanumerics; everything else separates words
+_WORD_RE = re.compile(r'[^\W_]+')
+DEFAULT_THRESHOLD = 0.35
+MEMO_SIZE = 8192
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    """pg_trgm show_trgm() as a set."""
+    grams = set()
+    for word in _WORD_RE.findall((value or '').lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return frozenset(grams)
+
+
+def _float4(value: float) -> float:
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm similarity(a, b), float4 precision."""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    common = len(ta & tb)
+    return _float4(common / (len(ta) + len(tb) - common))
+
+
+class DrugTrigramIndex:
+    """Read-only after __init__; the memo is lru_cache (thread-safe)."""
+
+    def __init__(self, drug_categories: List[dict], memo_size: int = MEMO_SIZE):
+        self._entries = []                          # (standard_name, trigram count), KB order
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for row in drug_categories:
+            grams = trigrams(row.get('raw_name'))
+            if not grams:
+                continue
+            entry_id = len(self._entries)
+            self._entries.append((row.get('standard_name'), len(grams)))
+            for gram in grams:
+                self._postings[gram].append(entry_id)
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self.best_match = lru_cache(maxsize=memo_size)(self._best_match)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _best_match(self, raw_drug_name: str, threshold: float = DEFAULT_THRESHOLD) -> Optional[str]:
+        """Same result as db.fuzzy_match_drug_name(conn, raw_drug_name, threshold)."""
+        if not raw_drug_name or not raw_drug_name.strip():
+            return None
+        probe = trigrams(raw_drug_name.lower().strip())
+        if not probe:
+            return None
+        with self._lock:
+            self._lookups += 1
+        common: Dict[int, int] = defaultdict(int)
+        for gram in probe:
+            for entry_id in self._postings.get(gram, ()):
+                common[entry_id] += 1
+
+        best_id, best_sim = None, -1.0
+        for entry_id in sorted(common):   # KB order breaks ties, like ORDER BY sim DESC LIMIT 1
+            count = common[entry_id]
+            sim = _float4(count / (len(probe) + self._entries[entry_id][1] - count))
+            if sim > best_sim:
+                best_id, best_sim = entry_id, sim
+        if best_id is None or best_sim < threshold:
+            return None
+        return self._entries[best_id][0]
+
+    def stats(self) -> Dict[str, int]:
+        info = self.best_match.cache_info()
+        return {'entries': len(self._entries), 'lookups': self._lookups,
+                'memo_hits': info.hits, 'memo_misses': info.misses}
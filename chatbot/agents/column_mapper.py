@@ -249,12 +249,14 @@ class IntelligentColumnMapper:
         
         return all_mappings
     
-    def find_columns(self, user_question: str) -> List[ColumnMatch]:
+    def find_columns(self, user_question: str, present_keywords: Optional[Set[str]] = None) -> List[ColumnMatch]:
         """
         Find all matching columns for a user question
         
         Args:
             user_question: User's question/query
+            present_keywords: Mapping keywords known to occur in the question (e.g. from a
+                precomputed SchemaContext); skips scanning every keyword when given
             
         Returns:
             List of ColumnMatch objects sorted by confidence
@@ -270,7 +272,7 @@ class IntelligentColumnMapper:
         # Check each keyword mapping
         for keyword, column_matches in self.column_mappings.items():
             # Check if keyword appears in question
-            if keyword in question_lower:
+            if (keyword in present_keywords) if present_keywords is not None else (keyword in question_lower):
                 for col_match in column_matches:
                     # ⭐ PRIORITIZE: If property query, boost property table matches
                     # If drug query, boost drug table matches
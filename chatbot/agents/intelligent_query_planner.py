@@ -361,7 +361,8 @@ class IntelligentQueryPlanner:
     def analyze_user_question(
         self,
         user_message: str,
-        available_tables: Dict[str, Dict]
+        available_tables: Dict[str, Dict],
+        relevant_tables: Optional[Dict[str, List[str]]] = None
     ) -> Dict:
         """
         Analyze user question and determine what data is needed
@@ -369,6 +370,8 @@ class IntelligentQueryPlanner:
         Args:
             user_message: User's natural language question
             available_tables: Dict of available tables/collections
+            relevant_tables: Tables already matched for this message (e.g. from a
+                precomputed SchemaContext); skips table matching when given
         
         Returns:
             Dict with analysis results (for backwards compatibility)
@@ -379,10 +382,11 @@ class IntelligentQueryPlanner:
         intent, confidence = self.intent_detector.detect(message_lower)
         
         # Find relevant tables
-        relevant_tables = self.table_matcher.find_relevant_tables(
-            message_lower,
-            available_tables
-        )
+        if relevant_tables is None:
+            relevant_tables = self.table_matcher.find_relevant_tables(
+                message_lower,
+                available_tables
+            )
         
         # Extract features
         search_terms = self.feature_extractor.extract_search_terms(message_lower)
@@ -4,14 +4,22 @@ Defines the workflow graph with proper error handling and type safety
 """
 
 import logging
-from typing import Dict, Any, Optional, Literal, Callable, List
+import queue
+import threading
+from typing import Dict, Any, Optional, Literal, Callable, Iterator, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from langgraph.graph import Graph, END
 from agents.nodes import AgentNodes
+from agents.narrative_formatter import StreamCancelled
 
 logger = logging.getLogger(__name__)
 
+# Streaming mode: rows per database included in the execute_query event, and the
+# keep-alive interval while a step (usually an LLM call) is still running
+STREAM_PREVIEW_ROWS = 5
+STREAM_HEARTBEAT_SECONDS = 15
+
 # ============================================================================
 # Type Definitions
 # ============================================================================
@@ -283,6 +291,12 @@ class DatabaseQueryAgent:
             Wrapped function with tracking
         """
         def wrapped(state: Dict[str, Any]) -> Dict[str, Any]:
+            # Streaming client went away - skip the remaining nodes
+            cancel_event = state.get('cancel_event')
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info(f"Skipping node {step_name}: request cancelled")
+                return state
+            
             # Track workflow step
             if 'workflow_steps' not in state:
                 state['workflow_steps'] = []
@@ -297,6 +311,9 @@ class DatabaseQueryAgent:
                 logger.debug(f"Executing node: {step_name}")
                 result = node_func(state)
                 logger.debug(f"Node {step_name} completed")
+                on_event = result.get('on_event') if isinstance(result, dict) else None
+                if on_event:
+                    on_event('step', self._step_event(step_name, result))
                 return result
             except Exception as e:
                 logger.error(f"Node {step_name} failed: {e}", exc_info=True)
@@ -310,6 +327,27 @@ class DatabaseQueryAgent:
         
         return wrapped
     
+    @staticmethod
+    def _step_event(step_name: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Client-facing summary of a finished step (streaming mode; no technical errors)"""
+        event = {'step': step_name}
+        if step_name == 'parse_intent':
+            event['intent'] = state.get('intent')
+            event['target_database'] = state.get('target_database')
+            event['early_exit'] = bool(state.get('early_exit'))
+        elif step_name == 'generate_sql':
+            event['queries'] = state.get('queries') or {}
+        elif step_name == 'validate_sql':
+            event['queries'] = state.get('validated_queries') or {}
+        elif step_name == 'execute_query':
+            results = state.get('results') or {}
+            event['results_count'] = {db: len(data) for db, data in results.items()}
+            event['preview'] = {
+                db: data[:STREAM_PREVIEW_ROWS] if isinstance(data, list) else []
+                for db, data in results.items()
+            }
+        return event
+    
     def add_progress_callback(self, callback: Callable[[str, Dict], None]):
         """
         Add a callback for progress updates
@@ -325,7 +363,9 @@ class DatabaseQueryAgent:
         self,
         user_message: str,
         session_id: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Dict[str, Any]:
         """
         Process a user message through the agent workflow
@@ -334,12 +374,23 @@ class DatabaseQueryAgent:
             user_message: User's natural language query
             session_id: Optional session identifier for tracking
             metadata: Optional additional metadata
+            on_event: Optional callback(event, data) receiving 'step' events as each
+                      node finishes and 'token' events while the narrative is generated
+            cancel_event: Optional event; once set, remaining nodes and the narrative
+                          stream are abandoned
         
         Returns:
             Dictionary with response data (backward compatible)
         """
         logger.info(f"Processing message: {user_message[:100]}...")
         
+        def _emit_token(chunk: str):
+            if cancel_event is not None and cancel_event.is_set():
+                raise StreamCancelled()
+            on_event('token', {'text': chunk})
+
+        token_callback = _emit_token if on_event else None
+
         # Create initial state with proper initialization
         initial_state = {
             'user_message': user_message,
@@ -355,7 +406,10 @@ class DatabaseQueryAgent:
             'error': None,  # None means no error (not truthy!)
             'early_exit': False,  # Explicitly False
             'workflow_steps': [],
-            'metadata': metadata or {}
+            'metadata': metadata or {},
+            'on_event': on_event,
+            'token_callback': token_callback,
+            'cancel_event': cancel_event
         }
         
         try:
@@ -401,6 +455,52 @@ class DatabaseQueryAgent:
                 'workflow_steps': initial_state.get('workflow_steps', [])
             }
     
+    def stream_message(
+        self,
+        user_message: str,
+        session_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of process_message()
+        
+        Runs the workflow on a background thread and yields (event, data) pairs:
+            ('step', {...})   after each workflow node finishes
+            ('token', {...})  narrative text chunks as the LLM produces them
+            ('ping', {})      keep-alive while a step is still running
+            ('done', {...})   the process_message() response (always last)
+        
+        Closing the generator early (client disconnected) cancels the run: nodes not
+        yet started are skipped and an in-flight narrative stream is aborted.
+        """
+        events: queue.Queue = queue.Queue()
+        cancel_event = threading.Event()
+        
+        def run():
+            response = None
+            try:
+                response = self.process_message(
+                    user_message, session_id, metadata,
+                    on_event=lambda event, data: events.put((event, data)),
+                    cancel_event=cancel_event
+                )
+            finally:
+                events.put(('done', response))
+        
+        threading.Thread(target=run, name='chat-stream', daemon=True).start()
+        try:
+            while True:
+                try:
+                    event, data = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield 'ping', {}
+                    continue
+                yield event, data
+                if event == 'done':
+                    return
+        finally:
+            cancel_event.set()
+    
     def get_workflow_visualization(self) -> str:
         """
         Get a text visualization of the workflow
@@ -3,7 +3,7 @@ Local LLM Client
 Connects to Qwen2.5-Coder running locally via Ollama or similar
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 import sys
 import os
 
@@ -36,6 +36,10 @@ class LocalLLMClient:
         """
         return self.llm_service.generate(prompt=prompt, system_prompt=system_prompt)
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Yield generated text in chunks as the LLM produces them"""
+        return self.llm_service.generate_stream(prompt=prompt, system_prompt=system_prompt)
+    
     def generate_sql(self, user_message: str, schema: str) -> Optional[str]:
         """
         Generate SQL query from natural language
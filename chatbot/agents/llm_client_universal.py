@@ -7,7 +7,7 @@ import re
 import json
 import logging
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import sys
@@ -68,6 +68,12 @@ class LLMProvider(ABC):
         """Generate text from prompt"""
         pass
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Yield the response in chunks as it is generated (default: one chunk from generate())"""
+        result = self.generate(prompt, system_prompt)
+        if result:
+            yield result
+    
     @abstractmethod
     def test_connection(self) -> bool:
         """Test if provider is accessible"""
@@ -88,6 +94,10 @@ class OllamaProvider(LLMProvider):
         """Generate using Ollama with detailed logging via core/llm_service"""
         return self.llm_service.generate(prompt=prompt, system_prompt=system_prompt)
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream tokens from Ollama via core/llm_service"""
+        return self.llm_service.generate_stream(prompt=prompt, system_prompt=system_prompt)
+    
     def test_connection(self) -> bool:
         """Test Ollama connection"""
         import requests
@@ -150,6 +160,33 @@ class OpenAIProvider(LLMProvider):
             logger.error(f"OpenAI request failed: {e}")
             return None
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream using OpenAI (stream=True chat completion)"""
+        if not self.client:
+            logger.error("OpenAI client not initialized")
+            return
+        
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        logger.info(f"OpenAI streaming request: {self.config.model}")
+        stream = self.client.chat.completions.create(
+            model=self.config.model,
+            messages=messages,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            timeout=self.config.timeout,
+            stream=True
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+    
     def test_connection(self) -> bool:
         """Test OpenAI connection"""
         return self.client is not None
@@ -206,6 +243,26 @@ class AnthropicProvider(LLMProvider):
             logger.error(f"Anthropic request failed: {e}")
             return None
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream using Anthropic Claude (messages.stream)"""
+        if not self.client:
+            logger.error("Anthropic client not initialized")
+            return
+        
+        kwargs = {
+            "model": self.config.model,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+        
+        logger.info(f"Anthropic streaming request: {self.config.model}")
+        with self.client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                yield text
+    
     def test_connection(self) -> bool:
         """Test Anthropic connection"""
         return self.client is not None
@@ -247,6 +304,10 @@ class UniversalLLMClient:
         """Generate text using configured provider"""
         return self.provider.generate(prompt, system_prompt)
     
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks using configured provider"""
+        return self.provider.generate_stream(prompt, system_prompt)
+    
     def test_connection(self) -> bool:
         """Test if LLM is accessible"""
         return self.provider.test_connection()
@@ -5,11 +5,16 @@ Converts raw query results into natural language narratives using LLM
 
 import logging
 import json
-from typing import Dict, List, Any, Optional
+from contextlib import closing
+from typing import Callable, Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
 
+class StreamCancelled(Exception):
+    """Raised by a token_callback to abort narrative streaming (client went away)"""
+
+
 class NarrativeFormatterAgent:
     """
     Agent 4: Transforms raw database results into natural language narratives
@@ -35,7 +40,8 @@ class NarrativeFormatterAgent:
         user_question: str,
         query_results: Dict[str, List[Dict]],
         query_metadata: Optional[Dict] = None,
-        format_preferences: Optional[Dict] = None
+        format_preferences: Optional[Dict] = None,
+        token_callback: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Convert raw query results into natural language narrative
@@ -46,6 +52,9 @@ class NarrativeFormatterAgent:
             query_results: Dict with 'postgresql' and/or 'mongodb' results
             query_metadata: Optional metadata (query type, entities detected, etc.)
             format_preferences: User's format preferences (from conversation patterns)
+            token_callback: Optional callable receiving narrative text chunks as the LLM
+                            generates them (streaming mode). The returned string stays
+                            authoritative — fallback formatting is not sent through it.
             
         Returns:
             Natural language narrative string
@@ -60,10 +69,12 @@ class NarrativeFormatterAgent:
             cached_narrative = self.cache.get_value(f"narrative:{cache_key}")
             if cached_narrative:
                 logger.info("Narrative retrieved from cache")
+                if token_callback:
+                    token_callback(cached_narrative)
                 return cached_narrative
         
         # Generate narrative using LLM (with format preferences)
-        narrative = self._generate_narrative(user_question, query_results, query_metadata, format_preferences)
+        narrative = self._generate_narrative(user_question, query_results, query_metadata, format_preferences, token_callback)
         
         # Cache the narrative (TTL from Config)
         if self.cache and narrative:
@@ -79,7 +90,8 @@ class NarrativeFormatterAgent:
         user_question: str,
         query_results: Dict[str, List[Dict]],
         query_metadata: Optional[Dict],
-        format_preferences: Optional[Dict] = None
+        format_preferences: Optional[Dict] = None,
+        token_callback: Optional[Callable[[str], None]] = None
     ) -> str:
         """Generate narrative using LLM with format preferences"""
         
@@ -242,10 +254,20 @@ Convert this into a professional, easy-to-understand narrative response."""
         try:
             # Generate narrative using LLM
             # Note: max_tokens and temperature are configured in LLMConfig, not here
-            narrative = self.llm.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt
-            )
+            if token_callback and hasattr(self.llm, 'generate_stream'):
+                # Streaming mode: forward chunks as they arrive; closing the stream on
+                # error/cancel aborts the LLM request
+                chunks = []
+                with closing(self.llm.generate_stream(prompt=user_prompt, system_prompt=system_prompt)) as stream:
+                    for chunk in stream:
+                        chunks.append(chunk)
+                        token_callback(chunk)
+                narrative = ''.join(chunks)
+            else:
+                narrative = self.llm.generate(
+                    prompt=user_prompt,
+                    system_prompt=system_prompt
+                )
             
             if narrative:
                 logger.info(f"Generated narrative ({len(narrative)} chars)")
@@ -254,6 +276,8 @@ Convert this into a professional, easy-to-understand narrative response."""
                 logger.warning("LLM returned empty narrative, using fallback")
                 return self._fallback_formatting(user_question, query_results)
                 
+        except StreamCancelled:
+            raise
         except Exception as e:
             logger.error(f"Narrative generation error: {e}")
             return self._fallback_formatting(user_question, query_results)
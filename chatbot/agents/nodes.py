@@ -37,6 +37,12 @@ class CacheManagerProtocol(Protocol):
     def cache_schema(self, schema: Dict) -> None: ...
     def get_cached_query_result(self, query: str) -> Optional[Any]: ...
     def cache_query_result(self, query: str, result: Any) -> None: ...
+    def get_schema_version(self, schema: Dict) -> str: ...
+    def get_cached_query_plan(self, plan_key: str) -> Optional[Dict]: ...
+    def cache_query_plan(self, plan_key: str, plan: Dict) -> bool: ...
+    def get_current_schema_version(self) -> Optional[str]: ...
+    def get_cached_schema_context(self, context_key: str) -> Optional[Dict]: ...
+    def cache_schema_context(self, context_key: str, artifact: Dict) -> bool: ...
 
 # ============================================================================
 # State Management
@@ -1090,12 +1096,22 @@ class SchemaFetcherNode(BaseNode):
         except ImportError:
             logger.warning("Column mapper not available")
             self.column_mapper = None
-    
-    def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Fetch and intelligently filter schema"""
-        logger.info("Node: get_schema")
         
-        user_message = state.get('user_message', '')
+        # Per-schema-version lookup artifacts (prompt snippets, table/column keyword indexes)
+        from agents.schema_context import SchemaContextStore
+        from config import Config
+        self.schema_contexts = SchemaContextStore(
+            cache_manager, query_planner, smart_schema, self.column_mapper,
+            ttl=Config.SCHEMA_CACHE_TTL
+        )
+    
+    def _get_schema_context(self, state: Dict[str, Any]):
+        """SchemaContext for the current schema; the full schema is only loaded to build one"""
+        context = self.schema_contexts.get(self.cache.get_current_schema_version())
+        if context is not None:
+            logger.info(f"Schema context {context.version} ready")
+            state['schema_version'] = context.version
+            return context
         
         # Get full schema
         cached_schema = self.cache.get_cached_schema()
@@ -1105,11 +1121,23 @@ class SchemaFetcherNode(BaseNode):
             self.cache.cache_schema(cached_schema)
         else:
             logger.info("Schema retrieved from cache")
+        state['schema_version'] = self.cache.get_schema_version(cached_schema)
+        
+        return self.schema_contexts.get_or_build(state['schema_version'], cached_schema)
+    
+    def execute(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and intelligently filter schema"""
+        logger.info("Node: get_schema")
+        
+        user_message = state.get('user_message', '')
         
-        # Analyze query to find relevant tables
+        context = self._get_schema_context(state)
+        
+        # Analyze query to find relevant tables (table matching is a keyword-index lookup)
         query_plan = self.query_planner.analyze_user_question(
             user_message,
-            cached_schema
+            {},
+            relevant_tables=context.match_tables(user_message)
         )
         state['query_plan'] = query_plan
         
@@ -1119,7 +1147,10 @@ class SchemaFetcherNode(BaseNode):
         required_tables = set(query_plan['relevant_tables'].get('postgresql', []))
         
         if self.column_mapper:
-            column_matches = self.column_mapper.find_columns(user_message)
+            column_matches = self.column_mapper.find_columns(
+                user_message,
+                present_keywords=context.column_keywords_in(user_message)
+            )
             if column_matches:
                 # Add columns to state so QueryGenerator can use them
                 state['required_columns'] = [
@@ -1143,12 +1174,8 @@ class SchemaFetcherNode(BaseNode):
         # Update relevant tables with auto-detected tables
         query_plan['relevant_tables']['postgresql'] = list(required_tables)
         
-        # Get targeted schema (only relevant tables)
-        schema_text = self.smart_schema.get_targeted_schema(
-            cached_schema,
-            query_plan['relevant_tables'],
-            max_columns=10
-        )
+        # Get targeted schema (only relevant tables) from the precomputed snippets
+        schema_text = context.targeted_schema(query_plan['relevant_tables'])
         
         logger.info(f"Intelligent schema generated ({len(schema_text)} chars) for tables: {query_plan['relevant_tables']}")
         state['schema'] = schema_text
@@ -1158,9 +1185,16 @@ class SchemaFetcherNode(BaseNode):
 class QueryGeneratorNode(BaseNode):
     """Node 3: Generate SQL/MongoDB queries using LLM with entity intelligence + AUTO-COLUMN DETECTION"""
     
-    def __init__(self, llm_client: LLMClientProtocol):
+    def __init__(self, llm_client: LLMClientProtocol, cache_manager: Optional[CacheManagerProtocol] = None):
         self.llm = llm_client
         
+        # Reuse SQL generated for equivalent questions (same shape, entity values re-bound)
+        self.plan_cache = None
+        from config import Config
+        if cache_manager is not None and Config.ENABLE_QUERY_PLAN_CACHE:
+            from agents.query_plan_cache import QueryPlanCache
+            self.plan_cache = QueryPlanCache(cache_manager)
+        
         # ⭐ NEW: Intelligent Column Mapper - KNOWS which columns to include!
         try:
             from agents.column_mapper import IntelligentColumnMapper
@@ -1361,14 +1395,22 @@ LIMIT 100
                         for col in required_columns[:5]:  # Log top 5
                             logger.info(f"  → {col['table']}.{col['column']}")
                     
-                    sql = self.llm.generate_sql_with_context(
-                        user_message,
-                        schema,
-                        query_plan
-                    )
+                    # Equivalent question answered before? Bind its SQL template, skip the LLM
+                    sql = self.plan_cache.lookup(state, target_db, query_plan) if self.plan_cache else None
+                    plan_cache_hit = sql is not None
+                    if not plan_cache_hit:
+                        sql = self.llm.generate_sql_with_context(
+                            user_message,
+                            schema,
+                            query_plan
+                        )
                     # ⚠️ CRITICAL: Check for both None and empty string
                     if sql and sql.strip():
-                        sql = SQLCleaner.clean(sql)
+                        if not plan_cache_hit:
+                            sql = SQLCleaner.clean(sql)
+                            if sql and sql.strip() and self.plan_cache:
+                                # Saved by the executor once the query ran successfully
+                                state['query_plan_cache_entry'] = self.plan_cache.prepare(state, target_db, query_plan, sql)
                         # After cleaning, check again if it's empty
                         if sql and sql.strip():
                             # ⭐ NEW: Remove IS NOT NULL filters for "information about" queries
@@ -2081,7 +2123,7 @@ class QueryExecutorNode(BaseNode):
                 logger.info("PostgreSQL result from cache")
                 results['postgresql'] = cached
             else:
-                success, result = self.postgres.execute_query(sql)
+                success, result = self.postgres.execute_query(sql, cancel_event=state.get('cancel_event'))
                 if success:
                     results['postgresql'] = result
                     self.cache.cache_query_result(sql, result)
@@ -2089,6 +2131,12 @@ class QueryExecutorNode(BaseNode):
                 else:
                     error = self.validator.sanitize_error_message(str(result))
                     state['error'] = f"PostgreSQL execution error: {error}"
+            
+            # Freshly generated SQL ran fine - keep it as a template for equivalent questions
+            plan_entry = state.get('query_plan_cache_entry')
+            if plan_entry and 'postgresql' in results:
+                from agents.query_plan_cache import QueryPlanCache
+                QueryPlanCache(self.cache).save(plan_entry)
         
         # Execute MongoDB
         if 'mongodb' in validated:
@@ -2367,7 +2415,8 @@ class ResponseFormatterNode(BaseNode):
                         user_question=user_message,
                         query_results=results,
                         query_metadata=query_metadata,
-                        format_preferences=format_prefs
+                        format_preferences=format_prefs,
+                        token_callback=state.get('token_callback')
                     )
                     
                     if narrative_response:
@@ -3194,7 +3243,7 @@ class AgentNodes:
         self._schema_fetcher = SchemaFetcherNode(
             schema_manager, cache_manager, query_planner, smart_schema
         )
-        self._query_generator = QueryGeneratorNode(llm_client)
+        self._query_generator = QueryGeneratorNode(llm_client, cache_manager)
         self._query_validator = QueryValidatorNode(validator)
         self._query_executor = QueryExecutorNode(
             postgres_executor, mongo_executor, cache_manager, validator
@@ -0,0 +1,202 @@
+"""
+Query Plan Cache - reuse LLM-generated SQL for equivalent questions
+
+generate_sql_with_context() is the slowest step of the workflow. Here its output is
+keyed on the question's *shape*: the normalized question with detected entity values
+replaced by typed slots ("cases against <person_name_0> in <location_0>"), plus the
+target database, the planner's relevant tables and the schema version. The SQL is
+stored as a template with the same slots in place of the entity values inside its
+string literals; a later question with the same shape binds its own values and
+skips the LLM.
+
+SQL is only cached when every slot value appears inside quoted literals of the
+generated SQL, and nowhere else - anything else (numeric comparisons, values the LLM
+rewrote) cannot be re-bound safely and always goes to the LLM. Templates are saved
+only after the query executed successfully.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shorter entity values are left in the question text (part of the key) instead of
+# becoming slots - they are too likely to match unrelated text
+MIN_SLOT_VALUE_LENGTH = 3
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+_MARKER_RE = re.compile(r"\x00(\d+)\x00")
+
+
+@dataclass
+class QuestionShape:
+    """Normalized question with entity values replaced by slots"""
+    text: str
+    slots: List[Tuple[str, str]] = field(default_factory=list)   # (slot_name, value) in order of appearance
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, collapse whitespace, drop trailing punctuation"""
+    return ' '.join((text or '').lower().split()).rstrip(' ?.!')
+
+
+def _alternation(values: List[str]) -> re.Pattern:
+    """Case-insensitive whole-value alternation, longest first (one pass, no re-matching)"""
+    ordered = sorted(values, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(v) for v in ordered), re.IGNORECASE)
+
+
+def question_shape(user_message: str, detected_entities: List[Dict[str, Any]]) -> QuestionShape:
+    """Replace detected entity values in the normalized question with typed slots"""
+    text = normalize_question(user_message)
+
+    entities = {}   # normalized value -> (original value, type)
+    for entity in detected_entities or []:
+        value = ' '.join(str(entity.get('value') or '').split())
+        needle = value.lower()
+        if len(needle) >= MIN_SLOT_VALUE_LENGTH and needle not in entities:
+            entities[needle] = (value, re.sub(r'\W+', '_', str(entity.get('type') or 'entity')).lower())
+    if not entities:
+        return QuestionShape(text=text)
+
+    needles = list(entities)
+    pattern = re.compile(r'(?<!\w)(?:' + _alternation(needles).pattern + r')(?!\w)', re.IGNORECASE)
+    found = []
+
+    def mark(match):
+        needle = match.group(0).lower()
+        if needle not in found:
+            found.append(needle)
+        return f"\x00{found.index(needle)}\x00"
+
+    text = pattern.sub(mark, text)
+
+    # Name slots by order of appearance so equivalent questions produce identical keys
+    names: Dict[int, str] = {}
+    counters: Dict[str, int] = {}
+    slots = []
+
+    def rename(match):
+        idx = int(match.group(1))
+        if idx not in names:
+            value, entity_type = entities[found[idx]]
+            names[idx] = f"{entity_type}_{counters.get(entity_type, 0)}"
+            counters[entity_type] = counters.get(entity_type, 0) + 1
+            slots.append((names[idx], value))
+        return f"<{names[idx]}>"
+
+    text = _MARKER_RE.sub(rename, text)
+    return QuestionShape(text=text, slots=slots)
+
+
+def plan_key(shape: QuestionShape, target_db: str, relevant_tables: Optional[Dict], schema_version: str) -> str:
+    """Cache key: schema version prefix + hash of question shape, target db and planned tables"""
+    tables = {db: sorted(names or []) for db, names in (relevant_tables or {}).items()}
+    payload = json.dumps({'q': shape.text, 'db': target_db, 'tables': tables}, sort_keys=True)
+    return f"{schema_version}:{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+
+def _case_of(matched: str, value: str) -> Optional[str]:
+    if matched == value.upper():
+        return 'upper'
+    if matched == value.lower():
+        return 'lower'
+    if matched == value.title():
+        return 'title'
+    if matched == value:
+        return 'asis'
+    return None
+
+
+def _apply_case(value: str, case: str) -> str:
+    return {'upper': value.upper(), 'lower': value.lower(), 'title': value.title()}.get(case, value)
+
+
+def parameterize_sql(sql: str, shape: QuestionShape) -> Optional[Dict[str, Any]]:
+    """
+    Turn generated SQL into a template by replacing slot values inside string literals
+
+    Returns:
+        {'sql': template, 'cases': {slot: case}} or None if the SQL cannot be re-bound safely
+    """
+    if not shape.slots:
+        return {'sql': sql, 'cases': {}}
+
+    by_value = {value.replace("'", "''").lower(): name for name, value in shape.slots}
+    values = dict(shape.slots)
+    pattern = _alternation(list(by_value))
+    cases: Dict[str, str] = {}
+    conflict = []
+
+    def replace_value(match):
+        name = by_value[match.group(0).lower()]
+        case = _case_of(match.group(0).replace("''", "'"), values[name])
+        if case is None or cases.setdefault(name, case) != case:
+            conflict.append(name)
+        return '{{' + name + '}}'
+
+    template = _LITERAL_RE.sub(lambda m: pattern.sub(replace_value, m.group(0)), sql)
+    if conflict or set(cases) != set(values):
+        return None
+    # A slot value left outside literals (identifiers, numbers) would not be re-bound
+    if pattern.search(template):
+        return None
+    return {'sql': template, 'cases': cases}
+
+
+def bind_sql(template: Dict[str, Any], shape: QuestionShape) -> Optional[str]:
+    """Fill a template with this question's slot values (None if the slots don't line up)"""
+    values = dict(shape.slots)
+    cases = template.get('cases') or {}
+    if set(values) != set(cases) or any('\\' in v for v in values.values()):
+        return None
+    return _SLOT_RE.sub(
+        lambda m: _apply_case(values[m.group(1)], cases[m.group(1)]).replace("'", "''"),
+        template['sql']
+    )
+
+
+class QueryPlanCache:
+    """SQL template cache on top of RedisManager"""
+
+    def __init__(self, cache_manager: Any):
+        self.cache = cache_manager
+
+    def _key(self, state: Dict[str, Any], target_db: str, query_plan: Dict) -> Tuple[Optional[str], QuestionShape]:
+        shape = question_shape(state.get('user_message', ''), state.get('detected_entities') or [])
+        schema_version = state.get('schema_version')
+        if not schema_version:
+            return None, shape
+        return plan_key(shape, target_db, (query_plan or {}).get('relevant_tables'), schema_version), shape
+
+    def lookup(self, state: Dict[str, Any], target_db: str, query_plan: Dict) -> Optional[str]:
+        """Bound SQL for an equivalent earlier question, or None"""
+        key, shape = self._key(state, target_db, query_plan)
+        if not key:
+            return None
+        template = self.cache.get_cached_query_plan(key)
+        if not template:
+            return None
+        sql = bind_sql(template, shape)
+        if sql:
+            logger.info(f"Query plan cache hit: '{shape.text}'")
+        return sql
+
+    def prepare(self, state: Dict[str, Any], target_db: str, query_plan: Dict, sql: str) -> Optional[Dict[str, Any]]:
+        """Template entry for freshly generated SQL; saved by save() once the SQL ran successfully"""
+        key, shape = self._key(state, target_db, query_plan)
+        if not key:
+            return None
+        template = parameterize_sql(sql, shape)
+        if not template:
+            logger.debug(f"SQL not cacheable as a template for: '{shape.text}'")
+            return None
+        return {'key': key, 'template': template}
+
+    def save(self, entry: Dict[str, Any]) -> bool:
+        return self.cache.cache_query_plan(entry['key'], entry['template'])
@@ -0,0 +1,213 @@
+"""
+Schema Context - precomputed, versioned schema artifacts for SchemaFetcherNode
+
+Selecting the schema for a chat turn used to mean decoding the full combined schema
+from Redis and re-running table matching, column mapping and prompt formatting from
+scratch. All of that depends only on the schema (and static keyword tables), so it is
+built once per schema version into a SchemaContext:
+
+  * snippets        - per-table prompt lines exactly as SmartSchemaSelector renders them
+  * table keywords  - each table's relevance keywords (name, name parts, plurals,
+                      planner aliases), inverted into one keyword index per database
+  * column keywords - IntelligentColumnMapper's alias keywords as one keyword index
+
+Per request, table selection, column detection and the schema prompt become keyword
+scans and dictionary lookups. Contexts live in process memory and in Redis
+(schema_context:<format>:<version>) so other workers load instead of rebuild. The
+version hashes every table's columns and types, and in-memory contexts expire on the
+same TTL as the Redis entries.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes; older Redis entries are then ignored
+CONTEXT_FORMAT = 1
+
+# Schema versions kept in process memory (old versions are only needed briefly)
+MAX_CONTEXTS_IN_MEMORY = 4
+
+# max_columns SchemaFetcherNode renders snippets with
+SNIPPET_MAX_COLUMNS = 10
+
+DATABASES = ('postgresql', 'mongodb')
+
+
+class KeywordIndex:
+    """
+    Finds which of a fixed set of keywords occur in a text as substrings
+
+    Equivalent to `{k for k in keywords if k in text}` in one regex pass: a lookahead
+    alternation (longest first) reports the longest keyword starting at each position,
+    and every keyword contained in a reported one is implied.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.always = '' in self.keywords   # '' is "in" every string
+        words = sorted((k for k in self.keywords if k), key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in words) + '))') if words else None
+        self._implied = {k: {w for w in words if w in k} for k in words}
+
+    def find(self, text: str) -> Set[str]:
+        found = {''} if self.always else set()
+        if self._pattern is not None:
+            for longest in {m.group(1) for m in self._pattern.finditer(text)}:
+                found |= self._implied[longest]
+        return found
+
+
+class SchemaContext:
+    """Lookup structures derived from one schema version"""
+
+    def __init__(self, version: str, artifact: Dict[str, Any]):
+        self.version = version
+        self.artifact = artifact
+        self._table_index = {}
+        self._keyword_tables = {}
+        for db in DATABASES:
+            keywords = artifact['table_keywords'].get(db, {})
+            inverted: Dict[str, List[str]] = {}
+            for table, table_keywords in keywords.items():
+                for keyword in table_keywords:
+                    inverted.setdefault(keyword, []).append(table)
+            self._keyword_tables[db] = inverted
+            self._table_index[db] = KeywordIndex(inverted)
+        self._column_index = KeywordIndex(artifact['column_keywords'])
+
+    @classmethod
+    def build(
+        cls,
+        version: str,
+        schema: Dict[str, Any],
+        query_planner: Any,
+        smart_schema: Any,
+        column_mapper: Any = None
+    ) -> 'SchemaContext':
+        """Precompute the artifact for `schema` (the combined schema dict)"""
+        matcher = query_planner.table_matcher
+        artifact = {
+            'tables': {},
+            'table_keywords': {},
+            'headers': {},
+            'snippets': {},
+            'column_keywords': list(column_mapper.column_mappings) if column_mapper else [],
+        }
+
+        for db in DATABASES:
+            tables = list((schema.get(db) or {}).keys())
+            artifact['tables'][db] = tables
+            artifact['table_keywords'][db] = {
+                table: sorted({table.lower(), *matcher._get_table_keywords(table)})
+                for table in tables
+            }
+            artifact['snippets'][db] = {}
+            for table in tables:
+                # Render through the selector itself so lookups match its output exactly
+                rendered = smart_schema.get_targeted_schema(
+                    schema, {db: [table]}, max_columns=SNIPPET_MAX_COLUMNS
+                ).split('\n')
+                artifact['headers'][db] = rendered[0]
+                artifact['snippets'][db][table] = rendered[1:]
+
+        # What get_targeted_schema falls back to when no table is relevant
+        artifact['fallback'] = smart_schema.get_compact_schema(
+            schema, "", SNIPPET_MAX_COLUMNS, max_tables=3
+        )
+        return cls(version, artifact)
+
+    def match_tables(self, message: str) -> Dict[str, List[str]]:
+        """Same result as the planner's TableMatcher.find_relevant_tables()"""
+        message_lower = message.lower()
+        relevant = {'postgresql': [], 'mongodb': []}
+        for db in DATABASES:
+            matched = set()
+            for keyword in self._table_index[db].find(message_lower):
+                matched.update(self._keyword_tables[db][keyword])
+            relevant[db] = [t for t in self.artifact['tables'][db] if t in matched]
+        return relevant
+
+    def column_keywords_in(self, message: str) -> Set[str]:
+        """Column mapper alias keywords occurring in the message"""
+        return self._column_index.find(message.lower())
+
+    def targeted_schema(self, relevant_tables: Dict[str, List[str]]) -> str:
+        """Same text as SmartSchemaSelector.get_targeted_schema(schema, relevant_tables, 10)"""
+        output = []
+        for db in DATABASES:
+            snippets = self.artifact['snippets'].get(db) or {}
+            lines = []
+            for table in relevant_tables.get(db) or []:
+                lines.extend(snippets.get(table, []))
+            if lines:
+                if output:
+                    output.append("")
+                output.append("\n".join([self.artifact['headers'][db]] + lines))
+        if not output:
+            return self.artifact['fallback']
+        return "\n".join(output)
+
+
+class SchemaContextStore:
+    """Process-memory SchemaContext cache backed by Redis for other workers"""
+
+    def __init__(self, cache_manager: Any, query_planner: Any, smart_schema: Any, column_mapper: Any = None,
+                 ttl: Optional[float] = None):
+        self.cache = cache_manager
+        self.query_planner = query_planner
+        self.smart_schema = smart_schema
+        self.column_mapper = column_mapper
+        self.ttl = ttl   # seconds an in-memory context is trusted (None: until evicted)
+        self._contexts: 'OrderedDict[str, Tuple[SchemaContext, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, context: SchemaContext) -> SchemaContext:
+        expires_at = time.monotonic() + self.ttl if self.ttl else float('inf')
+        with self._lock:
+            self._contexts[context.version] = (context, expires_at)
+            self._contexts.move_to_end(context.version)
+            while len(self._contexts) > MAX_CONTEXTS_IN_MEMORY:
+                self._contexts.popitem(last=False)
+        return context
+
+    def get(self, version: Optional[str]) -> Optional[SchemaContext]:
+        """Context for a schema version from memory or Redis, None if not built yet"""
+        if not version:
+            return None
+        with self._lock:
+            entry = self._contexts.get(version)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._contexts[version]
+                entry = None
+        if entry is not None:
+            return entry[0]
+
+        artifact = self.cache.get_cached_schema_context(f"{CONTEXT_FORMAT}:{version}")
+        if not artifact:
+            return None
+        try:
+            context = SchemaContext(version, artifact)
+        except (KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring malformed schema context {version}: {e}")
+            return None
+        logger.info(f"Schema context {version} loaded from cache")
+        return self._remember(context)
+
+    def get_or_build(self, version: str, schema: Dict[str, Any]) -> SchemaContext:
+        """Context for `schema`, building and publishing it when no worker has yet"""
+        context = self.get(version)
+        if context is not None:
+            return context
+
+        context = SchemaContext.build(version, schema, self.query_planner, self.smart_schema, self.column_mapper)
+        self.cache.cache_schema_context(f"{CONTEXT_FORMAT}:{version}", context.artifact)
+        logger.info(f"Schema context {version} built: "
+                    f"{sum(len(t) for t in context.artifact['tables'].values())} tables, "
+                    f"{len(context.artifact['column_keywords'])} column keywords")
+        return self._remember(context)
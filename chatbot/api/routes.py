@@ -2,9 +2,11 @@
 Flask API Routes
 Defines all HTTP endpoints for the chatbot
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from contextlib import closing
+import json
 import logging
 import uuid
 from security.input_sanitizer import InputSanitizer
@@ -19,6 +21,50 @@ api_bp = Blueprint('api', __name__, url_prefix='/api')
 limiter = Limiter(key_func=get_remote_address)
 
 
+def _sse(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _parse_chat_request():
+    """
+    Validate a chat request body
+    
+    Returns:
+        (error_response, message, session_id) - error_response is None when valid
+    """
+    data = request.get_json()
+    
+    if not data:
+        return (jsonify({
+            'success': False,
+            'error': 'No JSON data provided'
+        }), 400), None, None
+    
+    # Extract and validate message
+    message = data.get('message', '')
+    is_valid, result = InputSanitizer.sanitize_message(message)
+    
+    if not is_valid:
+        return (jsonify({
+            'success': False,
+            'error': result
+        }), 400), None, None
+    
+    sanitized_message = result
+    
+    # Get or create session ID
+    session_id = data.get('session_id')
+    if session_id:
+        is_valid, result = InputSanitizer.sanitize_session_id(session_id)
+        if not is_valid:
+            session_id = str(uuid.uuid4())
+    else:
+        session_id = str(uuid.uuid4())
+    
+    return None, sanitized_message, session_id
+
+
 def init_routes(agent, cache_manager, postgres_executor, mongo_executor):
     """
     Initialize routes with dependencies
@@ -71,35 +117,9 @@ def init_routes(agent, cache_manager, postgres_executor, mongo_executor):
             }
         """
         try:
-            # Get request data
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({
-                    'success': False,
-                    'error': 'No JSON data provided'
-                }), 400
-            
-            # Extract and validate message
-            message = data.get('message', '')
-            is_valid, result = InputSanitizer.sanitize_message(message)
-            
-            if not is_valid:
-                return jsonify({
-                    'success': False,
-                    'error': result
-                }), 400
-            
-            sanitized_message = result
-            
-            # Get or create session ID
-            session_id = data.get('session_id')
-            if session_id:
-                is_valid, result = InputSanitizer.sanitize_session_id(session_id)
-                if not is_valid:
-                    session_id = str(uuid.uuid4())
-            else:
-                session_id = str(uuid.uuid4())
+            error_response, sanitized_message, session_id = _parse_chat_request()
+            if error_response:
+                return error_response
             
             logger.info(f"Chat request - Session: {session_id}, Message: {sanitized_message[:50]}...")
             
@@ -126,6 +146,69 @@ def init_routes(agent, cache_manager, postgres_executor, mongo_executor):
                 'error': 'Internal server error'
             }), 500
     
+    @api_bp.route('/chat/stream', methods=['POST'])
+    @limiter.limit(f"{Config.RATE_LIMIT} per minute")
+    def chat_stream():
+        """
+        Streaming chat endpoint (server-sent events)
+        
+        Request JSON: same as /api/chat
+        
+        Response: text/event-stream with events
+            start   {"session_id": "..."}
+            step    {"step": "parse_intent", "intent": ..., ...} after each workflow step
+                    (generate_sql/validate_sql carry "queries", execute_query carries
+                    "results_count" and a few "preview" rows per database)
+            token   {"text": "..."} narrative chunks as the LLM generates them
+            done    the /api/chat response JSON - authoritative final text (replaces
+                    streamed tokens if narrative generation fell back)
+        Comment lines (": ping") are sent as keep-alives. Closing the connection
+        cancels the remaining workflow steps.
+        """
+        try:
+            error_response, sanitized_message, session_id = _parse_chat_request()
+            if error_response:
+                return error_response
+        except Exception as e:
+            logger.error(f"Chat stream endpoint error: {e}", exc_info=True)
+            return jsonify({
+                'success': False,
+                'error': 'Internal server error'
+            }), 500
+        
+        logger.info(f"Chat stream request - Session: {session_id}, Message: {sanitized_message[:50]}...")
+        
+        def event_stream():
+            yield _sse('start', {'session_id': session_id})
+            with closing(agent.stream_message(sanitized_message, session_id)) as events:
+                for event, data in events:
+                    if event == 'ping':
+                        yield ": ping\n\n"
+                        continue
+                    if event != 'done':
+                        yield _sse(event, data)
+                        continue
+                    
+                    response = data or {
+                        'success': False,
+                        'response': "I'm still learning and encountered an issue. Please try rephrasing your query.",
+                        'error': None
+                    }
+                    if response['success']:
+                        cache_manager.add_to_history(
+                            session_id,
+                            sanitized_message,
+                            response['response']
+                        )
+                    response['session_id'] = session_id
+                    yield _sse('done', response)
+        
+        return Response(
+            stream_with_context(event_stream()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
     @api_bp.route('/chat/history/<session_id>', methods=['GET'])
     @limiter.limit(f"{Config.RATE_LIMIT} per minute")
     def get_history(session_id):
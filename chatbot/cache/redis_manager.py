@@ -123,7 +123,7 @@ class RedisManager:
         Cache database schema with version tracking
         Auto-invalidates when schema changes!
         """
-        # Calculate schema version based on table names
+        # Calculate schema version based on tables and their columns
         schema_version = self._calculate_schema_version(schema)
         
         # Store schema with version
@@ -133,7 +133,10 @@ class RedisManager:
         }
         
         logger.info(f"Caching schema with version: {schema_version}")
-        return self.set_value('schema_info', versioned_schema, Config.SCHEMA_CACHE_TTL)
+        cached = self.set_value('schema_info', versioned_schema, Config.SCHEMA_CACHE_TTL)
+        # Small companion key: lets callers find the current version without decoding the schema
+        self.set_value('schema_info:version', schema_version, Config.SCHEMA_CACHE_TTL)
+        return cached
     
     def get_cached_schema(self) -> Optional[dict]:
         """
@@ -149,6 +152,7 @@ class RedisManager:
         if 'version' not in cached_data:
             logger.warning("Old cache format detected - invalidating")
             self.delete_key('schema_info')
+            self.delete_key('schema_info:version')
             return None
         
         cached_version = cached_data.get('version')
@@ -160,24 +164,50 @@ class RedisManager:
         if cached_version != current_version:
             logger.warning(f"Schema version mismatch (cached: {cached_version}, current: {current_version}) - invalidating cache")
             self.delete_key('schema_info')
+            self.delete_key('schema_info:version')
             return None
         
         logger.info(f"Using cached schema (version: {cached_version})")
         return cached_schema
     
+    def get_schema_version(self, schema: dict) -> str:
+        """Public accessor for the schema version hash (keys version-scoped caches)"""
+        return self._calculate_schema_version(schema)
+    
+    def get_current_schema_version(self) -> Optional[str]:
+        """Version of the cached schema, or None (without loading the schema itself)"""
+        return self.get_value('schema_info:version')
+    
+    def cache_schema_context(self, context_key: str, artifact: dict) -> bool:
+        """
+        Cache a precomputed schema context (see agents/schema_context.py)
+        
+        context_key carries the schema version, so contexts for an older schema are
+        never read again and simply expire.
+        """
+        return self.set_value(f'schema_context:{context_key}', artifact, Config.SCHEMA_CACHE_TTL)
+    
+    def get_cached_schema_context(self, context_key: str) -> Optional[dict]:
+        """Get a cached schema context or None"""
+        return self.get_value(f'schema_context:{context_key}')
+    
     def _calculate_schema_version(self, schema: dict) -> str:
         """
-        Calculate schema version hash based on table/collection names
-        Changes when tables are added/removed
+        Calculate schema version hash based on tables/collections and their columns
+        Changes when tables are added/removed or a column is added/removed/retyped
         """
-        # Get sorted list of all table/collection names
-        pg_tables = sorted(schema.get('postgresql', {}).keys())
-        mongo_collections = sorted(schema.get('mongodb', {}).keys())
-        
-        # Create version string
-        version_string = f"pg:{','.join(pg_tables)}|mongo:{','.join(mongo_collections)}"
+        # Columns (name, type, ...) per table; MongoDB collections keep them under
+        # 'fields' next to a document count that must not change the version
+        definition = {}
+        for db in ('postgresql', 'mongodb'):
+            tables = schema.get(db) or {}
+            definition[db] = {
+                name: columns.get('fields', []) if isinstance(columns, dict) else columns
+                for name, columns in tables.items()
+            }
         
         # Hash it
+        version_string = json.dumps(definition, sort_keys=True, default=str)
         version_hash = hashlib.md5(version_string.encode()).hexdigest()[:8]
         
         return version_hash
@@ -214,6 +244,19 @@ class RedisManager:
         
         return self.get_value(cache_key)
     
+    def cache_query_plan(self, plan_key: str, plan: dict) -> bool:
+        """
+        Cache a parameterized SQL template (see agents/query_plan_cache.py)
+        
+        plan_key starts with the schema version, so templates generated against an
+        older schema are never read again and simply expire.
+        """
+        return self.set_value(f'query_plan:{plan_key}', plan, Config.QUERY_PLAN_CACHE_TTL)
+    
+    def get_cached_query_plan(self, plan_key: str) -> Optional[dict]:
+        """Get a cached SQL template or None"""
+        return self.get_value(f'query_plan:{plan_key}')
+    
     def add_to_history(self, session_id: str, user_message: str, assistant_response: str) -> bool:
         """
         Add conversation to history
@@ -60,16 +60,24 @@ class Config:
     MAX_INPUT_LENGTH = int(os.getenv('MAX_INPUT_LENGTH'))
     MAX_QUERY_ROWS = int(os.getenv('MAX_QUERY_ROWS'))  # Reduced from 1000 to 100 for performance
     QUERY_TIMEOUT = int(os.getenv('QUERY_TIMEOUT_SECONDS'))
+    QUERY_FETCH_PAGE_SIZE = int(os.getenv('QUERY_FETCH_PAGE_SIZE', '100'))  # server-side cursor page
+    
+    # PostgreSQL pool (thread-safe; requests wait up to POSTGRES_POOL_TIMEOUT for a connection)
+    POSTGRES_POOL_MAX_CONN = int(os.getenv('POSTGRES_POOL_MAX_CONN', '10'))
+    POSTGRES_POOL_TIMEOUT = int(os.getenv('POSTGRES_POOL_TIMEOUT_SECONDS', '30'))
+    POSTGRES_HEALTHCHECK_IDLE_SECONDS = int(os.getenv('POSTGRES_HEALTHCHECK_IDLE_SECONDS', '60'))
     
     # Cache TTL
     SCHEMA_CACHE_TTL = int(os.getenv('SCHEMA_CACHE_TTL'))
     QUERY_CACHE_TTL = int(os.getenv('QUERY_CACHE_TTL'))
     HISTORY_CACHE_TTL = int(os.getenv('HISTORY_CACHE_TTL'))
     NARRATIVE_CACHE_TTL = int(os.getenv('NARRATIVE_CACHE_TTL'))  # 1 hour for narratives
+    QUERY_PLAN_CACHE_TTL = int(os.getenv('QUERY_PLAN_CACHE_TTL', '604800'))  # SQL templates; keyed by schema version
     
     # Agent Configuration
     ENABLE_NARRATIVE_FORMATTING = os.getenv('ENABLE_NARRATIVE_FORMATTING') == 'true'
     USE_SPACY_NER = os.getenv('USE_SPACY_NER') == 'true'
+    ENABLE_QUERY_PLAN_CACHE = os.getenv('ENABLE_QUERY_PLAN_CACHE', 'true') == 'true'
     
     # Session
     SESSION_LIFETIME_HOURS = int(os.getenv('SESSION_LIFETIME_HOURS'))
@@ -1,144 +1,321 @@
 """
 PostgreSQL Query Executor
 Handles connection pooling, query execution, and error handling
+
+Connections come from a ThreadedConnectionPool (the Flask app serves requests on many
+threads) behind a semaphore, so callers wait for a free connection instead of failing
+or corrupting the pool. Connections idle for a while are health-checked on checkout.
+Queries run through named (server-side) cursors and are fetched in pages, with a
+per-request statement_timeout and optional cancellation (e.g. client disconnected).
 """
+import threading
+import time
+import uuid
 import psycopg2
-from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool, sql, extensions
 import logging
-from typing import Dict, List, Any, Tuple
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# How often a running query checks its cancel_event
+CANCEL_POLL_SECONDS = 0.25
+
+
+class QueryCancelled(Exception):
+    """Raised by stream_query() when the request's cancel_event was set"""
+
 
 class PostgreSQLExecutor:
     """Execute PostgreSQL queries safely with connection pooling"""
-    
+
     def __init__(self):
         self.connection_pool = None
+        self._slots = threading.BoundedSemaphore(Config.POSTGRES_POOL_MAX_CONN)
+        self._last_used: Dict[int, float] = {}
         self._initialize_pool()
-    
+
     def _initialize_pool(self):
         """Initialize PostgreSQL connection pool"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=1,
-                maxconn=10,
+                maxconn=Config.POSTGRES_POOL_MAX_CONN,
                 host=Config.POSTGRES_CONFIG['host'],
                 port=Config.POSTGRES_CONFIG['port'],
                 database=Config.POSTGRES_CONFIG['database'],
                 user=Config.POSTGRES_CONFIG['user'],
                 password=Config.POSTGRES_CONFIG['password'],
                 connect_timeout=10,
+                application_name='dopams-chatbot',
+                keepalives=1,
+                keepalives_idle=30,
+                keepalives_interval=10,
+                keepalives_count=5,
                 options=f'-c statement_timeout={Config.QUERY_TIMEOUT * 1000}'  # milliseconds
             )
-            logger.info("PostgreSQL connection pool initialized")
+            logger.info(f"PostgreSQL connection pool initialized (max {Config.POSTGRES_POOL_MAX_CONN})")
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL pool: {e}")
             raise
-    
-    def execute_query(self, query: str, params: tuple = None) -> Tuple[bool, Any]:
+
+    # ------------------------------------------------------------------
+    # Connection checkout
+    # ------------------------------------------------------------------
+
+    def _is_healthy(self, connection) -> bool:
+        """Closed connections are dropped; ones idle past the threshold must answer SELECT 1"""
+        if connection.closed:
+            return False
+        idle = time.monotonic() - self._last_used.get(id(connection), 0.0)
+        if idle < Config.POSTGRES_HEALTHCHECK_IDLE_SECONDS:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    @contextmanager
+    def connection(self):
+        """Check out a healthy connection; waits up to POSTGRES_POOL_TIMEOUT seconds for a free one"""
+        if not self._slots.acquire(timeout=Config.POSTGRES_POOL_TIMEOUT):
+            raise psycopg2.pool.PoolError("Timed out waiting for a PostgreSQL connection")
+        connection = None
+        try:
+            connection = self.connection_pool.getconn()
+            if not self._is_healthy(connection):
+                logger.warning("Stale PostgreSQL connection detected, replacing it")
+                self._last_used.pop(id(connection), None)
+                self.connection_pool.putconn(connection, close=True)
+                connection = None
+                connection = self.connection_pool.getconn()
+            yield connection
+        finally:
+            if connection is not None:
+                discard = bool(connection.closed)
+                if not discard and connection.status != extensions.STATUS_READY:
+                    try:
+                        connection.rollback()
+                    except Exception:
+                        discard = True
+                if discard:
+                    self._last_used.pop(id(connection), None)
+                else:
+                    self._last_used[id(connection)] = time.monotonic()
+                self.connection_pool.putconn(connection, close=discard)
+            self._slots.release()
+
+    @contextmanager
+    def _cancel_watch(self, connection, cancel_event: Optional[threading.Event]):
+        """Cancel the backend query on `connection` as soon as cancel_event is set"""
+        if cancel_event is None:
+            yield
+            return
+        finished = threading.Event()
+        lock = threading.Lock()   # no cancel() once the connection may serve another query
+
+        def watch():
+            while not finished.is_set():
+                if cancel_event.wait(CANCEL_POLL_SECONDS):
+                    with lock:
+                        if not finished.is_set():
+                            try:
+                                connection.cancel()
+                            except Exception as e:
+                                logger.debug(f"Query cancel failed: {e}")
+                    return
+
+        watcher = threading.Thread(target=watch, name='pg-cancel-watch', daemon=True)
+        watcher.start()
+        try:
+            yield
+        finally:
+            with lock:
+                finished.set()
+
+    # ------------------------------------------------------------------
+    # Query execution
+    # ------------------------------------------------------------------
+
+    def stream_query(
+        self,
+        query: str,
+        params: tuple = None,
+        page_size: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Run a SELECT through a server-side cursor and yield rows in pages
+
+        Args:
+            query: SQL query string (single SELECT/WITH statement)
+            params: Query parameters for parameterization
+            page_size: Rows per page (default Config.QUERY_FETCH_PAGE_SIZE)
+            max_rows: Stop after this many rows (default Config.MAX_QUERY_ROWS; 0/None = no cap)
+            timeout_seconds: statement_timeout for this request (default Config.QUERY_TIMEOUT)
+            cancel_event: Optional event; setting it cancels the running query
+
+        Yields:
+            Lists of row dicts. The connection is held until the generator is exhausted or closed.
+
+        Raises:
+            QueryCancelled if cancel_event was set; psycopg2 errors otherwise
+        """
+        page_size = page_size or Config.QUERY_FETCH_PAGE_SIZE
+        if max_rows is None:
+            max_rows = Config.MAX_QUERY_ROWS
+        timeout_ms = int((timeout_seconds or Config.QUERY_TIMEOUT) * 1000)
+
+        with self.connection() as connection:
+            with self._cancel_watch(connection, cancel_event):
+                try:
+                    with connection.cursor() as setup:
+                        setup.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+
+                    # Named cursor: rows stay on the server and arrive page by page
+                    with connection.cursor(name=f"chatbot_{uuid.uuid4().hex}") as cursor:
+                        cursor.itersize = page_size
+                        if params:
+                            cursor.execute(query, params)
+                        else:
+                            cursor.execute(query)
+
+                        columns = None
+                        remaining = max_rows or None
+                        while remaining is None or remaining > 0:
+                            rows = cursor.fetchmany(page_size if remaining is None else min(page_size, remaining))
+                            if columns is None:
+                                columns = [desc[0] for desc in cursor.description]
+                            if not rows:
+                                break
+                            if remaining is not None:
+                                remaining -= len(rows)
+                            yield [dict(zip(columns, row)) for row in rows]
+                except psycopg2.extensions.QueryCanceledError:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise QueryCancelled()
+                    raise
+                finally:
+                    # Read-only work; also closes the server-side cursor. A broken connection
+                    # is discarded by connection() instead.
+                    try:
+                        connection.rollback()
+                    except Exception:
+                        pass
+
+    def execute_query(
+        self,
+        query: str,
+        params: tuple = None,
+        max_rows: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[bool, Any]:
         """
         Execute a SELECT query safely
-        
+
+        Rows are still materialized into one list (bounded by max_rows): the response
+        formatter, the query result cache and the SSE reply all work on the complete
+        result. Use stream_query() where pages can be consumed as they arrive.
+
         Args:
             query: SQL query string
             params: Query parameters for parameterization
-        
+            max_rows: Row cap (default Config.MAX_QUERY_ROWS; 0 = no cap)
+            timeout_seconds: statement_timeout for this request (default Config.QUERY_TIMEOUT)
+            cancel_event: Optional event; setting it cancels the running query
+
         Returns:
             Tuple of (success: bool, result: List[Dict] or error_message: str)
         """
-        connection = None
-        cursor = None
-        
         try:
-            # Get connection from pool
-            connection = self.connection_pool.getconn()
-            
-            # Use RealDictCursor for dict results
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
-            
-            # Execute query with timeout
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            
-            # Fetch results with row limit
-            results = cursor.fetchmany(Config.MAX_QUERY_ROWS)
-            
-            # Convert to list of dicts
-            data = [dict(row) for row in results]
-            
+            data = []
+            for page in self.stream_query(query, params, max_rows=max_rows,
+                                          timeout_seconds=timeout_seconds, cancel_event=cancel_event):
+                data.extend(page)
+
             logger.info(f"Query executed successfully, returned {len(data)} rows")
             return True, data
-            
+
+        except QueryCancelled:
+            logger.info("Query cancelled by client")
+            return False, "Query cancelled"
+
+        except psycopg2.extensions.QueryCanceledError as e:
+            logger.error(f"Query timed out: {e}")
+            return False, "Query timed out"
+
+        except psycopg2.pool.PoolError as e:
+            error_msg = "Database busy, please retry"
+            logger.error(f"Pool error: {e}")
+            return False, error_msg
+
         except psycopg2.OperationalError as e:
             error_msg = "Database connection error"
             logger.error(f"Operational error: {e}")
             return False, error_msg
-            
+
         except psycopg2.ProgrammingError as e:
             # Preserve the actual error message for better debugging
             error_msg = str(e)
             logger.error(f"Programming error: {e}")
             return False, error_msg
-            
+
         except Exception as e:
             error_msg = "Query execution failed"
             logger.error(f"Unexpected error: {e}")
             return False, error_msg
-            
-        finally:
-            # Clean up
-            if cursor:
-                cursor.close()
-            if connection:
-                self.connection_pool.putconn(connection)
-    
+
     def get_schema_info(self) -> Tuple[bool, Any]:
         """
         Get database schema information (ONLY base tables, NOT views/indexes)
-        
+
         Returns:
             Tuple of (success: bool, schema: Dict or error_message: str)
         """
         query = """
-        SELECT 
+        SELECT
             c.table_name,
             c.column_name,
             c.data_type,
             c.is_nullable
         FROM information_schema.columns c
-        INNER JOIN information_schema.tables t 
-            ON c.table_name = t.table_name 
+        INNER JOIN information_schema.tables t
+            ON c.table_name = t.table_name
             AND c.table_schema = t.table_schema
         WHERE c.table_schema = 'public'
             AND t.table_type = 'BASE TABLE'
-        ORDER BY c.table_name, c.ordinal_position;
+        ORDER BY c.table_name, c.ordinal_position
         """
-        
-        success, result = self.execute_query(query)
-        
+
+        # Every column, not just the first MAX_QUERY_ROWS
+        success, result = self.execute_query(query, max_rows=0)
+
         if not success:
             return False, result
-        
+
         # Organize schema by table
         schema = {}
         for row in result:
             table = row['table_name']
             if table not in schema:
                 schema[table] = []
-            
+
             schema[table].append({
                 'column': row['column_name'],
                 'type': row['data_type'],
                 'nullable': row['is_nullable'] == 'YES'
             })
-        
+
         return True, schema
-    
+
     def test_connection(self) -> bool:
         """Test if database connection is working"""
         try:
@@ -147,12 +324,9 @@ class PostgreSQLExecutor:
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
-    
+
     def close(self):
         """Close all connections in the pool"""
         if self.connection_pool:
             self.connection_pool.closeall()
             logger.info("PostgreSQL connection pool closed")
-
-
-
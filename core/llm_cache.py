@@ -0,0 +1,202 @@
+"""
+Content-addressed cache for parsed LLM extraction responses.
+
+Key: sha256 of (model identity, prompt template hash, normalized input hash), so a
+re-processed crime whose brief_facts text, prompt and model are unchanged skips the
+LLM call entirely. Stored in a local SQLite file (WAL, one connection per thread),
+evicted least-recently-used first once the stored responses exceed LLM_CACHE_MAX_MB.
+
+Environment:
+    LLM_CACHE_ENABLED   true/false (default true)
+    LLM_CACHE_PATH      SQLite file (default <repo>/.llm_cache/llm_responses.sqlite)
+    LLM_CACHE_MAX_MB    size budget for stored responses (default 512)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".llm_cache", "llm_responses.sqlite"
+)
+
+# Evict down to this fraction of the budget so eviction does not run on every store
+EVICT_TARGET_RATIO = 0.9
+EVICT_BATCH = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(value: str) -> str:
+    """NFC + collapsed whitespace: formatting-only edits of brief_facts keep the same key."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", value)).strip()
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def template_hash(*parts: str) -> str:
+    """Hash of the prompt template (plus anything else that shapes the response, e.g. schema text)."""
+    return _sha256("\x1f".join(parts))
+
+
+def input_hash(input_data: Dict[str, Any]) -> str:
+    normalized = {
+        key: normalize_text(value) if isinstance(value, str) else value
+        for key, value in sorted(input_data.items())
+    }
+    return _sha256(json.dumps(normalized, sort_keys=True, default=str, ensure_ascii=False))
+
+
+class LLMResponseCache:
+    """Thread-safe persistent cache of JSON-serializable LLM responses."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max(1, int(max_bytes))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "saved_seconds": 0.0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                template_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                cost_seconds REAL NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at)")
+        conn.commit()
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    @staticmethod
+    def make_key(model: str, tmpl_hash: str, input_data: Dict[str, Any]) -> str:
+        return _sha256(f"{model}\x1f{tmpl_hash}\x1f{input_hash(input_data)}")
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._conn()
+        row = conn.execute("SELECT response, cost_seconds FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        conn.execute(
+            "UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+        )
+        conn.commit()
+        self._count("hits")
+        self._count("saved_seconds", row[1])
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, tmpl_hash: str, response: Any, cost_seconds: float = 0.0) -> None:
+        payload = json.dumps(response, ensure_ascii=False, default=str)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        conn = self._conn()
+        old = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache
+                (key, model, template_hash, response, size, cost_seconds, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, model, tmpl_hash, payload, size, cost_seconds, now, now),
+        )
+        conn.commit()
+        with self._lock:
+            self._stats["stores"] += 1
+            self._size += size - (old[0] if old else 0)
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until the cache is under EVICT_TARGET_RATIO of its budget."""
+        conn = self._conn()
+        target = int(self.max_bytes * EVICT_TARGET_RATIO)
+        evicted = 0
+        with self._lock:
+            while self._size > target:
+                rows = conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_used_at LIMIT ?", (EVICT_BATCH,)
+                ).fetchall()
+                if not rows:
+                    self._size = 0
+                    break
+                for key, size in rows:
+                    if self._size <= target:
+                        break
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._size -= size
+                    evicted += 1
+                conn.commit()
+            self._stats["evictions"] += evicted
+        if evicted:
+            logger.info(f"[LLM cache] evicted {evicted} least-recently-used entries")
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size_mb"] = round(self._size / (1024 * 1024), 2)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["saved_seconds"] = round(stats["saved_seconds"], 1)
+        return stats
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+_cache_disabled = False
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache, or None when disabled (LLM_CACHE_ENABLED=false) or unusable."""
+    global _cache, _cache_disabled
+    if _cache is None and not _cache_disabled:
+        with _cache_lock:
+            if _cache is None and not _cache_disabled:
+                if os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() in ("0", "false", "no", "off"):
+                    _cache_disabled = True
+                    return None
+                path = os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH
+                try:
+                    max_mb = float(os.getenv("LLM_CACHE_MAX_MB", "512"))
+                    _cache = LLMResponseCache(path, max_bytes=int(max_mb * 1024 * 1024))
+                    logger.info(f"[LLM cache] using {path} (budget {max_mb:g} MB)")
+                except Exception as e:
+                    logger.warning(f"[LLM cache] disabled, could not open {path}: {e}")
+                    _cache_disabled = True
+    return _cache
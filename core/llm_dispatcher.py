@@ -0,0 +1,104 @@
+"""
+Process-wide LLM request dispatcher.
+
+Every extraction call (invoke_extraction_with_retry) and LLMService.generate() takes a
+slot here before it reaches Ollama, so at most N requests are in flight regardless of
+how many crime workers are running. Callers beyond N wait in FIFO order on the client
+side instead of piling up in Ollama's queue, where the wait would count against
+LLM_TIMEOUT and surface as spurious timeouts.
+
+N = LLM_MAX_IN_FLIGHT, else OLLAMA_NUM_PARALLEL (match the server setting), else 4.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def configured_max_in_flight() -> int:
+    for name in ("LLM_MAX_IN_FLIGHT", "OLLAMA_NUM_PARALLEL"):
+        value = os.getenv(name, "").strip()
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Ignoring non-integer {name}={value!r}")
+    return DEFAULT_MAX_IN_FLIGHT
+
+
+class LLMDispatcher:
+    """FIFO gate that keeps exactly `max_in_flight` LLM requests running when there is demand."""
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._cond = threading.Condition()
+        self._waiters = deque()
+        self._in_flight = 0
+        self._stats = {"requests": 0, "peak_in_flight": 0, "peak_queued": 0, "queue_wait_seconds": 0.0}
+
+    def acquire(self) -> None:
+        ticket = object()
+        t0 = time.monotonic()
+        with self._cond:
+            self._waiters.append(ticket)
+            self._stats["peak_queued"] = max(self._stats["peak_queued"], len(self._waiters))
+            acquired = False
+            try:
+                while self._waiters[0] is not ticket or self._in_flight >= self.max_in_flight:
+                    self._cond.wait()
+                acquired = True
+            finally:
+                # Always dequeue; a ticket left behind (wait interrupted) would block every later caller
+                self._waiters.remove(ticket)
+                if not acquired:
+                    self._cond.notify_all()
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+            self._stats["queue_wait_seconds"] += time.monotonic() - t0
+            # Next waiter may also fit if more than one slot is free
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["in_flight"] = self._in_flight
+            stats["queued"] = len(self._waiters)
+        stats["max_in_flight"] = self.max_in_flight
+        stats["queue_wait_seconds"] = round(stats["queue_wait_seconds"], 1)
+        return stats
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LLMDispatcher(configured_max_in_flight())
+                logger.info(f"[LLM dispatch] max {_dispatcher.max_in_flight} in-flight requests")
+    return _dispatcher
@@ -2,7 +2,7 @@ import os
 import re
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from functools import lru_cache
 
 from dotenv import load_dotenv
@@ -54,10 +54,8 @@ class LLMService:
         )
         return self._langchain_model_instance
 
-    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
-        """Direct HTTP generation primarily used for Chatbot SQL and legacy routing"""
-        import requests
-        
+    def _generate_request(self, prompt: str, system_prompt: Optional[str], stream: bool):
+        """(endpoint, payload) for Ollama /api/generate"""
         endpoint = f"{self.api_url}/api/generate"
         if not self.api_url.endswith("/api") and not endpoint.endswith("/api/generate"):
              # Normalise ollama urls
@@ -70,7 +68,7 @@ class LLMService:
         payload = {
             "model": self.model,
             "prompt": full_prompt,
-            "stream": self.stream,
+            "stream": stream,
             "keep_alive": os.getenv("OLLAMA_KEEP_ALIVE", "60m"),
             "options": {
                 "temperature": self.temperature,
@@ -78,12 +76,20 @@ class LLMService:
                 "num_ctx": self.context_window
             }
         }
-        
+        return endpoint, payload
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """Direct HTTP generation primarily used for Chatbot SQL and legacy routing"""
+        import requests
+
+        endpoint, payload = self._generate_request(prompt, system_prompt, self.stream)
         logger.info(f"Sending request to LLM: {self.model} with context_window {self.context_window}")
         
         try:
             # Explicit timeout to prevent silent hangs
-            response = requests.post(endpoint, json=payload, timeout=120)
+            from core.llm_dispatcher import get_llm_dispatcher
+            with get_llm_dispatcher().slot():
+                response = requests.post(endpoint, json=payload, timeout=120)
             response.raise_for_status()
             
             result = response.json()
@@ -99,6 +105,35 @@ class LLMService:
             logger.error(f"LLM request failed: {e}")
             return None
 
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """
+        Streaming variant of generate(): yields response text chunks as Ollama produces them.
+        The dispatcher slot and the HTTP response are held until the stream ends or the
+        consumer closes the generator (closing it aborts the generation).
+        Errors are logged and re-raised — callers decide how to recover from a partial stream.
+        """
+        import requests
+
+        endpoint, payload = self._generate_request(prompt, system_prompt, True)
+        logger.info(f"Streaming request to LLM: {self.model} with context_window {self.context_window}")
+
+        from core.llm_dispatcher import get_llm_dispatcher
+        try:
+            with get_llm_dispatcher().slot():
+                with requests.post(endpoint, json=payload, timeout=120, stream=True) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        part = json.loads(line)
+                        if part.get('response'):
+                            yield part['response']
+                        if part.get('done'):
+                            break
+        except requests.exceptions.RequestException as e:
+            logger.error(f"LLM streaming request failed: {e}")
+            raise
+
 @lru_cache(maxsize=10)
 def get_llm(task_type: str) -> LLMService:
     """
@@ -168,12 +203,28 @@ def invoke_extraction_with_retry(chain, input_data: dict, max_retries: int = 2)
     
     import time as _time
     
+    from core.llm_dispatcher import get_llm_dispatcher
+    dispatcher = get_llm_dispatcher()
+
     def _invoke_with_timeout(chain_obj, data):
-        """Invoke chain with timeout using ThreadPoolExecutor."""
+        """
+        Invoke chain with timeout using ThreadPoolExecutor, inside a dispatcher slot.
+        The timeout covers only the request itself, not the wait for a slot. The slot is
+        released when the request actually finishes, even after a timeout, so abandoned
+        requests still count against Ollama's parallelism.
+        """
+        dispatcher.acquire()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(chain_obj.invoke, data)
+        except Exception:
+            dispatcher.release()
+            executor.shutdown(wait=False)
+            raise
+        future.add_done_callback(lambda _f: dispatcher.release())
+        executor.shutdown(wait=False)
         try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(chain_obj.invoke, data)
-                return future.result(timeout=timeout_seconds)
+            return future.result(timeout=timeout_seconds)
         except FuturesTimeoutError:
             raise TimeoutError(f"LLM chain.invoke() timed out after {timeout_seconds}s")
     
@@ -239,6 +290,52 @@ def invoke_extraction_with_retry(chain, input_data: dict, max_retries: int = 2)
     return {}
 
 
+# --- Content-addressed cache in front of the retry wrapper ---
+
+def llm_identity(llm_service: LLMService) -> str:
+    """Everything about the model call that changes its output, as a stable string."""
+    return (f"{llm_service.model}|t={llm_service.temperature}"
+            f"|ctx={llm_service.context_window}|max={llm_service.max_tokens}")
+
+
+def invoke_extraction_cached(chain, input_data: dict, template: str, llm_service: LLMService,
+                             max_retries: int = 2):
+    """
+    invoke_extraction_with_retry() behind the persistent LLM response cache (core/llm_cache.py).
+
+    Key = (model identity, hash of `template`, normalized input_data). Pass as `template`
+    everything that shapes the response but is not in input_data (prompt text, schema
+    instructions). Only non-empty results are stored, so failures are retried next run.
+    """
+    from core.llm_cache import get_llm_cache, template_hash
+
+    cache = get_llm_cache()
+    if cache is None:
+        return invoke_extraction_with_retry(chain, input_data, max_retries=max_retries)
+
+    model = llm_identity(llm_service)
+    tmpl_hash = template_hash(template)
+    try:
+        key = cache.make_key(model, tmpl_hash, input_data)
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f"[LLM cache] lookup failed, calling LLM: {e}")
+        key, cached = None, None
+    if cached is not None:
+        logger.info("[LLM cache] hit - skipping LLM call")
+        return cached
+
+    import time as _time
+    t0 = _time.time()
+    result = invoke_extraction_with_retry(chain, input_data, max_retries=max_retries)
+    if result and key is not None:
+        try:
+            cache.put(key, model, tmpl_hash, result, cost_seconds=_time.time() - t0)
+        except Exception as e:
+            logger.warning(f"[LLM cache] store failed: {e}")
+    return result
+
+
 # --- Robust JSON Output Parser ---
 
 _RE_LINE_COMMENT   = re.compile(r'(?m)(?<!:)//[^\n\r]*')        # // ...  (avoid URLs http://)
@@ -34,6 +34,10 @@ ETL_CONFIG = {
     'end_date': resolve_api_base_url('ACCUSED_END_DATE', default='2025-12-31T23:59:59+05:30'),
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
+    # Chunks fetched ahead of the DB load (bounded queue) and concurrent API fetchers
+    # (0 = one fetcher per load worker, the API concurrency of the old per-chunk workers)
+    'prefetch_depth': get_int_env('API_PREFETCH_DEPTH', 2),
+    'fetch_workers': get_int_env('API_FETCH_WORKERS', 0),
     'batch_size': 250,
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
@@ -9,14 +9,10 @@ import sys
 import time
 import requests
 import psycopg2
-from psycopg2.extras import execute_batch
-from datetime import datetime, timedelta, timezone
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
+from datetime import datetime
 import logging
 import colorlog
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Optional, Tuple
 import json
 import os
 import re
@@ -24,9 +20,11 @@ import re
 # Import PostgreSQLConnectionPool
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db_pooling import PostgreSQLConnectionPool
+from etl_incremental import IncrementalETLEngine, get_yesterday_end_ist
 from env_utils import get_float_env, get_int_env
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 
 # ==========================================
 # ETL EXECUTION MODE
@@ -35,9 +33,6 @@ from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
 # ==========================================
 RUN_MODE = get_int_env('ACCUSED_RUN_MODE', 1)
 
-# IST timezone offset (UTC+05:30)
-IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
-
 # Add TRACE level support (lower than DEBUG)
 TRACE_LEVEL = 5
 logging.addLevelName(TRACE_LEVEL, 'TRACE')
@@ -81,112 +76,93 @@ ARRESTS_TABLE = TABLE_CONFIG.get('arrests', 'arrests')
 BRIEF_FACTS_ACCUSED_TABLE = TABLE_CONFIG.get('brief_facts_accused', 'brief_facts_accused')
 
 
-def parse_iso_date(date_str: str) -> datetime:
-    """Parse ISO 8601 date string (with optional time component) to datetime."""
-    clean_date = date_str.replace('Z', '+00:00')
-    try:
-        # Handle both T-separated and space-separated datetime formats
-        if 'T' in clean_date or ' ' in clean_date:
-            return datetime.fromisoformat(clean_date)
-        else:
-            return datetime.strptime(clean_date, '%Y-%m-%d')
-    except ValueError:
-        # Fall back to date-only parsing
-        date_only = clean_date.split('T')[0].split(' ')[0]
-        return datetime.strptime(date_only, '%Y-%m-%d')
-
-
-def get_yesterday_end_ist() -> str:
-    """Get yesterday's date at 23:59:59 in IST (UTC+05:30) as ISO format string."""
-    now_ist = datetime.now(IST_OFFSET)
-    yesterday = now_ist - timedelta(days=1)
-    yesterday_end = yesterday.replace(hour=23, minute=59, second=59, microsecond=0)
-    return yesterday_end.isoformat()
-
+class AccusedETL(IncrementalETLEngine):
+    module_name = 'accused'
+    display_name = 'Accused'
+    table_name = ACCUSED_TABLE
+    record_label = 'accused'
+    key_name = 'accused_id'
+    api_id_field = 'ACCUSED_ID'
+    duplicate_fields = ('crime_id', 'person_id')
+    field_mapping = {
+        'ACCUSED_ID': 'accused_id',
+        'CRIME_ID': 'crime_id',
+        'PERSON_ID': 'person_id',
+        'ACCUSED_CODE': 'accused_code',
+        'TYPE': 'type',
+        'SEQ_NUM': 'seq_num',
+        'IS_CCL': 'is_ccl',
+        'ACCUSED_STATUS': 'accused_status',
+        'DATE_CREATED': 'date_created',
+        'DATE_MODIFIED': 'date_modified'
+    }
+    nested_field_mappings = {
+        'PHYSICAL_FEATURES': {
+            'BEARD': 'beard',
+            'BUILD': 'build',
+            'COLOR': 'color',
+            'EAR': 'ear',
+            'EYES': 'eyes',
+            'FACE': 'face',
+            'HAIR': 'hair',
+            'HEIGHT': 'height',
+            'LEUCODERMA': 'leucoderma',
+            'MOLE': 'mole',
+            'MUSTACHE': 'mustache',
+            'NOSE': 'nose',
+            'TEETH': 'teeth'
+        }
+    }
+    column_types = {'height': 'VARCHAR(50)', 'is_ccl': 'INTEGER', 'seq_num': 'INTEGER'}
+    min_start_date = ETL_CONFIG['start_date']
+    # Every accused row goes through the smart-update path in insert_accused
+    bulk_upsert = False
+    use_run_checkpoint = True
 
-class AccusedETL:
     def __init__(self):
-        self.db_pool = None
-        self.run_state_enabled = True
-        self.stats_lock = threading.Lock()
-        self.schema_lock = threading.Lock()
-        self.stats = {
-            'total_api_calls': 0,
-            'total_accused_fetched': 0,
-            'total_accused_inserted': 0,
-            'total_accused_updated': 0,
-            'total_accused_no_change': 0,
-            'total_accused_failed': 0,
-            'total_duplicates': 0,
+        # Chunk-level parallelism - defaults to 4 for DB connection safety
+        # Safe default: 4 chunks × 4 workers = 16 concurrent threads
+        # Can override: ACCUSED_CHUNK_WORKERS=8 MAX_WORKERS=8 for higher throughput if DB allows
+        chunk_workers = max(1, get_int_env('ACCUSED_CHUNK_WORKERS', 4))
+        super().__init__(
+            chunk_days=ETL_CONFIG['chunk_days'],
+            overlap_days=ETL_CONFIG.get('chunk_overlap_days', 1),
+            batch_size=ETL_CONFIG.get('batch_size', 250),
+            prefetch_depth=ETL_CONFIG.get('prefetch_depth', 2),
+            fetch_workers=ETL_CONFIG.get('fetch_workers') or chunk_workers,
+            load_workers=chunk_workers,
+        )
+        self.stats.update({
             'stub_persons_created': 0,
-            'failed_api_calls': 0,
             'accused_without_crime': 0,
             'accused_without_person': 0,
             'crimes_inserted_from_accused': 0,
             'crimes_updated_from_accused': 0,
-            'errors': []
-        }
+        })
+        self.inter_chunk_sleep = get_float_env('ACCUSED_INTER_CHUNK_SLEEP', 0.0)
         self.db_limiter = None
-        
-        # Setup chunk-wise logging files
-        self.setup_chunk_loggers()
-    
+
+    def log_header_lines(self) -> List[str]:
+        return [
+            f"Date Range: {ETL_CONFIG['start_date']} to {ETL_CONFIG['end_date']}",
+            "Expected Total from API Team: 22423 (insert + update records)",
+        ]
+
     def setup_chunk_loggers(self):
-        """Setup separate log files for API responses, DB operations, and failed records"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        # API response log file
-        self.api_log_file = f'logs/accused_api_chunks_{timestamp}.log'
-        self.api_log = open(self.api_log_file, 'w', encoding='utf-8')
-        self.api_log.write(f"# Accused API Chunk-wise Log\n")
-        self.api_log.write(f"# Generated: {datetime.now().isoformat()}\n")
-        self.api_log.write(f"# Date Range: {ETL_CONFIG['start_date']} to {ETL_CONFIG['end_date']}\n")
-        overlap_days = ETL_CONFIG.get('chunk_overlap_days', 1)
-        self.api_log.write(f"# Chunk Size: {ETL_CONFIG['chunk_days']} days (overlap: {overlap_days} day(s) between chunks)\n")
-        self.api_log.write(f"# Expected Total from API Team: 22423 (insert + update records)\n")
-        self.api_log.write(f"{'='*80}\n\n")
-        
-        # Database operations log file
-        self.db_log_file = f'logs/accused_db_chunks_{timestamp}.log'
-        self.db_log = open(self.db_log_file, 'w', encoding='utf-8')
-        self.db_log.write(f"# Accused Database Operations Chunk-wise Log\n")
-        self.db_log.write(f"# Generated: {datetime.now().isoformat()}\n")
-        self.db_log.write(f"# Date Range: {ETL_CONFIG['start_date']} to {ETL_CONFIG['end_date']}\n")
-        overlap_days = ETL_CONFIG.get('chunk_overlap_days', 1)
-        self.db_log.write(f"# Chunk Size: {ETL_CONFIG['chunk_days']} days (overlap: {overlap_days} day(s) between chunks)\n")
-        self.db_log.write(f"{'='*80}\n\n")
-        
-        # Failed records log file (records that couldn't be inserted/updated)
-        self.failed_log_file = f'logs/accused_failed_{timestamp}.log'
-        self.failed_log = open(self.failed_log_file, 'w', encoding='utf-8')
-        self.failed_log.write(f"# Accused Failed Records Log\n")
-        self.failed_log.write(f"# Generated: {datetime.now().isoformat()}\n")
-        self.failed_log.write(f"# Records that failed to insert or update with reasons\n")
-        self.failed_log.write(f"{'='*80}\n\n")
-        
+        """Setup the shared chunk logs plus the API response details and fallback failures logs"""
+        super().setup_chunk_loggers()
+
         # API response details log file (accused_id, crime_id, person_id)
-        self.api_response_file = f'logs/accused_api_response_{timestamp}.log'
-        self.api_response_log = open(self.api_response_file, 'w', encoding='utf-8')
-        self.api_response_log.write(f"# Accused API Response Details\n")
-        self.api_response_log.write(f"# Generated: {datetime.now().isoformat()}\n")
-        self.api_response_log.write(f"# Format: accused_id|crime_id|person_id\n")
-        self.api_response_log.write(f"{'='*80}\n\n")
-        
+        self.api_response_file, self.api_response_log = self.open_chunk_log(
+            'api_response', "Accused API Response Details",
+            ["Format: accused_id|crime_id|person_id"])
+
         # Fallback failure log file (records that failed even after trying crime_id API)
-        self.fallback_failure_file = f'logs/accused_fallback_failures_{timestamp}.log'
-        self.fallback_failure_log = open(self.fallback_failure_file, 'w', encoding='utf-8')
-        self.fallback_failure_log.write(f"# Accused Fallback Failures Log\n")
-        self.fallback_failure_log.write(f"# Generated: {datetime.now().isoformat()}\n")
-        self.fallback_failure_log.write(f"# Records that failed even after trying crime_id API endpoint\n")
-        self.fallback_failure_log.write(f"# Format: accused_id|person_id|crime_id|reason\n")
-        self.fallback_failure_log.write(f"{'='*80}\n\n")
-        
-        logger.info(f"📝 API chunk log: {self.api_log_file}")
-        logger.info(f"📝 DB chunk log: {self.db_log_file}")
-        logger.info(f"📝 Failed records log: {self.failed_log_file}")
+        self.fallback_failure_file, self.fallback_failure_log = self.open_chunk_log(
+            'fallback_failures', "Accused Fallback Failures Log",
+            ["Records that failed even after trying crime_id API endpoint",
+             "Format: accused_id|person_id|crime_id|reason"])
+
         logger.info(f"📝 Fallback failures log: {self.fallback_failure_file}")
         logger.info(f"📝 API response details log: {self.api_response_file}")
 
@@ -278,19 +254,6 @@ class AccusedETL:
                 except Exception as e:
                     logger.error(f"Error updating {ARRESTS_TABLE} info: {e}")
 
-    def close_chunk_loggers(self):
-        """Close chunk log files"""
-        if hasattr(self, 'api_log') and self.api_log:
-            self.api_log.close()
-        if hasattr(self, 'db_log') and self.db_log:
-            self.db_log.close()
-        if hasattr(self, 'failed_log') and self.failed_log:
-            self.failed_log.close()
-        if hasattr(self, 'api_response_log') and self.api_response_log:
-            self.api_response_log.close()
-        if hasattr(self, 'fallback_failure_log') and self.fallback_failure_log:
-            self.fallback_failure_log.close()
-
     def connect_db(self):
         try:
             # Optimized parallelism for 64GB RAM server
@@ -318,6 +281,15 @@ class AccusedETL:
                 f"(maxconn={max_connections}, limiter={limiter_capacity})"
             )
             logger.info(f"🚀 Concurrency scaled for 64GB server: {chunk_workers} chunks, {row_workers} workers/chunk")
+
+            # Guardrail: don't allow row-level concurrency to exceed pool capacity.
+            # This prevents psycopg2.pool.PoolError: Connection pool exhausted under load.
+            self.record_workers = max(1, min(row_workers, max(1, max_connections - 2)))
+            if self.record_workers != row_workers:
+                logger.warning(
+                    f"⚠️  Capping MAX_WORKERS from {row_workers} to {self.record_workers} "
+                    f"to fit DB pool capacity (maxconn={max_connections})."
+                )
             return True
         except Exception as e:
             logger.error(f"❌ Database connection pool initialization failed: {e}")
@@ -328,273 +300,12 @@ class AccusedETL:
             self.db_pool.close_all()
         logger.info("Database connection closed")
 
-    def ensure_run_state_table(self):
-        """Ensure ETL run-state table exists."""
-        try:
-            with self.db_pool.get_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS etl_run_state (
-                        module_name TEXT PRIMARY KEY,
-                        last_successful_end TIMESTAMPTZ NOT NULL,
-                        updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                conn.commit()
-            self.run_state_enabled = True
-        except Exception as e:
-            self.run_state_enabled = False
-            logger.warning(
-                "⚠️  Could not initialize etl_run_state (continuing without checkpoint persistence): %s",
-                e,
-            )
-
-    def get_run_checkpoint(self, module_name: str) -> Optional[datetime]:
-        """Get last successful run checkpoint for a module."""
-        if not self.run_state_enabled:
-            return None
-
-        try:
-            with self.db_pool.get_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT last_successful_end FROM etl_run_state WHERE module_name = %s",
-                    (module_name,)
-                )
-                row = cursor.fetchone()
-                return row[0] if row else None
-        except Exception as e:
-            self.run_state_enabled = False
-            logger.warning(
-                "⚠️  Could not read etl_run_state checkpoint (continuing without checkpoint read): %s",
-                e,
-            )
-            return None
-
-    def update_run_checkpoint(self, module_name: str, end_date_iso: str):
-        """Persist successful run boundary."""
-        if not self.run_state_enabled:
-            return
-
-        end_dt = parse_iso_date(end_date_iso)
-        try:
-            with self.db_pool.get_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO etl_run_state (module_name, last_successful_end, updated_at)
-                    VALUES (%s, %s, CURRENT_TIMESTAMP)
-                    ON CONFLICT (module_name) DO UPDATE SET
-                        last_successful_end = EXCLUDED.last_successful_end,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (module_name, end_dt))
-                conn.commit()
-        except Exception as e:
-            self.run_state_enabled = False
-            logger.warning(
-                "⚠️  Could not persist etl_run_state checkpoint (continuing): %s",
-                e,
-            )
-    
-    def get_table_columns(self, table_name: str) -> Set[str]:
-        """Get all column names from a table."""
-        try:
-            with self.db_pool.get_connection_context() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name = %s
-                """, (table_name,))
-                return {row[0] for row in cursor.fetchall()}
-        except Exception as e:
-            logger.error(f"Error getting table columns for {table_name}: {e}")
-            return set()
-    
-    def get_effective_start_date(self) -> str:
-        """
-        Get effective start date for ETL:
-        - If table is empty: use DEFAULT_START_DATE (configurable, defaults to 2022-01-01T00:00:00+05:30)
-        - If table has data: return max(date_created, date_modified) from table
-        """
-        try:
-            with self.db_pool.get_connection_context() as conn:
-                cursor = conn.cursor()
-                # Check if table has any data
-                cursor.execute(f"SELECT COUNT(*) FROM {ACCUSED_TABLE}")
-                count = cursor.fetchone()[0]
-                
-                default_start_date = ETL_CONFIG['start_date']
-                if count == 0:
-                    # New database, start from beginning (configurable default)
-                    logger.info(f"📊 Table is empty, starting from {default_start_date}")
-                    return default_start_date
-                
-                # Table has data, get max of date_created and date_modified
-                # Only consider dates >= the configured default start date
-                MIN_START_DATE = default_start_date
-                min_start_dt = parse_iso_date(default_start_date)
-                
-                # Parse the date string to extract the date part for SQL
-                min_date_for_sql = min_start_dt.strftime('%Y-%m-%d')
-                
-                cursor.execute(f"""
-                    SELECT GREATEST(
-                        COALESCE(MAX(CASE WHEN date_created >= '{min_date_for_sql}'::timestamp THEN date_created END), '{min_date_for_sql}'::timestamp),
-                        COALESCE(MAX(CASE WHEN date_modified >= '{min_date_for_sql}'::timestamp THEN date_modified END), '{min_date_for_sql}'::timestamp)
-                    ) as max_date
-                    FROM {ACCUSED_TABLE}
-                """)
-                result = cursor.fetchone()
-                if result and result[0]:
-                    max_date = result[0]
-                    # Convert to IST timezone if needed
-                    if isinstance(max_date, datetime):
-                        if max_date.tzinfo is None:
-                            max_date = max_date.replace(tzinfo=IST_OFFSET)
-                        else:
-                            max_date = max_date.astimezone(IST_OFFSET)
-                        
-                        # Ensure we never go before the configured minimum start date
-                        if max_date < min_start_dt:
-                            logger.warning(f"⚠️  Max date ({max_date.isoformat()}) is before {MIN_START_DATE}, using {MIN_START_DATE}")
-                            return MIN_START_DATE
-                        
-                        logger.info(f"📊 Table has data, starting from: {max_date.isoformat()}")
-                        return max_date.isoformat()
-                
-                # Fallback to configured start date
-                logger.warning(f"⚠️  Could not determine max date, using configured start date: {default_start_date}")
-                return default_start_date
-                
-        except Exception as e:
-            logger.error(f"❌ Error getting effective start date: {e}")
-            default_start_date = ETL_CONFIG['start_date']
-            logger.warning(f"⚠️  Using default start date: {default_start_date}")
-            return default_start_date
-    
-    def detect_new_fields(self, api_record: Dict, table_columns: Set[str]) -> Dict[str, str]:
-        """
-        Detect new fields in API response that don't exist in table.
-        Returns dict mapping API field name to database column name (snake_case).
-        """
-        new_fields = {}
-        
-        # Map API field names to database column names
-        field_mapping = {
-            'ACCUSED_ID': 'accused_id',
-            'CRIME_ID': 'crime_id',
-            'PERSON_ID': 'person_id',
-            'ACCUSED_CODE': 'accused_code',
-            'TYPE': 'type',
-            'SEQ_NUM': 'seq_num',
-            'IS_CCL': 'is_ccl',
-            'ACCUSED_STATUS': 'accused_status',
-            'DATE_CREATED': 'date_created',
-            'DATE_MODIFIED': 'date_modified'
-        }
-        
-        # Physical features mapping
-        physical_features_mapping = {
-            'BEARD': 'beard',
-            'BUILD': 'build',
-            'COLOR': 'color',
-            'EAR': 'ear',
-            'EYES': 'eyes',
-            'FACE': 'face',
-            'HAIR': 'hair',
-            'HEIGHT': 'height',
-            'LEUCODERMA': 'leucoderma',
-            'MOLE': 'mole',
-            'MUSTACHE': 'mustache',
-            'NOSE': 'nose',
-            'TEETH': 'teeth'
-        }
-        
-        # Check main fields
-        for api_field, db_column in field_mapping.items():
-            if api_field in api_record and db_column not in table_columns:
-                new_fields[api_field] = db_column
-        
-        # Check physical features
-        pf = api_record.get('PHYSICAL_FEATURES', {})
-        if isinstance(pf, dict):
-            for api_field, db_column in physical_features_mapping.items():
-                if api_field in pf and db_column not in table_columns:
-                    new_fields[f'PHYSICAL_FEATURES.{api_field}'] = db_column
-        
-        return new_fields
-    
-    def add_column_to_table(self, column_name: str, column_type: str = 'TEXT'):
-        """Add a new column to the accused table."""
-        with self.schema_lock:
-            try:
-                with self.db_pool.get_connection_context() as conn:
-                    cursor = conn.cursor()
-                    # Determine column type based on field name
-                    if 'date' in column_name.lower():
-                        column_type = 'TIMESTAMP'
-                    elif 'id' in column_name.lower() or 'code' in column_name.lower():
-                        column_type = 'VARCHAR(50)'
-                    elif column_name in ('type', 'build', 'color', 'ear', 'eyes', 'face', 'hair', 'nose', 'teeth'):
-                        column_type = 'VARCHAR(255)'
-                    elif column_name == 'height':
-                        column_type = 'VARCHAR(50)'
-                    elif column_name == 'is_ccl' or column_name == 'seq_num':
-                        column_type = 'INTEGER'
-                    else:
-                        column_type = 'VARCHAR(255)'
-                    
-                    alter_sql = f"ALTER TABLE {ACCUSED_TABLE} ADD COLUMN IF NOT EXISTS {column_name} {column_type}"
-                    cursor.execute(alter_sql)
-                    conn.commit()
-                    logger.info(f"✅ Added column {column_name} ({column_type}) to {ACCUSED_TABLE}")
-                    return True
-            except Exception as e:
-                logger.error(f"❌ Error adding column {column_name}: {e}")
-                return False
-    
-    def update_existing_records_with_new_fields(self, new_fields: Dict[str, str], chunk_end_date: str):
-        """
-        Update existing records from start_date to chunk_end_date with new fields.
-        For new fields, set to NULL (they will be updated when those records are processed).
-        """
-        if not new_fields:
-            return
-        
-        try:
-            logger.info(f"📝 New fields detected: {list(new_fields.keys())}")
-            logger.info(f"   Note: Existing records will be updated when processed in future ETL runs")
-            logger.info(f"   New fields are set to NULL for existing records until they are reprocessed")
-        except Exception as e:
-            logger.error(f"❌ Error updating existing records: {e}")
-
-    def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
-        """
-        Generate date ranges in chunks with overlap to ensure no data is missed.
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records.
-        """
-        date_ranges = []
-        current_date = parse_iso_date(start_date).date()
-        end = parse_iso_date(end_date).date()
-
-        while current_date <= end:
-            chunk_end = current_date + timedelta(days=chunk_days - 1)
-            if chunk_end > end:
-                chunk_end = end
-
-            date_ranges.append((
-                current_date.strftime('%Y-%m-%d'),
-                chunk_end.strftime('%Y-%m-%d')
-            ))
-
-            next_start = chunk_end - timedelta(days=overlap_days - 1)
-
-            if chunk_end >= end:
-                break
-
-            current_date = next_start
-
-        return date_ranges
+    def fetch_chunk(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
+        """Fetch accused from API for given date range (logged by the engine)"""
+        rows = self.fetch_accused_api(from_date, to_date)
+        if self.inter_chunk_sleep > 0:
+            time.sleep(self.inter_chunk_sleep)
+        return rows
 
     def fetch_accused_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         url = f"{API_CONFIG['base_url']}/accused"
@@ -608,7 +319,7 @@ class AccusedETL:
         for attempt in range(API_CONFIG['max_retries']):
             try:
                 logger.debug(f"Fetching accused: {from_date} to {to_date} (Attempt {attempt + 1})")
-                resp = requests.get(url, params=params, headers=headers, timeout=API_CONFIG['timeout'])
+                resp = get_api_client().get(url, params=params, headers=headers, timeout=API_CONFIG['timeout'])
                 if resp.status_code == 200:
                     data = resp.json()
                     self.stats['total_api_calls'] += 1
@@ -645,6 +356,9 @@ class AccusedETL:
         logger.error(f"❌ Failed to fetch accused for {from_date} to {to_date}")
         return None
 
+    def describe_api_record(self, accused: Dict) -> str:
+        return f"{accused.get('ACCUSED_ID')} (CRIME_ID: {accused.get('CRIME_ID')}, PERSON_ID: {accused.get('PERSON_ID')})"
+
     def fetch_crime_by_id(self, crime_id: str) -> Optional[Dict]:
         """
         Fetch a single crime record by crime_id using the API endpoint.
@@ -664,7 +378,7 @@ class AccusedETL:
         for attempt in range(API_CONFIG['max_retries']):
             try:
                 logger.debug(f"Fetching crime by crime_id: {crime_id} (Attempt {attempt + 1})")
-                resp = requests.get(url, headers=headers, timeout=API_CONFIG['timeout'])
+                resp = get_api_client().get(url, headers=headers, timeout=API_CONFIG['timeout'])
                 
                 if resp.status_code == 200:
                     data = resp.json()
@@ -702,7 +416,7 @@ class AccusedETL:
         
         logger.error(f"❌ Failed to fetch crime by crime_id {crime_id} after {API_CONFIG['max_retries']} attempts")
         return None
-    
+
     def transform_crime(self, crime_raw: Dict) -> Dict:
         """
         Transform API response to database format
@@ -737,7 +451,7 @@ class AccusedETL:
         }
         logger.trace(f"Transformed crime: {json.dumps(transformed, indent=2, default=str)}")
         return transformed
-    
+
     def insert_crime(self, crime: Dict, conn, cursor) -> Tuple[bool, str]:
         """
         Insert or update single crime into database
@@ -822,7 +536,7 @@ class AccusedETL:
             with self.stats_lock:
                 self.stats['errors'].append(f"Crime {crime_id}: {str(e)}")
             return False, 'error'
-    
+
     def fetch_accused_by_crime_id(self, crime_id: str) -> Optional[List[Dict]]:
         """
         Fetch accused records by crime_id using the fallback API endpoint.
@@ -842,7 +556,7 @@ class AccusedETL:
         for attempt in range(API_CONFIG['max_retries']):
             try:
                 logger.debug(f"Fetching accused by crime_id: {crime_id} (Attempt {attempt + 1})")
-                resp = requests.get(url, headers=headers, timeout=API_CONFIG['timeout'])
+                resp = get_api_client().get(url, headers=headers, timeout=API_CONFIG['timeout'])
                 
                 if resp.status_code == 200:
                     data = resp.json()
@@ -909,7 +623,7 @@ class AccusedETL:
         """Check if accused exists by accused_id"""
         cursor.execute(f"SELECT 1 FROM {ACCUSED_TABLE} WHERE accused_id = %s", (accused_id,))
         return cursor.fetchone() is not None
-    
+
     def accused_exists_by_crime_and_code(self, crime_id: str, accused_code: str, cursor) -> Optional[str]:
         """
         Check if accused exists by (crime_id, accused_code) combination
@@ -928,7 +642,7 @@ class AccusedETL:
         row = cursor.fetchone()
         return row[0] if row else None
 
-    def transform_accused(self, row: Dict) -> Dict:
+    def transform(self, row: Dict) -> Dict:
         """Transform API response to database format"""
         pf = row.get('PHYSICAL_FEATURES') or {}
         
@@ -966,7 +680,7 @@ class AccusedETL:
             'date_created': date_created,  # From API if available
             'date_modified': date_modified  # From API if available
         }
-    
+
     def get_existing_accused(self, accused_id: str, cursor) -> Optional[Dict]:
         """Get existing accused record from database"""
         cursor.execute(f"""
@@ -1006,7 +720,7 @@ class AccusedETL:
                 'date_modified': row[22]
             }
         return None
-    
+
     def log_failed_record(self, accused: Dict, reason: str, error_details: str = ""):
         """Log a failed record to the failed records log file"""
         failed_info = {
@@ -1189,7 +903,7 @@ class AccusedETL:
             conn.rollback()
             logger.error(f"❌ Error inserting fallback accused {accused_id}: {e}")
             return False, f'insert_error: {str(e)}'
-    
+
     def insert_accused(self, accused: Dict, conn, cursor, chunk_date_range: str = "") -> Tuple[bool, str]:
         """
         Insert or update single accused into database with smart update logic
@@ -1217,8 +931,6 @@ class AccusedETL:
             reason = 'missing_accused_id'
             error_details = "Accused record missing ACCUSED_ID"
             logger.warning(f"⚠️  {error_details}")
-            with self.stats_lock:
-                self.stats['total_accused_failed'] += 1
             self.log_failed_record(accused, reason, error_details)
             return False, reason
         
@@ -1227,7 +939,6 @@ class AccusedETL:
             error_details = "Accused record missing CRIME_ID"
             logger.warning(f"⚠️  {error_details}")
             with self.stats_lock:
-                self.stats['total_accused_failed'] += 1
                 self.stats['accused_without_crime'] += 1
             self.log_failed_record(accused, reason, error_details)
             return False, reason
@@ -1245,7 +956,6 @@ class AccusedETL:
                 error_details = f"CRIME_ID {crime_id} not found in {CRIMES_TABLE} table"
                 logger.warning(f"⚠️  {error_details}, skipping accused {accused_id}")
                 with self.stats_lock:
-                    self.stats['total_accused_failed'] += 1
                     self.stats['accused_without_crime'] += 1
                 self.log_failed_record(accused, reason, error_details)
                 return False, reason
@@ -1270,7 +980,6 @@ class AccusedETL:
                         error_details = f"PERSON_ID {person_id} not found and could not create stub: {str(e)}"
                         logger.warning(f"⚠️  {error_details}, skipping accused {accused_id}")
                         with self.stats_lock:
-                            self.stats['total_accused_failed'] += 1
                             self.stats['accused_without_person'] += 1
                         self.log_failed_record(accused, reason, error_details)
                         return False, reason
@@ -1396,8 +1105,6 @@ class AccusedETL:
                         """
                         update_values.append(accused_id)
                         cursor.execute(update_query, tuple(update_values))
-                        with self.stats_lock:
-                            self.stats['total_accused_updated'] += 1
                         logger.debug(f"Updated accused: {accused_id} ({len(changes)} fields changed)")
                         logger.trace(f"Changes: {', '.join(changes)}")
                         # Route ACCUSED_STATUS to other tables
@@ -1409,8 +1116,6 @@ class AccusedETL:
                         # No changes needed for ACCUSED_TABLE, but might need to route ACCUSED_STATUS
                         self.route_accused_status(accused, cursor)
                         conn.commit()
-                        with self.stats_lock:
-                            self.stats['total_accused_no_change'] += 1
                         logger.trace(f"No changes needed for ACCUSED_ID: {accused_id} (all fields match or preserved)")
                         return True, 'no_change'
             else:
@@ -1431,8 +1136,6 @@ class AccusedETL:
                             f"⚠️  seq_num conflict: {seq_num} already exists with accused_id={existing_accused_id}, "
                             f"new accused_id={accused_id}. Skipping insert to preserve unique constraint."
                         )
-                        with self.stats_lock:
-                            self.stats['total_accused_failed'] += 1
                         self.log_failed_record(
                             accused, 'seq_num_conflict',
                             f"seq_num {seq_num} already exists with accused_id={existing_accused_id}"
@@ -1510,8 +1213,6 @@ class AccusedETL:
                     if cursor.rowcount == 0:
                         # No rows affected - might be duplicate or no change
                         if existing_before:
-                            with self.stats_lock:
-                                self.stats['total_accused_no_change'] += 1
                             logger.trace(f"No change for ACCUSED_ID: {accused_id} (already exists with same data)")
                             # Route ACCUSED_STATUS to other tables
                             self.route_accused_status(accused, cursor)
@@ -1528,13 +1229,9 @@ class AccusedETL:
                         # Row was inserted or updated
                         if existing_before:
                             # Record existed before, so this was an update via ON CONFLICT
-                            with self.stats_lock:
-                                self.stats['total_accused_updated'] += 1
                             logger.debug(f"Updated accused via ON CONFLICT: {accused_id}")
                         else:
                             # Record didn't exist before, so this was an insert
-                            with self.stats_lock:
-                                self.stats['total_accused_inserted'] += 1
                             logger.debug(f"Inserted accused: {accused_id}")
                     
                     logger.trace(f"Insert/Update query executed for ACCUSED_ID: {accused_id}")
@@ -1564,8 +1261,6 @@ class AccusedETL:
             reason = 'integrity_error'
             error_details = str(e)
             logger.warning(f"⚠️  Integrity error for accused {accused_id}: {e}")
-            with self.stats_lock:
-                self.stats['total_accused_failed'] += 1
             self.log_failed_record(accused, reason, error_details)
             return False, reason
         except Exception as e:
@@ -1574,264 +1269,41 @@ class AccusedETL:
             error_details = str(e)
             logger.error(f"❌ Error inserting accused {accused_id}: {e}")
             with self.stats_lock:
-                self.stats['total_accused_failed'] += 1
                 self.stats['errors'].append(f"Accused {accused_id}: {str(e)}")
             self.log_failed_record(accused, reason, error_details)
             return False, reason
 
-    def log_api_chunk(self, from_date: str, to_date: str, accused_list: List[Dict], error: Optional[str] = None):
-        """Log API response for a chunk"""
-        chunk_info = {
-            'chunk': f"{from_date} to {to_date}",
-            'timestamp': datetime.now().isoformat(),
-            'total_fetched': len(accused_list),
-            'accused_ids': [a.get('ACCUSED_ID') for a in accused_list],
-            'error': error
-        }
-        
-        self.api_log.write(f"\n{'='*80}\n")
-        self.api_log.write(f"CHUNK: {from_date} to {to_date}\n")
-        self.api_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        self.api_log.write(f"{'-'*80}\n")
-        
-        if error:
-            self.api_log.write(f"ERROR: {error}\n")
-        else:
-            self.api_log.write(f"Total Fetched from API: {len(accused_list)}\n")
-            self.api_log.write(f"\nACCUSED_IDs:\n")
-            for i, accused in enumerate(accused_list, 1):
-                self.api_log.write(f"  {i}. {accused.get('ACCUSED_ID')} (CRIME_ID: {accused.get('CRIME_ID')}, PERSON_ID: {accused.get('PERSON_ID')})\n")
-        
-        # Also write JSON format for easy parsing
-        self.api_log.write(f"\nJSON Format:\n")
-        self.api_log.write(json.dumps(chunk_info, indent=2, ensure_ascii=False, default=str))
-        self.api_log.write(f"\n")
-        self.api_log.flush()
-    
-    def log_db_chunk(self, from_date: str, to_date: str, total_fetched: int,
-                    inserted_ids: List[str], updated_ids: List[str], no_change_ids: List[str],
-                    failed_ids: List[str], failed_reasons: Dict, error: Optional[str] = None):
-        """Log database operations for a chunk"""
-        chunk_info = {
-            'chunk': f"{from_date} to {to_date}",
-            'timestamp': datetime.now().isoformat(),
-            'total_fetched': total_fetched,
-            'inserted_count': len(inserted_ids),
-            'inserted_ids': inserted_ids,
-            'updated_count': len(updated_ids),
-            'updated_ids': updated_ids,
-            'no_change_count': len(no_change_ids),
-            'no_change_ids': no_change_ids,
-            'failed_count': len(failed_ids),
-            'failed_ids': failed_ids,
-            'failed_reasons': failed_reasons,
-            'error': error
-        }
-        
-        self.db_log.write(f"\n{'='*80}\n")
-        self.db_log.write(f"CHUNK: {from_date} to {to_date}\n")
-        self.db_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        self.db_log.write(f"{'-'*80}\n")
-        
-        if error:
-            self.db_log.write(f"ERROR: {error}\n")
-        else:
-            self.db_log.write(f"Total Fetched from API: {total_fetched}\n")
-            self.db_log.write(f"\nINSERTED: {len(inserted_ids)}\n")
-            for i, accused_id in enumerate(inserted_ids, 1):
-                self.db_log.write(f"  {i}. {accused_id}\n")
-            
-            self.db_log.write(f"\nUPDATED: {len(updated_ids)}\n")
-            for i, accused_id in enumerate(updated_ids, 1):
-                self.db_log.write(f"  {i}. {accused_id}\n")
-            
-            self.db_log.write(f"\nNO CHANGE: {len(no_change_ids)}\n")
-            for i, accused_id in enumerate(no_change_ids, 1):
-                self.db_log.write(f"  {i}. {accused_id}\n")
-            
-            self.db_log.write(f"\nFAILED: {len(failed_ids)}\n")
-            if failed_reasons:
-                for reason, ids in failed_reasons.items():
-                    self.db_log.write(f"  Reason: {reason} ({len(ids)})\n")
-                    for i, accused_id in enumerate(ids[:20], 1):  # Show first 20
-                        self.db_log.write(f"    {i}. {accused_id}\n")
-                    if len(ids) > 20:
-                        self.db_log.write(f"    ... and {len(ids) - 20} more\n")
-            
-            # Also write JSON format for easy parsing
-            self.db_log.write(f"\nJSON Format:\n")
-            self.db_log.write(json.dumps(chunk_info, indent=2, ensure_ascii=False))
-            self.db_log.write(f"\n")
-        
-        self.db_log.flush()
+    def upsert_record(self, accused: Dict, chunk_range: str) -> str:
+        """Insert or update one accused on a limiter-gated pooled connection."""
+        # Protected resource access using ConnectionLimiter
+        with self.db_limiter.acquire() as conn:
+            cursor = conn.cursor()
+            _, operation = self.insert_accused(accused, conn, cursor, chunk_range)
+        return operation
 
-    def process_date_range(self, from_date: str, to_date: str, table_columns: Set[str] = None):
-        """Process accused for a specific date range"""
-        chunk_range = f"{from_date} to {to_date}"
-        logger.info(f"📅 Processing: {chunk_range}")
-        
-        # Fetch accused from API
-        accused_raw = self.fetch_accused_api(from_date, to_date)
-        
-        if accused_raw is None:
-            logger.error(f"❌ Failed to fetch accused for {chunk_range}")
-            self.log_api_chunk(from_date, to_date, [], error="API fetch failed")
-            self.log_db_chunk(from_date, to_date, 0, [], [], [], [], {}, error="API fetch failed")
-            return
-        
-        if not accused_raw:
-            logger.info(f"ℹ️  No accused found for {chunk_range}")
-            self.log_api_chunk(from_date, to_date, [])
-            self.log_db_chunk(from_date, to_date, 0, [], [], [], [], {}, error="No accused in API response")
+    def after_chunk(self, from_date: str, to_date: str, accused_by_id: Dict[str, Dict], operations: Dict[str, str]):
+        """
+        Invalidate Branch C processing-log entries for crimes that now have real
+        accused records.  Brief_facts_ai will re-run those crimes on its next batch,
+        promoting the LLM-only rows to proper Branch A/B rows with relational identity.
+        """
+        inserted_crime_ids = {
+            accused_by_id[accused_id].get('crime_id')
+            for accused_id, operation in operations.items()
+            if operation == 'inserted' and accused_by_id[accused_id].get('crime_id')
+        }
+        if not inserted_crime_ids:
             return
-        
-        # Check for schema evolution if we got data
-        if table_columns is not None and len(accused_raw) > 0:
-            # Check for new fields in first record
-            new_fields = self.detect_new_fields(accused_raw[0], table_columns)
-            if new_fields:
-                logger.info(f"🔍 New fields detected in API response: {list(new_fields.keys())}")
-                # Add new columns to table
-                for api_field, db_column in new_fields.items():
-                    if self.add_column_to_table(db_column):
-                        # Update table_columns set
-                        table_columns.add(db_column)
-                # Update existing records from start_date to current chunk end_date
-                self.update_existing_records_with_new_fields(new_fields, to_date)
-        
-        # Log API response
-        self.log_api_chunk(from_date, to_date, accused_raw)
-        
-        # Transform and insert each accused
-        self.stats['total_accused_fetched'] += len(accused_raw)
-        logger.trace(f"Processing {len(accused_raw)} accused for chunk {chunk_range}")
-        
-        # Track operations for this chunk
-        inserted_ids = []
-        updated_ids = []
-        no_change_ids = []
-        failed_ids = []
-        failed_reasons = {}
-        duplicates_in_chunk = []
-        # crime_ids of newly inserted accused rows — used to invalidate Branch C logs
-        inserted_crime_ids = set()
-        
-        # Track accused_ids seen in this chunk to detect duplicates (for reporting only, not skipping)
-        seen_accused_ids = {}
-        accused_id_occurrences = {}  # Track how many times each accused_id appears
-        
-        logger.trace(f"Starting to process records for chunk: {chunk_range} concurrently")
-        
-        def process_row(accused_raw_row, chunk_range):
-            # Protected resource access using ConnectionLimiter
-            with self.db_limiter.acquire() as conn:
-                cursor = conn.cursor()
-                accused = self.transform_accused(accused_raw_row)
-                accused_id = accused.get('accused_id')
-                if not accused_id:
-                    with self.stats_lock:
-                        self.stats['total_accused_failed'] += 1
-                    return {'accused_id': None, 'operation': 'missing_accused_id', 'success': False, 'crime_id': accused.get('crime_id'), 'person_id': accused.get('person_id')}
-                success, operation = self.insert_accused(accused, conn, cursor, chunk_range)
-                return {'accused_id': accused_id, 'operation': operation, 'success': success, 'crime_id': accused.get('crime_id'), 'person_id': accused.get('person_id')}
-
-        # Scale concurrency for 64GB server; default to 8 workers per chunk
-        requested_workers = get_int_env('MAX_WORKERS', 8)
-        # Guardrail: don't allow row-level concurrency to exceed pool capacity.
-        # This prevents psycopg2.pool.PoolError: Connection pool exhausted under load.
-        pool_maxconn = getattr(self.db_pool, 'maxconn', None)
-        if isinstance(pool_maxconn, int) and pool_maxconn > 0:
-            max_workers = max(1, min(requested_workers, max(1, pool_maxconn - 2)))
-            if max_workers != requested_workers:
-                logger.warning(
-                    f"⚠️  Capping MAX_WORKERS from {requested_workers} to {max_workers} "
-                    f"to fit DB pool capacity (maxconn={pool_maxconn})."
-                )
-        else:
-            max_workers = requested_workers
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_row = {executor.submit(process_row, row, chunk_range): row for row in accused_raw}
-            for future in as_completed(future_to_row):
-                try:
-                    res = future.result()
-                    accused_id = res['accused_id']
-                    operation = res['operation']
-                    success = res['success']
-                    
-                    if not accused_id:
-                        failed_ids.append(None)
-                        if operation not in failed_reasons:
-                            failed_reasons[operation] = []
-                        failed_reasons[operation].append(None)
-                        continue
-                        
-                    # Track occurrences for duplicate reporting
-                    with self.stats_lock:
-                        if accused_id in seen_accused_ids:
-                            occurrence_count = accused_id_occurrences.get(accused_id, 1) + 1
-                            accused_id_occurrences[accused_id] = occurrence_count
-                            duplicates_in_chunk.append({
-                                'accused_id': accused_id,
-                                'crime_id': res.get('crime_id'),
-                                'person_id': res.get('person_id'),
-                                'occurrence': occurrence_count,
-                                'first_seen_in': seen_accused_ids[accused_id],
-                                'duplicate_in': chunk_range
-                            })
-                            self.stats['total_duplicates'] += 1
-                            logger.trace(f"Duplicate details - First seen: {seen_accused_ids[accused_id]}, Current occurrence: {occurrence_count}")
-                        else:
-                            seen_accused_ids[accused_id] = chunk_range
-                            accused_id_occurrences[accused_id] = 1
-                            logger.trace(f"New ACCUSED_ID seen: {accused_id} in chunk {chunk_range}")
-
-                    if success:
-                        if operation == 'inserted':
-                            if accused_id not in inserted_ids:
-                                inserted_ids.append(accused_id)
-                            cid = res.get('crime_id')
-                            if cid:
-                                inserted_crime_ids.add(cid)
-                        elif operation == 'updated':
-                            updated_ids.append(accused_id)
-                        elif operation == 'no_change':
-                            if accused_id not in no_change_ids:
-                                no_change_ids.append(accused_id)
-                    else:
-                        failed_ids.append(accused_id)
-                        if operation not in failed_reasons:
-                            failed_reasons[operation] = []
-                        failed_reasons[operation].append(accused_id)
-                except Exception as exc:
-                    logger.error(f"Record generated an exception: {exc}")
-        
-        # Log duplicates for this chunk (for reporting, but they were all processed)
-        if duplicates_in_chunk:
-            logger.info(f"📊 Found {len(duplicates_in_chunk)} duplicate occurrences in chunk {chunk_range} - All were processed for potential updates")
-            logger.trace(f"Duplicate details: {duplicates_in_chunk}")
-        
-        # Log database operations for this chunk
-        logger.trace(f"Chunk summary - Inserted: {len(inserted_ids)}, Updated: {len(updated_ids)}, No Change: {len(no_change_ids)}, Failed: {len(failed_ids)}, Duplicates: {len(duplicates_in_chunk)}")
-        self.log_db_chunk(from_date, to_date, len(accused_raw), inserted_ids, updated_ids, 
-                         no_change_ids, failed_ids, failed_reasons)
-        
-        logger.info(f"✅ Completed: {chunk_range} - Inserted: {len(inserted_ids)}, Updated: {len(updated_ids)}, No Change: {len(no_change_ids)}, Failed: {len(failed_ids)}, Duplicates: {len(duplicates_in_chunk)}")
-        logger.trace(f"Chunk processing complete for {chunk_range}")
-
-        # Invalidate Branch C processing-log entries for crimes that now have real
-        # accused records.  Brief_facts_ai will re-run those crimes on its next batch,
-        # promoting the LLM-only rows to proper Branch A/B rows with relational identity.
-        if inserted_crime_ids:
-            try:
-                from brief_facts_accused.db import invalidate_branch_c_log_for_crimes
-                with self.db_pool.get_connection_context() as _inv_conn:
-                    invalidate_branch_c_log_for_crimes(_inv_conn, list(inserted_crime_ids))
-                    _inv_conn.commit()
-            except Exception as _inv_err:
-                logger.warning(
-                    f"Branch C invalidation skipped for chunk {chunk_range}: {_inv_err} "
-                    "(non-fatal — brief_facts_ai will re-detect via date_modified)"
-                )
+        try:
+            from brief_facts_accused.db import invalidate_branch_c_log_for_crimes
+            with self.db_pool.get_connection_context() as _inv_conn:
+                invalidate_branch_c_log_for_crimes(_inv_conn, list(inserted_crime_ids))
+                _inv_conn.commit()
+        except Exception as _inv_err:
+            logger.warning(
+                f"Branch C invalidation skipped for chunk {from_date} to {to_date}: {_inv_err} "
+                "(non-fatal — brief_facts_ai will re-detect via date_modified)"
+            )
 
     def write_log_summaries(self):
         """Write summary sections to log files"""
@@ -1883,70 +1355,21 @@ class AccusedETL:
             return False
         
         try:
-            self.ensure_run_state_table()
-
             # Strict incremental mode: always use dynamic resume + automatic end date
             if RUN_MODE != 1:
                 logger.warning("⚠️ ACCUSED_RUN_MODE!=1 ignored. Enforcing strict incremental mode.")
 
+            # Table watermark, or the etl_run_state checkpoint when that is later
             effective_start_date = self.get_effective_start_date()
-            checkpoint_date = self.get_run_checkpoint('accused')
-            if checkpoint_date:
-                checkpoint_iso = checkpoint_date if isinstance(checkpoint_date, str) else checkpoint_date.isoformat()
-                if parse_iso_date(checkpoint_iso) > parse_iso_date(effective_start_date):
-                    effective_start_date = checkpoint_iso
-
             calculated_end_date = get_yesterday_end_ist()
             logger.info(f"🔄 Incremental Mode: Fetching data from {effective_start_date} to {calculated_end_date}")
-            
-            # Get table columns for schema evolution
-            table_columns = self.get_table_columns(ACCUSED_TABLE)
-            logger.debug(f"Existing table columns: {sorted(table_columns)}")
-            
-            ranges = self.generate_date_ranges(
-                effective_start_date, 
-                calculated_end_date, 
-                ETL_CONFIG['chunk_days'],
-                ETL_CONFIG.get('chunk_overlap_days', 1)  # Default to 1 day overlap for safety
-            )
-            
-            logger.info(f"Date Range: {effective_start_date} to {calculated_end_date}")
-            overlap_days = ETL_CONFIG.get('chunk_overlap_days', 1)
-            logger.info(f"Chunk Size: {ETL_CONFIG['chunk_days']} days (overlap: {overlap_days} day(s) to ensure no data loss)")
-            logger.info("=" * 80)
-            
-            logger.info(f"📊 Total date ranges to process: {len(ranges)}")
             logger.info(f"ℹ️  Expected Total from API Team: 22423 (insert + update records)")
-            logger.info("")
-            
-            # Chunk-level parallelism - defaults to 4 for DB connection safety
-            # Safe default: 4 chunks × 4 workers = 16 concurrent threads
-            # Can override: ACCUSED_CHUNK_WORKERS=8 MAX_WORKERS=8 for higher throughput if DB allows
-            chunk_workers = get_int_env('ACCUSED_CHUNK_WORKERS', 4)
-            inter_chunk_sleep = get_float_env('ACCUSED_INTER_CHUNK_SLEEP', 0.0)
 
-            if chunk_workers <= 1:
-                for fd, td in tqdm(ranges, desc="Processing date ranges", unit="range"):
-                    self.process_date_range(fd, td, table_columns)
-                    if inter_chunk_sleep > 0:
-                        time.sleep(inter_chunk_sleep)
-            else:
-                logger.info(f"🚀 Starting parallel chunk processing with {chunk_workers} workers")
-                with ThreadPoolExecutor(max_workers=chunk_workers) as executor:
-                    future_to_range = {
-                        executor.submit(self.process_date_range, fd, td, table_columns): (fd, td)
-                        for fd, td in ranges
-                    }
-                    with tqdm(total=len(ranges), desc="Processing date ranges", unit="range") as pbar:
-                        for future in as_completed(future_to_range):
-                            fd, td = future_to_range[future]
-                            try:
-                                future.result()
-                            except Exception as exc:
-                                logger.error(f"Chunk failed {fd} to {td}: {exc}")
-                                with self.stats_lock:
-                                    self.stats['errors'].append(f"Chunk failed {fd} to {td}: {exc}")
-                            pbar.update(1)
+            self.table_columns = self.get_table_columns()
+            logger.debug(f"Existing table columns: {sorted(self.table_columns)}")
+
+            # The checkpoint only advances when every chunk loaded
+            self.run_chunks(calculated_end_date, effective_start_date)
 
             # Get database counts
             with self.db_pool.get_connection_context() as conn:
@@ -2013,7 +1436,6 @@ class AccusedETL:
             
             # Write summary to log files
             self.write_log_summaries()
-            self.update_run_checkpoint('accused', calculated_end_date)
             
             logger.info("✅ ETL Pipeline completed successfully!")
             logger.info(f"📝 API chunk log saved to: {self.api_log_file}")
@@ -2034,7 +1456,6 @@ class AccusedETL:
             self.close_chunk_loggers()
             self.close_db()
 
-
 def main():
     etl = AccusedETL()
     success = etl.run()
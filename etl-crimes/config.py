@@ -69,7 +69,13 @@ ETL_CONFIG = {
     'end_date': get_etl_end_date(),  # Fixed during backfill, dynamic after
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
+    # Chunks fetched ahead of the DB load (bounded queue) and concurrent API fetchers
+    # (0 = one fetcher per load worker, the API concurrency of the old per-chunk workers)
+    'prefetch_depth': get_int_env('API_PREFETCH_DEPTH', 2),
+    'fetch_workers': get_int_env('API_FETCH_WORKERS', 0),
     'batch_size': 100,
+    # Stage each chunk into one set-based UPSERT instead of one round trip + commit per crime
+    'bulk_upsert': get_bool_env('CRIMES_BULK_UPSERT', True),
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
 
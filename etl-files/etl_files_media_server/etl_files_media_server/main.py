@@ -24,8 +24,15 @@ Key behavior:
     interrogation/INTERROGATION_REPORT -> interrogations/interrogationreport/
     interrogation/DOPAMS_DATA       -> interrogations/dopamsdata/
 - File name: {file_id}.{ext}, where ext is derived from Content-Type (fallback: .pdf).
-- Idempotency on disk: if file already exists, it is skipped.
-- Files API rate limit: 10 requests per minute (enforced by sleeping between requests).
+- Idempotency on disk: if file already exists, it is skipped (checked before any API request
+  for the known extensions).
+- Files API rate limit: FILES_API_MAX_RPM requests per minute, enforced by one token bucket
+  shared by all concurrent downloads (FILES_DOWNLOAD_CONCURRENCY, default 4).
+- Downloads stream into {file_id}.part with large buffers and are atomically renamed into place;
+  an interrupted .part is resumed with an HTTP Range request on the next attempt.
+- Tracking columns are updated by DownloadStatusWriter: outcomes are journaled to an append-only
+  file (FILES_STATUS_JOURNAL) and written in batches with one UPDATE ... FROM (VALUES ...) every
+  FILES_STATUS_FLUSH_ROWS files / FILES_STATUS_FLUSH_SECONDS, instead of two commits per file.
 
 FIX LOG:
 - BUG FIX: download_attempts was being incremented TWICE on a successful download:
@@ -33,24 +40,34 @@ FIX LOG:
     Fixed by removing the increment from _mark_as_downloaded entirely.
     download_attempts is now only incremented once, at the start of each attempt, accurately
     reflecting the real number of attempts made.
+- download_attempts is now added in the batched status update as the number of GETs sent
+  for the file (no separate UPDATE + commit before each attempt).
 """
 
 from __future__ import annotations
 
 import os
 import sys
+import json
 import time
+import asyncio
 import logging
 import argparse
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import psycopg2
+from psycopg2.extras import execute_values
 import requests
+from requests.adapters import HTTPAdapter
 import colorlog
-from env_utils import first_env, get_bool_env, get_int_env
+from env_utils import first_env, get_bool_env, get_float_env, get_int_env
+from api_client import parse_retry_after
 
 # Allow running this file directly as a script as well as via `python -m`.
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -72,9 +89,31 @@ FILES_TABLE = first_env("FILES_TABLE", default="files")
 # Base path on the Tomcat media server - ALWAYS read from env
 BASE_MEDIA_PATH = first_env("FILES_MEDIA_BASE_PATH", default="/mnt/shared-etl-files")
 
-# Files API rate limit: reduced to 5 requests per minute to avoid connection blocking
-FILES_API_MAX_RPM = 5
-SECONDS_PER_REQUEST = 60.0 / FILES_API_MAX_RPM  # 12.0 seconds
+# Files API rate limit: 5 requests per minute by default to avoid connection blocking
+FILES_API_MAX_RPM = max(1, get_int_env("FILES_API_MAX_RPM", 5))
+SECONDS_PER_REQUEST = 60.0 / FILES_API_MAX_RPM  # 12.0 seconds at the default
+
+# Downloads in flight at once (all against the files API host; also its connection pool size)
+DOWNLOAD_CONCURRENCY = max(1, get_int_env("FILES_DOWNLOAD_CONCURRENCY", 4))
+
+# Read / write buffer for streamed downloads
+DOWNLOAD_CHUNK_BYTES = max(64 * 1024, get_int_env("FILES_DOWNLOAD_CHUNK_BYTES", 1024 * 1024))
+
+# Tracking-column updates are written once this many files have finished (or this many seconds passed)
+STATUS_FLUSH_ROWS = max(1, get_int_env("FILES_STATUS_FLUSH_ROWS", 200))
+STATUS_FLUSH_SECONDS = get_float_env("FILES_STATUS_FLUSH_SECONDS", 30.0)
+
+# Append-only journal of outcomes not yet written to the DB (replayed on the next run after a crash).
+# Kept with the downloaded media as run-independent state, not in the source tree or a log directory.
+STATUS_JOURNAL_PATH = first_env(
+    "FILES_STATUS_JOURNAL", default=os.path.join(BASE_MEDIA_PATH, ".etl_state", "files_download_status.journal")
+)
+
+# In-progress downloads live next to their destination as {file_id}.part
+PARTIAL_SUFFIX = ".part"
+
+# Extensions produced by extension_from_response() from Content-Type
+KNOWN_EXTENSIONS = (".pdf", ".jpg", ".png", ".gif", ".mp4", ".webp")
 
 # Hard cap to avoid retrying permanently bad file_ids forever across runs.
 MAX_TOTAL_ATTEMPTS = get_int_env("FILES_MAX_TOTAL_ATTEMPTS", 5)
@@ -271,6 +310,21 @@ def ensure_directory(path: str) -> None:
             os.makedirs(path, exist_ok=True)
 
 
+def find_existing_download(dest_dir: str, file_id: str) -> Optional[str]:
+    """
+    Return the path of a completed, non-empty download of file_id in dest_dir, if any.
+    Empty leftovers are removed so they are downloaded again.
+    """
+    for ext in KNOWN_EXTENSIONS:
+        path = os.path.join(dest_dir, f"{file_id}{ext}")
+        if os.path.exists(path):
+            if os.path.getsize(path) > 0:
+                return path
+            logger.warning(f"⚠️  File {path} exists but is 0 bytes. Re-downloading...")
+            os.remove(path)
+    return None
+
+
 def build_destination_path(file_id: str, source_type: str, source_field: str, resp: requests.Response) -> Optional[str]:
     """
     Build the absolute destination path for a file.
@@ -286,6 +340,243 @@ def build_destination_path(file_id: str, source_type: str, source_field: str, re
     return os.path.join(dest_dir, f"{file_id}{ext}")
 
 
+# -----------------------------------------------------------------------------
+# Download engine helpers
+# -----------------------------------------------------------------------------
+
+@dataclass
+class DownloadResult:
+    """Outcome of one GET: downloaded | exists | failed (terminal) | retry (transient)."""
+
+    status: str
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+    path: Optional[str] = None
+    size: int = 0
+    resumed_from: int = 0
+
+
+class AsyncTokenBucket:
+    """
+    Request pacing shared by every download task in the event loop.
+
+    Capacity 1 keeps the old strict spacing (no bursts): one request every
+    60 / rate_per_minute seconds. pause() holds back all tasks (Retry-After).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1) -> None:
+        self.interval = 60.0 / rate_per_minute
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.interval)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class DownloadStatusWriter:
+    """
+    Buffered, crash-safe writer for the download tracking columns.
+
+    record() only queues the outcome, so the download coroutines never wait on disk or DB
+    I/O. A dedicated writer thread takes every queued outcome at once, appends the group to
+    an append-only journal with a single fsync, and buffers it. When the buffer is full or
+    old enough it writes the whole buffer with a single UPDATE ... FROM (VALUES ...) and one
+    commit, then truncates the journal. Outcomes still in the journal when the process dies
+    are replayed by open() on the next run; outcomes queued but not yet journaled are lost,
+    and those files are simply looked at again on the next run.
+
+    Outcomes for the same file_id are merged (attempts summed, last outcome wins). A crash
+    between the commit and the journal truncate replays that batch once more, which can
+    over-count download_attempts for those files by one batch.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        conn,
+        cursor,
+        journal_path: str = STATUS_JOURNAL_PATH,
+        file_id_type: str = "uuid",
+        flush_rows: int = STATUS_FLUSH_ROWS,
+        flush_seconds: float = STATUS_FLUSH_SECONDS,
+    ) -> None:
+        self.conn = conn
+        self.cursor = cursor
+        self.journal_path = journal_path
+        self.flush_rows = max(1, flush_rows)
+        self.flush_seconds = flush_seconds
+        self.template = f"(%s::{file_id_type}, %s::integer, %s::boolean, %s::text)"
+        self._buffer: Dict[str, List] = {}
+        self._journal = None
+        self._last_flush = time.monotonic()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.flushed_rows = 0
+
+    def open(self) -> int:
+        """Replay outcomes left over from a previous run, open the journal and start the writer thread."""
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._merge(entry["file_id"], entry["attempts"], entry["success"], entry.get("error"))
+                        replayed += 1
+                    except (ValueError, KeyError, TypeError):
+                        # Torn last line from a crash mid-write
+                        continue
+        journal_dir = os.path.dirname(self.journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if replayed:
+            logger.info(f"📒 Replaying {replayed} unflushed download statuses from {self.journal_path}")
+            self._flush()
+        self._thread = threading.Thread(target=self._run, name="files-status-writer", daemon=True)
+        self._thread.start()
+        return replayed
+
+    def _merge(self, file_id: str, attempts: int, success: bool, error_msg: Optional[str]) -> None:
+        entry = self._buffer.get(file_id)
+        if entry is None:
+            self._buffer[file_id] = [attempts, success, error_msg]
+        else:
+            entry[0] += attempts
+            entry[1] = success
+            entry[2] = error_msg
+
+    def record(self, file_id: str, attempts: int, success: bool, error_msg: Optional[str] = None) -> None:
+        """Queue one outcome for the writer thread (returns immediately)."""
+        error_msg = None if success else (error_msg or "Download failed")
+        outcome = (file_id, attempts, success, error_msg)
+        if self._thread is None:
+            # Not opened: no writer thread, write in the caller
+            self._apply([outcome])
+        else:
+            self._queue.put(outcome)
+
+    def _run(self) -> None:
+        """Writer thread: journal queued outcomes group by group and flush them to the DB."""
+        while True:
+            timeout = max(0.1, self.flush_seconds - (time.monotonic() - self._last_flush))
+            try:
+                items = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Everything already queued goes into this group (one journal fsync for all of it)
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            outcomes = [item for item in items if isinstance(item, tuple)]
+            requests = [item for item in items if not isinstance(item, tuple)]
+            try:
+                self._apply(outcomes)
+            except Exception as exc:
+                logger.error(f"❌ Download status writer failed for {len(outcomes)} outcomes: {exc}")
+
+            for request in requests:
+                if request is not self._STOP:
+                    done, result = request
+                    result.append(self._flush())
+                    done.set()
+            if any(request is self._STOP for request in requests):
+                return
+
+    def _apply(self, outcomes: List[Tuple]) -> None:
+        """Journal (one fsync) and buffer a group of outcomes; flush when the batch is full or old enough."""
+        if outcomes and self._journal is not None:
+            self._journal.write("".join(
+                json.dumps({"file_id": file_id, "attempts": attempts, "success": success, "error": error_msg}) + "\n"
+                for file_id, attempts, success, error_msg in outcomes
+            ))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        for outcome in outcomes:
+            self._merge(*outcome)
+        if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self._flush()
+
+    def flush(self) -> bool:
+        """Write everything recorded so far to the DB; waits for the writer thread to do it."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._flush()
+        done, result = threading.Event(), []
+        self._queue.put([done, result])
+        done.wait()
+        return result[0]
+
+    def _flush(self) -> bool:
+        """Write buffered outcomes in one statement. On failure they stay buffered (and journaled)."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return True
+        rows = [(file_id, *entry) for file_id, entry in self._buffer.items()]
+        update_sql = f"""
+            UPDATE {FILES_TABLE} AS f
+            SET download_attempts = COALESCE(f.download_attempts, 0) + v.attempts,
+                is_downloaded = v.success,
+                downloaded_at = CASE WHEN v.success THEN CURRENT_TIMESTAMP ELSE f.downloaded_at END,
+                download_error = v.error
+            FROM (VALUES %s) AS v(file_id, attempts, success, error)
+            WHERE f.file_id = v.file_id
+        """
+        try:
+            execute_values(self.cursor, update_sql, rows, template=self.template, page_size=len(rows))
+            self.conn.commit()
+        except Exception as exc:
+            logger.warning(f"⚠️  Failed to update download status for {len(rows)} files (kept in journal): {exc}")
+            self.conn.rollback()
+            return False
+
+        self._buffer.clear()
+        self.flushed_rows += len(rows)
+        if self._journal is not None:
+            self._journal.seek(0)
+            self._journal.truncate()
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        return True
+
+    def close(self) -> None:
+        """Stop the writer thread and flush; the journal file is removed only if everything reached the DB."""
+        if self._thread is not None:
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+        flushed = self._flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            if flushed:
+                try:
+                    os.remove(self.journal_path)
+                except OSError:
+                    pass
+
+
 # -----------------------------------------------------------------------------
 # Core ETL class
 # -----------------------------------------------------------------------------
@@ -297,10 +588,18 @@ class FilesMediaServerETL:
         self.db_conn: Optional[psycopg2.extensions.connection] = None
         self.db_cursor: Optional[psycopg2.extensions.cursor] = None
         self.repair = repair
-        # Strict global API pacing gate: every HEAD/GET must pass through this.
-        # This prevents bursts even in fast sequential code paths.
-        self._api_rate_lock = threading.Lock()
-        self._last_api_request_ts = 0.0
+        # Download engine state: one keep-alive pool shared by the per-thread sessions,
+        # the shared rate limiter (created inside the event loop) and queued status updates.
+        self._http_adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=DOWNLOAD_CONCURRENCY,
+            pool_block=True,
+            max_retries=0,
+        )
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._rate_limiter: Optional[AsyncTokenBucket] = None
+        self.status_writer: Optional[DownloadStatusWriter] = None
         self.stats = {
             "total_rows": 0,
             "total_with_file_id": 0,
@@ -311,6 +610,7 @@ class FilesMediaServerETL:
             "skipped_null_file_id": 0,
             "skipped_already_downloaded": 0,
             "skipped_exists_on_disk": 0,
+            "resumed_partial": 0,
             "resumed_from": None,
         }
 
@@ -397,6 +697,24 @@ class FilesMediaServerETL:
             self.db_conn.rollback()
             return False
 
+    def get_file_id_type(self) -> str:
+        """SQL type of FILES_TABLE.file_id, used to cast the batched status VALUES (default uuid)."""
+        try:
+            self.db_cursor.execute(
+                """
+                SELECT format_type(a.atttypid, a.atttypmod)
+                FROM pg_attribute a
+                WHERE a.attrelid = %s::regclass AND a.attname = 'file_id' AND NOT a.attisdropped
+                """,
+                (FILES_TABLE,),
+            )
+            row = self.db_cursor.fetchone()
+            return row[0] if row and row[0] else "uuid"
+        except Exception as exc:
+            logger.warning(f"⚠️  Could not determine file_id column type, assuming uuid: {exc}")
+            self.db_conn.rollback()
+            return "uuid"
+
     def get_last_processed_date_per_source_type(self) -> dict:
         """
         Get the last processed date per source_type (for informational logging only).
@@ -523,330 +841,260 @@ class FilesMediaServerETL:
     # HTTP / download helpers
     # -------------------------------------------------------------------------
 
-    def _wait_for_request_slot(self) -> None:
-        """
-        Strict pacing: allow only one API request every SECONDS_PER_REQUEST.
-
-        This is enforced before EVERY outbound HEAD/GET call so we do not rely
-        on loop speed or sequential execution behavior.
-        """
-        with self._api_rate_lock:
-            now = time.time()
-            wait_for = (self._last_api_request_ts + SECONDS_PER_REQUEST) - now
-            if wait_for > 0:
-                time.sleep(wait_for)
-            self._last_api_request_ts = time.time()
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread session; all sessions share one keep-alive pool to the files API."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._http_adapter)
+            session.mount("https://", self._http_adapter)
+            self._local.session = session
+        return session
 
     def build_file_url(self, file_id: str) -> str:
         """Build the files API URL for a given file_id."""
         return f"{FILES_BASE_URL}/{file_id}"
 
-    def check_file_exists(self, file_id: str) -> Tuple[bool, Optional[str]]:
+    @staticmethod
+    def prepare_destination(file_id: str, source_type: str, source_field: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve the destination directory before any API request is made.
+        Returns (dest_dir, existing_path); dest_dir is None if the combination is unsupported.
         """
-        Check if file exists using HEAD request (faster than full download).
-        Returns: (exists: bool, error_message: Optional[str])
+        subdir = map_destination_subdir(source_type, source_field)
+        if subdir is None:
+            return None, None
+        dest_dir = os.path.join(BASE_MEDIA_PATH, subdir)
+        ensure_directory(dest_dir)
+        return dest_dir, find_existing_download(dest_dir, file_id)
+
+    def fetch_to_disk(self, file_id: str, source_type: str, source_field: str, dest_dir: str) -> DownloadResult:
         """
-        url = self.build_file_url(file_id)
+        One GET for file_id, streamed into {file_id}.part and atomically renamed into place.
+
+        A leftover .part from an interrupted attempt is resumed with an HTTP Range request;
+        if the server ignores the range (200) the file is rewritten from the start.
+        The GET also answers the existence question (400/404 -> PERMANENT), so no HEAD is sent.
+        Runs in a worker thread; exceptions propagate to the retry loop in download_file().
+        """
+        part_path = os.path.join(dest_dir, f"{file_id}{PARTIAL_SUFFIX}")
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
         headers = {"x-api-key": API_CONFIG["api_key"]}
-        
-        # Retry logic for existence check to handle transient connection errors
-        for attempt in range(1, 4):
-            try:
-                # Enforce strict request pacing for every HEAD call.
-                self._wait_for_request_slot()
-                response = requests.head(
-                    url,
-                    headers=headers,
-                    timeout=API_CONFIG.get("timeout", 30),
-                    allow_redirects=True
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        with self.session.get(
+            self.build_file_url(file_id),
+            headers=headers,
+            timeout=API_CONFIG["timeout"],
+            stream=True,
+        ) as resp:
+            if resp.status_code == 416:
+                # Stale partial (file changed or already complete upstream): start over
+                os.remove(part_path)
+                return DownloadResult("retry", error="HTTP 416 Range Not Satisfiable - partial file discarded")
+
+            if resp.status_code in (200, 206):
+                resumed = (
+                    offset > 0
+                    and resp.status_code == 206
+                    and resp.headers.get("Content-Range", "").startswith(f"bytes {offset}-")
                 )
+                if not resumed:
+                    offset = 0
+                dest_path = build_destination_path(file_id, source_type, source_field, resp)
 
-                if response.status_code == 200:
-                    return (True, None)
-                elif response.status_code == 404:
-                    return (False, "PERMANENT: HTTP 404 Not Found - File does not exist")
-                elif response.status_code == 400:
-                    return (False, "PERMANENT: HTTP 400 Bad Request - File does not exist or invalid file_id")
-                elif response.status_code == 429:
-                    # Rate limited, wait and retry
-                    time.sleep(SECONDS_PER_REQUEST * attempt)
-                    continue
-                elif response.status_code in (401, 403):
-                    return (False, f"HTTP {response.status_code} - Authentication/Authorization failed")
-                else:
-                    return (True, None)
+                if os.path.exists(dest_path) and os.path.getsize(dest_path) > 0:
+                    return DownloadResult("exists", path=dest_path, size=os.path.getsize(dest_path))
 
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exc:
-                if attempt < 3:
-                    logger.warning(f"⚠️  Existence check attempt {attempt} failed for {file_id}: {exc}. Retrying...")
-                    time.sleep(SECONDS_PER_REQUEST * attempt)
-                    continue
-                return (False, f"Connection error after {attempt} attempts: {str(exc)}")
-            except Exception as exc:
-                return (False, f"Error checking file: {str(exc)}")
-        
-        return (False, "Failed to check existence after retries")
+                try:
+                    with open(part_path, "ab" if resumed else "wb", buffering=DOWNLOAD_CHUNK_BYTES) as f:
+                        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                            if chunk:
+                                f.write(chunk)
+                    os.chmod(part_path, 0o644)
+                    os.replace(part_path, dest_path)
+                except PermissionError as e:
+                    logger.error(f"❌ Permission denied writing file {dest_path}: {e}")
+                    logger.error(f"   Directory: {dest_dir}")
+                    logger.error(f"   Directory writable: {os.access(dest_dir, os.W_OK)}")
+                    logger.error(f"   Current user: {first_env('USER', default='unknown')}")
+                    logger.error(f"   Current UID: {os.getuid()}")
+                    logger.error(f"   Solution: Run chmod -R 777 {BASE_MEDIA_PATH}")
+                    raise
 
-    def download_single_file(
-        self,
-        file_id: str,
-        source_type: str,
-        source_field: str,
-    ) -> bool:
-        """
-        Download a single file by its metadata.
+                return DownloadResult(
+                    "downloaded", path=dest_path, size=os.path.getsize(dest_path), resumed_from=offset
+                )
+
+            if resp.status_code == 429 or 500 <= resp.status_code < 600:
+                return DownloadResult(
+                    "retry",
+                    error=f"HTTP {resp.status_code}",
+                    retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+                )
+
+            try:
+                error_body = resp.text[:200].replace("'", "''")
+            except Exception:
+                error_body = "Could not read response body"
+
+            if resp.status_code == 400:
+                error_msg = f"PERMANENT: HTTP 400 Bad Request - {error_body}"
+            elif resp.status_code == 404:
+                error_msg = f"PERMANENT: HTTP 404 Not Found - {error_body}"
+            elif resp.status_code == 401:
+                error_msg = f"HTTP 401 Unauthorized - {error_body}"
+            elif resp.status_code == 403:
+                error_msg = f"HTTP 403 Forbidden - {error_body}"
+            else:
+                error_msg = f"HTTP {resp.status_code} - {error_body}"
+            return DownloadResult("failed", error=error_msg)
+
+    async def _run_blocking(self, func, *args):
+        """Run blocking disk / HTTP work on the download thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
 
-        FIX: download_attempts is now incremented ONCE per attempt at the start
-        of each retry loop iteration. It is NOT incremented again in
-        _mark_as_downloaded(). This gives an accurate count of real attempts made.
+    async def download_file(self, file_id: str, source_type: str, source_field: str) -> bool:
         """
-        logger.info(f"🔍 Checking if file exists: file_id={file_id}")
-        exists, check_error = self.check_file_exists(file_id)
+        Download a single file, retrying transient failures.
 
-        if not exists and check_error:
-            logger.error(
-                f"❌ File does not exist for file_id={file_id}: {check_error} - "
-                f"marking as permanently failed and skipping"
+        Every GET waits for a token from the shared bucket, so FILES_API_MAX_RPM holds no matter
+        how many downloads are in flight. download_attempts counts GETs actually sent and is
+        written together with the final status by the DownloadStatusWriter.
+        """
+        dest_dir, existing_path = await self._run_blocking(
+            self.prepare_destination, file_id, source_type, source_field
+        )
+        if dest_dir is None:
+            logger.warning(
+                f"⚠️  No destination mapping for "
+                f"(source_type={source_type}, source_field={source_field}); "
+                f"skipping file_id={file_id}"
+            )
+            self.stats["skipped_no_mapping"] += 1
+            self.status_writer.record(
+                file_id,
+                attempts=0,
+                success=False,
+                error_msg=(
+                    f"PERMANENT: No destination mapping for "
+                    f"source_type={source_type}, source_field={source_field}"
+                ),
             )
-            self._mark_as_downloaded(file_id, success=False, error_msg=check_error)
-            self.stats["failed"] += 1
             return False
 
-        url = self.build_file_url(file_id)
-        headers = {"x-api-key": API_CONFIG["api_key"]}
+        if existing_path:
+            logger.info(f"⏭️  File already exists on disk for file_id={file_id}: path={existing_path} (skipping download)")
+            self.stats["skipped_exists_on_disk"] += 1
+            self.status_writer.record(file_id, attempts=0, success=True)
+            return True
+
         max_retries = int(API_CONFIG.get("max_retries", 3))
+        error_msg = f"Failed after {max_retries} attempts"
 
         for attempt in range(1, max_retries + 1):
-            start_time = time.time()
-
-            # ----------------------------------------------------------------
-            # FIX: Increment download_attempts ONCE per attempt here.
-            # _mark_as_downloaded() no longer increments it, preventing the
-            # double-count that occurred on every successful download.
-            # ----------------------------------------------------------------
+            await self._rate_limiter.acquire()
+            logger.info(
+                f"⬇️  Downloading file_id={file_id} "
+                f"(source_type={source_type}, source_field={source_field}) "
+                f"(attempt {attempt}/{max_retries})"
+            )
             try:
-                increment_sql = f"""
-                    UPDATE {FILES_TABLE}
-                    SET download_attempts = COALESCE(download_attempts, 0) + 1
-                    WHERE file_id = %s
-                """
-                self.db_cursor.execute(increment_sql, (file_id,))
-                self.db_conn.commit()
+                result = await self._run_blocking(self.fetch_to_disk, file_id, source_type, source_field, dest_dir)
+            except requests.exceptions.Timeout:
+                logger.error(f"❌ Timeout while downloading file_id={file_id} (attempt {attempt}/{max_retries})")
+                result = DownloadResult("retry", error="Timeout")
             except Exception as exc:
-                logger.warning(f"⚠️  Failed to increment download_attempts for file_id={file_id}: {exc}")
-                self.db_conn.rollback()
+                logger.error(f"❌ Error while downloading file_id={file_id} (attempt {attempt}/{max_retries}): {exc}")
+                result = DownloadResult("retry", error=str(exc))
 
-            try:
+            if result.status == "exists":
                 logger.info(
-                    f"⬇️  Downloading file_id={file_id} "
-                    f"(source_type={source_type}, source_field={source_field}) "
-                    f"from {url} (attempt {attempt}/{max_retries})"
+                    f"⏭️  File already exists on disk for file_id={file_id}: "
+                    f"path={result.path}, size={result.size} bytes (skipping download)"
                 )
-                # Enforce strict request pacing for every GET call.
-                self._wait_for_request_slot()
-                with requests.get(
-                    url,
-                    headers=headers,
-                    timeout=API_CONFIG["timeout"],
-                    stream=True,
-                ) as resp:
-                    if resp.status_code == 200:
-                        dest_path = build_destination_path(
-                            file_id=file_id,
-                            source_type=source_type,
-                            source_field=source_field,
-                            resp=resp,
-                        )
-
-                        if dest_path is None:
-                            logger.warning(
-                                f"⚠️  No destination mapping for "
-                                f"(source_type={source_type}, source_field={source_field}); "
-                                f"skipping file_id={file_id}"
-                            )
-                            self.stats["skipped_no_mapping"] += 1
-                            self._mark_as_downloaded(
-                                file_id,
-                                success=False,
-                                error_msg=(
-                                    f"PERMANENT: No destination mapping for "
-                                    f"source_type={source_type}, source_field={source_field}"
-                                ),
-                            )
-                            self._respect_rate_limit(start_time)
-                            return False
-
-                        if os.path.exists(dest_path):
-                            existing_size = os.path.getsize(dest_path)
-                            if existing_size > 0:
-                                logger.info(
-                                    f"⏭️  File already exists on disk for file_id={file_id}: "
-                                    f"path={dest_path}, size={existing_size} bytes (skipping download)"
-                                )
-                                self._mark_as_downloaded(file_id, success=True)
-                                self.stats["skipped_exists_on_disk"] += 1
-                                self._respect_rate_limit(start_time)
-                                return True
-                            else:
-                                logger.warning(f"⚠️  File {dest_path} exists but is 0 bytes. Re-downloading...")
-                                os.remove(dest_path)
-
-                        try:
-                            with open(dest_path, "wb") as f:
-                                for chunk in resp.iter_content(chunk_size=8192):
-                                    if chunk:
-                                        f.write(chunk)
-                            os.chmod(dest_path, 0o644)
-                        except PermissionError as e:
-                            logger.error(f"❌ Permission denied writing file {dest_path}: {e}")
-                            logger.error(f"   Directory: {os.path.dirname(dest_path)}")
-                            logger.error(f"   Directory exists: {os.path.exists(os.path.dirname(dest_path))}")
-                            logger.error(f"   Directory writable: {os.access(os.path.dirname(dest_path), os.W_OK)}")
-                            logger.error(f"   Current user: {first_env('USER', default='unknown')}")
-                            logger.error(f"   Current UID: {os.getuid()}")
-                            logger.error(f"   Solution: Run chmod -R 777 {BASE_MEDIA_PATH}")
-                            raise
-
-                        new_size = os.path.getsize(dest_path)
-                        logger.info(
-                            f"✅ Downloaded file_id={file_id} to {dest_path}, "
-                            f"size={new_size} bytes"
-                        )
-                        self._mark_as_downloaded(file_id, success=True)
-                        self.stats["downloaded"] += 1
-                        self._respect_rate_limit(start_time)
-                        return True
-
-                    if resp.status_code == 429 or 500 <= resp.status_code < 600:
-                        if resp.status_code == 429:
-                            logger.warning(
-                                f"⚠️  HTTP 429 (Rate Limited) for file_id={file_id} "
-                                f"(attempt {attempt}/{max_retries}) - will retry"
-                            )
-                        else:
-                            logger.error(
-                                f"❌ HTTP {resp.status_code} while downloading file_id={file_id} "
-                                f"(attempt {attempt}/{max_retries})"
-                            )
-
-                        if attempt < max_retries:
-                            retry_after_header = resp.headers.get("Retry-After")
-                            if retry_after_header:
-                                try:
-                                    sleep_for = float(retry_after_header)
-                                    logger.info(f"⏳ API requested wait: {sleep_for:.1f}s (Retry-After header)")
-                                except ValueError:
-                                    sleep_for = SECONDS_PER_REQUEST * attempt
-                            else:
-                                sleep_for = SECONDS_PER_REQUEST * attempt
-
-                            logger.info(f"⏳ Backing off for {sleep_for:.1f}s before retrying file_id={file_id}")
-                            self._respect_rate_limit(start_time, extra_sleep=sleep_for)
-                            continue
-
-                    else:
-                        try:
-                            error_body = resp.text[:200].replace("'", "''")
-                        except:
-                            error_body = "Could not read response body"
-                            
-                        if resp.status_code == 400:
-                            error_msg = f"PERMANENT: HTTP 400 Bad Request - {error_body}"
-                            logger.error(f"❌ File does not exist (HTTP 400) for file_id={file_id}: {error_body}")
-                        elif resp.status_code == 404:
-                            error_msg = f"PERMANENT: HTTP 404 Not Found - {error_body}"
-                            logger.error(f"❌ File not found (HTTP 404) for file_id={file_id}")
-                        elif resp.status_code == 401:
-                            error_msg = f"HTTP 401 Unauthorized - {error_body}"
-                            logger.error(f"❌ Authentication failed (HTTP 401) for file_id={file_id}")
-                        elif resp.status_code == 403:
-                            error_msg = f"HTTP 403 Forbidden - {error_body}"
-                            logger.error(f"❌ Access denied (HTTP 403) for file_id={file_id}")
-                        else:
-                            error_msg = f"HTTP {resp.status_code} - {error_body}"
-                            logger.error(f"❌ {error_msg} for file_id={file_id}")
-
-                        self._mark_as_downloaded(file_id, success=False, error_msg=error_msg)
-                        self._respect_rate_limit(start_time)
-                        self.stats["failed"] += 1
-                        return False
+                self.stats["skipped_exists_on_disk"] += 1
+                self.status_writer.record(file_id, attempts=attempt, success=True)
+                return True
 
-            except requests.exceptions.Timeout:
-                logger.error(f"❌ Timeout while downloading file_id={file_id} (attempt {attempt}/{max_retries})")
-                if attempt < max_retries:
-                    sleep_for = SECONDS_PER_REQUEST * attempt
-                    logger.info(f"⏳ Backing off for {sleep_for:.1f}s before retrying file_id={file_id}")
-                    self._respect_rate_limit(start_time, extra_sleep=sleep_for)
-                    continue
-            except Exception as exc:
-                logger.error(f"❌ Error while downloading file_id={file_id} (attempt {attempt}/{max_retries}): {exc}")
-                if attempt < max_retries:
-                    sleep_for = SECONDS_PER_REQUEST * attempt
-                    logger.info(f"⏳ Backing off for {sleep_for:.1f}s before retrying file_id={file_id}")
-                    self._respect_rate_limit(start_time, extra_sleep=sleep_for)
-                    continue
+            if result.status == "downloaded":
+                resumed = f" (resumed at byte {result.resumed_from})" if result.resumed_from else ""
+                logger.info(f"✅ Downloaded file_id={file_id} to {result.path}, size={result.size} bytes{resumed}")
+                self.stats["downloaded"] += 1
+                if result.resumed_from:
+                    self.stats["resumed_partial"] += 1
+                self.status_writer.record(file_id, attempts=attempt, success=True)
+                return True
 
-            self._respect_rate_limit(start_time)
-            break
+            if result.status == "failed":
+                logger.error(f"❌ {result.error} for file_id={file_id}")
+                self.stats["failed"] += 1
+                self.status_writer.record(file_id, attempts=attempt, success=False, error_msg=result.error)
+                return False
+
+            # Transient failure (429 / 5xx / timeout / connection error)
+            error_msg = f"Failed after {max_retries} attempts: {result.error}"
+            if attempt < max_retries:
+                if result.retry_after is not None:
+                    logger.info(f"⏳ API requested wait: {result.retry_after:.1f}s (Retry-After header)")
+                    # Retry-After is about the API, not this file: hold back every download
+                    self._rate_limiter.pause(result.retry_after)
+                    sleep_for = result.retry_after
+                else:
+                    sleep_for = SECONDS_PER_REQUEST * attempt
+                logger.warning(
+                    f"⚠️  {result.error} for file_id={file_id} (attempt {attempt}/{max_retries}); "
+                    f"backing off for {sleep_for:.1f}s"
+                )
+                await asyncio.sleep(sleep_for)
 
-        error_msg = f"Failed after {max_retries} attempts"
-        self._mark_as_downloaded(file_id, success=False, error_msg=error_msg)
         self.stats["failed"] += 1
+        self.status_writer.record(file_id, attempts=max_retries, success=False, error_msg=error_msg)
         return False
 
-    def _mark_as_downloaded(self, file_id: str, success: bool, error_msg: Optional[str] = None) -> None:
+    async def download_all(self, rows) -> None:
         """
-        Update database to mark file as downloaded or record error.
-
-        FIX: download_attempts is NO LONGER incremented here. It is incremented
-        once at the start of each attempt loop in download_single_file(), which
-        gives an accurate count. The previous code incremented it here AND at
-        the top of the loop, resulting in double-counting on success.
+        Download rows with DOWNLOAD_CONCURRENCY workers sharing one rate limiter.
 
-        Args:
-            file_id: The file ID
-            success: True if download succeeded, False if failed
-            error_msg: Error message if download failed
+        Workers pull from a single iterator, so at most DOWNLOAD_CONCURRENCY files are in
+        flight and memory stays flat regardless of how many rows are queued.
         """
-        try:
-            if success:
-                # NOTE: download_attempts intentionally NOT incremented here.
-                # It is already incremented once per attempt in download_single_file().
-                update_sql = f"""
-                    UPDATE {FILES_TABLE}
-                    SET is_downloaded = TRUE,
-                        downloaded_at = CURRENT_TIMESTAMP,
-                        download_error = NULL
-                    WHERE file_id = %s
-                """
-                self.db_cursor.execute(update_sql, (file_id,))
-            else:
-                # NOTE: download_attempts intentionally NOT incremented here either.
-                update_sql = f"""
-                    UPDATE {FILES_TABLE}
-                    SET is_downloaded = FALSE,
-                        download_error = %s
-                    WHERE file_id = %s
-                """
-                self.db_cursor.execute(update_sql, (error_msg or "Download failed", file_id,))
+        self._rate_limiter = AsyncTokenBucket(FILES_API_MAX_RPM)
+        pending = iter(enumerate(rows, start=1))
+        total = len(rows)
 
-            self.db_conn.commit()
-        except Exception as exc:
-            logger.warning(f"⚠️  Failed to update download status for file_id={file_id}: {exc}")
-            self.db_conn.rollback()
+        async def worker() -> None:
+            for idx, (source_type, source_field, file_id) in pending:
+                if not file_id:
+                    self.stats["skipped_null_file_id"] += 1
+                    logger.warning(
+                        f"[{idx}/{total}] Skipping row with NULL file_id "
+                        f"(source_type={source_type}, source_field={source_field})"
+                    )
+                    continue
 
-    @staticmethod
-    def _respect_rate_limit(start_time: float, extra_sleep: float = 0.0) -> None:
-        """
-        Sleep enough to respect 10 RPM overall.
-        Ensures at least SECONDS_PER_REQUEST between the start of this request
-        and the next attempt. Adds optional extra_sleep for backoff / Retry-After.
-        """
-        elapsed = time.time() - start_time
-        min_sleep = max(0.0, SECONDS_PER_REQUEST - elapsed)
-        total_sleep = min_sleep + max(0.0, extra_sleep)
-        if total_sleep > 0:
-            time.sleep(total_sleep)
+                logger.info(
+                    f"[{idx}/{total}] Processing file_id={file_id} "
+                    f"(source_type={source_type}, source_field={source_field})"
+                )
+                self.stats["total_processed"] += 1
+                success = await self.download_file(str(file_id), str(source_type), str(source_field))
+                if not success:
+                    logger.error(
+                        f"❌ Download failed for file_id={file_id} after all retries; "
+                        f"moving to next file (will retry on next run if is_downloaded = FALSE)"
+                    )
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY, thread_name_prefix="files-download") as executor:
+            self._executor = executor
+            try:
+                await asyncio.gather(*(worker() for _ in range(DOWNLOAD_CONCURRENCY)))
+            finally:
+                # Waits for the writer thread; off the event loop like every other blocking call
+                await asyncio.get_running_loop().run_in_executor(None, self.status_writer.flush)
 
     # -------------------------------------------------------------------------
     # Main run
@@ -860,6 +1108,7 @@ class FilesMediaServerETL:
         logger.info(f"Files base URL: {FILES_BASE_URL}")
         logger.info(f"Media base path: {BASE_MEDIA_PATH}")
         logger.info(f"Rate limit: {FILES_API_MAX_RPM} requests per minute")
+        logger.info(f"Concurrent downloads: {DOWNLOAD_CONCURRENCY}")
 
         if not self.connect_db():
             logger.error("Failed to connect to database. Exiting.")
@@ -871,6 +1120,11 @@ class FilesMediaServerETL:
                 logger.error("Failed to set up download tracking columns. Exiting.")
                 return False
 
+            self.status_writer = DownloadStatusWriter(
+                self.db_conn, self.db_cursor, file_id_type=self.get_file_id_type()
+            )
+            self.status_writer.open()
+
             last_dates_per_source = self.get_last_processed_date_per_source_type()
             if last_dates_per_source:
                 logger.info("📌 Last download dates per source_type (for reference):")
@@ -887,29 +1141,7 @@ class FilesMediaServerETL:
 
             self.stats["total_with_file_id"] = len(rows)
 
-            for idx, (source_type, source_field, file_id) in enumerate(rows, start=1):
-                if not file_id:
-                    self.stats["skipped_null_file_id"] += 1
-                    logger.warning(
-                        f"[{idx}/{len(rows)}] Skipping row with NULL file_id "
-                        f"(source_type={source_type}, source_field={source_field})"
-                    )
-                    continue
-
-                logger.info(
-                    f"[{idx}/{len(rows)}] Processing file_id={file_id} "
-                    f"(source_type={source_type}, source_field={source_field})"
-                )
-                self.stats["total_processed"] += 1
-                success = self.download_single_file(
-                    str(file_id), str(source_type), str(source_field)
-                )
-
-                if not success:
-                    logger.error(
-                        f"❌ Download failed for file_id={file_id} after all retries; "
-                        f"moving to next file (will retry on next run if is_downloaded = FALSE)"
-                    )
+            asyncio.run(self.download_all(rows))
 
             logger.info("")
             logger.info("=" * 80)
@@ -924,6 +1156,8 @@ class FilesMediaServerETL:
             logger.info(f"Skipped (NULL file_id in loop): {self.stats['skipped_null_file_id']}")
             logger.info(f"Skipped (already downloaded in DB): {self.stats['skipped_already_downloaded']}")
             logger.info(f"Skipped (exists on disk): {self.stats['skipped_exists_on_disk']}")
+            logger.info(f"Resumed partial downloads: {self.stats['resumed_partial']}")
+            logger.info(f"Status rows written (batched): {self.status_writer.flushed_rows}")
             if self.stats['resumed_from']:
                 logger.info(f"Resumed from file_id: {self.stats['resumed_from']}")
             logger.info("=" * 80)
@@ -937,6 +1171,8 @@ class FilesMediaServerETL:
             logger.error(f"❌ Files Media Server ETL failed with error: {exc}")
             return False
         finally:
+            if self.status_writer:
+                self.status_writer.close()
             self.close_db()
 
 
@@ -18,6 +18,7 @@ import sys
 # Import PostgreSQLConnectionPool using relative path based on user instructions
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db_pooling import PostgreSQLConnectionPool
+from etl_incremental import generate_date_ranges as shared_generate_date_ranges
 from tqdm import tqdm
 import logging
 import colorlog
@@ -25,6 +26,7 @@ from typing import List, Dict, Optional, Tuple, Set
 import json
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 
 # IST timezone offset (UTC+05:30)
 IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
@@ -349,51 +351,10 @@ class HierarchyETL:
     
     def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
         """
-        Generate date ranges in chunks with overlap to ensure no data is missed
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records
-        
-        Args:
-            start_date: Start date in ISO format (YYYY-MM-DDTHH:MM:SS) or YYYY-MM-DD
-            end_date: End date in ISO format (YYYY-MM-DDTHH:MM:SS) or YYYY-MM-DD
-            chunk_days: Number of days per chunk
-            overlap_days: Number of days to overlap between chunks (default: 1 to ensure no data loss)
-        
-        Returns:
-            List of (from_date, to_date) tuples in ISO format (YYYY-MM-DDTHH:MM:SS)
+        Generate overlapping date ranges in chunks (shared implementation in etl_incremental).
+        Returns (from_date, to_date) tuples as YYYY-MM-DDTHH:MM:SS day bounds.
         """
-        date_ranges = []
-        # Parse ISO format dates
-        current_date = parse_iso_date(start_date).date()
-        end = parse_iso_date(end_date).date()
-        
-        while current_date <= end:
-            chunk_end = current_date + timedelta(days=chunk_days - 1)
-            if chunk_end > end:
-                chunk_end = end
-            
-            # Convert to datetime with time
-            start_datetime = datetime.combine(current_date, datetime.min.time())  # 00:00:00
-            end_datetime = datetime.combine(chunk_end, datetime.max.time().replace(microsecond=0))  # 23:59:59
-            
-            # Format as ISO format
-            date_ranges.append((
-                start_datetime.strftime('%Y-%m-%dT%H:%M:%S'),
-                end_datetime.strftime('%Y-%m-%dT%H:%M:%S')
-            ))
-            
-            # If we've already reached or passed the end date, break
-            if chunk_end >= end:
-                break
-            
-            # Next chunk starts with overlap: current chunk end - overlap_days + 1
-            # For overlap_days=1: next_start = chunk_end (same day, creating 1-day overlap)
-            # This ensures: Last day of chunk N = First day of chunk N+1
-            next_start = chunk_end - timedelta(days=overlap_days - 1)
-            
-            # Move to next chunk start
-            current_date = next_start
-        
-        return date_ranges
+        return shared_generate_date_ranges(start_date, end_date, chunk_days, overlap_days, include_time=True)
     
     def fetch_hierarchy_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -423,7 +384,7 @@ class HierarchyETL:
             try:
                 logger.debug(f"Fetching hierarchy: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.trace(f"API Request - URL: {url}, Params: {params}, Headers: {headers}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
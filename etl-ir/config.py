@@ -33,6 +33,10 @@ ETL_CONFIG = {
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
     'batch_size': 100,
+    # Resolvable pending-FK rows reprocessed (and marked resolved) per round trip
+    'pending_fk_batch_size': get_int_env('PENDING_FK_BATCH_SIZE', 500),
+    # Write each chunk's changed IRs in one transaction: one DELETE per child table + COPY
+    'batch_child_writes': get_bool_env('IR_BATCH_CHILD_WRITES', True),
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
 
@@ -15,7 +15,9 @@ from datetime import datetime, timedelta
 from tqdm import tqdm
 import logging
 import colorlog
+import io
 import json
+import re
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Tuple, Any, Set
@@ -28,6 +30,7 @@ except ImportError:
     pass
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 
 # IST timezone offset (UTC+05:30)
 IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
@@ -78,6 +81,60 @@ IR_CONVICTION_ACQUITTAL_TABLE = TABLE_CONFIG.get('ir_conviction_acquittal', 'ir_
 CRIMES_TABLE = TABLE_CONFIG.get('crimes', 'crimes')
 PENDING_FK_TABLE = 'ir_pending_fk'
 
+# Child tables replaced wholesale whenever an IR changes
+IR_CHILD_TABLES = [
+    IR_FAMILY_HISTORY_TABLE,
+    IR_LOCAL_CONTACTS_TABLE,
+    IR_REGULAR_HABITS_TABLE,
+    IR_TYPES_OF_DRUGS_TABLE,
+    IR_SIM_DETAILS_TABLE,
+    IR_FINANCIAL_HISTORY_TABLE,
+    IR_CONSUMER_DETAILS_TABLE,
+    IR_MODUS_OPERANDI_TABLE,
+    IR_PREVIOUS_OFFENCES_TABLE,
+    IR_DEFENCE_COUNSEL_TABLE,
+    IR_ASSOCIATE_DETAILS_TABLE,
+    IR_SHELTER_TABLE,
+    IR_MEDIA_TABLE,
+    IR_INTERROGATION_REPORT_REFS_TABLE,
+    IR_DOPAMS_LINKS_TABLE,
+    IR_INDULGANCE_BEFORE_OFFENCE_TABLE,
+    IR_PROPERTY_DISPOSAL_TABLE,
+    IR_REGULARIZATION_TRANSIT_WARRANTS_TABLE,
+    IR_EXECUTION_OF_NBW_TABLE,
+    IR_PENDING_NBW_TABLE,
+    IR_SURETIES_TABLE,
+    IR_JAIL_SENTENCE_TABLE,
+    IR_NEW_GANG_FORMATION_TABLE,
+    IR_CONVICTION_ACQUITTAL_TABLE
+]
+
+# Columns read back from the IR table for change detection (see should_update_record)
+IR_EXISTING_COLUMNS = """
+    interrogation_report_id,
+    date_created,
+    date_modified,
+    crime_id,
+    person_id,
+    other_regular_habits,
+    other_indulgence_before_offence,
+    time_since_modus_operandi,
+    is_in_jail,
+    is_on_bail,
+    is_absconding,
+    is_normal_life,
+    is_rehabilitated,
+    is_dead,
+    is_facing_trial,
+    date_of_bail
+"""
+
+# "INSERT INTO <table> (<columns>) VALUES %s [ON CONFLICT DO NOTHING]" as written by insert_related_records
+CHILD_INSERT_RE = re.compile(
+    r"INSERT INTO\s+(\S+)\s*\((.*?)\)\s*VALUES %s\s*(ON CONFLICT DO NOTHING)?\s*$",
+    re.DOTALL
+)
+
 def parse_iso_date(date_str: str) -> datetime:
     """Parse ISO 8601 date string (with optional time component) to datetime."""
     if 'T' in date_str or ' ' in date_str:
@@ -135,6 +192,44 @@ def truncate_string(value: Optional[str], max_length: int) -> Optional[str]:
     return value
 
 
+def copy_text_value(value: Any) -> str:
+    """Render one value as a field of PostgreSQL COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, dict):
+        raise TypeError("can't adapt type 'dict'")   # as execute_values would
+    if isinstance(value, bool):
+        text = 't' if value else 'f'
+    elif isinstance(value, (list, tuple)):
+        # text[] literal, same values execute_values would send as ARRAY[...]
+        items = []
+        for item in value:
+            if item is None:
+                items.append('NULL')
+            else:
+                item = str(item).replace('\\', '\\\\').replace('"', '\\"')
+                items.append(f'"{item}"')
+        text = '{' + ','.join(items) + '}'
+    else:
+        text = str(value)
+    return (text.replace('\\', '\\\\').replace('\n', '\\n')
+                .replace('\r', '\\r').replace('\t', '\\t'))
+
+
+class ChildRowBuffer:
+    """Child-table rows produced by insert_related_records(), grouped by INSERT statement."""
+
+    def __init__(self):
+        self.statements: Dict[str, List[tuple]] = {}
+
+    def add(self, sql: str, values: List[tuple]):
+        self.statements.setdefault(sql, []).extend(values)
+
+    def merge(self, other: 'ChildRowBuffer'):
+        for sql, values in other.statements.items():
+            self.add(sql, values)
+
+
 class InterrogationReportsETL:
     """ETL Pipeline for Interrogation Reports API"""
     
@@ -306,60 +401,75 @@ class InterrogationReportsETL:
             logger.error(f"Failed to queue pending FK for IR {ir_id}: {e}")
 
     def retry_pending_fk(self):
-        """Retry all unresolved pending FK records."""
+        """
+        Retry unresolved pending FK records whose crime_id now exists.
+
+        Resolvable rows are found by joining the pending table against crimes, reprocessed
+        in batches and marked resolved with one UPDATE per batch. Rows whose crime is still
+        missing are only counted, so they cost nothing per run.
+        """
         logger.info("")
         logger.info("=" * 80)
         logger.info("🔄 Retrying pending FK records...")
 
+        batch_size = ETL_CONFIG.get('pending_fk_batch_size', 500)
         try:
             with self.db_pool.get_connection_context() as conn:
                 with conn.cursor() as cur:
                     cur.execute(f"""
-                        SELECT id, ir_id, crime_id, raw_data, retry_count
-                        FROM {PENDING_FK_TABLE}
-                        WHERE resolved = FALSE
-                        ORDER BY created_at
+                        SELECT
+                            COUNT(*),
+                            COUNT(*) FILTER (WHERE EXISTS (
+                                SELECT 1 FROM {CRIMES_TABLE} c WHERE c.crime_id = p.crime_id
+                            ))
+                        FROM {PENDING_FK_TABLE} p
+                        WHERE p.resolved = FALSE
                     """)
-                    pending_rows = cur.fetchall()
+                    total_pending, resolvable = cur.fetchone()
 
-            if not pending_rows:
+            if not total_pending:
                 logger.info("ℹ️  No pending FK records to retry")
                 return
 
-            logger.info(f"📊 Found {len(pending_rows)} pending FK records to retry")
+            logger.info(f"📊 Found {total_pending} pending FK records, {resolvable} with crime_id now present")
 
             resolved_count = 0
-            still_missing = 0
+            last_id = 0
+            while True:
+                with self.db_pool.get_connection_context() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(f"""
+                            SELECT p.id, p.ir_id, p.crime_id, p.raw_data
+                            FROM {PENDING_FK_TABLE} p
+                            WHERE p.resolved = FALSE
+                              AND p.id > %s
+                              AND EXISTS (SELECT 1 FROM {CRIMES_TABLE} c WHERE c.crime_id = p.crime_id)
+                            ORDER BY p.id
+                            LIMIT %s
+                        """, (last_id, batch_size))
+                        batch = cur.fetchall()
+                if not batch:
+                    break
+                last_id = batch[-1][0]
 
-            for row_id, ir_id, crime_id, raw_data, retry_count in pending_rows:
-                try:
-                    with self.db_pool.get_connection_context() as conn:
-                        with conn.cursor() as cur:
-                            if crime_id in self.crime_ids:
-                                success = self.process_ir_record(raw_data, conn, cur)
-                                if success:
-                                    conn.commit()
-                                cur.execute(f"""
-                                    UPDATE {PENDING_FK_TABLE}
-                                    SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP,
-                                        last_retry_at = CURRENT_TIMESTAMP, retry_count = %s
-                                    WHERE id = %s
-                                """, (retry_count + 1, row_id))
-                                conn.commit()
-                                resolved_count += 1
-                                logger.debug(f"✅ Resolved pending IR {ir_id}")
-                            else:
-                                cur.execute(f"""
-                                    UPDATE {PENDING_FK_TABLE}
-                                    SET last_retry_at = CURRENT_TIMESTAMP, retry_count = %s
-                                    WHERE id = %s
-                                """, (retry_count + 1, row_id))
-                                conn.commit()
-                                still_missing += 1
-                except Exception as e:
-                    logger.error(f"Error retrying pending IR {ir_id}: {e}")
-                    still_missing += 1
+                # These crimes exist now, even if they arrived after load_crime_ids()
+                self.crime_ids.update(row[2] for row in batch)
+                self.write_records([row[3] for row in batch], f"{len(batch)} pending FK records")
 
+                # Resolved regardless of outcome (avoid infinite re-inserts on data issues)
+                with self.db_pool.get_connection_context() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(f"""
+                            UPDATE {PENDING_FK_TABLE}
+                            SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP,
+                                last_retry_at = CURRENT_TIMESTAMP, retry_count = retry_count + 1
+                            WHERE id = ANY(%s)
+                        """, ([row[0] for row in batch],))
+                        conn.commit()
+                resolved_count += len(batch)
+                logger.debug(f"✅ Resolved {len(batch)} pending IRs (up to id {last_id})")
+
+            still_missing = total_pending - resolved_count
             with self.stats_lock:
                 self.stats['total_retried_ok'] = resolved_count
                 self.stats['total_retried_still_missing'] = still_missing
@@ -563,7 +673,7 @@ class InterrogationReportsETL:
                 logger.debug(f"Fetching IR data: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.debug(f"API URL: {url}")
                 logger.debug(f"API Params: {params}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
@@ -636,23 +746,7 @@ class InterrogationReportsETL:
         """Get existing IR record from database with a snapshot used for fallback comparison."""
         cursor.execute(
             f"""
-            SELECT
-                interrogation_report_id,
-                date_created,
-                date_modified,
-                crime_id,
-                person_id,
-                other_regular_habits,
-                other_indulgence_before_offence,
-                time_since_modus_operandi,
-                is_in_jail,
-                is_on_bail,
-                is_absconding,
-                is_normal_life,
-                is_rehabilitated,
-                is_dead,
-                is_facing_trial,
-                date_of_bail
+            SELECT {IR_EXISTING_COLUMNS}
             FROM {IR_TABLE}
             WHERE interrogation_report_id = %s
             """,
@@ -660,28 +754,46 @@ class InterrogationReportsETL:
         )
         result = cursor.fetchone()
         if result:
-            return {
-                'interrogation_report_id': result[0],
-                'date_created': result[1],
-                'date_modified': result[2],
-                'snapshot': {
-                    'crime_id': result[3],
-                    'person_id': result[4],
-                    'other_regular_habits': result[5],
-                    'other_indulgence_before_offence': result[6],
-                    'time_since_modus_operandi': result[7],
-                    'is_in_jail': result[8],
-                    'is_on_bail': result[9],
-                    'is_absconding': result[10],
-                    'is_normal_life': result[11],
-                    'is_rehabilitated': result[12],
-                    'is_dead': result[13],
-                    'is_facing_trial': result[14],
-                    'date_of_bail': result[15]
-                }
-            }
+            return self._existing_from_row(result)
         return None
 
+    def get_existing_ir_records(self, ir_ids: List[str], cursor) -> Dict[str, Dict[str, Any]]:
+        """get_existing_ir_record() for many IRs in one query: {ir_id: existing}."""
+        if not ir_ids:
+            return {}
+        cursor.execute(
+            f"""
+            SELECT {IR_EXISTING_COLUMNS}
+            FROM {IR_TABLE}
+            WHERE interrogation_report_id = ANY(%s)
+            """,
+            (list(ir_ids),)
+        )
+        return {row[0]: self._existing_from_row(row) for row in cursor.fetchall()}
+
+    @staticmethod
+    def _existing_from_row(result: tuple) -> Dict[str, Any]:
+        return {
+            'interrogation_report_id': result[0],
+            'date_created': result[1],
+            'date_modified': result[2],
+            'snapshot': {
+                'crime_id': result[3],
+                'person_id': result[4],
+                'other_regular_habits': result[5],
+                'other_indulgence_before_offence': result[6],
+                'time_since_modus_operandi': result[7],
+                'is_in_jail': result[8],
+                'is_on_bail': result[9],
+                'is_absconding': result[10],
+                'is_normal_life': result[11],
+                'is_rehabilitated': result[12],
+                'is_dead': result[13],
+                'is_facing_trial': result[14],
+                'date_of_bail': result[15]
+            }
+        }
+
     def _build_main_snapshot_from_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Build a comparable snapshot from API payload for fallback updates when DATE_MODIFIED is missing."""
         pw = record.get('PRESENT_WHEREABOUTS', {})
@@ -742,36 +854,50 @@ class InterrogationReportsETL:
 
     def delete_related_records(self, ir_id: str, cursor):
         """Delete all related records for an IR before re-inserting."""
-        tables = [
-            IR_FAMILY_HISTORY_TABLE,
-            IR_LOCAL_CONTACTS_TABLE,
-            IR_REGULAR_HABITS_TABLE,
-            IR_TYPES_OF_DRUGS_TABLE,
-            IR_SIM_DETAILS_TABLE,
-            IR_FINANCIAL_HISTORY_TABLE,
-            IR_CONSUMER_DETAILS_TABLE,
-            IR_MODUS_OPERANDI_TABLE,
-            IR_PREVIOUS_OFFENCES_TABLE,
-            IR_DEFENCE_COUNSEL_TABLE,
-            IR_ASSOCIATE_DETAILS_TABLE,
-            IR_SHELTER_TABLE,
-            IR_MEDIA_TABLE,
-            IR_INTERROGATION_REPORT_REFS_TABLE,
-            IR_DOPAMS_LINKS_TABLE,
-            IR_INDULGANCE_BEFORE_OFFENCE_TABLE,
-            IR_PROPERTY_DISPOSAL_TABLE,
-            IR_REGULARIZATION_TRANSIT_WARRANTS_TABLE,
-            IR_EXECUTION_OF_NBW_TABLE,
-            IR_PENDING_NBW_TABLE,
-            IR_SURETIES_TABLE,
-            IR_JAIL_SENTENCE_TABLE,
-            IR_NEW_GANG_FORMATION_TABLE,
-            IR_CONVICTION_ACQUITTAL_TABLE
-        ]
-        
-        for table in tables:
+        for table in IR_CHILD_TABLES:
             cursor.execute(f"DELETE FROM {table} WHERE interrogation_report_id = %s", (ir_id,))
 
+    def delete_related_records_bulk(self, ir_ids: List[str], cursor):
+        """delete_related_records() for many IRs: one DELETE per child table."""
+        if not ir_ids:
+            return
+        for table in IR_CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE interrogation_report_id = ANY(%s)", (list(ir_ids),))
+
+    def copy_related_rows(self, rows: ChildRowBuffer, cursor):
+        """Bulk-load buffered child rows with one COPY per table.
+
+        Statements that ended in ON CONFLICT DO NOTHING are COPYed into a temporary
+        staging table first and moved over with the same conflict clause.
+        """
+        for sql, values in rows.statements.items():
+            if not values:
+                continue
+            match = CHILD_INSERT_RE.search(sql)
+            if not match:
+                raise ValueError(f"Unrecognised child insert statement: {sql[:80]}")
+            table, columns, on_conflict = match.group(1), match.group(2), match.group(3)
+            columns = ', '.join(col.strip() for col in columns.split(','))
+
+            buffer = io.StringIO()
+            for row in values:
+                buffer.write('\t'.join(copy_text_value(value) for value in row))
+                buffer.write('\n')
+            buffer.seek(0)
+
+            if on_conflict:
+                stage = f"stage_{table.replace('.', '_')}"
+                cursor.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DROP AS "
+                    f"SELECT {columns} FROM {table} WITH NO DATA"
+                )
+                cursor.copy_expert(f"COPY {stage} ({columns}) FROM STDIN", buffer)
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} ON CONFLICT DO NOTHING"
+                )
+            else:
+                cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", buffer)
+
     def insert_main_record(self, record: Dict[str, Any], cursor, is_update: bool = False):
         """Insert or update main interrogation_reports record."""
         pf = record.get('PHYSICAL_FEATURES', {})
@@ -915,10 +1041,19 @@ class InterrogationReportsETL:
             """
             cursor.execute(insert_sql, main_values)
     
-    def insert_related_records(self, record: Dict[str, Any], cursor):
-        """Insert all related records for an IR. Person_id is optional - all data is inserted."""
+    def insert_related_records(self, record: Dict[str, Any], cursor, sink: Optional[ChildRowBuffer] = None):
+        """Insert all related records for an IR. Person_id is optional - all data is inserted.
+
+        With a sink, rows are collected there (for a chunk-level COPY) instead of inserted.
+        """
         ir_id = record.get('INTERROGATION_REPORT_ID')
         
+        if sink is not None:
+            write_rows = sink.add
+        else:
+            def write_rows(sql, values):
+                execute_values(cursor, sql, values)
+        
         # 1. Family History
         family_history = record.get('FAMILY_HISTORY', [])
         if family_history:
@@ -933,8 +1068,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if family_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_FAMILY_HISTORY_TABLE} 
                            (interrogation_report_id, person_id, relation, family_member_peculiarity,
                             criminal_background, is_alive, family_stay_together)
@@ -958,8 +1092,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if contact_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_LOCAL_CONTACTS_TABLE} 
                            (interrogation_report_id, person_id, town, address, jurisdiction_ps)
                            VALUES %s""",
@@ -974,8 +1107,7 @@ class InterrogationReportsETL:
         if regular_habits:
             habit_values = [(ir_id, habit) for habit in regular_habits if habit]
             if habit_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_REGULAR_HABITS_TABLE} (interrogation_report_id, habit)
                        VALUES %s ON CONFLICT DO NOTHING""",
                     habit_values
@@ -999,8 +1131,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if drug_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_TYPES_OF_DRUGS_TABLE} 
                            (interrogation_report_id, type_of_drug, quantity, purchase_amount_in_inr,
                             mode_of_payment, mode_of_transport, supplier_person_id, receivers_person_id)
@@ -1023,8 +1154,7 @@ class InterrogationReportsETL:
                 ))
             
             if sim_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_SIM_DETAILS_TABLE} 
                        (interrogation_report_id, phone_number, sdr, imei, true_caller_name, person_id)
                        VALUES %s""",
@@ -1046,8 +1176,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if financial_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_FINANCIAL_HISTORY_TABLE} 
                            (interrogation_report_id, account_holder_person_id, pan_no, upi_id,
                             name_of_bank, account_number, branch_name, ifsc_code,
@@ -1072,8 +1201,7 @@ class InterrogationReportsETL:
                 ))
             
             if consumer_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_CONSUMER_DETAILS_TABLE} 
                        (interrogation_report_id, consumer_person_id, place_of_consumption,
                         other_sources, other_sources_phone_no, aadhar_card_number, aadhar_card_number_phone_no)
@@ -1089,8 +1217,7 @@ class InterrogationReportsETL:
                  mo.get('MODUS_OPERANDI'))
                 for mo in modus_operandi
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_MODUS_OPERANDI_TABLE} 
                    (interrogation_report_id, crime_head, crime_sub_head, modus_operandi)
                    VALUES %s""",
@@ -1124,8 +1251,7 @@ class InterrogationReportsETL:
                     )
                     for po in previous_offences
                 ]
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_PREVIOUS_OFFENCES_TABLE} 
                        (interrogation_report_id, arrest_date, arrested_by, arrest_place, crime_num,
                         dist_unit_division, gang_member, interrogated_by, law_section,
@@ -1154,8 +1280,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if dc_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_DEFENCE_COUNSEL_TABLE} 
                            (interrogation_report_id, dist_division, ps_code, crime_num, law_section,
                             sc_cc_num, defence_counsel_address, defence_counsel_phone, assistance, defence_counsel_person_id)
@@ -1178,8 +1303,7 @@ class InterrogationReportsETL:
                     ))
                 
                 if assoc_values:
-                    execute_values(
-                        cursor,
+                    write_rows(
                         f"""INSERT INTO {IR_ASSOCIATE_DETAILS_TABLE} 
                            (interrogation_report_id, person_id, gang, relation)
                            VALUES %s""",
@@ -1197,8 +1321,7 @@ class InterrogationReportsETL:
                  sh.get('REGULAR_RESIDENCY'), sh.get('REMARKS'), sh.get('OTHER_REGULAR_RESIDENCY'))
                 for sh in shelter
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_SHELTER_TABLE} 
                    (interrogation_report_id, preparation_of_offence, after_offence,
                     regular_residency, remarks, other_regular_residency)
@@ -1211,8 +1334,7 @@ class InterrogationReportsETL:
         if media:
             media_values = [(ir_id, media_id) for media_id in media if media_id]
             if media_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_MEDIA_TABLE} (interrogation_report_id, media_id)
                        VALUES %s ON CONFLICT DO NOTHING""",
                     media_values
@@ -1223,8 +1345,7 @@ class InterrogationReportsETL:
         if interrogation_report:
             ir_ref_values = [(ir_id, ref_id) for ref_id in interrogation_report if ref_id]
             if ir_ref_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_INTERROGATION_REPORT_REFS_TABLE} (interrogation_report_id, report_ref_id)
                        VALUES %s ON CONFLICT DO NOTHING""",
                     ir_ref_values
@@ -1238,8 +1359,7 @@ class InterrogationReportsETL:
                  dl.get('DOPAMS_DATA') if isinstance(dl.get('DOPAMS_DATA'), list) else [])
                 for dl in dopams_links
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_DOPAMS_LINKS_TABLE} (interrogation_report_id, phone_number, dopams_data)
                    VALUES %s""",
                 dopams_values
@@ -1250,8 +1370,7 @@ class InterrogationReportsETL:
         if indulgance_before_offence:
             ind_values = [(ir_id, value) for value in indulgance_before_offence if value]
             if ind_values:
-                execute_values(
-                    cursor,
+                write_rows(
                     f"""INSERT INTO {IR_INDULGANCE_BEFORE_OFFENCE_TABLE} (interrogation_report_id, indulgance)
                        VALUES %s""",
                     ind_values
@@ -1272,8 +1391,7 @@ class InterrogationReportsETL:
                 )
                 for pd in property_disposal
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_PROPERTY_DISPOSAL_TABLE}
                    (interrogation_report_id, mode_of_disposal, buyer_name, sold_amount_in_inr,
                     location_of_disposal, date_of_disposal, remarks)
@@ -1297,8 +1415,7 @@ class InterrogationReportsETL:
                 )
                 for row in regularization_transit
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_REGULARIZATION_TRANSIT_WARRANTS_TABLE}
                    (interrogation_report_id, warrant_number, warrant_type, issued_date,
                     jurisdiction_ps, crime_num, status, remarks)
@@ -1323,8 +1440,7 @@ class InterrogationReportsETL:
                 )
                 for row in execution_of_nbw
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_EXECUTION_OF_NBW_TABLE}
                    (interrogation_report_id, nbw_number, issued_date, executed_date,
                     jurisdiction_ps, crime_num, executed_by, place_of_execution, remarks)
@@ -1348,8 +1464,7 @@ class InterrogationReportsETL:
                 )
                 for row in pending_nbw
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_PENDING_NBW_TABLE}
                    (interrogation_report_id, nbw_number, issued_date, jurisdiction_ps,
                     crime_num, reason_for_pending, expected_execution_date, remarks)
@@ -1383,8 +1498,7 @@ class InterrogationReportsETL:
                 )
                 for row in sureties
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_SURETIES_TABLE}
                    (interrogation_report_id, surety_person_id, surety_name, relation_to_accused,
                     occupation, aadhar_number, pan_number, house_no, street_road_no,
@@ -1415,8 +1529,7 @@ class InterrogationReportsETL:
                 )
                 for row in jail_sentence
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_JAIL_SENTENCE_TABLE}
                    (interrogation_report_id, crime_num, jurisdiction_ps, law_section,
                     sentence_type, sentence_duration_in_months, sentence_start_date,
@@ -1445,8 +1558,7 @@ class InterrogationReportsETL:
                 )
                 for row in new_gang_formation
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_NEW_GANG_FORMATION_TABLE}
                    (interrogation_report_id, gang_name, gang_formation_date, number_of_members,
                     leader_name, leader_person_id, gang_objective, criminal_history,
@@ -1477,8 +1589,7 @@ class InterrogationReportsETL:
                 )
                 for row in conviction_acquittal
             ]
-            execute_values(
-                cursor,
+            write_rows(
                 f"""INSERT INTO {IR_CONVICTION_ACQUITTAL_TABLE}
                    (interrogation_report_id, crime_num, jurisdiction_ps, court_name,
                     judge_name, law_section, verdict, verdict_date,
@@ -1620,6 +1731,123 @@ class InterrogationReportsETL:
                 self.stats['errors'].append(f"IR {ir_id}: {str(e)}")
             raise
     
+    def process_records_batched(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write a chunk of IR records in one transaction with set-based child-table writes.
+
+        Unchanged IRs (per should_update_record) are skipped; new and changed IRs get
+        their main row upserted, the changed ones lose their old children through one
+        DELETE ... = ANY(%s) per child table, and all new children are loaded with one
+        COPY per table. Duplicate IR ids within the chunk collapse to the last occurrence.
+
+        Returns:
+            Records still to be written. On a database error the transaction is rolled
+            back and all new/changed records are returned for the per-record path.
+        """
+        records_by_id: Dict[str, Dict[str, Any]] = {}
+        with self.db_pool.get_connection_context() as conn:
+            with conn.cursor() as cur:
+                for record in records:
+                    ir_id = record.get('INTERROGATION_REPORT_ID')
+                    crime_id = record.get('CRIME_ID')
+                    if not ir_id:
+                        logger.warning("Record missing INTERROGATION_REPORT_ID, skipping")
+                        with self.stats_lock:
+                            self.stats['total_ir_failed'] += 1
+                        continue
+                    if crime_id and crime_id not in self.crime_ids:
+                        self.queue_pending_fk(record, crime_id, conn, cur)
+                        logger.debug(f"⏳ IR {ir_id}: crime_id {crime_id} not in crimes table — queued for retry")
+                        continue
+                    records_by_id.pop(ir_id, None)
+                    records_by_id[ir_id] = record
+
+                if not records_by_id:
+                    return []
+
+                try:
+                    existing_by_id = self.get_existing_ir_records(list(records_by_id), cur)
+                except Exception as e:
+                    conn.rollback()
+                    logger.warning(f"⚠️  Could not load existing IRs, falling back to per-record mode: {e}")
+                    return list(records_by_id.values())
+
+                to_insert, to_update = [], []
+                child_rows = ChildRowBuffer()
+                for ir_id, record in records_by_id.items():
+                    existing = existing_by_id.get(ir_id)
+                    if existing and not self.should_update_record(existing, record):
+                        logger.debug(f"Record {ir_id} is up-to-date, skipping")
+                        with self.stats_lock:
+                            self.stats['total_ir_no_change'] += 1
+                        continue
+                    # Build the children up front: a record whose children cannot be built
+                    # fails alone, exactly as its dependent insert would have
+                    record_rows = ChildRowBuffer()
+                    try:
+                        self.insert_related_records(record, cur, sink=record_rows)
+                    except Exception as e:
+                        logger.error(f"Dependent insert failed for {ir_id}; skipping record: {e}")
+                        with self.stats_lock:
+                            self.stats['total_ir_failed'] += 1
+                            self.stats['errors'].append(f"IR {ir_id}: dependent insert failed ({e})")
+                        continue
+                    child_rows.merge(record_rows)
+                    (to_update if existing else to_insert).append(record)
+
+                pending = to_insert + to_update
+                if not pending:
+                    conn.commit()
+                    return []
+
+                try:
+                    for record in to_insert:
+                        self.insert_main_record(record, cur, is_update=False)
+                    for record in to_update:
+                        self.insert_main_record(record, cur, is_update=True)
+                    self.delete_related_records_bulk(
+                        [record['INTERROGATION_REPORT_ID'] for record in to_update], cur
+                    )
+                    self.copy_related_rows(child_rows, cur)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.warning(f"⚠️  Batched write failed for {len(pending)} IRs, falling back to per-record mode: {e}")
+                    return pending
+
+        with self.stats_lock:
+            self.stats['total_ir_inserted'] += len(to_insert)
+            self.stats['total_ir_updated'] += len(to_update)
+        logger.debug(f"Batched write: {len(to_insert)} inserted, {len(to_update)} updated, "
+                     f"{len(child_rows.statements)} child tables loaded")
+        return []
+
+    def write_records(self, records: List[Dict[str, Any]], label: str):
+        """Write IR records: batched per chunk when enabled, per record for whatever is left."""
+        def process_record_worker(record):
+            try:
+                with self.db_pool.get_connection_context() as conn:
+                    with conn.cursor() as cur:
+                        result = self.process_ir_record(record, conn, cur)
+                        if result:
+                            conn.commit()
+            except Exception as e:
+                logger.error(f"Worker thread error: {e}")
+                with self.stats_lock:
+                    self.stats['total_ir_failed'] += 1
+        
+        if ETL_CONFIG.get('batch_child_writes', True):
+            try:
+                records = self.process_records_batched(records)
+            except Exception as e:
+                logger.warning(f"⚠️  Batched write failed for {label}, falling back to per-record mode: {e}")
+        
+        if records:
+            requested_workers = int(os.environ.get('MAX_WORKERS', min(32, (os.cpu_count() or 1) * 4)))
+            max_workers = compute_safe_workers(self.db_pool, requested_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(process_record_worker, records))
+    
     def process_date_range(self, from_date: str, to_date: str, table_columns: Set[str] = None):
         """Process IR records for a specific date range"""
         logger.info(f"📅 Processing: {from_date} to {to_date}")
@@ -1668,23 +1896,8 @@ class InterrogationReportsETL:
         # Process each record
         with self.stats_lock:
             self.stats['total_ir_fetched'] += len(records)
-            
-        def process_record_worker(record):
-            try:
-                with self.db_pool.get_connection_context() as conn:
-                    with conn.cursor() as cur:
-                        result = self.process_ir_record(record, conn, cur)
-                        if result:
-                            conn.commit()
-            except Exception as e:
-                logger.error(f"Worker thread error: {e}")
-                with self.stats_lock:
-                    self.stats['total_ir_failed'] += 1
         
-        requested_workers = int(os.environ.get('MAX_WORKERS', min(32, (os.cpu_count() or 1) * 4)))
-        max_workers = compute_safe_workers(self.db_pool, requested_workers)
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            list(executor.map(process_record_worker, records))
+        self.write_records(records, f"{from_date} to {to_date}")
         
         with self.stats_lock:
             # Calculate chunk statistics
@@ -2,6 +2,7 @@
 
 from env_utils import (
     get_bool_env,
+    get_float_env,
     get_int_env,
     load_repo_environment,
     resolve_api_base_url,
@@ -57,6 +58,15 @@ PERSON_GENDER_CONFIG = {
     'preserve_valid_api': get_bool_env('PERSON_GENDER_PRESERVE_VALID_API', True),
 }
 
+# Write-behind batching: fetched persons are buffered and written with one multi-row
+# upsert every flush_rows rows or flush_seconds seconds (ignored in gender dry-run mode).
+PERSON_BATCH_CONFIG = {
+    'write_behind': get_bool_env('PERSONS_WRITE_BEHIND', True),
+    'flush_rows': get_int_env('PERSONS_FLUSH_ROWS', 500),
+    'flush_seconds': get_float_env('PERSONS_FLUSH_SECONDS', 5.0),
+    'id_batch_size': get_int_env('PERSONS_ID_BATCH_SIZE', 1000),
+}
+
 
 def _table_name(env_key: str, default: str) -> str:
     return resolve_table_name(env_key, default)
@@ -12,7 +12,7 @@ import re
 import json
 import requests
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 from datetime import datetime, timezone, timedelta
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -22,8 +22,10 @@ from typing import Dict, Optional, List, Set, Tuple, Any
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from db_pooling import PostgreSQLConnectionPool, compute_safe_workers
+from etl_incremental import batched
 
-from config import DB_CONFIG, API_CONFIG, LOG_CONFIG, TABLE_CONFIG, PERSON_GENDER_CONFIG
+from config import DB_CONFIG, API_CONFIG, LOG_CONFIG, TABLE_CONFIG, PERSON_GENDER_CONFIG, PERSON_BATCH_CONFIG
+from api_client import get_api_client
 
 # IST timezone offset (UTC+05:30)
 IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
@@ -47,6 +49,44 @@ def get_yesterday_end_ist() -> str:
 ACCUSED_TABLE = TABLE_CONFIG.get('accused', 'accused')
 PERSONS_TABLE = TABLE_CONFIG.get('persons', 'persons')
 
+# Columns written by the persons INSERT/UPDATE, in statement order (UPDATE skips person_id)
+PERSON_UPSERT_COLUMNS = [
+    'person_id', 'name', 'surname', 'alias', 'full_name',
+    'relation_type', 'relative_name', 'gender', 'is_died',
+    'date_of_birth', 'age', 'occupation',
+    'education_qualification', 'caste', 'sub_caste', 'religion',
+    'nationality', 'designation', 'place_of_work',
+    'present_house_no', 'present_street_road_no', 'present_ward_colony',
+    'present_landmark_milestone', 'present_locality_village', 'present_area_mandal',
+    'present_district', 'present_state_ut', 'present_country', 'present_residency_type',
+    'present_pin_code', 'present_jurisdiction_ps',
+    'permanent_house_no', 'permanent_street_road_no', 'permanent_ward_colony',
+    'permanent_landmark_milestone', 'permanent_locality_village', 'permanent_area_mandal',
+    'permanent_district', 'permanent_state_ut', 'permanent_country', 'permanent_residency_type',
+    'permanent_pin_code', 'permanent_jurisdiction_ps',
+    'phone_number', 'country_code', 'email_id',
+    'date_created', 'date_modified'
+]
+
+# Enrichment columns (added by ensure_person_enrichment_columns, written when present)
+PERSON_ENRICHMENT_COLUMNS = ['raw_full_name', 'gender_confidence', 'gender_source', 'phone_numbers']
+
+# Address columns that are only filled when the stored value is blank (never overwritten)
+PERSON_FILL_IF_BLANK_COLUMNS = {
+    'present_area_mandal', 'present_district', 'present_state_ut', 'present_country',
+    'permanent_area_mandal', 'permanent_district', 'permanent_state_ut', 'permanent_country',
+}
+
+# Placeholders for the bulk VALUES list (untyped literals would otherwise resolve to text)
+PERSON_BULK_PLACEHOLDERS = {
+    'is_died': '%s::boolean',
+    'date_of_birth': "NULLIF(%s, '')::date",
+    'age': '%s::integer',
+    'date_created': '%s::timestamp',
+    'date_modified': '%s::timestamp',
+    'gender_confidence': '%s::numeric',
+}
+
 # Setup logging
 handler = colorlog.StreamHandler()
 handler.setFormatter(colorlog.ColoredFormatter(
@@ -65,6 +105,68 @@ logger.addHandler(handler)
 logger.setLevel(LOG_CONFIG['level'])
 
 
+class PersonWriteBuffer:
+    """
+    Write-behind buffer for transformed person rows.
+
+    Worker threads add() rows as they are fetched; a batch is handed to flush_fn once
+    the buffer holds flush_rows rows or its oldest row is flush_seconds old (a
+    background thread covers the time trigger while no new rows arrive). Rows are
+    keyed by person_id, so a person buffered twice is written once (last wins).
+    """
+
+    def __init__(self, flush_fn, flush_rows: int = 500, flush_seconds: float = 5.0):
+        self.flush_fn = flush_fn
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = max(0.1, float(flush_seconds))
+        self._rows: Dict[str, Tuple[Dict, Dict]] = {}
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = threading.Thread(target=self._flush_on_timer, name='persons-write-behind', daemon=True)
+        self._timer.start()
+
+    def _take(self) -> List[Tuple[Dict, Dict]]:
+        batch = list(self._rows.values())
+        self._rows = {}
+        self._oldest = None
+        return batch
+
+    def add(self, person_id: str, data: Dict, row: Dict):
+        batch = None
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows[person_id] = (data, row)
+            if len(self._rows) >= self.flush_rows:
+                batch = self._take()
+        if batch:
+            self.flush_fn(batch)
+
+    def flush(self):
+        with self._lock:
+            batch = self._take() if self._rows else None
+        if batch:
+            self.flush_fn(batch)
+
+    def _flush_on_timer(self):
+        while not self._stop.wait(min(1.0, self.flush_seconds / 2)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.flush_seconds
+                batch = self._take() if due else None
+            if batch:
+                try:
+                    self.flush_fn(batch)
+                except Exception as e:
+                    logger.error(f"❌ Timed flush of {len(batch)} persons failed: {e}")
+
+    def close(self):
+        """Stop the timer thread and write whatever is still buffered."""
+        self._stop.set()
+        self._timer.join()
+        self.flush()
+
+
 class PersonsETL:
     def __init__(self):
         self.db_pool = None
@@ -987,7 +1089,7 @@ class PersonsETL:
         for attempt in range(API_CONFIG['max_retries']):
             try:
                 logger.debug(f"Fetching person details for {person_id} (Attempt {attempt + 1})")
-                resp = requests.get(url, params=params, headers=headers, timeout=API_CONFIG['timeout'])
+                resp = get_api_client().get(url, params=params, headers=headers, timeout=API_CONFIG['timeout'])
                 
                 if resp.status_code == 200:
                     data = resp.json()
@@ -1014,10 +1116,10 @@ class PersonsETL:
                         self.stats['no_data'] += 1
                     return None
                 else:
-                    # Other status codes - retry
-                    logger.warning(f"API returned status code {resp.status_code}... waiting 60s before retrying")
+                    # Other status codes - retry (a down API is paused centrally by the client's circuit breaker)
+                    logger.warning(f"API returned status code {resp.status_code} for person {person_id}, retrying...")
                     if attempt < API_CONFIG['max_retries'] - 1:
-                        time.sleep(60)
+                        get_api_client().backoff(attempt)
                     
             except requests.exceptions.Timeout:
                 logger.warning(f"API timeout for person {person_id}, retrying... (Attempt {attempt + 1}/{API_CONFIG['max_retries']})")
@@ -1053,7 +1155,8 @@ class PersonsETL:
             return value[:max_length]
         return value
 
-    def upsert_person(self, d: Dict, table_columns: Set[str], conn, cursor):
+    def transform_person(self, d: Dict) -> Dict[str, Any]:
+        """Map a person-details API payload to persons column values (PERSON_UPSERT_COLUMNS + enrichment)."""
         p = d or {}
         personal = p.get('PERSONAL_DETAILS') or {}
         present = p.get('PRESENT_ADDRESS') or {}
@@ -1095,6 +1198,77 @@ class PersonsETL:
         primary_phone = self.truncate_string(normalized_phone_numbers[0], 20, 'phone_number') if normalized_phone_numbers else None
         phone_numbers_value = self.truncate_string(' | '.join(normalized_phone_numbers), 500, 'phone_numbers') if normalized_phone_numbers else None
 
+        return {
+            'person_id': person_id,
+            'name': self.truncate_string(personal.get('NAME'), 255, 'name'),
+            'surname': self.truncate_string(personal.get('SURNAME'), 255, 'surname'),
+            'alias': self.truncate_string(personal.get('ALIAS'), 255, 'alias'),
+            'full_name': clean_full_name,
+            'relation_type': self.truncate_string(personal.get('RELATION_TYPE'), 50, 'relation_type'),
+            'relative_name': self.truncate_string(personal.get('RELATIVE_NAME'), 255, 'relative_name'),
+            'gender': resolved_gender,
+            'is_died': personal.get('IS_DIED'),
+            'date_of_birth': personal.get('DATE_OF_BIRTH'),
+            'age': age_value,
+            'occupation': self.truncate_string(personal.get('OCCUPATION'), 255, 'occupation'),
+            'education_qualification': self.truncate_string(personal.get('EDUCATION_QUALIFICATION'), 255, 'education_qualification'),
+            'caste': self.truncate_string(personal.get('CASTE'), 100, 'caste'),
+            'sub_caste': self.truncate_string(personal.get('SUB_CASTE'), 100, 'sub_caste'),
+            'religion': self.truncate_string(personal.get('RELIGION'), 100, 'religion'),
+            'nationality': self.truncate_string(personal.get('NATIONALITY'), 100, 'nationality'),
+            'designation': self.truncate_string(personal.get('DESIGNATION'), 255, 'designation'),
+            'place_of_work': self.truncate_string(personal.get('PLACE_OF_WORK'), 500, 'place_of_work'),
+            'present_house_no': self.truncate_string(present.get('HOUSE_NO'), 255, 'present_house_no'),
+            'present_street_road_no': self.truncate_string(present.get('STREET_ROAD_NO'), 255, 'present_street_road_no'),
+            'present_ward_colony': self.truncate_string(present.get('WARD_COLONY'), 255, 'present_ward_colony'),
+            'present_landmark_milestone': self.truncate_string(present.get('LANDMARK_MILESTONE'), 255, 'present_landmark_milestone'),
+            'present_locality_village': self.truncate_string(present.get('LOCALITY_VILLAGE'), 255, 'present_locality_village'),
+            'present_area_mandal': self.truncate_string(present.get('AREA_MANDAL'), 255, 'present_area_mandal'),
+            'present_district': self.truncate_string(present.get('DISTRICT'), 255, 'present_district'),
+            'present_state_ut': self.truncate_string(present.get('STATE_UT'), 255, 'present_state_ut'),
+            'present_country': self.truncate_string(present.get('COUNTRY'), 255, 'present_country'),
+            'present_residency_type': self.truncate_string(present.get('RESIDENCY_TYPE'), 100, 'present_residency_type'),
+            'present_pin_code': self.truncate_string(present.get('PIN_CODE'), 20, 'present_pin_code'),
+            'present_jurisdiction_ps': self.truncate_string(present.get('JURISDICTION_PS'), 20, 'present_jurisdiction_ps'),
+            'permanent_house_no': self.truncate_string(permanent.get('HOUSE_NO'), 255, 'permanent_house_no'),
+            'permanent_street_road_no': self.truncate_string(permanent.get('STREET_ROAD_NO'), 255, 'permanent_street_road_no'),
+            'permanent_ward_colony': self.truncate_string(permanent.get('WARD_COLONY'), 255, 'permanent_ward_colony'),
+            'permanent_landmark_milestone': self.truncate_string(permanent.get('LANDMARK_MILESTONE'), 255, 'permanent_landmark_milestone'),
+            'permanent_locality_village': self.truncate_string(permanent.get('LOCALITY_VILLAGE'), 255, 'permanent_locality_village'),
+            'permanent_area_mandal': self.truncate_string(permanent.get('AREA_MANDAL'), 255, 'permanent_area_mandal'),
+            'permanent_district': self.truncate_string(permanent.get('DISTRICT'), 255, 'permanent_district'),
+            'permanent_state_ut': self.truncate_string(permanent.get('STATE_UT'), 255, 'permanent_state_ut'),
+            'permanent_country': self.truncate_string(permanent.get('COUNTRY'), 255, 'permanent_country'),
+            'permanent_residency_type': self.truncate_string(permanent.get('RESIDENCY_TYPE'), 100, 'permanent_residency_type'),
+            'permanent_pin_code': self.truncate_string(permanent.get('PIN_CODE'), 20, 'permanent_pin_code'),
+            'permanent_jurisdiction_ps': self.truncate_string(permanent.get('JURISDICTION_PS'), 20, 'permanent_jurisdiction_ps'),
+            'phone_number': primary_phone,
+            'country_code': self.truncate_string(contact.get('COUNTRY_CODE'), 10, 'country_code'),
+            'email_id': self.truncate_string(contact.get('EMAIL_ID'), 255, 'email_id'),
+            'date_created': date_created,
+            'date_modified': date_modified,
+            'raw_full_name': raw_full_name_value,
+            'gender_confidence': gender_confidence,
+            'gender_source': gender_source,
+            'phone_numbers': phone_numbers_value,
+        }
+
+    def upsert_person(self, d: Dict, table_columns: Set[str], conn, cursor):
+        p = d or {}
+        personal = p.get('PERSONAL_DETAILS') or {}
+        present = p.get('PRESENT_ADDRESS') or {}
+        permanent = p.get('PERMANENT_ADDRESS') or {}
+        contact = p.get('CONTACT_DETAILS') or {}
+
+        row = self.transform_person(p)
+        person_id = row['person_id']
+        clean_full_name = row['full_name']
+        raw_full_name_value = row['raw_full_name']
+        resolved_gender = row['gender']
+        gender_confidence = row['gender_confidence']
+        gender_source = row['gender_source']
+        phone_numbers_value = row['phone_numbers']
+
         try:
             if self.person_gender_dry_run:
                 self.handle_dry_run(
@@ -1110,7 +1284,7 @@ class PersonsETL:
                 )
                 return
 
-            cursor.execute(f"SELECT 1 FROM {PERSONS_TABLE} WHERE person_id = %s", (p.get('PERSON_ID'),))
+            cursor.execute(f"SELECT 1 FROM {PERSONS_TABLE} WHERE person_id = %s", (person_id,))
             exists = cursor.fetchone() is not None
 
             if exists:
@@ -1199,54 +1373,7 @@ class PersonsETL:
                         date_modified=COALESCE(%s, date_modified)
                     WHERE person_id=%s
                     """,
-                    (
-                        self.truncate_string(personal.get('NAME'), 255, 'name'),
-                        self.truncate_string(personal.get('SURNAME'), 255, 'surname'),
-                        self.truncate_string(personal.get('ALIAS'), 255, 'alias'),
-                        clean_full_name,
-                        self.truncate_string(personal.get('RELATION_TYPE'), 50, 'relation_type'),
-                        self.truncate_string(personal.get('RELATIVE_NAME'), 255, 'relative_name'),
-                        resolved_gender,
-                        personal.get('IS_DIED'),
-                        personal.get('DATE_OF_BIRTH'), age_value,
-                        self.truncate_string(personal.get('OCCUPATION'), 255, 'occupation'),
-                        self.truncate_string(personal.get('EDUCATION_QUALIFICATION'), 255, 'education_qualification'),
-                        self.truncate_string(personal.get('CASTE'), 100, 'caste'),
-                        self.truncate_string(personal.get('SUB_CASTE'), 100, 'sub_caste'),
-                        self.truncate_string(personal.get('RELIGION'), 100, 'religion'),
-                        self.truncate_string(personal.get('NATIONALITY'), 100, 'nationality'),
-                        self.truncate_string(personal.get('DESIGNATION'), 255, 'designation'),
-                        self.truncate_string(personal.get('PLACE_OF_WORK'), 500, 'place_of_work'),
-                        self.truncate_string(present.get('HOUSE_NO'), 255, 'present_house_no'),
-                        self.truncate_string(present.get('STREET_ROAD_NO'), 255, 'present_street_road_no'),
-                        self.truncate_string(present.get('WARD_COLONY'), 255, 'present_ward_colony'),
-                        self.truncate_string(present.get('LANDMARK_MILESTONE'), 255, 'present_landmark_milestone'),
-                        self.truncate_string(present.get('LOCALITY_VILLAGE'), 255, 'present_locality_village'),
-                        self.truncate_string(present.get('AREA_MANDAL'), 255, 'present_area_mandal'),
-                        self.truncate_string(present.get('DISTRICT'), 255, 'present_district'),
-                        self.truncate_string(present.get('STATE_UT'), 255, 'present_state_ut'),
-                        self.truncate_string(present.get('COUNTRY'), 255, 'present_country'),
-                        self.truncate_string(present.get('RESIDENCY_TYPE'), 100, 'present_residency_type'),
-                        self.truncate_string(present.get('PIN_CODE'), 20, 'present_pin_code'),
-                        self.truncate_string(present.get('JURISDICTION_PS'), 20, 'present_jurisdiction_ps'),
-                        self.truncate_string(permanent.get('HOUSE_NO'), 255, 'permanent_house_no'),
-                        self.truncate_string(permanent.get('STREET_ROAD_NO'), 255, 'permanent_street_road_no'),
-                        self.truncate_string(permanent.get('WARD_COLONY'), 255, 'permanent_ward_colony'),
-                        self.truncate_string(permanent.get('LANDMARK_MILESTONE'), 255, 'permanent_landmark_milestone'),
-                        self.truncate_string(permanent.get('LOCALITY_VILLAGE'), 255, 'permanent_locality_village'),
-                        self.truncate_string(permanent.get('AREA_MANDAL'), 255, 'permanent_area_mandal'),
-                        self.truncate_string(permanent.get('DISTRICT'), 255, 'permanent_district'),
-                        self.truncate_string(permanent.get('STATE_UT'), 255, 'permanent_state_ut'),
-                        self.truncate_string(permanent.get('COUNTRY'), 255, 'permanent_country'),
-                        self.truncate_string(permanent.get('RESIDENCY_TYPE'), 100, 'permanent_residency_type'),
-                        self.truncate_string(permanent.get('PIN_CODE'), 20, 'permanent_pin_code'),
-                        self.truncate_string(permanent.get('JURISDICTION_PS'), 20, 'permanent_jurisdiction_ps'),
-                        primary_phone,
-                        self.truncate_string(contact.get('COUNTRY_CODE'), 10, 'country_code'),
-                        self.truncate_string(contact.get('EMAIL_ID'), 255, 'email_id'),
-                        date_created, date_modified,
-                        person_id
-                    )
+                    tuple(row[col] for col in PERSON_UPSERT_COLUMNS[1:]) + (person_id,)
                 )
 
                 self.apply_person_enrichment(
@@ -1301,54 +1428,7 @@ class PersonsETL:
                         %s, %s
                     )
                     """,
-                    (
-                        person_id,
-                        self.truncate_string(personal.get('NAME'), 255, 'name'),
-                        self.truncate_string(personal.get('SURNAME'), 255, 'surname'),
-                        self.truncate_string(personal.get('ALIAS'), 255, 'alias'),
-                        clean_full_name,
-                        self.truncate_string(personal.get('RELATION_TYPE'), 50, 'relation_type'),
-                        self.truncate_string(personal.get('RELATIVE_NAME'), 255, 'relative_name'),
-                        resolved_gender,
-                        personal.get('IS_DIED'),
-                        personal.get('DATE_OF_BIRTH'), age_value,
-                        self.truncate_string(personal.get('OCCUPATION'), 255, 'occupation'),
-                        self.truncate_string(personal.get('EDUCATION_QUALIFICATION'), 255, 'education_qualification'),
-                        self.truncate_string(personal.get('CASTE'), 100, 'caste'),
-                        self.truncate_string(personal.get('SUB_CASTE'), 100, 'sub_caste'),
-                        self.truncate_string(personal.get('RELIGION'), 100, 'religion'),
-                        self.truncate_string(personal.get('NATIONALITY'), 100, 'nationality'),
-                        self.truncate_string(personal.get('DESIGNATION'), 255, 'designation'),
-                        self.truncate_string(personal.get('PLACE_OF_WORK'), 500, 'place_of_work'),
-                        self.truncate_string(present.get('HOUSE_NO'), 255, 'present_house_no'),
-                        self.truncate_string(present.get('STREET_ROAD_NO'), 255, 'present_street_road_no'),
-                        self.truncate_string(present.get('WARD_COLONY'), 255, 'present_ward_colony'),
-                        self.truncate_string(present.get('LANDMARK_MILESTONE'), 255, 'present_landmark_milestone'),
-                        self.truncate_string(present.get('LOCALITY_VILLAGE'), 255, 'present_locality_village'),
-                        self.truncate_string(present.get('AREA_MANDAL'), 255, 'present_area_mandal'),
-                        self.truncate_string(present.get('DISTRICT'), 255, 'present_district'),
-                        self.truncate_string(present.get('STATE_UT'), 255, 'present_state_ut'),
-                        self.truncate_string(present.get('COUNTRY'), 255, 'present_country'),
-                        self.truncate_string(present.get('RESIDENCY_TYPE'), 100, 'present_residency_type'),
-                        self.truncate_string(present.get('PIN_CODE'), 20, 'present_pin_code'),
-                        self.truncate_string(present.get('JURISDICTION_PS'), 20, 'present_jurisdiction_ps'),
-                        self.truncate_string(permanent.get('HOUSE_NO'), 255, 'permanent_house_no'),
-                        self.truncate_string(permanent.get('STREET_ROAD_NO'), 255, 'permanent_street_road_no'),
-                        self.truncate_string(permanent.get('WARD_COLONY'), 255, 'permanent_ward_colony'),
-                        self.truncate_string(permanent.get('LANDMARK_MILESTONE'), 255, 'permanent_landmark_milestone'),
-                        self.truncate_string(permanent.get('LOCALITY_VILLAGE'), 255, 'permanent_locality_village'),
-                        self.truncate_string(permanent.get('AREA_MANDAL'), 255, 'permanent_area_mandal'),
-                        self.truncate_string(permanent.get('DISTRICT'), 255, 'permanent_district'),
-                        self.truncate_string(permanent.get('STATE_UT'), 255, 'permanent_state_ut'),
-                        self.truncate_string(permanent.get('COUNTRY'), 255, 'permanent_country'),
-                        self.truncate_string(permanent.get('RESIDENCY_TYPE'), 100, 'permanent_residency_type'),
-                        self.truncate_string(permanent.get('PIN_CODE'), 20, 'permanent_pin_code'),
-                        self.truncate_string(permanent.get('JURISDICTION_PS'), 20, 'permanent_jurisdiction_ps'),
-                        primary_phone,
-                        self.truncate_string(contact.get('COUNTRY_CODE'), 10, 'country_code'),
-                        self.truncate_string(contact.get('EMAIL_ID'), 255, 'email_id'),
-                        date_created, date_modified
-                    )
+                    tuple(row[col] for col in PERSON_UPSERT_COLUMNS)
                 )
 
                 self.apply_person_enrichment(
@@ -1376,6 +1456,90 @@ class PersonsETL:
                 self.stats['failed'] += 1
                 self.stats['errors'] += 1
 
+    def bulk_upsert_persons(self, batch: List[Tuple[Dict, Dict]], table_columns: Set[str], conn, cursor):
+        """
+        Upsert a batch of (api_payload, transformed_row) pairs in a single statement.
+
+        Same merge rules as upsert_person: COALESCE keeps stored values when the API
+        sends NULL, and the area/district/state/country columns are only filled when
+        blank. RETURNING (xmax = 0) separates inserts from updates. Commits once;
+        raises on DB error so the caller can fall back to upsert_person.
+        """
+        if not batch:
+            return
+
+        columns = PERSON_UPSERT_COLUMNS + [c for c in PERSON_ENRICHMENT_COLUMNS if c in (table_columns or ())]
+        column_list = ", ".join(columns)
+        placeholders = ", ".join(PERSON_BULK_PLACEHOLDERS.get(col, "%s") for col in columns)
+        set_clauses = []
+        for col in columns[1:]:
+            if col in PERSON_FILL_IF_BLANK_COLUMNS:
+                set_clauses.append(
+                    f"{col} = CASE WHEN NULLIF(TRIM(t.{col}), '') IS NULL "
+                    f"THEN COALESCE(NULLIF(TRIM(EXCLUDED.{col}), ''), t.{col}) ELSE t.{col} END"
+                )
+            else:
+                set_clauses.append(f"{col} = COALESCE(EXCLUDED.{col}, t.{col})")
+
+        upsert_query = f"""
+            INSERT INTO {PERSONS_TABLE} AS t ({column_list})
+            VALUES %s
+            ON CONFLICT (person_id) DO UPDATE SET
+                {', '.join(set_clauses)}
+            RETURNING person_id, (xmax = 0) AS inserted
+        """
+        values = [tuple(row[col] for col in columns) for _data, row in batch]
+        returned = execute_values(
+            cursor, upsert_query, values,
+            template=f"({placeholders})", page_size=len(values), fetch=True
+        ) or []
+
+        # Columns added via schema evolution are still written per person, inside the same transaction
+        if table_columns:
+            for data, row in batch:
+                self.update_new_fields(
+                    row['person_id'], data, data.get('PERSONAL_DETAILS') or {},
+                    data.get('PRESENT_ADDRESS') or {}, data.get('PERMANENT_ADDRESS') or {},
+                    data.get('CONTACT_DETAILS') or {}, table_columns, cursor
+                )
+        conn.commit()
+
+        inserted = sum(1 for _pid, was_inserted in returned if was_inserted)
+        with self.stats_lock:
+            self.stats['inserted'] += inserted
+            self.stats['updated'] += len(returned) - inserted
+
+    def flush_person_rows(self, batch: List[Tuple[Dict, Dict]], table_columns: Set[str]):
+        """Write-behind flush: bulk upsert with transient-error retries, per-person fallback otherwise."""
+        db_retry_attempts = int(os.environ.get('DB_WRITE_MAX_RETRIES', '3'))
+        for db_attempt in range(db_retry_attempts):
+            try:
+                with self.db_pool.get_connection_context() as conn:
+                    cursor = conn.cursor()
+                    try:
+                        self.bulk_upsert_persons(batch, table_columns, conn, cursor)
+                        logger.debug(f"💾 Flushed {len(batch)} persons in one upsert")
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                        raise
+                    except Exception as e:
+                        conn.rollback()
+                        logger.warning(f"⚠️  Bulk upsert of {len(batch)} persons failed ({e}); falling back to per-person upserts")
+                        for data, _row in batch:
+                            self.upsert_person(data, table_columns, conn, cursor)
+                return
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as db_err:
+                if db_attempt == db_retry_attempts - 1:
+                    logger.error(f"❌ Failed to flush {len(batch)} persons: {db_err}")
+                    with self.stats_lock:
+                        self.stats['failed'] += len(batch)
+                        self.stats['errors'] += 1
+                    return
+                logger.warning(
+                    f"Transient DB error flushing {len(batch)} persons, retrying "
+                    f"({db_attempt + 1}/{db_retry_attempts}): {db_err}"
+                )
+                time.sleep(2 ** db_attempt)
+
     def run(self):
         logger.info("=" * 80)
         logger.info("🚀 DOPAMAS ETL Pipeline - Person Details API")
@@ -1438,6 +1602,21 @@ class PersonsETL:
             
             batch_size = 100  # Log batch stats every 100 records
             first_record_processed = False
+
+            # Write-behind mode: rows are buffered and flushed with one multi-row upsert
+            # (dry-run keeps the per-person path, which only logs would-be changes)
+            write_buffer = None
+            if PERSON_BATCH_CONFIG.get('write_behind', True) and not self.person_gender_dry_run:
+                write_buffer = PersonWriteBuffer(
+                    lambda batch: self.flush_person_rows(batch, table_columns),
+                    flush_rows=PERSON_BATCH_CONFIG.get('flush_rows', 500),
+                    flush_seconds=PERSON_BATCH_CONFIG.get('flush_seconds', 5.0),
+                )
+                logger.info(
+                    f"💾 Write-behind enabled: flush every {write_buffer.flush_rows} rows "
+                    f"or {write_buffer.flush_seconds:g}s"
+                )
+            id_batch_size = max(1, PERSON_BATCH_CONFIG.get('id_batch_size', 1000))
             
             def process_person(pid, table_columns, from_date, to_date):
                 nonlocal first_record_processed
@@ -1459,7 +1638,11 @@ class PersonsETL:
                                     # Update existing records with new fields
                                     self.update_existing_records_with_new_fields(new_fields)
                                 first_record_processed = True
-                    
+
+                    if write_buffer is not None:
+                        write_buffer.add(pid, data, self.transform_person(data))
+                        return
+
                     db_retry_attempts = int(os.environ.get('DB_WRITE_MAX_RETRIES', '3'))
                     for db_attempt in range(db_retry_attempts):
                         try:
@@ -1482,44 +1665,54 @@ class PersonsETL:
             requested_workers = int(os.environ.get('MAX_WORKERS', min(32, (os.cpu_count() or 1) * 4)))
             max_workers = compute_safe_workers(self.db_pool, requested_workers)
 
-            for from_date, to_date in tqdm(date_ranges, desc="Processing date ranges", unit="range"):
-                window_person_ids = self.get_person_ids_for_window(from_date, to_date)
-                window_person_ids = [pid for pid in window_person_ids if pid not in processed_person_ids]
-
-                if not window_person_ids:
-                    continue
+            # One executor for the whole run: person_ids are fetched concurrently over the
+            # shared API client's keep-alive pool, one id batch at a time
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                for from_date, to_date in tqdm(date_ranges, desc="Processing date ranges", unit="range"):
+                    window_person_ids = [
+                        pid for pid in dict.fromkeys(self.get_person_ids_for_window(from_date, to_date))
+                        if pid not in processed_person_ids
+                    ]
 
-                for pid in window_person_ids:
-                    processed_person_ids.add(pid)
+                    if not window_person_ids:
+                        continue
 
-                with self.stats_lock:
-                    self.stats['person_ids'] += len(window_person_ids)
+                    processed_person_ids.update(window_person_ids)
 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {
-                        executor.submit(process_person, pid, table_columns, from_date, to_date): pid
-                        for pid in window_person_ids
-                    }
+                    with self.stats_lock:
+                        self.stats['person_ids'] += len(window_person_ids)
 
                     with tqdm(total=len(window_person_ids), desc=f"Persons {from_date} to {to_date}", unit="person", leave=False) as pbar:
-                        for idx, future in enumerate(as_completed(futures), 1):
-                            pid = futures[future]
-                            try:
-                                future.result()
-                            except Exception as e:
-                                logger.error(f"Error processing person {pid}: {e}")
-                                with self.stats_lock:
-                                    self.stats['failed'] += 1
-                                    self.stats['errors'] += 1
-
-                            pbar.update(1)
-                            if idx % batch_size == 0:
-                                with self.stats_lock:
-                                    logger.info(
-                                        f"   📊 Progress ({from_date} to {to_date}): {idx}/{len(window_person_ids)} - "
-                                        f"Inserted: {self.stats['inserted']}, Updated: {self.stats['updated']}, "
-                                        f"Failed: {self.stats['failed']}"
-                                    )
+                        idx = 0
+                        for id_batch in batched(window_person_ids, id_batch_size):
+                            futures = {
+                                executor.submit(process_person, pid, table_columns, from_date, to_date): pid
+                                for pid in id_batch
+                            }
+                            for future in as_completed(futures):
+                                idx += 1
+                                pid = futures[future]
+                                try:
+                                    future.result()
+                                except Exception as e:
+                                    logger.error(f"Error processing person {pid}: {e}")
+                                    with self.stats_lock:
+                                        self.stats['failed'] += 1
+                                        self.stats['errors'] += 1
+
+                                pbar.update(1)
+                                if idx % batch_size == 0:
+                                    with self.stats_lock:
+                                        logger.info(
+                                            f"   📊 Progress ({from_date} to {to_date}): {idx}/{len(window_person_ids)} - "
+                                            f"Inserted: {self.stats['inserted']}, Updated: {self.stats['updated']}, "
+                                            f"Failed: {self.stats['failed']}"
+                                        )
+            finally:
+                executor.shutdown(wait=True)
+                if write_buffer is not None:
+                    write_buffer.close()
 
             # Get database counts
             with self.db_pool.get_connection_context() as conn:
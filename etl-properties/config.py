@@ -33,6 +33,8 @@ ETL_CONFIG = {
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
     'batch_size': 100,
+    # Resolvable pending-FK rows reprocessed (and marked resolved) per round trip
+    'pending_fk_batch_size': get_int_env('PENDING_FK_BATCH_SIZE', 500),
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
 
@@ -25,10 +25,12 @@ try:
     from db_pooling import PostgreSQLConnectionPool, compute_safe_workers
 except ImportError:
     pass
+from etl_incremental import generate_date_ranges as shared_generate_date_ranges
 
 import json
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 
 # IST timezone offset (UTC+05:30)
 IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
@@ -240,67 +242,79 @@ class PropertiesETL:
 
     def retry_pending_fk(self):
         """
-        Retry all unresolved pending FK records.
-        For each, check if crime_id now exists in crimes. If so, process normally.
+        Retry unresolved pending FK records whose crime_id now exists.
+
+        Resolvable rows are found by joining the pending table against crimes, reprocessed
+        in batches on one connection and marked resolved with one UPDATE per batch. Rows
+        whose crime is still missing are only counted, so they cost nothing per run.
         """
         logger.info("")
         logger.info("=" * 80)
         logger.info("🔄 Retrying pending FK records...")
 
+        batch_size = ETL_CONFIG.get('pending_fk_batch_size', 500)
         try:
-            # Fetch all unresolved pending records
             with self.db_pool.get_connection_context() as conn:
                 with conn.cursor() as cur:
                     cur.execute(f"""
-                        SELECT id, property_id, crime_id, raw_data, retry_count
-                        FROM {PENDING_FK_TABLE}
-                        WHERE resolved = FALSE
-                        ORDER BY created_at
+                        SELECT
+                            COUNT(*),
+                            COUNT(*) FILTER (WHERE EXISTS (
+                                SELECT 1 FROM {CRIMES_TABLE} c WHERE c.crime_id = p.crime_id
+                            ))
+                        FROM {PENDING_FK_TABLE} p
+                        WHERE p.resolved = FALSE
                     """)
-                    pending_rows = cur.fetchall()
+                    total_pending, resolvable = cur.fetchone()
 
-            if not pending_rows:
+            if not total_pending:
                 logger.info("ℹ️  No pending FK records to retry")
                 return
 
-            logger.info(f"📊 Found {len(pending_rows)} pending FK records to retry")
+            logger.info(f"📊 Found {total_pending} pending FK records, {resolvable} with crime_id now present")
 
             resolved_count = 0
-            still_missing = 0
-
-            for row_id, property_id, crime_id, raw_data, retry_count in pending_rows:
-                try:
-                    with self.db_pool.get_connection_context() as conn:
-                        with conn.cursor() as cur:
-                            if crime_id in self.crime_ids:
-                                # Crime now exists — process the property
+            last_id = 0
+            while True:
+                with self.db_pool.get_connection_context() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(f"""
+                            SELECT p.id, p.property_id, p.crime_id, p.raw_data
+                            FROM {PENDING_FK_TABLE} p
+                            WHERE p.resolved = FALSE
+                              AND p.id > %s
+                              AND EXISTS (SELECT 1 FROM {CRIMES_TABLE} c WHERE c.crime_id = p.crime_id)
+                            ORDER BY p.id
+                            LIMIT %s
+                        """, (last_id, batch_size))
+                        batch = cur.fetchall()
+                        if not batch:
+                            break
+                        last_id = batch[-1][0]
+
+                        for row_id, property_id, crime_id, raw_data in batch:
+                            # Crime now exists — process the property (each success commits
+                            # on its own; insert_property rolls back only its own work)
+                            try:
                                 prop = self.transform_property(raw_data)
-                                success = self.insert_property(prop, conn, cur)
-                                if success:
+                                if self.insert_property(prop, conn, cur):
                                     conn.commit()
-                                # Mark as resolved regardless (avoid infinite re-inserts on data issues)
-                                cur.execute(f"""
-                                    UPDATE {PENDING_FK_TABLE}
-                                    SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP,
-                                        last_retry_at = CURRENT_TIMESTAMP, retry_count = %s
-                                    WHERE id = %s
-                                """, (retry_count + 1, row_id))
-                                conn.commit()
-                                resolved_count += 1
-                                logger.debug(f"✅ Resolved pending property {property_id}")
-                            else:
-                                # Still missing — bump retry count
-                                cur.execute(f"""
-                                    UPDATE {PENDING_FK_TABLE}
-                                    SET last_retry_at = CURRENT_TIMESTAMP, retry_count = %s
-                                    WHERE id = %s
-                                """, (retry_count + 1, row_id))
-                                conn.commit()
-                                still_missing += 1
-                except Exception as e:
-                    logger.error(f"Error retrying pending property {property_id}: {e}")
-                    still_missing += 1
+                            except Exception as e:
+                                conn.rollback()
+                                logger.error(f"Error retrying pending property {property_id}: {e}")
+
+                        # Mark as resolved regardless (avoid infinite re-inserts on data issues)
+                        cur.execute(f"""
+                            UPDATE {PENDING_FK_TABLE}
+                            SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP,
+                                last_retry_at = CURRENT_TIMESTAMP, retry_count = retry_count + 1
+                            WHERE id = ANY(%s)
+                        """, ([row[0] for row in batch],))
+                        conn.commit()
+                resolved_count += len(batch)
+                logger.debug(f"✅ Resolved {len(batch)} pending properties (up to id {last_id})")
 
+            still_missing = total_pending - resolved_count
             with self.stats_lock:
                 self.stats['total_retried_ok'] = resolved_count
                 self.stats['total_retried_still_missing'] = still_missing
@@ -462,47 +476,10 @@ class PropertiesETL:
     
     def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
         """
-        Generate date ranges in chunks with overlap to ensure no data is missed
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records
-        
-        Args:
-            start_date: Start date in YYYY-MM-DD format
-            end_date: End date in YYYY-MM-DD format
-            chunk_days: Number of days per chunk
-            overlap_days: Number of days to overlap between chunks (default: 1 to ensure no data loss)
-        
-        Returns:
-            List of (from_date, to_date) tuples in YYYY-MM-DD format
+        Generate overlapping date ranges in chunks (shared implementation in etl_incremental).
+        Returns (from_date, to_date) tuples as YYYY-MM-DD.
         """
-        date_ranges = []
-        current_date = parse_iso_date(start_date).date()
-        end = parse_iso_date(end_date).date()
-        
-        while current_date <= end:
-            chunk_end = current_date + timedelta(days=chunk_days - 1)
-            if chunk_end > end:
-                chunk_end = end
-            
-            # Always add the range, even if it's less than chunk_days (handles partial chunks)
-            date_ranges.append((
-                current_date.strftime('%Y-%m-%d'),
-                chunk_end.strftime('%Y-%m-%d')
-            ))
-            
-            # Next chunk starts with overlap: current chunk end - overlap_days + 1
-            # This ensures the last overlap_days of current chunk are included in next chunk
-            # Example: If chunk_end = 2022-10-05 and overlap_days = 1:
-            #   next chunk starts at 2022-10-05 - 1 + 1 = 2022-10-05 (includes day 5 in both chunks)
-            next_start = chunk_end - timedelta(days=overlap_days - 1)
-            
-            # If we've already reached or passed the end date, break
-            if chunk_end >= end:
-                break
-            
-            # Move to next chunk start
-            current_date = next_start
-        
-        return date_ranges
+        return shared_generate_date_ranges(start_date, end_date, chunk_days, overlap_days)
     
     def fetch_properties_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -527,7 +504,7 @@ class PropertiesETL:
         for attempt in range(API_CONFIG['max_retries']):
             try:
                 logger.debug(f"Fetching properties: {from_date} to {to_date} (Attempt {attempt + 1})")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers
@@ -50,6 +50,9 @@ ETL_CONFIG = {
     'end_date': '2025-12-31T23:59:59+05:30',
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
+    # Chunks fetched ahead of the DB load (bounded queue) and concurrent API fetchers
+    'prefetch_depth': get_int_env('API_PREFETCH_DEPTH', 2),
+    'fetch_workers': get_int_env('API_FETCH_WORKERS', 1),
     'batch_size': 100,
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
@@ -25,7 +25,9 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 from db_pooling import PostgreSQLConnectionPool, compute_safe_workers
+from etl_incremental import generate_date_ranges as shared_generate_date_ranges, run_chunk_pipeline
 
 try:
     from etl_fk_retry_queue import push_fk_failure, drain_fk_queue as _drain_fk_queue
@@ -464,72 +466,10 @@ class ArrestsETL:
     
     def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
         """
-        Generate date ranges in chunks with overlap to ensure no data is missed
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records
-        
-        Accepts ISO 8601 format dates (e.g., '2022-10-01T00:00:00+05:30')
-        Returns date-only format (YYYY-MM-DD) for API compatibility
-        
-        API interprets dates as:
-        - fromDate: YYYY-MM-DD 00:00:00 IST (start of day)
-        - toDate: YYYY-MM-DD 23:59:59 IST (end of day)
-        
-        Example with chunk_days=5, overlap_days=1:
-        - Chunk 1: 2022-10-01 to 2022-10-05 (2022-10-01 00:00:00 IST to 2022-10-05 23:59:59 IST)
-        - Chunk 2: 2022-10-05 to 2022-10-10 (2022-10-05 00:00:00 IST to 2022-10-10 23:59:59 IST) - overlaps by 1 day
-        - Chunk 3: 2022-10-10 to 2022-10-15 (2022-10-10 00:00:00 IST to 2022-10-15 23:59:59 IST) - overlaps by 1 day
-        - Overlap ensures no records are missed at boundaries ✅
-        
-        Note: Duplicate records from overlap are handled by smart update logic (updates only if changed)
-        
-        Args:
-            start_date: Start date in ISO 8601 format (e.g., '2022-10-01T00:00:00+05:30')
-            end_date: End date in ISO 8601 format (e.g., '2025-11-18T23:59:59+05:30')
-            chunk_days: Number of days per chunk
-            overlap_days: Number of days to overlap between chunks (default: 1 to ensure no data loss)
-        
-        Returns:
-            List of (from_date, to_date) tuples in YYYY-MM-DD format (for API compatibility)
+        Generate overlapping date ranges in chunks (shared implementation in etl_incremental).
+        Returns (from_date, to_date) tuples as YYYY-MM-DD.
         """
-        date_ranges = []
-        # Parse ISO format dates
-        current_date = parse_iso_date(start_date)
-        end = parse_iso_date(end_date)
-        
-        # Extract date part (without time) for comparison
-        current_date_only = current_date.date()
-        end_date_only = end.date()
-        
-        while current_date_only <= end_date_only:
-            # Calculate chunk end: current_date + (chunk_days - 1) days
-            # Example: If current_date = 2022-10-01 and chunk_days = 5:
-            #   chunk_end = 2022-10-01 + 4 days = 2022-10-05 (5 days total: 1,2,3,4,5)
-            chunk_end_date = current_date_only + timedelta(days=chunk_days - 1)
-            if chunk_end_date > end_date_only:
-                chunk_end_date = end_date_only
-            
-            # Return date-only format for API compatibility
-            date_ranges.append((
-                current_date_only.strftime('%Y-%m-%d'),
-                chunk_end_date.strftime('%Y-%m-%d')
-            ))
-            
-            # Next chunk starts with overlap: current chunk end - overlap_days + 1
-            # This ensures the last overlap_days of current chunk are included in next chunk
-            # Example: If chunk_end = 2022-10-05 and overlap_days = 1:
-            #   next chunk starts at 2022-10-05 - 1 + 1 = 2022-10-05 (includes day 5 in both chunks)
-            # Example: If chunk_end = 2022-10-05 and overlap_days = 2:
-            #   next chunk starts at 2022-10-05 - 2 + 1 = 2022-10-04 (includes days 4,5 in both chunks)
-            next_start = chunk_end_date - timedelta(days=overlap_days - 1)
-            
-            # If we've already reached or passed the end date, break
-            if chunk_end_date >= end_date_only:
-                break
-            
-            # Move to next chunk start
-            current_date_only = next_start
-        
-        return date_ranges
+        return shared_generate_date_ranges(start_date, end_date, chunk_days, overlap_days)
     
     def fetch_arrests_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -556,7 +496,7 @@ class ArrestsETL:
             try:
                 logger.debug(f"Fetching arrests: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.trace(f"API Request - URL: {url}, Params: {params}, Headers: {headers}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
@@ -1335,11 +1275,15 @@ class ArrestsETL:
     
     def process_date_range(self, from_date: str, to_date: str, table_columns: Set[str] = None):
         """Process arrests records for a specific date range"""
-        chunk_range = f"{from_date} to {to_date}"
-        logger.info(f"📅 Processing: {chunk_range}")
-        
         # Fetch arrests from API
         arrests_raw = self.fetch_arrests_api(from_date, to_date)
+        self.load_date_range(from_date, to_date, arrests_raw, table_columns)
+
+    def load_date_range(self, from_date: str, to_date: str, arrests_raw: Optional[List[Dict]],
+                        table_columns: Set[str] = None):
+        """Load an already fetched chunk of arrests records (None means the API fetch failed)"""
+        chunk_range = f"{from_date} to {to_date}"
+        logger.info(f"📅 Processing: {chunk_range}")
         
         if arrests_raw is None:
             logger.error(f"❌ Failed to fetch arrests for {chunk_range}")
@@ -1598,7 +1542,8 @@ class ArrestsETL:
         if _drain_fk_queue is not None:
             try:
                 with self.db_pool.get_connection_context() as _drain_conn:
-                    _drain_fk_queue(_drain_conn, 'arrests', self._retry_arrests_record)
+                    _drain_fk_queue(_drain_conn, 'arrests', self._retry_arrests_record,
+                                    references={'crime_id': CRIMES_TABLE})
                     _drain_conn.commit()
             except Exception as _de:
                 logger.warning("FK queue drain failed at startup: %s (non-fatal)", _de)
@@ -1635,11 +1580,25 @@ class ArrestsETL:
             logger.info(f"ℹ️  ETL Server Timezone: UTC")
             logger.info("")
             
-            # Process each date range with progress bar
-            for from_date, to_date in tqdm(date_ranges, desc="Processing date ranges", unit="range"):
-                # Process the chunk (will check for schema evolution and process data)
-                self.process_date_range(from_date, to_date, table_columns)
+            def fetch_chunk(from_date: str, to_date: str) -> Optional[List[Dict]]:
+                arrests_raw = self.fetch_arrests_api(from_date, to_date)
                 time.sleep(1)  # Be nice to the API
+                return arrests_raw
+
+            # Chunks are still loaded one at a time, but the API fetch of the next
+            # chunk(s) now overlaps the DB load of the current one.
+            with tqdm(total=len(date_ranges), desc="Processing date ranges", unit="range") as pbar:
+                run_chunk_pipeline(
+                    date_ranges,
+                    fetch=fetch_chunk,
+                    load=lambda from_date, to_date, arrests_raw: self.load_date_range(
+                        from_date, to_date, arrests_raw, table_columns
+                    ),
+                    prefetch_depth=ETL_CONFIG.get('prefetch_depth', 2),
+                    fetch_workers=ETL_CONFIG.get('fetch_workers', 1),
+                    load_workers=1,
+                    on_chunk_done=lambda from_date, to_date: pbar.update(1),
+                )
             
             # Get database counts
             with self.db_pool.get_connection_context() as conn:
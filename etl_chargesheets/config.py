@@ -52,6 +52,9 @@ ETL_CONFIG = {
     'chunk_days': 5,
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
     'batch_size': 100,
+    # Write chargesheets in batches: one transaction, one DELETE + multi-row INSERT per child table
+    'batch_child_writes': get_bool_env('CHARGESHEETS_BATCH_CHILD_WRITES', True),
+    'child_batch_size': get_int_env('CHARGESHEETS_CHILD_BATCH_SIZE', 50),
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
 }
 
@@ -9,7 +9,7 @@ import sys
 import time
 import requests
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 from datetime import datetime, timedelta, timezone
 from tqdm import tqdm
 import logging
@@ -20,6 +20,7 @@ import uuid
 import threading
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 # Add project root to Python path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -27,6 +28,9 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
+from etl_incremental import generate_date_ranges as shared_generate_date_ranges
+from db_pooling import PostgreSQLConnectionPool, compute_safe_workers
 
 try:
     from etl_fk_retry_queue import push_fk_failure, drain_fk_queue as _drain_fk_queue
@@ -83,6 +87,23 @@ CHARGESHEET_MEDIA_TABLE = TABLE_CONFIG.get('chargesheet_media', 'chargesheet_med
 CHARGESHEET_ACTS_SECTIONS_TABLE = TABLE_CONFIG.get('chargesheet_acts_sections', 'chargesheet_acts_sections')
 CRIMES_TABLE = TABLE_CONFIG.get('crimes', 'crimes')
 
+# Child rows written per chargesheet: key -> (table, columns, execute_values template)
+CHILD_TABLE_COLUMNS = {
+    'files': (CHARGESHEET_FILES_TABLE, ['id', 'chargesheet_id', 'file_id', 'created_at'], None),
+    'media': (CHARGESHEET_MEDIA_TABLE,
+              ['id', 'chargesheet_id', 'media_index', 'file_id', 'media_payload', 'created_at', 'date_modified'],
+              '(%s, %s, %s, %s, %s::jsonb, %s, %s)'),
+    'acts': (CHARGESHEET_ACTS_TABLE,
+             ['id', 'chargesheet_id', 'act_description', 'section', 'rw_required',
+              'section_description', 'grave_particulars', 'created_at'], None),
+    'acts_sections': (CHARGESHEET_ACTS_SECTIONS_TABLE,
+                      ['id', 'chargesheet_id', 'act_index', 'section_index', 'act_description', 'section',
+                       'rw_required', 'section_description', 'grave_particulars', 'created_at', 'date_modified'], None),
+    'accused': (CHARGESHEET_ACCUSED_TABLE,
+                ['id', 'chargesheet_id', 'accused_person_id', 'charge_status', 'requested_for_nbw',
+                 'reason_for_no_charge', 'is_person_master_present', 'created_at'], None),
+}
+
 # IST timezone offset (UTC+05:30)
 IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
 
@@ -169,6 +190,7 @@ class ChargesheetsETL:
     
     def __init__(self):
         self._local = threading.local()
+        self.db_pool = None
         self._table_columns_cache = {}
         self.stats_lock = threading.Lock()
         self.log_lock = threading.Lock()
@@ -279,44 +301,69 @@ class ChargesheetsETL:
         if hasattr(self, 'invalid_crime_id_log') and self.invalid_crime_id_log:
             self.invalid_crime_id_log.close()
     
+    def _ensure_thread_connection(self):
+        """Lease a pooled connection for this thread (replacing a closed one)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed:
+            if conn is not None:
+                self._release_thread_connection()
+            self._local.conn = self.db_pool.get_connection()
+            self._local.cursor = self._local.conn.cursor()
+
     @property
     def _conn(self):
-        if not hasattr(self._local, 'conn') or self._local.conn is None or self._local.conn.closed:
-            self._local.conn = psycopg2.connect(**DB_CONFIG)
-            self._local.cursor = self._local.conn.cursor()
+        self._ensure_thread_connection()
         return self._local.conn
 
     @property
     def _cursor(self):
-        if not hasattr(self._local, 'conn') or self._local.conn is None or self._local.conn.closed:
-            self._local.conn = psycopg2.connect(**DB_CONFIG)
-            self._local.cursor = self._local.conn.cursor()
+        self._ensure_thread_connection()
         return self._local.cursor
 
+    def _release_thread_connection(self):
+        """Return this thread's pooled connection (if any) to the pool"""
+        cursor = getattr(self._local, 'cursor', None)
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        self._local.cursor = None
+        try:
+            if cursor:
+                cursor.close()
+        except Exception:
+            pass
+        if conn is not None and self.db_pool:
+            self.db_pool.return_connection(conn, close_conn=bool(conn.closed))
+
+    @contextmanager
+    def _thread_connection(self):
+        """Lease a pooled connection as this worker thread's _conn for the duration of the block"""
+        try:
+            yield self._conn
+        finally:
+            self._release_thread_connection()
+
     def connect_db(self):
-        """Connect to PostgreSQL database (thread-local connection)"""
+        """Create the shared connection pool; each thread leases its own connection from it"""
         try:
+            self.db_pool = PostgreSQLConnectionPool(
+                minconn=5,
+                maxconn=self.max_workers + 5
+            )
             _ = self._conn
-            logger.info(f"✅ Connected to database: {DB_CONFIG['dbname']}")
+            logger.info(f"✅ Connected to database: {DB_CONFIG['dbname']} (pool maxconn={self.max_workers + 5})")
             return True
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}")
             return False
     
     def close_db(self):
-        """Close thread-local database connection"""
-        try:
-            if hasattr(self._local, 'cursor') and self._local.cursor:
-                self._local.cursor.close()
-        except Exception:
-            pass
+        """Return this thread's connection and close the pool"""
         try:
-            if hasattr(self._local, 'conn') and self._local.conn:
-                self._local.conn.close()
+            self._release_thread_connection()
         except Exception:
             pass
-        self._local.conn = None
-        self._local.cursor = None
+        if self.db_pool:
+            self.db_pool.close_all()
         logger.info("Database connection closed")
     
     def get_table_columns(self, table_name: str) -> Set[str]:
@@ -529,65 +576,10 @@ class ChargesheetsETL:
     
     def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
         """
-        Generate date ranges in chunks with overlap to ensure no data is missed
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records
-        
-        Accepts ISO 8601 format dates (e.g., '2022-10-01T00:00:00+05:30')
-        Returns date-only format (YYYY-MM-DD) for API compatibility
-        
-        API interprets dates as:
-        - fromDate: YYYY-MM-DD 00:00:00 IST (start of day)
-        - toDate: YYYY-MM-DD 23:59:59 IST (end of day)
-        
-        Example with chunk_days=5, overlap_days=1:
-        - Chunk 1: 2022-10-01 to 2022-10-05 (2022-10-01 00:00:00 IST to 2022-10-05 23:59:59 IST)
-        - Chunk 2: 2022-10-05 to 2022-10-10 (2022-10-05 00:00:00 IST to 2022-10-10 23:59:59 IST) - overlaps by 1 day
-        - Chunk 3: 2022-10-10 to 2022-10-15 (2022-10-10 00:00:00 IST to 2022-10-15 23:59:59 IST) - overlaps by 1 day
-        - Overlap ensures no records are missed at boundaries ✅
-        
-        Note: Duplicate records from overlap are handled by smart update logic (updates only if changed)
-        
-        Args:
-            start_date: Start date in ISO 8601 format (e.g., '2022-10-01T00:00:00+05:30')
-            end_date: End date in ISO 8601 format (e.g., '2025-11-18T23:59:59+05:30')
-            chunk_days: Number of days per chunk
-            overlap_days: Number of days to overlap between chunks (default: 1 to ensure no data loss)
-        
-        Returns:
-            List of (from_date, to_date) tuples in YYYY-MM-DD format (for API compatibility)
+        Generate overlapping date ranges in chunks (shared implementation in etl_incremental).
+        Returns (from_date, to_date) tuples as YYYY-MM-DD.
         """
-        date_ranges = []
-        # Parse ISO format dates
-        current_date = parse_iso_date(start_date)
-        end = parse_iso_date(end_date)
-        
-        # Extract date part (without time) for comparison
-        current_date_only = current_date.date()
-        end_date_only = end.date()
-        
-        while current_date_only <= end_date_only:
-            # Calculate chunk end: current_date + (chunk_days - 1) days
-            chunk_end_date = current_date_only + timedelta(days=chunk_days - 1)
-            if chunk_end_date > end_date_only:
-                chunk_end_date = end_date_only
-            
-            # Return date-only format for API compatibility
-            date_ranges.append((
-                current_date_only.strftime('%Y-%m-%d'),
-                chunk_end_date.strftime('%Y-%m-%d')
-            ))
-            
-            # Next chunk starts with overlap
-            next_start = chunk_end_date - timedelta(days=overlap_days - 1)
-            
-            # If we've already reached or passed the end date, break
-            if chunk_end_date >= end_date_only:
-                break
-            
-            # Move to next chunk start
-            current_date_only = next_start
-        
-        return date_ranges
+        return shared_generate_date_ranges(start_date, end_date, chunk_days, overlap_days)
     
     def fetch_chargesheets_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -614,7 +606,7 @@ class ChargesheetsETL:
             try:
                 logger.debug(f"Fetching chargesheets: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.trace(f"API Request - URL: {url}, Params: {params}, Headers: {headers}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
@@ -1036,18 +1028,16 @@ class ChargesheetsETL:
         """
         Insert or update single chargesheet into database with smart update logic
         Also handles related tables: chargesheet_files, chargesheet_acts, chargesheet_accused
+        The chargesheet and its children are written in one transaction (all or nothing)
         Dates are always from API (never use CURRENT_TIMESTAMP)
-        
+
         Returns:
             Tuple of (success: bool, operation: str, chargesheet_id: str) where operation is 'inserted', 'updated', 'no_change', or 'skipped'
             chargesheet_id is returned as string for psycopg2 compatibility
         """
-        charge_sheet_id = chargesheet.get('charge_sheet_id')
         crime_id = chargesheet.get('crime_id')
-        chargesheet_no = chargesheet.get('chargesheet_no')
-        chargesheet_date = chargesheet.get('chargesheet_date')
         original_crime_id = chargesheet.get('_original_crime_id')
-        
+
         # Validate crime_id exists in crimes table
         if not crime_id:
             reason = 'invalid_crime_id'
@@ -1062,7 +1052,7 @@ class ChargesheetsETL:
             if push_fk_failure is not None:
                 try:
                     push_fk_failure(
-                        conn, 'chargesheets',
+                        self._conn, 'chargesheets',
                         record_id=original_crime_id or 'UNKNOWN',
                         record_json=json.dumps(
                             {k: str(v) if v is not None else None
@@ -1071,234 +1061,287 @@ class ChargesheetsETL:
                         missing_fk_column='crime_id',
                         missing_fk_value=original_crime_id or '',
                     )
-                    conn.commit()
+                    self._conn.commit()
                 except Exception as _qe:
                     logger.warning("FK queue push failed for chargesheet %s: %s",
                                    original_crime_id, _qe)
             return False, reason, None
-        
+
         try:
-            logger.trace(f"Processing chargesheet: charge_sheet_id={charge_sheet_id}, crime_id={crime_id}, chargesheet_no={chargesheet_no}, chargesheet_date={chargesheet_date}")
-            
-            # Check if chargesheet already exists
-            if self.chargesheet_exists(charge_sheet_id, crime_id, chargesheet_no, chargesheet_date):
-                # Get existing record to compare
-                existing = self.get_existing_chargesheet(charge_sheet_id, crime_id, chargesheet_no, chargesheet_date)
-                if not existing:
-                    logger.warning(f"⚠️  Chargesheet exists check returned True but fetch returned None")
-                    existing = None
-                
-                if existing:
-                    # Convert UUID to string (psycopg2 returns UUID objects from database)
-                    chargesheet_id = str(existing['id']) if existing['id'] else None
-                    if not chargesheet_id:
-                        logger.warning(f"⚠️  Existing chargesheet has no id")
-                        existing = None
-                        chargesheet_id = None
-                    
-                    # Smart update: only update fields that need updating
-                    update_fields = []
-                    update_values = []
-                    changes = []
-                    
-                    # Define all fields to check (excluding primary key: id)
-                    fields_to_check = [
-                        ('chargesheet_no_icjs', 'CHARGESHEET_NO_ICJS'),
-                        ('chargesheet_type', 'CHARGESHEET_TYPE'),
-                        ('court_name', 'COURT_NAME'),
-                        ('is_ccl', 'IS_CCL'),
-                        ('is_esigned', 'IS_ESIGNED'),
-                        ('date_created', 'DATE_CREATED'),  # Always from API
-                        ('date_modified', 'DATE_MODIFIED')  # Always from API
-                    ]
-
-                    if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id'):
-                        fields_to_check.insert(0, ('charge_sheet_id', 'charge_sheet_id'))
-                    
-                    for db_field, api_field in fields_to_check:
-                        existing_val = existing.get(db_field)
-                        new_val = chargesheet.get(db_field)
-                        
-                        if db_field == 'charge_sheet_id':
-                            if existing_val != new_val:
-                                update_fields.append(f"{db_field} = %s")
-                                update_values.append(new_val)
-                                changes.append(f"{db_field}: {existing_val} → {new_val}")
-                        # Special handling for date fields - always use API value
-                        elif db_field in ('date_created', 'date_modified'):
-                            if existing_val != new_val:
-                                update_fields.append(f"{db_field} = %s")
-                                update_values.append(new_val)
-                                changes.append(f"{db_field}: {existing_val} → {new_val}")
-                        else:
-                            # Rule 1: Existing is NULL, new is not NULL → update
-                            if existing_val is None and new_val is not None:
-                                update_fields.append(f"{db_field} = %s")
-                                update_values.append(new_val)
-                                changes.append(f"{db_field}: NULL → {new_val}")
-                            
-                            # Rule 2: Existing is not NULL, new is NULL → keep existing (skip)
-                            elif existing_val is not None and new_val is None:
-                                logger.trace(f"  Will keep existing {db_field}: {existing_val} (new value is NULL)")
-                            
-                            # Rule 3 & 4: Both are not NULL
-                            elif existing_val is not None and new_val is not None:
-                                # Rule 3: Different → update
-                                if existing_val != new_val:
-                                    update_fields.append(f"{db_field} = %s")
-                                    update_values.append(new_val)
-                                    changes.append(f"{db_field}: {existing_val} → {new_val}")
-                            
-                            # Both are NULL → no update needed
-                    
-                    # Only update if there are changes
-                    if update_fields:
-                        update_query = f"""
-                            UPDATE {CHARGESHEETS_TABLE} SET
-                                {', '.join(update_fields)}
-                            WHERE {'charge_sheet_id = %s' if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id') and charge_sheet_id else 'id = %s'}
-                        """
-                        update_values.append(charge_sheet_id if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id') and charge_sheet_id else chargesheet_id)
-                        self._cursor.execute(update_query, tuple(update_values))
-                        with self.stats_lock:
-                            self.stats['total_chargesheets_updated'] += 1
-                        logger.debug(f"Updated chargesheet: id={chargesheet_id} ({len(changes)} fields changed)")
-                        self._conn.commit()
-                        operation = 'updated'
-                    else:
-                        with self.stats_lock:
-                            self.stats['total_chargesheets_no_change'] += 1
-                        logger.trace(f"No changes needed for chargesheet")
-                        operation = 'no_change'
-                    
-                    # Process related tables (files, acts, accused)
-                    self.process_related_tables(chargesheet_id, chargesheet)
-                    
-                    return True, operation, chargesheet_id
-                else:
-                    # Exists check returned True but couldn't fetch - treat as new insert
-                    logger.warning(f"⚠️  Chargesheet exists but couldn't fetch, treating as new insert")
-            else:
-                # Insert new chargesheet
-                logger.trace(f"Inserting new chargesheet: crime_id={crime_id}, chargesheet_no={chargesheet_no}")
-                chargesheet_id = str(uuid.uuid4())  # Convert UUID to string for psycopg2
-                
-                has_api_key = self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id')
-                insert_columns = [
-                    'id', 'crime_id', 'chargesheet_no', 'chargesheet_no_icjs', 'chargesheet_date',
-                    'chargesheet_type', 'court_name', 'is_ccl', 'is_esigned',
-                    'date_created', 'date_modified'
-                ]
-                insert_values = [
-                    chargesheet_id,
-                    crime_id,
-                    chargesheet_no,
-                    chargesheet.get('chargesheet_no_icjs'),
-                    chargesheet_date,
-                    chargesheet.get('chargesheet_type'),
-                    chargesheet.get('court_name'),
-                    chargesheet.get('is_ccl'),
-                    chargesheet.get('is_esigned'),
-                    chargesheet.get('date_created'),
-                    chargesheet.get('date_modified')
-                ]
-                if has_api_key:
-                    insert_columns.insert(1, 'charge_sheet_id')
-                    insert_values.insert(1, charge_sheet_id)
-
-                insert_query = f"""
-                    INSERT INTO {CHARGESHEETS_TABLE} ({', '.join(insert_columns)})
-                    VALUES ({', '.join(['%s'] * len(insert_columns))})
-                """
-                self._cursor.execute(insert_query, tuple(insert_values))
-                with self.stats_lock:
-                    self.stats['total_chargesheets_inserted'] += 1
-                logger.debug(f"Inserted chargesheet: id={chargesheet_id}")
-                self._conn.commit()
-                
-                # Process related tables (files, acts, accused)
-                self.process_related_tables(chargesheet_id, chargesheet)
-                
-                return True, 'inserted', chargesheet_id
-            
-        except psycopg2.IntegrityError as e:
-            self._conn.rollback()
-            reason = 'integrity_error'
-            error_details = str(e)
-            logger.warning(f"⚠️  Integrity error for chargesheet: {e}")
-            with self.stats_lock:
-                self.stats['total_chargesheets_failed'] += 1
-            self.log_failed_record(chargesheet, reason, error_details)
-            return False, reason, None
+            return self.write_chargesheets([chargesheet], chunk_date_range)[0]
         except Exception as e:
-            self._conn.rollback()
-            reason = 'error'
-            error_details = str(e)
-            logger.error(f"❌ Error inserting chargesheet: {e}")
+            # Child-table write failed; the whole chargesheet was rolled back
+            reason = 'integrity_error' if isinstance(e, psycopg2.IntegrityError) else 'error'
+            logger.error(f"❌ Error writing chargesheet children: {e}")
             with self.stats_lock:
                 self.stats['total_chargesheets_failed'] += 1
                 self.stats['errors'].append(f"Chargesheet crime_id={crime_id}: {str(e)}")
-            self.log_failed_record(chargesheet, reason, error_details)
+            self.log_failed_record(chargesheet, reason, str(e))
             return False, reason, None
-    
-    def process_related_tables(self, chargesheet_id: str, chargesheet: Dict):
-        """Process related tables: files, acts, accused"""
-        charge_sheet_api_id = chargesheet.get('charge_sheet_id')
 
-        self.delete_related_tables(chargesheet_id, charge_sheet_api_id)
+    def write_chargesheets(self, chargesheets: List[Dict], chunk_date_range: str = "") -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Write chargesheets (crime_id already validated) and their children in one transaction
+
+        Each chargesheet row is written under its own savepoint; a failing chargesheet is
+        rolled back alone and its children are never written. The children of all
+        chargesheets that made it are then replaced at once: one DELETE ... = ANY(%s) and
+        one multi-row INSERT per child table, followed by a single commit. Stats and
+        failure logs are applied only after the commit.
+
+        Returns:
+            (success, operation, chargesheet_id) per chargesheet, in input order
+
+        Raises:
+            The child-table write error, after rolling back the whole transaction
+            (nothing is counted; callers retry per chargesheet)
+        """
+        self.warm_column_cache()
+        results = []
+        failures = []
+        related = {}   # chargesheet_id -> (charge_sheet_api_id, child rows); last occurrence wins
+        stats = {}
+
+        for chargesheet in chargesheets:
+            record_stats = {}
+            self._cursor.execute("SAVEPOINT chargesheet_write")
+            try:
+                operation, chargesheet_id = self.write_chargesheet_row(chargesheet, record_stats)
+                child_rows = self.build_related_rows(chargesheet_id, chargesheet, record_stats)
+                self._cursor.execute("RELEASE SAVEPOINT chargesheet_write")
+            except Exception as e:
+                self._cursor.execute("ROLLBACK TO SAVEPOINT chargesheet_write")
+                reason = 'integrity_error' if isinstance(e, psycopg2.IntegrityError) else 'error'
+                failures.append((chargesheet, reason, e))
+                results.append((False, reason, None))
+                continue
+
+            related.pop(chargesheet_id, None)
+            related[chargesheet_id] = (chargesheet.get('charge_sheet_id'), child_rows)
+            for key, count in record_stats.items():
+                stats[key] = stats.get(key, 0) + count
+            results.append((True, operation, chargesheet_id))
+
+        try:
+            self.write_related_rows(related)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+        with self.stats_lock:
+            for key, count in stats.items():
+                self.stats[key] += count
+        for chargesheet, reason, e in failures:
+            if reason == 'integrity_error':
+                logger.warning(f"⚠️  Integrity error for chargesheet: {e}")
+                with self.stats_lock:
+                    self.stats['total_chargesheets_failed'] += 1
+            else:
+                logger.error(f"❌ Error inserting chargesheet: {e}")
+                with self.stats_lock:
+                    self.stats['total_chargesheets_failed'] += 1
+                    self.stats['errors'].append(f"Chargesheet crime_id={chargesheet.get('crime_id')}: {str(e)}")
+            self.log_failed_record(chargesheet, reason, str(e))
+        return results
+
+    def write_chargesheet_row(self, chargesheet: Dict, stats: Dict[str, int]) -> Tuple[str, str]:
+        """
+        Insert or update the chargesheets row (no commit)
+
+        Behavior:
+        - NEW DATA: not found by charge_sheet_id / (crime_id, chargesheet_no, chargesheet_date) → INSERT
+        - EXISTING DATA: smart update, only changed fields; existing values kept when API sends NULL
+
+        Returns:
+            (operation, chargesheet_id) where operation is 'inserted', 'updated' or 'no_change'
+        """
+        charge_sheet_id = chargesheet.get('charge_sheet_id')
+        crime_id = chargesheet.get('crime_id')
+        chargesheet_no = chargesheet.get('chargesheet_no')
+        chargesheet_date = chargesheet.get('chargesheet_date')
+
+        logger.trace(f"Processing chargesheet: charge_sheet_id={charge_sheet_id}, crime_id={crime_id}, chargesheet_no={chargesheet_no}, chargesheet_date={chargesheet_date}")
+
+        # Check if chargesheet already exists
+        if self.chargesheet_exists(charge_sheet_id, crime_id, chargesheet_no, chargesheet_date):
+            # Get existing record to compare
+            existing = self.get_existing_chargesheet(charge_sheet_id, crime_id, chargesheet_no, chargesheet_date)
+            # Convert UUID to string (psycopg2 returns UUID objects from database)
+            chargesheet_id = str(existing['id']) if existing and existing['id'] else None
+            if not chargesheet_id:
+                raise ValueError("Chargesheet exists but its id could not be fetched")
+
+            # Smart update: only update fields that need updating
+            update_fields = []
+            update_values = []
+            changes = []
+
+            # Define all fields to check (excluding primary key: id)
+            fields_to_check = [
+                ('chargesheet_no_icjs', 'CHARGESHEET_NO_ICJS'),
+                ('chargesheet_type', 'CHARGESHEET_TYPE'),
+                ('court_name', 'COURT_NAME'),
+                ('is_ccl', 'IS_CCL'),
+                ('is_esigned', 'IS_ESIGNED'),
+                ('date_created', 'DATE_CREATED'),  # Always from API
+                ('date_modified', 'DATE_MODIFIED')  # Always from API
+            ]
+
+            if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id'):
+                fields_to_check.insert(0, ('charge_sheet_id', 'charge_sheet_id'))
+
+            for db_field, api_field in fields_to_check:
+                existing_val = existing.get(db_field)
+                new_val = chargesheet.get(db_field)
+
+                if db_field == 'charge_sheet_id':
+                    if existing_val != new_val:
+                        update_fields.append(f"{db_field} = %s")
+                        update_values.append(new_val)
+                        changes.append(f"{db_field}: {existing_val} → {new_val}")
+                # Special handling for date fields - always use API value
+                elif db_field in ('date_created', 'date_modified'):
+                    if existing_val != new_val:
+                        update_fields.append(f"{db_field} = %s")
+                        update_values.append(new_val)
+                        changes.append(f"{db_field}: {existing_val} → {new_val}")
+                else:
+                    # Rule 1: Existing is NULL, new is not NULL → update
+                    if existing_val is None and new_val is not None:
+                        update_fields.append(f"{db_field} = %s")
+                        update_values.append(new_val)
+                        changes.append(f"{db_field}: NULL → {new_val}")
+
+                    # Rule 2: Existing is not NULL, new is NULL → keep existing (skip)
+                    elif existing_val is not None and new_val is None:
+                        logger.trace(f"  Will keep existing {db_field}: {existing_val} (new value is NULL)")
+
+                    # Rule 3 & 4: Both are not NULL
+                    elif existing_val is not None and new_val is not None:
+                        # Rule 3: Different → update
+                        if existing_val != new_val:
+                            update_fields.append(f"{db_field} = %s")
+                            update_values.append(new_val)
+                            changes.append(f"{db_field}: {existing_val} → {new_val}")
+
+                    # Both are NULL → no update needed
+
+            # Only update if there are changes
+            if not update_fields:
+                logger.trace(f"No changes needed for chargesheet")
+                stats['total_chargesheets_no_change'] = stats.get('total_chargesheets_no_change', 0) + 1
+                return 'no_change', chargesheet_id
+
+            update_query = f"""
+                UPDATE {CHARGESHEETS_TABLE} SET
+                    {', '.join(update_fields)}
+                WHERE {'charge_sheet_id = %s' if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id') and charge_sheet_id else 'id = %s'}
+            """
+            update_values.append(charge_sheet_id if self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id') and charge_sheet_id else chargesheet_id)
+            self._cursor.execute(update_query, tuple(update_values))
+            logger.debug(f"Updated chargesheet: id={chargesheet_id} ({len(changes)} fields changed)")
+            stats['total_chargesheets_updated'] = stats.get('total_chargesheets_updated', 0) + 1
+            return 'updated', chargesheet_id
+
+        # Insert new chargesheet
+        logger.trace(f"Inserting new chargesheet: crime_id={crime_id}, chargesheet_no={chargesheet_no}")
+        chargesheet_id = str(uuid.uuid4())  # Convert UUID to string for psycopg2
+
+        has_api_key = self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id')
+        insert_columns = [
+            'id', 'crime_id', 'chargesheet_no', 'chargesheet_no_icjs', 'chargesheet_date',
+            'chargesheet_type', 'court_name', 'is_ccl', 'is_esigned',
+            'date_created', 'date_modified'
+        ]
+        insert_values = [
+            chargesheet_id,
+            crime_id,
+            chargesheet_no,
+            chargesheet.get('chargesheet_no_icjs'),
+            chargesheet_date,
+            chargesheet.get('chargesheet_type'),
+            chargesheet.get('court_name'),
+            chargesheet.get('is_ccl'),
+            chargesheet.get('is_esigned'),
+            chargesheet.get('date_created'),
+            chargesheet.get('date_modified')
+        ]
+        if has_api_key:
+            insert_columns.insert(1, 'charge_sheet_id')
+            insert_values.insert(1, charge_sheet_id)
+
+        insert_query = f"""
+            INSERT INTO {CHARGESHEETS_TABLE} ({', '.join(insert_columns)})
+            VALUES ({', '.join(['%s'] * len(insert_columns))})
+        """
+        self._cursor.execute(insert_query, tuple(insert_values))
+        logger.debug(f"Inserted chargesheet: id={chargesheet_id}")
+        stats['total_chargesheets_inserted'] = stats.get('total_chargesheets_inserted', 0) + 1
+        return 'inserted', chargesheet_id
+
+    def build_related_rows(self, chargesheet_id: str, chargesheet: Dict, stats: Dict[str, int]) -> Dict[str, List[tuple]]:
+        """Build the child-table rows (files, acts, accused) of one chargesheet, keyed like CHILD_TABLE_COLUMNS"""
+        charge_sheet_api_id = chargesheet.get('charge_sheet_id')
+        rows = {key: [] for key in CHILD_TABLE_COLUMNS}
 
         # Process files
         files = chargesheet.get('_files', [])
         for file_data in files:
-            self.insert_chargesheet_file(chargesheet_id, charge_sheet_api_id, file_data)
-        
+            self.add_chargesheet_file(rows, stats, chargesheet_id, charge_sheet_api_id, file_data)
+
         # Process acts
         acts = chargesheet.get('_acts', [])
         for act_index, act_data in enumerate(acts):
-            self.insert_chargesheet_act(chargesheet_id, charge_sheet_api_id, act_index, act_data)
-        
+            self.add_chargesheet_act(rows, stats, chargesheet_id, charge_sheet_api_id, act_index, act_data)
+
         # Process accused
         accused_list = chargesheet.get('_accused', [])
         for accused_data in accused_list:
-            self.insert_chargesheet_accused(chargesheet_id, charge_sheet_api_id, accused_data)
+            self.add_chargesheet_accused(rows, stats, chargesheet_id, accused_data)
+        return rows
 
-    def delete_related_tables(self, chargesheet_id: str, charge_sheet_api_id: Optional[str]):
-        """Remove stale child rows before reloading the current API snapshot."""
-        try:
-            self._cursor.execute(f"DELETE FROM {CHARGESHEET_FILES_TABLE} WHERE chargesheet_id = %s", (chargesheet_id,))
-            self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACTS_TABLE} WHERE chargesheet_id = %s", (chargesheet_id,))
-            self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACCUSED_TABLE} WHERE chargesheet_id = %s", (chargesheet_id,))
-            if charge_sheet_api_id and self.has_table_column(CHARGESHEET_MEDIA_TABLE, 'chargesheet_id'):
-                self._cursor.execute(f"DELETE FROM {CHARGESHEET_MEDIA_TABLE} WHERE chargesheet_id = %s", (charge_sheet_api_id,))
-            if charge_sheet_api_id and self.has_table_column(CHARGESHEET_ACTS_SECTIONS_TABLE, 'chargesheet_id'):
-                self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACTS_SECTIONS_TABLE} WHERE chargesheet_id = %s", (charge_sheet_api_id,))
-            self._conn.commit()
-        except Exception as e:
-            logger.warning(f"⚠️  Failed to clear existing chargesheet children: {e}")
-            self._conn.rollback()
-    
-    def insert_chargesheet_file(self, chargesheet_id: str, charge_sheet_api_id: Optional[str], file_data: Dict):
-        """Insert or update chargesheet file"""
+    def write_related_rows(self, related: Dict[str, Tuple[Optional[str], Dict[str, List[tuple]]]]):
+        """Replace the children of the given chargesheets: one DELETE and one multi-row INSERT per table (no commit)"""
+        if not related:
+            return
+        chargesheet_ids = list(related)
+        api_ids = [api_id for api_id, _ in related.values() if api_id]
+
+        # Remove stale child rows before reloading the current API snapshot
+        self._cursor.execute(f"DELETE FROM {CHARGESHEET_FILES_TABLE} WHERE chargesheet_id = ANY(%s::uuid[])", (chargesheet_ids,))
+        self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACTS_TABLE} WHERE chargesheet_id = ANY(%s::uuid[])", (chargesheet_ids,))
+        self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACCUSED_TABLE} WHERE chargesheet_id = ANY(%s::uuid[])", (chargesheet_ids,))
+        if api_ids and self.has_table_column(CHARGESHEET_MEDIA_TABLE, 'chargesheet_id'):
+            self._cursor.execute(f"DELETE FROM {CHARGESHEET_MEDIA_TABLE} WHERE chargesheet_id = ANY(%s)", (api_ids,))
+        if api_ids and self.has_table_column(CHARGESHEET_ACTS_SECTIONS_TABLE, 'chargesheet_id'):
+            self._cursor.execute(f"DELETE FROM {CHARGESHEET_ACTS_SECTIONS_TABLE} WHERE chargesheet_id = ANY(%s)", (api_ids,))
+
+        for key, (table, columns, template) in CHILD_TABLE_COLUMNS.items():
+            values = [row for _, rows in related.values() for row in rows[key]]
+            if values:
+                execute_values(
+                    self._cursor,
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+                    values,
+                    template=template,
+                    page_size=1000,
+                )
+
+    def add_chargesheet_file(self, rows: Dict[str, List[tuple]], stats: Dict[str, int], chargesheet_id: str,
+                             charge_sheet_api_id: Optional[str], file_data: Dict):
+        """Add chargesheet file (and media) rows"""
         try:
             # API uses camelCase: 'fileId'
             file_id = self.normalize_text_value(file_data.get('fileId') or file_data.get('FILE_ID'))
             created_at = self.normalize_date_value(file_data.get('createdAt') or file_data.get('CREATED_AT'))
 
-            self._cursor.execute(f"""
-                INSERT INTO {CHARGESHEET_FILES_TABLE} (
-                    id, chargesheet_id, file_id, created_at
-                ) VALUES (%s, %s, %s, %s)
-            """, (str(uuid.uuid4()), chargesheet_id, file_id, created_at))
-            with self.stats_lock:
-                self.stats['total_files_inserted'] += 1
+            rows['files'].append((str(uuid.uuid4()), chargesheet_id, file_id, created_at))
+            stats['total_files_inserted'] = stats.get('total_files_inserted', 0) + 1
 
             if charge_sheet_api_id and self.has_table_column(CHARGESHEET_MEDIA_TABLE, 'chargesheet_id'):
                 media_payload = json.dumps(file_data, ensure_ascii=False, default=str)
-                self._cursor.execute(f"""
-                    INSERT INTO {CHARGESHEET_MEDIA_TABLE} (
-                        id, chargesheet_id, media_index, file_id, media_payload, created_at, date_modified
-                    ) VALUES (%s, %s, %s, %s, %s::jsonb, %s, %s)
-                """, (
+                rows['media'].append((
                     str(uuid.uuid4()),
                     charge_sheet_api_id,
                     0,
@@ -1307,14 +1350,12 @@ class ChargesheetsETL:
                     created_at,
                     created_at,
                 ))
-            
-            self._conn.commit()
         except Exception as e:
             logger.error(f"❌ Error processing chargesheet file: {e}")
-            self._conn.rollback()
-    
-    def insert_chargesheet_act(self, chargesheet_id: str, charge_sheet_api_id: Optional[str], act_index: int, act_data: Dict):
-        """Insert or update chargesheet act"""
+
+    def add_chargesheet_act(self, rows: Dict[str, List[tuple]], stats: Dict[str, int], chargesheet_id: str,
+                            charge_sheet_api_id: Optional[str], act_index: int, act_data: Dict):
+        """Add chargesheet act (and per-section) rows"""
         try:
             # API uses camelCase and section is an array
             section_values = self.normalize_sections(act_data.get('section') or act_data.get('SECTION'))
@@ -1333,12 +1374,7 @@ class ChargesheetsETL:
                 logger.warning(f"⚠️  Skipping act with empty section for chargesheet_id={chargesheet_id}")
                 return
 
-            self._cursor.execute(f"""
-                INSERT INTO {CHARGESHEET_ACTS_TABLE} (
-                    id, chargesheet_id, act_description, section, rw_required,
-                    section_description, grave_particulars, created_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            rows['acts'].append((
                 str(uuid.uuid4()),
                 chargesheet_id,
                 act_description,
@@ -1348,19 +1384,13 @@ class ChargesheetsETL:
                 grave_particulars,
                 created_at,
             ))
-            with self.stats_lock:
-                self.stats['total_acts_inserted'] += 1
+            stats['total_acts_inserted'] = stats.get('total_acts_inserted', 0) + 1
 
             if charge_sheet_api_id and self.has_table_column(CHARGESHEET_ACTS_SECTIONS_TABLE, 'chargesheet_id'):
                 for section_index, section_item in enumerate(section_values or [None]):
                     if section_item is None:
                         continue
-                    self._cursor.execute(f"""
-                        INSERT INTO {CHARGESHEET_ACTS_SECTIONS_TABLE} (
-                            id, chargesheet_id, act_index, section_index, act_description, section,
-                            rw_required, section_description, grave_particulars, created_at, date_modified
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
+                    rows['acts_sections'].append((
                         str(uuid.uuid4()),
                         charge_sheet_api_id,
                         act_index,
@@ -1373,14 +1403,12 @@ class ChargesheetsETL:
                         created_at,
                         created_at,
                     ))
-            
-            self._conn.commit()
         except Exception as e:
             logger.error(f"❌ Error processing chargesheet act: {e}")
-            self._conn.rollback()
-    
-    def insert_chargesheet_accused(self, chargesheet_id: str, charge_sheet_api_id: Optional[str], accused_data: Dict):
-        """Insert or update chargesheet accused"""
+
+    def add_chargesheet_accused(self, rows: Dict[str, List[tuple]], stats: Dict[str, int], chargesheet_id: str,
+                                accused_data: Dict):
+        """Add chargesheet accused row"""
         try:
             # API uses camelCase
             accused_person_id = self.normalize_text_value(accused_data.get('accusedPersonId') or accused_data.get('ACCUSED_PERSON_ID'))
@@ -1399,12 +1427,7 @@ class ChargesheetsETL:
                 logger.warning(f"⚠️  Skipping accused row with empty accusedPersonId for chargesheet_id={chargesheet_id}")
                 return
 
-            self._cursor.execute(f"""
-                INSERT INTO {CHARGESHEET_ACCUSED_TABLE} (
-                    id, chargesheet_id, accused_person_id, charge_status, requested_for_nbw,
-                    reason_for_no_charge, is_person_master_present, created_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
+            rows['accused'].append((
                 str(uuid.uuid4()),
                 chargesheet_id,
                 accused_person_id,
@@ -1414,89 +1437,162 @@ class ChargesheetsETL:
                 is_person_master_present,
                 created_at,
             ))
-            with self.stats_lock:
-                self.stats['total_accused_inserted'] += 1
-
-            if charge_sheet_api_id and self.has_table_column(CHARGESHEET_ACCUSED_TABLE, 'chargesheet_id'):
-                pass
-            
-            self._conn.commit()
+            stats['total_accused_inserted'] = stats.get('total_accused_inserted', 0) + 1
         except Exception as e:
             logger.error(f"❌ Error processing chargesheet accused: {e}")
-            self._conn.rollback()
-    
+
+    def prepare_record(self, chargesheet_record: Dict, chunk_range: str,
+                       chunk_state: Dict, chunk_lock: threading.Lock) -> Optional[Tuple[Dict, str]]:
+        """Transform one API record and track duplicates; None when its CRIME_ID is not in crimes"""
+        chargesheet = self.transform_chargesheet(chargesheet_record)
+        charge_sheet_id = chargesheet.get('charge_sheet_id')
+        crime_id = chargesheet.get('crime_id')
+        chargesheet_no = chargesheet.get('chargesheet_no')
+        chargesheet_date = chargesheet.get('chargesheet_date')
+        original_crime_id = chargesheet.get('_original_crime_id')
+
+        if not crime_id:
+            with chunk_lock:
+                logger.warning(f"⚠️  Chargesheet with CRIME_ID {original_crime_id} not found in crimes table, skipping")
+                with self.stats_lock:
+                    self.stats['total_chargesheets_failed'] += 1
+                    self.stats['total_chargesheets_failed_crime_id'] += 1
+                chunk_state['failed_keys'].append(f"{original_crime_id}:{chargesheet_no}:{chargesheet_date}")
+                reason = 'invalid_crime_id'
+                if reason not in chunk_state['failed_reasons']:
+                    chunk_state['failed_reasons'][reason] = []
+                chunk_state['failed_reasons'][reason].append(original_crime_id)
+                chunk_state['invalid_crime_ids_in_chunk'].append({
+                    'crime_id': original_crime_id,
+                    'chargesheet_no': chargesheet_no,
+                    'chargesheet_date': chargesheet_date
+                })
+            self.log_invalid_crime_id(chargesheet, original_crime_id, chunk_range)
+            return None
+
+        unique_key = charge_sheet_id or f"{crime_id}:{chargesheet_no}:{chargesheet_date}"
+
+        with chunk_lock:
+            if unique_key in chunk_state['seen_keys']:
+                occurrence_count = chunk_state['key_occurrences'].get(unique_key, 1) + 1
+                chunk_state['key_occurrences'][unique_key] = occurrence_count
+                chunk_state['duplicates'].append({
+                    'crime_id': crime_id,
+                    'chargesheet_no': chargesheet_no,
+                    'chargesheet_date': chargesheet_date,
+                    'occurrence': occurrence_count,
+                    'first_seen_in': chunk_state['seen_keys'][unique_key],
+                    'duplicate_in': chunk_range
+                })
+                with self.stats_lock:
+                    self.stats['total_duplicates'] += 1
+                logger.info(f"⚠️  Duplicate chargesheet found in chunk {chunk_range} (occurrence #{occurrence_count})")
+            else:
+                chunk_state['seen_keys'][unique_key] = chunk_range
+                chunk_state['key_occurrences'][unique_key] = 1
+        return chargesheet, unique_key
+
+    def record_outcome(self, unique_key: str, success: bool, operation: str,
+                       chunk_state: Dict, chunk_lock: threading.Lock):
+        """Add one chargesheet's write result to the chunk state"""
+        with chunk_lock:
+            if success:
+                if operation == 'inserted':
+                    if unique_key not in chunk_state['inserted_keys']:
+                        chunk_state['inserted_keys'].append(unique_key)
+                elif operation == 'updated':
+                    chunk_state['updated_keys'].append(unique_key)
+                elif operation == 'no_change':
+                    if unique_key not in chunk_state['no_change_keys']:
+                        chunk_state['no_change_keys'].append(unique_key)
+            else:
+                chunk_state['failed_keys'].append(unique_key)
+                if operation not in chunk_state['failed_reasons']:
+                    chunk_state['failed_reasons'][operation] = []
+                chunk_state['failed_reasons'][operation].append(unique_key)
+
     def process_record_worker(self, idx: int, total_records: int, chargesheet_record: Dict,
                               chunk_range: str, chunk_state: Dict, chunk_lock: threading.Lock):
         """Worker method to process a single chargesheet record in a thread"""
         try:
-            chargesheet = self.transform_chargesheet(chargesheet_record)
-            charge_sheet_id = chargesheet.get('charge_sheet_id')
-            crime_id = chargesheet.get('crime_id')
-            chargesheet_no = chargesheet.get('chargesheet_no')
-            chargesheet_date = chargesheet.get('chargesheet_date')
-            original_crime_id = chargesheet.get('_original_crime_id')
-
-            if not crime_id:
-                with chunk_lock:
-                    logger.warning(f"⚠️  Chargesheet with CRIME_ID {original_crime_id} not found in crimes table, skipping")
-                    with self.stats_lock:
-                        self.stats['total_chargesheets_failed'] += 1
-                        self.stats['total_chargesheets_failed_crime_id'] += 1
-                    chunk_state['failed_keys'].append(f"{original_crime_id}:{chargesheet_no}:{chargesheet_date}")
-                    reason = 'invalid_crime_id'
-                    if reason not in chunk_state['failed_reasons']:
-                        chunk_state['failed_reasons'][reason] = []
-                    chunk_state['failed_reasons'][reason].append(original_crime_id)
-                    chunk_state['invalid_crime_ids_in_chunk'].append({
-                        'crime_id': original_crime_id,
-                        'chargesheet_no': chargesheet_no,
-                        'chargesheet_date': chargesheet_date
-                    })
-                self.log_invalid_crime_id(chargesheet, original_crime_id, chunk_range)
-                return
+            with self._thread_connection():
+                prepared = self.prepare_record(chargesheet_record, chunk_range, chunk_state, chunk_lock)
+                if prepared is None:
+                    return
+                chargesheet, unique_key = prepared
+                success, operation, chargesheet_id = self.insert_chargesheet(chargesheet, chunk_range)
+                self.record_outcome(unique_key, success, operation, chunk_state, chunk_lock)
 
-            unique_key = charge_sheet_id or f"{crime_id}:{chargesheet_no}:{chargesheet_date}"
+        except Exception as e:
+            logger.error(f"❌ Error in worker processing record {idx}: {e}")
+            with self.stats_lock:
+                self.stats['total_chargesheets_failed'] += 1
 
-            with chunk_lock:
-                if unique_key in chunk_state['seen_keys']:
-                    occurrence_count = chunk_state['key_occurrences'].get(unique_key, 1) + 1
-                    chunk_state['key_occurrences'][unique_key] = occurrence_count
-                    chunk_state['duplicates'].append({
-                        'crime_id': crime_id,
-                        'chargesheet_no': chargesheet_no,
-                        'chargesheet_date': chargesheet_date,
-                        'occurrence': occurrence_count,
-                        'first_seen_in': chunk_state['seen_keys'][unique_key],
-                        'duplicate_in': chunk_range
-                    })
-                    with self.stats_lock:
-                        self.stats['total_duplicates'] += 1
-                    logger.info(f"⚠️  Duplicate chargesheet found in chunk {chunk_range} (occurrence #{occurrence_count})")
-                else:
-                    chunk_state['seen_keys'][unique_key] = chunk_range
-                    chunk_state['key_occurrences'][unique_key] = 1
+    def process_batch_worker(self, chargesheet_records: List[Dict], chunk_range: str,
+                             chunk_state: Dict, chunk_lock: threading.Lock):
+        """
+        Worker method to write a batch of chargesheets in one transaction (see write_chargesheets)
 
-            success, operation, chargesheet_id = self.insert_chargesheet(chargesheet, chunk_range)
-            with chunk_lock:
-                if success:
-                    if operation == 'inserted':
-                        if unique_key not in chunk_state['inserted_keys']:
-                            chunk_state['inserted_keys'].append(unique_key)
-                    elif operation == 'updated':
-                        chunk_state['updated_keys'].append(unique_key)
-                    elif operation == 'no_change':
-                        if unique_key not in chunk_state['no_change_keys']:
-                            chunk_state['no_change_keys'].append(unique_key)
-                else:
-                    chunk_state['failed_keys'].append(unique_key)
-                    if operation not in chunk_state['failed_reasons']:
-                        chunk_state['failed_reasons'][operation] = []
-                    chunk_state['failed_reasons'][operation].append(unique_key)
+        If the batch's child-table write fails, the batch is rolled back and every
+        chargesheet is written again in its own transaction.
+        """
+        try:
+            with self._thread_connection():
+                prepared = []
+                for record in chargesheet_records:
+                    item = self.prepare_record(record, chunk_range, chunk_state, chunk_lock)
+                    if item is not None:
+                        prepared.append(item)
+                if not prepared:
+                    return
+
+                try:
+                    results = self.write_chargesheets([chargesheet for chargesheet, _ in prepared], chunk_range)
+                except Exception as e:
+                    logger.warning(f"⚠️  Batched write failed for {len(prepared)} chargesheets, falling back to per-record mode: {e}")
+                    results = [self.insert_chargesheet(chargesheet, chunk_range) for chargesheet, _ in prepared]
+
+                for (_, unique_key), (success, operation, _) in zip(prepared, results):
+                    self.record_outcome(unique_key, success, operation, chunk_state, chunk_lock)
 
         except Exception as e:
-            logger.error(f"❌ Error in worker processing record {idx}: {e}")
+            logger.error(f"❌ Error in worker processing batch of {len(chargesheet_records)} records: {e}")
             with self.stats_lock:
-                self.stats['total_chargesheets_failed'] += 1
+                self.stats['total_chargesheets_failed'] += len(chargesheet_records)
+
+    def build_record_batches(self, chargesheets_raw: List[Dict], batch_size: int) -> List[List[Dict]]:
+        """
+        Split a chunk's API records into batches of about batch_size
+
+        All chargesheets of a CRIME_ID go to the same batch, in API order. Both forms of
+        the unique key (charge_sheet_id, crime_id:chargesheet_no:chargesheet_date) belong
+        to a single crime, so concurrent workers never write the same chargesheet.
+        """
+        by_key = {}
+        for idx, record in enumerate(chargesheets_raw, 1):
+            key = (
+                self.normalize_text_value(record.get('crimeId') or record.get('CRIME_ID'))
+                or self.normalize_text_value(record.get('chargeSheetId') or record.get('CHARGE_SHEET_ID') or record.get('_id'))
+                or f"record_{idx}"
+            )
+            by_key.setdefault(str(key), []).append(record)
+
+        batches = []
+        batch = []
+        for records in by_key.values():
+            batch.extend(records)
+            if len(batch) >= batch_size:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def warm_column_cache(self):
+        """Resolve the optional columns up front (get_table_columns rolls back, so never mid-batch)"""
+        self.has_table_column(CHARGESHEETS_TABLE, 'charge_sheet_id')
+        self.has_table_column(CHARGESHEET_MEDIA_TABLE, 'chargesheet_id')
+        self.has_table_column(CHARGESHEET_ACTS_SECTIONS_TABLE, 'chargesheet_id')
 
     def process_date_range(self, from_date: str, to_date: str, table_columns: Set[str] = None):
         """Process chargesheet records for a specific date range"""
@@ -1548,13 +1644,20 @@ class ChargesheetsETL:
         }
 
         logger.trace(f"Starting parallel processing for chunk: {chunk_range}")
-        max_workers = min(self.max_workers, len(chargesheets_raw))
+        max_workers = compute_safe_workers(self.db_pool, min(self.max_workers, len(chargesheets_raw)))
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             total_records = len(chargesheets_raw)
-            futures = [
-                executor.submit(self.process_record_worker, idx + 1, total_records, record, chunk_range, chunk_state, chunk_lock)
-                for idx, record in enumerate(chargesheets_raw)
-            ]
+            if ETL_CONFIG.get('batch_child_writes', True):
+                batch_size = max(1, ETL_CONFIG.get('child_batch_size', 50))
+                futures = [
+                    executor.submit(self.process_batch_worker, batch, chunk_range, chunk_state, chunk_lock)
+                    for batch in self.build_record_batches(chargesheets_raw, batch_size)
+                ]
+            else:
+                futures = [
+                    executor.submit(self.process_record_worker, idx + 1, total_records, record, chunk_range, chunk_state, chunk_lock)
+                    for idx, record in enumerate(chargesheets_raw)
+                ]
             for future in as_completed(futures):
                 future.result()
 
@@ -1756,7 +1859,8 @@ class ChargesheetsETL:
             try:
                 with self.db_pool.get_connection_context() as _drain_conn:
                     _drain_fk_queue(_drain_conn, 'chargesheets',
-                                    self._retry_chargesheet_record)
+                                    self._retry_chargesheet_record,
+                                    references={'crime_id': CRIMES_TABLE})
                     _drain_conn.commit()
             except Exception as _de:
                 logger.warning("FK queue drain failed at startup: %s (non-fatal)", _de)
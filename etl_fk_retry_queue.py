@@ -25,15 +25,27 @@ push_fk_failure(conn, source_table='disposal', record_id='abc-123',
 
 # At ETL startup — retry previously failed records:
 drain_fk_queue(conn, source_table='disposal',
-               retry_fn=lambda conn, record: insert_disposal(conn, record))
+               retry_fn=lambda conn, record: insert_disposal(conn, record),
+               references={'crime_id': CRIMES_TABLE})
+
+Draining only fetches rows whose missing FK value now exists in the referenced
+table (see `references`), in keyset batches of FK_RETRY_BATCH_SIZE.  Each
+record is retried under a savepoint and the attempt/resolution bookkeeping for
+a batch is written in one UPDATE followed by one commit.  Rows whose parent is
+still missing are not touched, so their attempt_count only grows once the
+parent has arrived and the retry itself fails.
 """
 
 import json
 import logging
+import os
+import threading
+
+from psycopg2 import extensions
 
 logger = logging.getLogger(__name__)
 
-# DDL — table is created lazily on first use.
+# DDL — table is created lazily on first use, once per process.
 _CREATE_DDL = """
 CREATE TABLE IF NOT EXISTS public.etl_fk_retry_queue (
     queue_id            BIGSERIAL PRIMARY KEY,
@@ -55,13 +67,34 @@ CREATE INDEX IF NOT EXISTS etl_fk_retry_queue_source_unresolved
     WHERE resolved = FALSE;
 """
 
-_MAX_ATTEMPTS = int(__import__('os').environ.get('FK_RETRY_MAX_ATTEMPTS', '5'))
+_MAX_ATTEMPTS = int(os.environ.get('FK_RETRY_MAX_ATTEMPTS', '5'))
+_BATCH_SIZE = int(os.environ.get('FK_RETRY_BATCH_SIZE', '200'))
+
+# missing_fk_column -> referenced table (same column name there).  Callers
+# pass their own mapping when tables are renamed through TABLE_CONFIG.
+_DEFAULT_REFERENCES = {'crime_id': 'crimes'}
+
+_queue_table_ready = False
+_queue_table_lock = threading.Lock()
 
 
 def _ensure_queue_table(conn):
-    """Create etl_fk_retry_queue if it does not exist (idempotent)."""
-    with conn.cursor() as cur:
-        cur.execute(_CREATE_DDL)
+    """Create etl_fk_retry_queue if it does not exist (once per process)."""
+    global _queue_table_ready
+    if _queue_table_ready:
+        return
+    with _queue_table_lock:
+        if _queue_table_ready:
+            return
+        with conn.cursor() as cur:
+            cur.execute(_CREATE_DDL)
+        _queue_table_ready = True
+
+
+def _forget_queue_table():
+    """Re-run the DDL on next use (e.g. the transaction that created it was rolled back)."""
+    global _queue_table_ready
+    _queue_table_ready = False
 
 
 def push_fk_failure(conn, source_table: str, record_id: str,
@@ -78,115 +111,203 @@ def push_fk_failure(conn, source_table: str, record_id: str,
         missing_fk_value:   Value of the unresolved FK key.
     """
     _ensure_queue_table(conn)
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO public.etl_fk_retry_queue
-                (source_table, record_id, record_json,
-                 missing_fk_column, missing_fk_value)
-            VALUES (%s, %s, %s::jsonb, %s, %s)
-            ON CONFLICT DO NOTHING
-            """,
-            (source_table, record_id,
-             record_json if isinstance(record_json, str) else json.dumps(record_json),
-             missing_fk_column, missing_fk_value),
-        )
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO public.etl_fk_retry_queue
+                    (source_table, record_id, record_json,
+                     missing_fk_column, missing_fk_value)
+                VALUES (%s, %s, %s::jsonb, %s, %s)
+                ON CONFLICT DO NOTHING
+                """,
+                (source_table, record_id,
+                 record_json if isinstance(record_json, str) else json.dumps(record_json),
+                 missing_fk_column, missing_fk_value),
+            )
+    except Exception:
+        _forget_queue_table()
+        raise
     logger.warning(
         "FK retry queue: parked %s record_id=%s (missing %s=%s)",
         source_table, record_id, missing_fk_column, missing_fk_value,
     )
 
 
-def drain_fk_queue(conn, source_table: str, retry_fn):
-    """Attempt re-insertion of all unresolved records for source_table.
 
-    For each queued record:
-    - Calls retry_fn(conn, record_dict) → True on success, False on failure.
-    - Marks resolved=TRUE on success.
-    - Increments attempt_count and updates error_detail on failure.
+
+def _eligible_clause(references):
+    """SQL condition: the row's missing FK value now exists in its referenced table.
+
+    Rows whose missing_fk_column has no entry in `references` are always
+    eligible (there is nothing to pre-check them against).
+    """
+    checks = [
+        f"(q.missing_fk_column = '{column}' AND EXISTS ("
+        f"SELECT 1 FROM {table} r WHERE r.{column} = q.missing_fk_value))"
+        for column, table in references.items()
+    ]
+    known = ", ".join(f"'{column}'" for column in references)
+    if known:
+        checks.append(f"q.missing_fk_column NOT IN ({known})")
+    return "(" + " OR ".join(checks) + ")" if checks else "TRUE"
+
+
+def _retry_under_savepoint(conn, retry_fn, record):
+    """Run retry_fn(conn, record) inside SAVEPOINT fk_retry.
+
+    A failed or raising retry is rolled back to the savepoint so earlier
+    records of the batch survive.  retry_fn may still commit or roll back on
+    its own (the ETL insert_* helpers do); the savepoint is then gone and the
+    record's outcome is already final.
+
+    Returns:
+        (success, error_detail)
+    """
+    with conn.cursor() as cur:
+        cur.execute("SAVEPOINT fk_retry")
+    try:
+        success = bool(retry_fn(conn, record))
+        err = None
+    except Exception as exc:
+        success = False
+        err = str(exc)
+
+    status = conn.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_IDLE:
+        return success, err
+    with conn.cursor() as cur:
+        if success and status == extensions.TRANSACTION_STATUS_INTRANS:
+            cur.execute("RELEASE SAVEPOINT fk_retry")
+        else:
+            cur.execute("ROLLBACK TO SAVEPOINT fk_retry")
+            cur.execute("RELEASE SAVEPOINT fk_retry")
+    return success, err
+
+
+def drain_fk_queue(conn, source_table: str, retry_fn, references=None,
+                   batch_size: int = None):
+    """Attempt re-insertion of unresolved records whose parent now exists.
+
+    Only rows whose missing_fk_value is present in the referenced table are
+    fetched (keyset batches ordered by queue_id).  For each batch:
+    - Calls retry_fn(conn, record_dict) → True on success, False on failure,
+      each under its own savepoint.
+    - Marks resolved=TRUE on success, bumps attempt_count and stores
+      error_detail on failure — one UPDATE for the whole batch, then commit.
     - Records that exceed FK_RETRY_MAX_ATTEMPTS (default 5) are left in the
       table with their full error history for manual review.
 
     Args:
-        conn:         Active DB connection. drain_fk_queue commits per record.
+        conn:         Active DB connection. drain_fk_queue commits per batch.
         source_table: Table name matching what was passed to push_fk_failure.
         retry_fn:     Callable(conn, record: dict) -> bool.
-                      Must not commit \u2014 drain_fk_queue handles that.
+        references:   {missing_fk_column: referenced_table} used to pre-filter
+                      rows (default {'crime_id': 'crimes'}).
+        batch_size:   Rows per batch (default FK_RETRY_BATCH_SIZE, 200).
     """
+    references = _DEFAULT_REFERENCES if references is None else references
+    batch_size = batch_size or _BATCH_SIZE
+    eligible = _eligible_clause(references)
+
     _ensure_queue_table(conn)
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT queue_id, record_id, record_json, attempt_count
-            FROM public.etl_fk_retry_queue
-            WHERE source_table = %s
-              AND resolved = FALSE
-              AND attempt_count < %s
-            ORDER BY first_failed_at
-            """,
-            (source_table, _MAX_ATTEMPTS),
-        )
-        rows = cur.fetchall()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE {eligible})
+                FROM public.etl_fk_retry_queue q
+                WHERE q.source_table = %s
+                  AND q.resolved = FALSE
+                  AND q.attempt_count < %s
+                """,
+                (source_table, _MAX_ATTEMPTS),
+            )
+            pending, ready = cur.fetchone()
+    except Exception:
+        _forget_queue_table()
+        raise
+    conn.commit()
 
-    if not rows:
+    if not pending:
         logger.info("FK retry queue: no pending records for %s", source_table)
         return
+    if not ready:
+        logger.info(
+            "FK retry queue: %d pending records for %s, none with their parent present yet",
+            pending, source_table,
+        )
+        return
 
     logger.info(
-        "FK retry queue: attempting %d queued records for %s",
-        len(rows), source_table,
+        "FK retry queue: attempting %d of %d queued records for %s (batches of %d)",
+        ready, pending, source_table, batch_size,
     )
     resolved = 0
     still_failing = 0
+    last_queue_id = 0
 
-    for queue_id, record_id, record_json, attempt_count in rows:
-        record = record_json if isinstance(record_json, dict) else json.loads(record_json)
-        try:
-            success = retry_fn(conn, record)
-        except Exception as exc:
-            success = False
-            err = str(exc)
-        else:
-            err = None
-
+    while True:
         with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT q.queue_id, q.record_id, q.record_json, q.attempt_count
+                FROM public.etl_fk_retry_queue q
+                WHERE q.source_table = %s
+                  AND q.resolved = FALSE
+                  AND q.attempt_count < %s
+                  AND q.queue_id > %s
+                  AND {eligible}
+                ORDER BY q.queue_id
+                LIMIT %s
+                """,
+                (source_table, _MAX_ATTEMPTS, last_queue_id, batch_size),
+            )
+            rows = cur.fetchall()
+        if not rows:
+            break
+        last_queue_id = rows[-1][0]
+
+        queue_ids, outcomes, errors = [], [], []
+        for queue_id, record_id, record_json, attempt_count in rows:
+            record = record_json if isinstance(record_json, dict) else json.loads(record_json)
+            success, err = _retry_under_savepoint(conn, retry_fn, record)
+            queue_ids.append(queue_id)
+            outcomes.append(success)
+            errors.append(err)
             if success:
-                cur.execute(
-                    """
-                    UPDATE public.etl_fk_retry_queue
-                    SET resolved = TRUE,
-                        last_attempted_at = CURRENT_TIMESTAMP,
-                        attempt_count = attempt_count + 1,
-                        error_detail = NULL
-                    WHERE queue_id = %s
-                    """,
-                    (queue_id,),
-                )
                 resolved += 1
                 logger.info(
                     "FK retry queue: resolved %s record_id=%s after %d attempts",
                     source_table, record_id, attempt_count + 1,
                 )
             else:
-                cur.execute(
-                    """
-                    UPDATE public.etl_fk_retry_queue
-                    SET last_attempted_at = CURRENT_TIMESTAMP,
-                        attempt_count = attempt_count + 1,
-                        error_detail = %s
-                    WHERE queue_id = %s
-                    """,
-                    (err, queue_id),
-                )
                 still_failing += 1
                 logger.warning(
                     "FK retry queue: %s record_id=%s still unresolvable "
                     "(attempt %d/%d): %s",
                     source_table, record_id, attempt_count + 1, _MAX_ATTEMPTS, err,
                 )
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE public.etl_fk_retry_queue q
+                SET resolved = b.ok,
+                    last_attempted_at = CURRENT_TIMESTAMP,
+                    attempt_count = q.attempt_count + 1,
+                    error_detail = CASE WHEN b.ok THEN NULL ELSE b.err END
+                FROM unnest(%s::bigint[], %s::boolean[], %s::text[]) AS b(queue_id, ok, err)
+                WHERE q.queue_id = b.queue_id
+                """,
+                (queue_ids, outcomes, errors),
+            )
         conn.commit()
 
+        if len(rows) < batch_size:
+            break
+
     logger.info(
-        "FK retry queue drain complete for %s: resolved=%d, still_failing=%d",
-        source_table, resolved, still_failing,
+        "FK retry queue drain complete for %s: resolved=%d, still_failing=%d, waiting_on_parent=%d",
+        source_table, resolved, still_failing, pending - ready,
     )
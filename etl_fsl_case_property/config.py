@@ -62,6 +62,9 @@ ETL_CONFIG = {
     'chunk_overlap_days': get_int_env('CHUNK_OVERLAP_DAYS', 1),
     'batch_size': 100,
     'enable_embeddings': get_bool_env('ENABLE_EMBEDDINGS', False),
+    'parallel_mode': get_bool_env('FSL_PARALLEL_MODE', True),
+    'batch_media_writes': get_bool_env('FSL_BATCH_MEDIA_WRITES', True),
+    'write_batch_size': get_int_env('FSL_WRITE_BATCH_SIZE', 50),
 }
 
 EMBEDDING_CONFIG = {
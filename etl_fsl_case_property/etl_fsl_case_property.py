@@ -8,14 +8,18 @@ import sys
 import time
 import requests
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import Json, execute_values
 from datetime import datetime, timedelta, timezone
 from tqdm import tqdm
 import logging
 import colorlog
 from typing import List, Dict, Optional, Tuple, Set
+import ast
 import json
+import threading
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
 # Add project root to Python path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -23,6 +27,9 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
+from etl_incremental import generate_date_ranges as shared_generate_date_ranges
+from db_pooling import PostgreSQLConnectionPool, compute_safe_workers
 
 try:
     from etl_fk_retry_queue import push_fk_failure, drain_fk_queue as _drain_fk_queue
@@ -153,8 +160,12 @@ class FSLCasePropertyETL:
     """ETL Pipeline for FSL Case Property API"""
     
     def __init__(self):
-        self.db_conn = None
-        self.db_cursor = None
+        self._local = threading.local()
+        self.db_pool = None
+        self.mo_seizure_keys = None  # (crime_id, mo_id) pairs from mo_seizures, loaded once per run
+        self.stats_lock = threading.Lock()
+        self.log_lock = threading.Lock()
+        self.max_workers = min(32, int(os.environ.get('MAX_WORKERS', (os.cpu_count() or 1) * 4)))
         self.stats = {
             'total_api_calls': 0,
             'total_records_fetched': 0,
@@ -256,23 +267,69 @@ class FSLCasePropertyETL:
         if hasattr(self, 'duplicates_log') and self.duplicates_log:
             self.duplicates_log.close()
     
+    def _ensure_thread_connection(self):
+        """Lease a pooled connection for this thread (replacing a closed one)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed:
+            if conn is not None:
+                self._release_thread_connection()
+            self._local.conn = self.db_pool.get_connection()
+            self._local.cursor = self._local.conn.cursor()
+
+    @property
+    def db_conn(self):
+        self._ensure_thread_connection()
+        return self._local.conn
+
+    @property
+    def db_cursor(self):
+        self._ensure_thread_connection()
+        return self._local.cursor
+
+    def _release_thread_connection(self):
+        """Return this thread's pooled connection (if any) to the pool"""
+        cursor = getattr(self._local, 'cursor', None)
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        self._local.cursor = None
+        try:
+            if cursor:
+                cursor.close()
+        except Exception:
+            pass
+        if conn is not None and self.db_pool:
+            self.db_pool.return_connection(conn, close_conn=bool(conn.closed))
+
+    @contextmanager
+    def _thread_connection(self):
+        """Lease a pooled connection as this worker thread's db_conn for the duration of the block"""
+        try:
+            yield self.db_conn
+        finally:
+            self._release_thread_connection()
+
     def connect_db(self):
-        """Connect to PostgreSQL database"""
+        """Create the shared connection pool; each thread leases its own connection from it"""
         try:
-            self.db_conn = psycopg2.connect(**DB_CONFIG)
-            self.db_cursor = self.db_conn.cursor()
-            logger.info(f"✅ Connected to database: {DB_CONFIG['dbname']}")
+            self.db_pool = PostgreSQLConnectionPool(
+                minconn=5,
+                maxconn=self.max_workers + 5
+            )
+            _ = self.db_conn
+            logger.info(f"✅ Connected to database: {DB_CONFIG['dbname']} (pool maxconn={self.max_workers + 5})")
             return True
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}")
             return False
     
     def close_db(self):
-        """Close database connection"""
-        if self.db_cursor:
-            self.db_cursor.close()
-        if self.db_conn:
-            self.db_conn.close()
+        """Return this thread's connection and close the pool"""
+        try:
+            self._release_thread_connection()
+        except Exception:
+            pass
+        if self.db_pool:
+            self.db_pool.close_all()
         logger.info("Database connection closed")
     
     def get_table_columns(self, table_name: str) -> Set[str]:
@@ -397,10 +454,40 @@ class FSLCasePropertyETL:
         
         return new_fields
 
+    def load_mo_seizure_keys(self):
+        """
+        Load every (crime_id, mo_id) pair of mo_seizures into memory (once per run)
+
+        MO_ID validation then becomes a set lookup instead of a query per record. If the
+        load fails, mo_id_exists_for_crime() keeps querying the table.
+        """
+        try:
+            keys = set()
+            # Named cursor: pairs are streamed from the server instead of fetched at once
+            with self.db_conn.cursor(name='fsl_mo_seizure_keys') as cursor:
+                cursor.itersize = 50000
+                cursor.execute(f"""
+                    SELECT DISTINCT crime_id::text, mo_id::text
+                    FROM {MO_SEIZURES_TABLE}
+                    WHERE mo_id IS NOT NULL
+                """)
+                for crime_id, mo_id in cursor:
+                    keys.add((crime_id, mo_id))
+            self.db_conn.commit()
+            self.mo_seizure_keys = keys
+            logger.info(f"📥 Loaded {len(keys)} (crime_id, mo_id) pairs from {MO_SEIZURES_TABLE} for MO_ID validation")
+        except Exception as e:
+            self.db_conn.rollback()
+            self.mo_seizure_keys = None
+            logger.warning(f"⚠️  Could not preload {MO_SEIZURES_TABLE} keys, validating MO_ID per record: {e}")
+
     def mo_id_exists_for_crime(self, crime_id: str, mo_id: Optional[str]) -> bool:
         """Return True if mo_id is null/empty or found for the same crime in mo_seizures."""
         if not mo_id:
             return True
+        if self.mo_seizure_keys is not None and (str(crime_id), str(mo_id)) in self.mo_seizure_keys:
+            return True
+        # Not preloaded, or a miss: confirm against the table (the row may have landed since the preload)
         try:
             self.db_cursor.execute(
                 f"""
@@ -507,72 +594,10 @@ class FSLCasePropertyETL:
     
     def generate_date_ranges(self, start_date: str, end_date: str, chunk_days: int = 5, overlap_days: int = 1) -> List[Tuple[str, str]]:
         """
-        Generate date ranges in chunks with overlap to ensure no data is missed
-        OVERLAP: Each chunk overlaps with the previous chunk by overlap_days to catch boundary records
-        
-        Accepts ISO 8601 format dates (e.g., '2022-10-01T00:00:00+05:30')
-        Returns date-only format (YYYY-MM-DD) for API compatibility
-        
-        API interprets dates as:
-        - fromDate: YYYY-MM-DD 00:00:00 IST (start of day)
-        - toDate: YYYY-MM-DD 23:59:59 IST (end of day)
-        
-        Example with chunk_days=5, overlap_days=1:
-        - Chunk 1: 2022-10-01 to 2022-10-05 (2022-10-01 00:00:00 IST to 2022-10-05 23:59:59 IST)
-        - Chunk 2: 2022-10-05 to 2022-10-10 (2022-10-05 00:00:00 IST to 2022-10-10 23:59:59 IST) - overlaps by 1 day
-        - Chunk 3: 2022-10-10 to 2022-10-15 (2022-10-10 00:00:00 IST to 2022-10-15 23:59:59 IST) - overlaps by 1 day
-        - Overlap ensures no records are missed at boundaries ✅
-        
-        Note: Duplicate records from overlap are handled by smart update logic (updates only if changed)
-        
-        Args:
-            start_date: Start date in ISO 8601 format (e.g., '2022-10-01T00:00:00+05:30')
-            end_date: End date in ISO 8601 format (e.g., '2025-11-18T23:59:59+05:30')
-            chunk_days: Number of days per chunk
-            overlap_days: Number of days to overlap between chunks (default: 1 to ensure no data loss)
-        
-        Returns:
-            List of (from_date, to_date) tuples in YYYY-MM-DD format (for API compatibility)
+        Generate overlapping date ranges in chunks (shared implementation in etl_incremental).
+        Returns (from_date, to_date) tuples as YYYY-MM-DD.
         """
-        date_ranges = []
-        # Parse ISO format dates
-        current_date = parse_iso_date(start_date)
-        end = parse_iso_date(end_date)
-        
-        # Extract date part (without time) for comparison
-        current_date_only = current_date.date()
-        end_date_only = end.date()
-        
-        while current_date_only <= end_date_only:
-            # Calculate chunk end: current_date + (chunk_days - 1) days
-            # Example: If current_date = 2022-10-01 and chunk_days = 5:
-            #   chunk_end = 2022-10-01 + 4 days = 2022-10-05 (5 days total: 1,2,3,4,5)
-            chunk_end_date = current_date_only + timedelta(days=chunk_days - 1)
-            if chunk_end_date > end_date_only:
-                chunk_end_date = end_date_only
-            
-            # Return date-only format for API compatibility
-            date_ranges.append((
-                current_date_only.strftime('%Y-%m-%d'),
-                chunk_end_date.strftime('%Y-%m-%d')
-            ))
-            
-            # Next chunk starts with overlap: current chunk end - overlap_days + 1
-            # This ensures the last overlap_days of current chunk are included in next chunk
-            # Example: If chunk_end = 2022-10-05 and overlap_days = 1:
-            #   next chunk starts at 2022-10-05 - 1 + 1 = 2022-10-05 (includes day 5 in both chunks)
-            # Example: If chunk_end = 2022-10-05 and overlap_days = 2:
-            #   next chunk starts at 2022-10-05 - 2 + 1 = 2022-10-04 (includes days 4,5 in both chunks)
-            next_start = chunk_end_date - timedelta(days=overlap_days - 1)
-            
-            # If we've already reached or passed the end date, break
-            if chunk_end_date >= end_date_only:
-                break
-            
-            # Move to next chunk start
-            current_date_only = next_start
-        
-        return date_ranges
+        return shared_generate_date_ranges(start_date, end_date, chunk_days, overlap_days)
     
     def fetch_fsl_case_property_api(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
         """
@@ -599,7 +624,7 @@ class FSLCasePropertyETL:
             try:
                 logger.debug(f"Fetching FSL case property: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.trace(f"API Request - URL: {url}, Params: {params}, Headers: {headers}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
@@ -906,19 +931,20 @@ class FSLCasePropertyETL:
             'case_property_data': case_property
         }
         
-        self.failed_log.write(f"\n{'='*80}\n")
-        self.failed_log.write(f"CASE_PROPERTY_ID: {case_property.get('case_property_id')}\n")
-        self.failed_log.write(f"CRIME_ID: {case_property.get('crime_id')}\n")
-        self.failed_log.write(f"FSL_NO: {case_property.get('fsl_no')}\n")
-        self.failed_log.write(f"MO_ID: {case_property.get('mo_id')}\n")
-        self.failed_log.write(f"REASON: {reason}\n")
-        if error_details:
-            self.failed_log.write(f"ERROR: {error_details}\n")
-        self.failed_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        self.failed_log.write(f"\nJSON Format:\n")
-        self.failed_log.write(json.dumps(failed_info, indent=2, ensure_ascii=False, default=str))
-        self.failed_log.write(f"\n")
-        self.failed_log.flush()
+        with self.log_lock:
+            self.failed_log.write(f"\n{'='*80}\n")
+            self.failed_log.write(f"CASE_PROPERTY_ID: {case_property.get('case_property_id')}\n")
+            self.failed_log.write(f"CRIME_ID: {case_property.get('crime_id')}\n")
+            self.failed_log.write(f"FSL_NO: {case_property.get('fsl_no')}\n")
+            self.failed_log.write(f"MO_ID: {case_property.get('mo_id')}\n")
+            self.failed_log.write(f"REASON: {reason}\n")
+            if error_details:
+                self.failed_log.write(f"ERROR: {error_details}\n")
+            self.failed_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
+            self.failed_log.write(f"\nJSON Format:\n")
+            self.failed_log.write(json.dumps(failed_info, indent=2, ensure_ascii=False, default=str))
+            self.failed_log.write(f"\n")
+            self.failed_log.flush()
     
     def log_invalid_crime_id(self, case_property: Dict, crime_id_str: str, chunk_range: str = ""):
         """Log a case property that failed due to invalid CRIME_ID (not found in crimes table)"""
@@ -932,18 +958,19 @@ class FSLCasePropertyETL:
             'case_property_data': case_property
         }
         
-        self.invalid_crime_id_log.write(f"\n{'='*80}\n")
-        self.invalid_crime_id_log.write(f"CASE_PROPERTY_ID: {case_property.get('case_property_id')}\n")
-        self.invalid_crime_id_log.write(f"CRIME_ID: {crime_id_str}\n")
-        self.invalid_crime_id_log.write(f"FSL_NO: {case_property.get('fsl_no')}\n")
-        self.invalid_crime_id_log.write(f"MO_ID: {case_property.get('mo_id')}\n")
-        self.invalid_crime_id_log.write(f"REASON: CRIME_ID not found in crimes table\n")
-        self.invalid_crime_id_log.write(f"Chunk: {chunk_range}\n")
-        self.invalid_crime_id_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
-        self.invalid_crime_id_log.write(f"\nJSON Format:\n")
-        self.invalid_crime_id_log.write(json.dumps(failure_info, indent=2, ensure_ascii=False, default=str))
-        self.invalid_crime_id_log.write(f"\n")
-        self.invalid_crime_id_log.flush()
+        with self.log_lock:
+            self.invalid_crime_id_log.write(f"\n{'='*80}\n")
+            self.invalid_crime_id_log.write(f"CASE_PROPERTY_ID: {case_property.get('case_property_id')}\n")
+            self.invalid_crime_id_log.write(f"CRIME_ID: {crime_id_str}\n")
+            self.invalid_crime_id_log.write(f"FSL_NO: {case_property.get('fsl_no')}\n")
+            self.invalid_crime_id_log.write(f"MO_ID: {case_property.get('mo_id')}\n")
+            self.invalid_crime_id_log.write(f"REASON: CRIME_ID not found in crimes table\n")
+            self.invalid_crime_id_log.write(f"Chunk: {chunk_range}\n")
+            self.invalid_crime_id_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
+            self.invalid_crime_id_log.write(f"\nJSON Format:\n")
+            self.invalid_crime_id_log.write(json.dumps(failure_info, indent=2, ensure_ascii=False, default=str))
+            self.invalid_crime_id_log.write(f"\n")
+            self.invalid_crime_id_log.flush()
     
     def log_duplicates_chunk(self, from_date: str, to_date: str, duplicates: List[Dict]):
         """Log duplicates found in a chunk"""
@@ -974,108 +1001,83 @@ class FSLCasePropertyETL:
         
         self.duplicates_log.flush()
     
-    def insert_media_files(self, case_property_id, media_files: List[Dict]) -> int:
+    def build_media_rows(self, case_property_id, media_files: List[Dict]) -> List[tuple]:
+        """Build the media child rows of one case property (API snapshot, in API order)"""
+        rows = []
+        for position, media_item in enumerate(media_files or []):
+            media_payload = media_item.get('media_payload')
+            rows.append((
+                case_property_id,
+                media_item.get('media_index', position),
+                media_item.get('file_id'),
+                Json(media_payload) if media_payload is not None else None
+            ))
+        return rows
+
+    def write_media_rows(self, media: Dict[str, List[tuple]]):
         """
-        Insert or update media files for a case property.
-        Uses replace strategy: delete existing rows then insert API snapshot rows.
-        
-        Args:
-            case_property_id: MongoDB ObjectId (string) of the case property
-            media_files: List of normalized media entries with media_index, file_id, media_payload
-        
-        Returns:
-            Number of media files inserted
+        Replace the media files of the given case properties (no commit)
+        Uses replace strategy: one DELETE ... = ANY(%s) of the existing rows, then one
+        multi-row INSERT of the API snapshot rows.
         """
-        if not case_property_id:
-            return 0
-        
-        try:
-            # Delete existing media files for this case property
-            self.db_cursor.execute(
-                f"DELETE FROM {FSL_CASE_PROPERTY_MEDIA_TABLE} WHERE case_property_id = %s",
-                (case_property_id,)
+        if not media:
+            return
+        self.db_cursor.execute(
+            f"DELETE FROM {FSL_CASE_PROPERTY_MEDIA_TABLE} WHERE case_property_id = ANY(%s)",
+            (list(media),)
+        )
+        values = [row for rows in media.values() for row in rows]
+        if values:
+            execute_values(
+                self.db_cursor,
+                f"""
+                INSERT INTO {FSL_CASE_PROPERTY_MEDIA_TABLE}
+                    (case_property_id, media_index, file_id, media_payload)
+                VALUES %s
+                """,
+                values,
+                page_size=1000,
             )
-            
-            inserted_count = 0
-            if not media_files:
-                return 0
-            for media_item in media_files:
-                media_index = media_item.get('media_index', inserted_count)
-                file_id = media_item.get('file_id')
-                media_payload = media_item.get('media_payload')
-
-                # Insert media row with preserved payload snapshot
-                self.db_cursor.execute(
-                    f"""
-                    INSERT INTO {FSL_CASE_PROPERTY_MEDIA_TABLE}
-                        (case_property_id, media_index, file_id, media_payload)
-                    VALUES (%s, %s, %s, %s)
-                    """,
-                    (case_property_id, media_index, file_id, Json(media_payload) if media_payload is not None else None)
-                )
-                inserted_count += 1
-            
-            if inserted_count > 0:
-                logger.trace(f"Inserted {inserted_count} media files for case_property_id={case_property_id}")
-            
-            return inserted_count
-            
-        except Exception as e:
-            logger.error(f"Error inserting media files: {e}")
-            return 0
-    
-    def insert_fsl_case_property(self, case_property: Dict, chunk_date_range: str = "") -> Tuple[bool, str]:
+            logger.trace(f"Inserted {len(values)} media files for {len(media)} case properties")
+
+    def validate_case_property(self, case_property: Dict, chunk_date_range: str = "") -> Optional[str]:
         """
-        Insert or update single FSL case property into database with smart update logic
-        Dates are always from API (never use CURRENT_TIMESTAMP)
-        
-        Behavior:
-        - NEW DATA: If case_property_id doesn't exist → INSERT
-        - EXISTING DATA: If exists → UPDATE (updates only changed fields)
-        - Smart Update: Only updates fields that have changed, preserves existing values if API sends NULL
-        - Media Files: Always replaced (delete old, insert new)
-        
-        Date Handling:
-        - date_created and date_modified are always taken from API
-        - If API provides dates, they are used (even if different from existing)
-        - If API doesn't provide dates, they remain NULL
-        
-        Args:
-            case_property: Transformed case property dict
-            chunk_date_range: Date range for chunk tracking
-        
+        Check the required fields and the MO_ID reference of a transformed case property
+        Failures are counted and logged here.
+
         Returns:
-            Tuple of (success: bool, operation: str) where operation is 'inserted', 'updated', 'no_change', or 'skipped'
+            None if the case property can be written, otherwise the failure reason
         """
         case_property_id = case_property.get('case_property_id')
         crime_id = case_property.get('crime_id')
         mo_id = case_property.get('mo_id')
         original_crime_id = case_property.get('_original_crime_id')
-        media_files = case_property.get('_media_files', [])
-        
+
         # Validate case_property_id exists
         if not case_property_id:
             reason = 'missing_case_property_id'
             error_details = "Case property record missing CASE_PROPERTY_ID"
             logger.warning(f"⚠️  {error_details}")
-            self.stats['total_records_failed'] += 1
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
             self.log_failed_record(case_property, reason, error_details)
-            return False, reason
+            return reason
         
         # Validate crime_id is provided (NOT NULL constraint)
         if not crime_id:
             reason = 'missing_crime_id'
             error_details = f"CRIME_ID is required (NOT NULL) but was not provided"
             logger.warning(f"⚠️  {error_details}, skipping case property")
-            self.stats['total_records_failed'] += 1
-            self.stats['total_records_failed_crime_id'] += 1
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
+                self.stats['total_records_failed_crime_id'] += 1
             self.log_failed_record(case_property, reason, error_details)
             self.log_invalid_crime_id(case_property, original_crime_id or 'NULL', chunk_date_range)
             # Park in FK retry queue — recovers when crime record arrives.
             if push_fk_failure is not None and original_crime_id:
                 try:
                     push_fk_failure(
-                        conn, 'fsl_case_property',
+                        self.db_conn, 'fsl_case_property',
                         record_id=original_crime_id,
                         record_json=json.dumps(
                             {k: str(v) if v is not None else None
@@ -1084,11 +1086,11 @@ class FSLCasePropertyETL:
                         missing_fk_column='crime_id',
                         missing_fk_value=original_crime_id,
                     )
-                    conn.commit()
+                    self.db_conn.commit()
                 except Exception as _qe:
                     logger.warning("FK queue push failed for fsl_case_property %s: %s",
                                    original_crime_id, _qe)
-            return False, reason
+            return reason
 
         # Validate MO relationship logically (crime_id + mo_id) when mo_id is provided.
         if mo_id and not self.mo_id_exists_for_crime(crime_id, mo_id):
@@ -1097,181 +1099,417 @@ class FSLCasePropertyETL:
                 f"MO_ID {mo_id} not found in {MO_SEIZURES_TABLE} for CRIME_ID {crime_id}"
             )
             logger.warning(f"⚠️  {error_details}")
-            self.stats['total_records_failed'] += 1
-            self.stats['total_records_failed_mo_id'] += 1
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
+                self.stats['total_records_failed_mo_id'] += 1
             self.log_failed_record(case_property, reason, error_details)
-            return False, reason
+            return reason
+        return None
+
+    def insert_fsl_case_property(self, case_property: Dict, chunk_date_range: str = "") -> Tuple[bool, str]:
+        """
+        Insert or update single FSL case property into database with smart update logic
+        The case property and its media files are written in one transaction (all or nothing)
+        
+        Args:
+            case_property: Transformed case property dict
+            chunk_date_range: Date range for chunk tracking
         
+        Returns:
+            Tuple of (success: bool, operation: str) where operation is 'inserted', 'updated', 'no_change', or the failure reason
+        """
+        reason = self.validate_case_property(case_property, chunk_date_range)
+        if reason:
+            return False, reason
+
         try:
-            logger.trace(f"Processing case property: case_property_id={case_property_id}, crime_id={crime_id}")
-            
-            # Check if case property already exists (based on primary key)
-            if self.case_property_exists(case_property_id):
-                # Get existing record to compare
-                existing = self.get_existing_case_property(case_property_id)
-                if not existing:
-                    logger.warning(f"⚠️  Case property exists check returned True but fetch returned None")
-                    # Fall back to insert
-                    existing = None
+            return self.write_case_properties([case_property], chunk_date_range)[0]
+        except Exception as e:
+            # Media write failed; the whole case property was rolled back
+            reason = 'integrity_error' if isinstance(e, psycopg2.IntegrityError) else 'error'
+            logger.error(f"❌ Error writing case property media files: {e}")
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
+                self.stats['errors'].append(f"Case property case_property_id={case_property.get('case_property_id')}: {str(e)}")
+            self.log_failed_record(case_property, reason, str(e))
+            return False, reason
+
+    def write_case_properties(self, case_properties: List[Dict], chunk_date_range: str = "") -> List[Tuple[bool, str]]:
+        """
+        Write validated case properties and their media files in one transaction
+
+        Each case property row is written under its own savepoint; a failing row is rolled
+        back alone and its media files are left untouched. The media files of all case
+        properties that made it are then replaced at once (see write_media_rows), followed
+        by a single commit. Stats and failure logs are applied only after the commit.
+
+        Media Files: Always replaced (delete old, insert new); a case property whose row
+        did not change but has media files counts as 'updated'.
+
+        Returns:
+            (success, operation) per case property, in input order
+
+        Raises:
+            The media write error, after rolling back the whole transaction
+            (nothing is counted; callers retry per case property)
+        """
+        results = []
+        failures = []
+        media = {}   # case_property_id -> media rows; last occurrence wins
+        stats = {}
+
+        for case_property in case_properties:
+            case_property_id = case_property.get('case_property_id')
+            record_stats = {}
+            self.db_cursor.execute("SAVEPOINT case_property_write")
+            try:
+                operation = self.write_case_property_row(case_property, record_stats)
+                media_rows = self.build_media_rows(case_property_id, case_property.get('_media_files', []))
+                self.db_cursor.execute("RELEASE SAVEPOINT case_property_write")
+            except Exception as e:
+                self.db_cursor.execute("ROLLBACK TO SAVEPOINT case_property_write")
+                reason = 'integrity_error' if isinstance(e, psycopg2.IntegrityError) else 'error'
+                failures.append((case_property, reason, e))
+                results.append((False, reason))
+                continue
+
+            if media_rows:
+                media_key = 'total_media_inserted' if operation == 'inserted' else 'total_media_updated'
+                record_stats[media_key] = record_stats.get(media_key, 0) + len(media_rows)
+                if operation == 'no_change':
+                    operation = 'updated'  # Media updated even if main record didn't change
+            if operation == 'no_change':
+                record_stats['total_records_no_change'] = 1
+                logger.trace(f"No changes needed for case property (all fields match or preserved)")
+
+            media.pop(case_property_id, None)
+            media[case_property_id] = media_rows
+            for key, count in record_stats.items():
+                stats[key] = stats.get(key, 0) + count
+            results.append((True, operation))
+
+        try:
+            self.write_media_rows(media)
+            self.db_conn.commit()
+            logger.trace(f"Transaction committed for {len(case_properties)} case properties")
+        except Exception:
+            self.db_conn.rollback()
+            raise
+
+        with self.stats_lock:
+            for key, count in stats.items():
+                self.stats[key] += count
+        for case_property, reason, e in failures:
+            if reason == 'integrity_error':
+                logger.warning(f"⚠️  Integrity error for case property: {e}")
+                with self.stats_lock:
+                    self.stats['total_records_failed'] += 1
+            else:
+                logger.error(f"❌ Error inserting case property: {e}")
+                with self.stats_lock:
+                    self.stats['total_records_failed'] += 1
+                    self.stats['errors'].append(f"Case property case_property_id={case_property.get('case_property_id')}: {str(e)}")
+            self.log_failed_record(case_property, reason, str(e))
+        return results
+
+    def write_case_property_row(self, case_property: Dict, stats: Dict[str, int]) -> str:
+        """
+        Insert or update the fsl_case_property row (no commit, no media files)
+        Dates are always from API (never use CURRENT_TIMESTAMP)
+        
+        Behavior:
+        - NEW DATA: If case_property_id doesn't exist → INSERT
+        - EXISTING DATA: If exists → UPDATE (updates only changed fields)
+        - Source-of-truth overwrite: a field that differs from the API value (including NULL transitions) is updated
+        
+        Date Handling:
+        - date_created and date_modified are always taken from API
+        - If API provides dates, they are used (even if different from existing)
+        - If API doesn't provide dates, they remain NULL
+        
+        Returns:
+            'inserted', 'updated' or 'no_change'
+        """
+        case_property_id = case_property.get('case_property_id')
+        crime_id = case_property.get('crime_id')
+        logger.trace(f"Processing case property: case_property_id={case_property_id}, crime_id={crime_id}")
+        
+        # Check if case property already exists (based on primary key)
+        if self.case_property_exists(case_property_id):
+            # Get existing record to compare
+            existing = self.get_existing_case_property(case_property_id)
+            if existing:
+                update_fields = []
+                update_values = []
+                changes = []
                 
-                if existing:
-                    # Source-of-truth overwrite model:
-                    # if API value differs from DB (including NULL transitions), update it.
-                    
-                    update_fields = []
-                    update_values = []
-                    changes = []
-                    
-                    # Define all fields to check (excluding primary key)
-                    fields_to_check = [
-                        ('case_type',), ('crime_id',), ('mo_id',), ('status',),
-                        ('send_date',), ('fsl_date',), ('date_disposal',), ('release_date',),
-                        ('return_date',), ('date_custody',), ('date_sent_to_expert',), ('court_order_date',),
-                        ('forwarding_through',), ('court_name',), ('fsl_court_name',), ('cpr_court_name',),
-                        ('court_order_number',), ('fsl_no',), ('fsl_request_id',), ('report_received',),
-                        ('opinion',), ('opinion_furnished',), ('strength_of_evidence',), ('expert_type',),
-                        ('other_expert_type',), ('cpr_no',), ('direction_by_court',), ('details_disposal',),
-                        ('place_disposal',), ('release_order_no',), ('place_custody',), ('assign_custody',),
-                        ('property_received_back',), ('date_created',), ('date_modified',)
-                    ]
-                    
-                    for db_field in fields_to_check:
-                        db_field = db_field[0] if isinstance(db_field, tuple) else db_field
-                        existing_val = existing.get(db_field)
-                        new_val = case_property.get(db_field)
-                        
-                        if existing_val != new_val:
-                            update_fields.append(f"{db_field} = %s")
-                            update_values.append(new_val)
-                            changes.append(f"{db_field}: {existing_val} → {new_val}")
-                            logger.trace(f"  Will update {db_field}: {existing_val} → {new_val}")
-                        else:
-                            logger.trace(f"  No change for {db_field}: {existing_val}")
+                # Define all fields to check (excluding primary key)
+                fields_to_check = [
+                    ('case_type',), ('crime_id',), ('mo_id',), ('status',),
+                    ('send_date',), ('fsl_date',), ('date_disposal',), ('release_date',),
+                    ('return_date',), ('date_custody',), ('date_sent_to_expert',), ('court_order_date',),
+                    ('forwarding_through',), ('court_name',), ('fsl_court_name',), ('cpr_court_name',),
+                    ('court_order_number',), ('fsl_no',), ('fsl_request_id',), ('report_received',),
+                    ('opinion',), ('opinion_furnished',), ('strength_of_evidence',), ('expert_type',),
+                    ('other_expert_type',), ('cpr_no',), ('direction_by_court',), ('details_disposal',),
+                    ('place_disposal',), ('release_order_no',), ('place_custody',), ('assign_custody',),
+                    ('property_received_back',), ('date_created',), ('date_modified',)
+                ]
+                
+                for db_field in fields_to_check:
+                    db_field = db_field[0] if isinstance(db_field, tuple) else db_field
+                    existing_val = existing.get(db_field)
+                    new_val = case_property.get(db_field)
                     
-                    # Only update if there are changes
-                    if update_fields:
-                        update_query = f"""
-                            UPDATE {FSL_CASE_PROPERTY_TABLE} SET
-                                {', '.join(update_fields)}
-                            WHERE case_property_id = %s
-                        """
-                        update_values.append(case_property_id)
-                        self.db_cursor.execute(update_query, tuple(update_values))
-                        self.stats['total_records_updated'] += 1
-                        logger.debug(f"Updated case property: case_property_id={case_property_id} ({len(changes)} fields changed)")
-                        logger.trace(f"Changes: {', '.join(changes)}")
-                        
-                        # Handle media files (always replace)
-                        media_count = self.insert_media_files(case_property_id, media_files)
-                        if media_count > 0:
-                            self.stats['total_media_updated'] += media_count
-                        
-                        self.db_conn.commit()
-                        logger.trace(f"Transaction committed for updated case property")
-                        return True, 'updated'
+                    if existing_val != new_val:
+                        update_fields.append(f"{db_field} = %s")
+                        update_values.append(new_val)
+                        changes.append(f"{db_field}: {existing_val} → {new_val}")
+                        logger.trace(f"  Will update {db_field}: {existing_val} → {new_val}")
                     else:
-                        # No changes needed, but still update media files if they changed
-                        media_count = self.insert_media_files(case_property_id, media_files)
-                        if media_count > 0:
-                            self.stats['total_media_updated'] += media_count
-                            self.db_conn.commit()
-                            return True, 'updated'  # Media updated even if main record didn't change
-                        
-                        self.stats['total_records_no_change'] += 1
-                        logger.trace(f"No changes needed for case property (all fields match or preserved)")
-                        return True, 'no_change'
-                else:
-                    # Exists check returned True but couldn't fetch - treat as new insert
-                    logger.warning(f"⚠️  Case property exists but couldn't fetch, treating as new insert")
-                    # Fall through to insert logic
-            else:
-                # Insert new case property
-                logger.trace(f"Inserting new case property: case_property_id={case_property_id}, crime_id={crime_id}")
-                insert_query = f"""
-                    INSERT INTO {FSL_CASE_PROPERTY_TABLE} (
-                        case_property_id, case_type, crime_id, mo_id, status,
-                        send_date, fsl_date, date_disposal, release_date, return_date,
-                        date_custody, date_sent_to_expert, court_order_date,
-                        forwarding_through, court_name, fsl_court_name, cpr_court_name,
-                        court_order_number, fsl_no, fsl_request_id, report_received,
-                        opinion, opinion_furnished, strength_of_evidence, expert_type,
-                        other_expert_type, cpr_no, direction_by_court, details_disposal,
-                        place_disposal, release_order_no, place_custody, assign_custody,
-                        property_received_back, date_created, date_modified
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                """
-                self.db_cursor.execute(insert_query, (
-                    case_property.get('case_property_id'),
-                    case_property.get('case_type'),
-                    case_property.get('crime_id'),
-                    case_property.get('mo_id'),
-                    case_property.get('status'),
-                    case_property.get('send_date'),
-                    case_property.get('fsl_date'),
-                    case_property.get('date_disposal'),
-                    case_property.get('release_date'),
-                    case_property.get('return_date'),
-                    case_property.get('date_custody'),
-                    case_property.get('date_sent_to_expert'),
-                    case_property.get('court_order_date'),
-                    case_property.get('forwarding_through'),
-                    case_property.get('court_name'),
-                    case_property.get('fsl_court_name'),
-                    case_property.get('cpr_court_name'),
-                    case_property.get('court_order_number'),
-                    case_property.get('fsl_no'),
-                    case_property.get('fsl_request_id'),
-                    case_property.get('report_received'),
-                    case_property.get('opinion'),
-                    case_property.get('opinion_furnished'),
-                    case_property.get('strength_of_evidence'),
-                    case_property.get('expert_type'),
-                    case_property.get('other_expert_type'),
-                    case_property.get('cpr_no'),
-                    case_property.get('direction_by_court'),
-                    case_property.get('details_disposal'),
-                    case_property.get('place_disposal'),
-                    case_property.get('release_order_no'),
-                    case_property.get('place_custody'),
-                    case_property.get('assign_custody'),
-                    case_property.get('property_received_back'),
-                    case_property.get('date_created'),  # From API (or NULL)
-                    case_property.get('date_modified')  # From API (or NULL)
-                ))
-                self.stats['total_records_inserted'] += 1
+                        logger.trace(f"  No change for {db_field}: {existing_val}")
                 
-                # Insert media files
-                media_count = self.insert_media_files(case_property_id, media_files)
-                if media_count > 0:
-                    self.stats['total_media_inserted'] += media_count
-                
-                logger.debug(f"Inserted case property: case_property_id={case_property_id}, crime_id={crime_id}")
-                logger.trace(f"Insert query executed for case property")
-                self.db_conn.commit()
-                logger.trace(f"Transaction committed for inserted case property")
-                return True, 'inserted'
-            
-        except psycopg2.IntegrityError as e:
-            self.db_conn.rollback()
-            reason = 'integrity_error'
-            error_details = str(e)
-            logger.warning(f"⚠️  Integrity error for case property: {e}")
-            self.stats['total_records_failed'] += 1
-            self.log_failed_record(case_property, reason, error_details)
-            return False, reason
-        except Exception as e:
-            self.db_conn.rollback()
-            reason = 'error'
-            error_details = str(e)
-            logger.error(f"❌ Error inserting case property: {e}")
-            self.stats['total_records_failed'] += 1
-            self.stats['errors'].append(f"Case property case_property_id={case_property_id}: {str(e)}")
-            self.log_failed_record(case_property, reason, error_details)
-            return False, reason
+                # Only update if there are changes
+                if not update_fields:
+                    return 'no_change'
+                update_query = f"""
+                    UPDATE {FSL_CASE_PROPERTY_TABLE} SET
+                        {', '.join(update_fields)}
+                    WHERE case_property_id = %s
+                """
+                update_values.append(case_property_id)
+                self.db_cursor.execute(update_query, tuple(update_values))
+                stats['total_records_updated'] = stats.get('total_records_updated', 0) + 1
+                logger.debug(f"Updated case property: case_property_id={case_property_id} ({len(changes)} fields changed)")
+                logger.trace(f"Changes: {', '.join(changes)}")
+                return 'updated'
+            # Exists check returned True but couldn't fetch - treat as new insert
+            logger.warning(f"⚠️  Case property exists but couldn't fetch, treating as new insert")
+
+        # Insert new case property
+        logger.trace(f"Inserting new case property: case_property_id={case_property_id}, crime_id={crime_id}")
+        insert_query = f"""
+            INSERT INTO {FSL_CASE_PROPERTY_TABLE} (
+                case_property_id, case_type, crime_id, mo_id, status,
+                send_date, fsl_date, date_disposal, release_date, return_date,
+                date_custody, date_sent_to_expert, court_order_date,
+                forwarding_through, court_name, fsl_court_name, cpr_court_name,
+                court_order_number, fsl_no, fsl_request_id, report_received,
+                opinion, opinion_furnished, strength_of_evidence, expert_type,
+                other_expert_type, cpr_no, direction_by_court, details_disposal,
+                place_disposal, release_order_no, place_custody, assign_custody,
+                property_received_back, date_created, date_modified
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            )
+        """
+        self.db_cursor.execute(insert_query, (
+            case_property.get('case_property_id'),
+            case_property.get('case_type'),
+            case_property.get('crime_id'),
+            case_property.get('mo_id'),
+            case_property.get('status'),
+            case_property.get('send_date'),
+            case_property.get('fsl_date'),
+            case_property.get('date_disposal'),
+            case_property.get('release_date'),
+            case_property.get('return_date'),
+            case_property.get('date_custody'),
+            case_property.get('date_sent_to_expert'),
+            case_property.get('court_order_date'),
+            case_property.get('forwarding_through'),
+            case_property.get('court_name'),
+            case_property.get('fsl_court_name'),
+            case_property.get('cpr_court_name'),
+            case_property.get('court_order_number'),
+            case_property.get('fsl_no'),
+            case_property.get('fsl_request_id'),
+            case_property.get('report_received'),
+            case_property.get('opinion'),
+            case_property.get('opinion_furnished'),
+            case_property.get('strength_of_evidence'),
+            case_property.get('expert_type'),
+            case_property.get('other_expert_type'),
+            case_property.get('cpr_no'),
+            case_property.get('direction_by_court'),
+            case_property.get('details_disposal'),
+            case_property.get('place_disposal'),
+            case_property.get('release_order_no'),
+            case_property.get('place_custody'),
+            case_property.get('assign_custody'),
+            case_property.get('property_received_back'),
+            case_property.get('date_created'),  # From API (or NULL)
+            case_property.get('date_modified')  # From API (or NULL)
+        ))
+        stats['total_records_inserted'] = stats.get('total_records_inserted', 0) + 1
+        logger.debug(f"Inserted case property: case_property_id={case_property_id}, crime_id={crime_id}")
+        return 'inserted'
     
+    def prepare_record(self, idx: int, case_property_record: Dict, chunk_range: str,
+                       chunk_state: Dict, chunk_lock: threading.Lock) -> Optional[Tuple[Dict, str]]:
+        """Transform one API record and track duplicates; None when it cannot be written"""
+        logger.trace(f"Processing record {idx}: CASE_PROPERTY_ID={case_property_record.get('CASE_PROPERTY_ID')}, CRIME_ID={case_property_record.get('CRIME_ID')}")
+        case_property = self.transform_fsl_case_property(case_property_record)
+        
+        # Check if transform returned empty (missing required fields)
+        if not case_property:
+            logger.warning(f"⚠️  Transform returned empty for record {idx}, skipping")
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
+            with chunk_lock:
+                chunk_state['failed_keys'].append(f"record_{idx}")
+                reason = 'transform_failed'
+                if reason not in chunk_state['failed_reasons']:
+                    chunk_state['failed_reasons'][reason] = []
+                chunk_state['failed_reasons'][reason].append(f"record_{idx}")
+            return None
+        
+        case_property_id = case_property.get('case_property_id')
+        crime_id = case_property.get('crime_id')
+        original_crime_id = case_property.get('_original_crime_id')
+        
+        # Check if crime_id is provided (NOT NULL constraint)
+        if not crime_id:
+            logger.warning(f"⚠️  Case property missing CRIME_ID (required NOT NULL), skipping")
+            with self.stats_lock:
+                self.stats['total_records_failed'] += 1
+                self.stats['total_records_failed_crime_id'] += 1
+            with chunk_lock:
+                chunk_state['failed_keys'].append(f"{case_property_id or 'unknown'}")
+                reason = 'missing_crime_id'
+                if reason not in chunk_state['failed_reasons']:
+                    chunk_state['failed_reasons'][reason] = []
+                chunk_state['failed_reasons'][reason].append(original_crime_id or 'NULL')
+                chunk_state['invalid_crime_ids_in_chunk'].append({
+                    'case_property_id': case_property_id,
+                    'crime_id': original_crime_id or 'NULL',
+                    'fsl_no': case_property.get('fsl_no')
+                })
+            self.log_invalid_crime_id(case_property, original_crime_id or 'NULL', chunk_range)
+            return None
+        
+        # Create unique key for tracking duplicates (use case_property_id)
+        unique_key = str(case_property_id) if case_property_id else f"unknown_{idx}"
+        
+        # Track occurrences for duplicate reporting (but don't skip - process all)
+        with chunk_lock:
+            if unique_key in chunk_state['seen_keys']:
+                # This is a duplicate occurrence - track it but still process
+                occurrence_count = chunk_state['key_occurrences'].get(unique_key, 1) + 1
+                chunk_state['key_occurrences'][unique_key] = occurrence_count
+                chunk_state['duplicates'].append({
+                    'case_property_id': case_property_id,
+                    'crime_id': crime_id,
+                    'fsl_no': case_property.get('fsl_no'),
+                    'occurrence': occurrence_count,
+                    'first_seen_in': chunk_state['seen_keys'][unique_key],
+                    'duplicate_in': chunk_range
+                })
+                with self.stats_lock:
+                    self.stats['total_duplicates'] += 1
+                logger.info(f"⚠️  Duplicate case property found in chunk {chunk_range} (occurrence #{occurrence_count}) - Will process to update record")
+            else:
+                chunk_state['seen_keys'][unique_key] = chunk_range
+                chunk_state['key_occurrences'][unique_key] = 1
+                logger.trace(f"New case property key seen: {unique_key} in chunk {chunk_range}")
+        return case_property, unique_key
+
+    def record_outcome(self, unique_key: str, success: bool, operation: str,
+                       chunk_state: Dict, chunk_lock: threading.Lock):
+        """Add one case property's write result to the chunk state"""
+        logger.trace(f"Operation result for case property {unique_key}: success={success}, operation={operation}")
+        with chunk_lock:
+            if success:
+                if operation == 'inserted':
+                    # Only add to list if first occurrence (to avoid duplicate entries in log)
+                    if unique_key not in chunk_state['inserted_keys']:
+                        chunk_state['inserted_keys'].append(unique_key)
+                elif operation == 'updated':
+                    # Track all updates (even if same key updated multiple times)
+                    chunk_state['updated_keys'].append(unique_key)
+                elif operation == 'no_change':
+                    # Only add to list if first occurrence
+                    if unique_key not in chunk_state['no_change_keys']:
+                        chunk_state['no_change_keys'].append(unique_key)
+            else:
+                chunk_state['failed_keys'].append(unique_key)
+                if operation not in chunk_state['failed_reasons']:
+                    chunk_state['failed_reasons'][operation] = []
+                chunk_state['failed_reasons'][operation].append(unique_key)
+
+    def process_batch_worker(self, indexed_records: List[Tuple[int, Dict]], chunk_range: str,
+                             chunk_state: Dict, chunk_lock: threading.Lock):
+        """
+        Worker method to write a batch of case property records on its own pooled connection
+
+        Records are validated first, then written together by write_case_properties. If the
+        batch's media write fails, the batch is rolled back and every case property is
+        written again in its own transaction. With batch_media_writes off, every case
+        property is written in its own transaction from the start.
+        """
+        try:
+            with self._thread_connection():
+                prepared = []
+                for idx, record in indexed_records:
+                    item = self.prepare_record(idx, record, chunk_range, chunk_state, chunk_lock)
+                    if item is not None:
+                        prepared.append(item)
+                if not prepared:
+                    return
+
+                if not ETL_CONFIG.get('batch_media_writes', True):
+                    results = [self.insert_fsl_case_property(case_property, chunk_range) for case_property, _ in prepared]
+                else:
+                    results = [None] * len(prepared)
+                    writable = []
+                    for position, (case_property, _) in enumerate(prepared):
+                        reason = self.validate_case_property(case_property, chunk_range)
+                        if reason:
+                            results[position] = (False, reason)
+                        else:
+                            writable.append(position)
+
+                    if writable:
+                        try:
+                            written = self.write_case_properties([prepared[p][0] for p in writable], chunk_range)
+                        except Exception as e:
+                            logger.warning(f"⚠️  Batched write failed for {len(writable)} case properties, falling back to per-record mode: {e}")
+                            written = [self.insert_fsl_case_property(prepared[p][0], chunk_range) for p in writable]
+                        for position, result in zip(writable, written):
+                            results[position] = result
+
+                for (_, unique_key), (success, operation) in zip(prepared, results):
+                    self.record_outcome(unique_key, success, operation, chunk_state, chunk_lock)
+
+        except Exception as e:
+            logger.error(f"❌ Error in worker processing batch of {len(indexed_records)} records: {e}")
+            with self.stats_lock:
+                self.stats['total_records_failed'] += len(indexed_records)
+
+    def build_record_batches(self, case_property_raw: List[Dict], batch_size: int) -> List[List[Tuple[int, Dict]]]:
+        """
+        Split a chunk's API records into (record number, record) batches
+
+        All occurrences of a CASE_PROPERTY_ID go to the same batch, in API order, so
+        concurrent workers never write the same case property.
+        """
+        by_key = {}
+        for idx, record in enumerate(case_property_raw, 1):
+            key = record.get('CASE_PROPERTY_ID') or f"record_{idx}"
+            by_key.setdefault(str(key), []).append((idx, record))
+
+        batches = []
+        batch = []
+        for occurrences in by_key.values():
+            batch.extend(occurrences)
+            if len(batch) >= batch_size:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+        return batches
+
     def process_date_range(self, from_date: str, to_date: str, table_columns: Set[str] = None):
         """Process FSL case property records for a specific date range"""
         chunk_range = f"{from_date} to {to_date}"
@@ -1305,111 +1543,51 @@ class FSLCasePropertyETL:
                 self.update_existing_records_with_new_fields(new_fields, to_date)
         
         # Transform and insert each case property
-        self.stats['total_records_fetched'] += len(case_property_raw)
+        with self.stats_lock:
+            self.stats['total_records_fetched'] += len(case_property_raw)
         logger.trace(f"Processing {len(case_property_raw)} FSL case property records for chunk {chunk_range}")
         
-        # Track operations for this chunk
-        inserted_keys = []
-        updated_keys = []
-        no_change_keys = []
-        failed_keys = []
-        failed_reasons = {}
-        duplicates_in_chunk = []
-        invalid_crime_ids_in_chunk = []
-        
-        # Track unique keys seen in this chunk to detect duplicates (for reporting only, not skipping)
-        seen_keys = {}
-        key_occurrences = {}
-        
-        logger.trace(f"Starting to process records for chunk: {chunk_range}")
-        for idx, case_property_record in enumerate(case_property_raw, 1):
-            logger.trace(f"Processing record {idx}/{len(case_property_raw)}: CASE_PROPERTY_ID={case_property_record.get('CASE_PROPERTY_ID')}, CRIME_ID={case_property_record.get('CRIME_ID')}")
-            case_property = self.transform_fsl_case_property(case_property_record)
-            
-            # Check if transform returned empty (missing required fields)
-            if not case_property:
-                logger.warning(f"⚠️  Transform returned empty for record {idx}, skipping")
-                self.stats['total_records_failed'] += 1
-                failed_keys.append(f"record_{idx}")
-                reason = 'transform_failed'
-                if reason not in failed_reasons:
-                    failed_reasons[reason] = []
-                failed_reasons[reason].append(f"record_{idx}")
-                continue
-            
-            case_property_id = case_property.get('case_property_id')
-            crime_id = case_property.get('crime_id')
-            original_crime_id = case_property.get('_original_crime_id')
-            
-            # Check if crime_id is provided (NOT NULL constraint)
-            if not crime_id:
-                logger.warning(f"⚠️  Case property missing CRIME_ID (required NOT NULL), skipping")
-                self.stats['total_records_failed'] += 1
-                self.stats['total_records_failed_crime_id'] += 1
-                failed_keys.append(f"{case_property_id or 'unknown'}")
-                reason = 'missing_crime_id'
-                if reason not in failed_reasons:
-                    failed_reasons[reason] = []
-                failed_reasons[reason].append(original_crime_id or 'NULL')
-                invalid_crime_ids_in_chunk.append({
-                    'case_property_id': case_property_id,
-                    'crime_id': original_crime_id or 'NULL',
-                    'fsl_no': case_property.get('fsl_no')
-                })
-                self.log_invalid_crime_id(case_property, original_crime_id or 'NULL', chunk_range)
-                continue
-            
-            # Create unique key for tracking duplicates (use case_property_id)
-            unique_key = str(case_property_id) if case_property_id else f"unknown_{idx}"
-            
-            # Track occurrences for duplicate reporting (but don't skip - process all)
-            if unique_key in seen_keys:
-                # This is a duplicate occurrence - track it but still process
-                occurrence_count = key_occurrences.get(unique_key, 1) + 1
-                key_occurrences[unique_key] = occurrence_count
-                
-                duplicates_in_chunk.append({
-                    'case_property_id': case_property_id,
-                    'crime_id': crime_id,
-                    'fsl_no': case_property.get('fsl_no'),
-                    'occurrence': occurrence_count,
-                    'first_seen_in': seen_keys[unique_key],
-                    'duplicate_in': chunk_range
-                })
-                self.stats['total_duplicates'] += 1
-                logger.info(f"⚠️  Duplicate case property found in chunk {chunk_range} (occurrence #{occurrence_count}) - Will process to update record")
-                logger.trace(f"Duplicate details - First seen: {seen_keys[unique_key]}, Current occurrence: {occurrence_count}")
-            else:
-                seen_keys[unique_key] = chunk_range
-                key_occurrences[unique_key] = 1
-                logger.trace(f"New case property key seen: {unique_key} in chunk {chunk_range}")
-            
-            # IMPORTANT: Process ALL records, even duplicates
-            # If same key appears multiple times, each occurrence might have updated data
-            # The smart update logic will handle whether to actually update or not
-            success, operation = self.insert_fsl_case_property(case_property, chunk_range)
-            logger.trace(f"Operation result for case property: success={success}, operation={operation}")
-            if success:
-                if operation == 'inserted':
-                    # Only add to list if first occurrence (to avoid duplicate entries in log)
-                    if unique_key not in inserted_keys:
-                        inserted_keys.append(unique_key)
-                    logger.trace(f"Added to inserted list: {unique_key}")
-                elif operation == 'updated':
-                    # Track all updates (even if same key updated multiple times)
-                    updated_keys.append(unique_key)
-                    logger.trace(f"Added to updated list: {unique_key} (occurrence #{key_occurrences.get(unique_key, 1)})")
-                elif operation == 'no_change':
-                    # Only add to list if first occurrence
-                    if unique_key not in no_change_keys:
-                        no_change_keys.append(unique_key)
-                    logger.trace(f"Added to no_change list: {unique_key}")
-            else:
-                failed_keys.append(unique_key)
-                if operation not in failed_reasons:
-                    failed_reasons[operation] = []
-                failed_reasons[operation].append(unique_key)
-                logger.trace(f"Added to failed list: {unique_key}, reason: {operation}")
+        # Track operations for this chunk (shared by the workers)
+        chunk_lock = threading.Lock()
+        chunk_state = {
+            'inserted_keys': [],
+            'updated_keys': [],
+            'no_change_keys': [],
+            'failed_keys': [],
+            'failed_reasons': {},
+            'duplicates': [],
+            'invalid_crime_ids_in_chunk': [],
+            # Track unique keys seen in this chunk to detect duplicates (for reporting only, not skipping)
+            'seen_keys': {},
+            'key_occurrences': {}
+        }
+        
+        # IMPORTANT: Process ALL records, even duplicates
+        # If same key appears multiple times, each occurrence might have updated data
+        # The smart update logic will handle whether to actually update or not
+        batches = self.build_record_batches(case_property_raw, max(1, ETL_CONFIG.get('write_batch_size', 50)))
+        if ETL_CONFIG.get('parallel_mode', True) and len(batches) > 1:
+            logger.trace(f"Starting parallel processing of {len(batches)} batches for chunk: {chunk_range}")
+            max_workers = compute_safe_workers(self.db_pool, min(self.max_workers, len(batches)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self.process_batch_worker, batch, chunk_range, chunk_state, chunk_lock)
+                    for batch in batches
+                ]
+                for future in as_completed(futures):
+                    future.result()
+        else:
+            logger.trace(f"Starting to process records for chunk: {chunk_range}")
+            for batch in batches:
+                self.process_batch_worker(batch, chunk_range, chunk_state, chunk_lock)
+        
+        inserted_keys = chunk_state['inserted_keys']
+        updated_keys = chunk_state['updated_keys']
+        no_change_keys = chunk_state['no_change_keys']
+        failed_keys = chunk_state['failed_keys']
+        failed_reasons = chunk_state['failed_reasons']
+        duplicates_in_chunk = chunk_state['duplicates']
+        invalid_crime_ids_in_chunk = chunk_state['invalid_crime_ids_in_chunk']
         
         # Log duplicates for this chunk (for reporting, but they were all processed)
         if duplicates_in_chunk:
@@ -1567,7 +1745,10 @@ class FSLCasePropertyETL:
                 return False  # Still missing
             record['crime_id'] = original_crime_id
             record['_original_crime_id'] = original_crime_id
-            success, _ = self.insert_case_property(record, conn, cur, 'FK_RETRY')
+            if isinstance(record.get('_media_files'), str):
+                # The queue stores values as str(); media files come back as a list literal
+                record['_media_files'] = ast.literal_eval(record['_media_files'])
+            success, _ = self.insert_fsl_case_property(record, 'FK_RETRY')
             return success
 
     def run(self):
@@ -1590,12 +1771,16 @@ class FSLCasePropertyETL:
             logger.error("Failed to connect to database. Exiting.")
             return False
 
+        # Reference data for MO_ID validation (before the FK retry drain, which validates too)
+        self.load_mo_seizure_keys()
+
         # Retry any FSL case property records queued from previous runs due to FK misses.
         if _drain_fk_queue is not None:
             try:
                 with self.db_pool.get_connection_context() as _drain_conn:
                     _drain_fk_queue(_drain_conn, 'fsl_case_property',
-                                    self._retry_fsl_case_property_record)
+                                    self._retry_fsl_case_property_record,
+                                    references={'crime_id': CRIMES_TABLE})
                     _drain_conn.commit()
             except Exception as _de:
                 logger.warning("FK queue drain failed at startup: %s (non-fatal)", _de)
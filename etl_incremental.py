@@ -0,0 +1,916 @@
+#!/usr/bin/env python3
+"""
+Shared Incremental ETL Engine
+=============================
+
+The date-range driven DOPAMAS API loaders (crimes, accused, arrests, disposal,
+mo_seizures, chargesheets, fsl_case_property, properties, hierarchy) all run the
+same loop: pick a watermark, split [watermark, yesterday] into overlapping
+chunks, fetch each chunk from the API, transform the records and upsert them.
+
+This module owns that loop once so throughput work (batching, pooling,
+pipelining) lands in one place. The crimes and accused loaders subclass
+IncrementalETLEngine; the others still drive generate_date_ranges and
+run_chunk_pipeline themselves.
+
+- Date-range chunking with overlap (generate_date_ranges)
+- Watermarks from MAX(date_created, date_modified) and the etl_run_state checkpoint
+- Bounded fetch -> transform -> load pipelining (run_chunk_pipeline)
+- Record batching (batched)
+- IncrementalETLEngine: base class with pluggable fetch/transform/key/upsert hooks
+  that also owns schema evolution, stats and the chunk-wise log files
+
+Usage
+-----
+    class ArrestsETL(IncrementalETLEngine):
+        module_name = 'arrests'
+        table_name = 'arrests'
+        record_label = 'arrests'
+        key_name = 'arrest_id'
+        api_id_field = 'ARREST_ID'
+
+        def fetch_chunk(self, from_date, to_date):
+            return api_get(...)            # None = fetch failed, [] = no data
+
+        def transform(self, raw):
+            return {...}
+
+        def key(self, record):
+            return record['arrest_id']
+
+        def upsert(self, records, conn):
+            ...                            # one statement per batch, the engine commits
+            return {key: 'inserted' | 'updated' | 'no_change' | '<failure reason>'}
+
+    etl = ArrestsETL(db_pool)
+    etl.run_chunks(end_date=get_yesterday_end_ist())
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+# IST timezone offset (UTC+05:30) - the DOPAMAS API interprets dates in IST
+IST_OFFSET = timezone(timedelta(hours=5, minutes=30))
+
+DEFAULT_START_DATE = '2022-01-01T00:00:00+05:30'
+
+SUCCESS_OPERATIONS = ('inserted', 'updated', 'no_change')
+
+
+# ============================================================================
+# DATE HELPERS
+# ============================================================================
+
+def parse_iso_date(iso_date_str: str) -> datetime:
+    """Parse an ISO 8601 timestamp or YYYY-MM-DD date (date-only values are IST midnight)."""
+    value = str(iso_date_str).strip()
+    try:
+        if 'T' in value or ' ' in value:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        else:
+            dt = datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        dt = datetime.strptime(value.split('T')[0].split(' ')[0], '%Y-%m-%d')
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=IST_OFFSET)
+    return dt
+
+
+def generate_date_ranges(start_date: str, end_date: str, chunk_days: int = 5,
+                         overlap_days: int = 1, include_time: bool = False) -> List[Tuple[str, str]]:
+    """
+    Split [start_date, end_date] into chunks of chunk_days that overlap by overlap_days.
+
+    The API treats fromDate as 00:00:00 IST and toDate as 23:59:59 IST, so with
+    chunk_days=5 and overlap_days=1 the chunks are 10-01..10-05, 10-05..10-09, ...
+    Overlapping records are absorbed by the change-aware upserts.
+
+    Returns (from, to) tuples as YYYY-MM-DD, or as YYYY-MM-DDTHH:MM:SS day
+    bounds when include_time is set.
+    """
+    chunk_days = max(1, int(chunk_days))
+    overlap_days = max(0, int(overlap_days))
+
+    current = parse_iso_date(start_date).date()
+    end = parse_iso_date(end_date).date()
+    date_ranges = []
+
+    while current <= end:
+        chunk_end = min(current + timedelta(days=chunk_days - 1), end)
+
+        if include_time:
+            date_ranges.append((
+                datetime.combine(current, datetime.min.time()).strftime('%Y-%m-%dT%H:%M:%S'),
+                datetime.combine(chunk_end, datetime.max.time().replace(microsecond=0)).strftime('%Y-%m-%dT%H:%M:%S'),
+            ))
+        else:
+            date_ranges.append((current.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+
+        if chunk_end >= end:
+            break
+
+        # Next chunk re-reads the last overlap_days of this one; always move forward
+        current = max(chunk_end - timedelta(days=overlap_days - 1), current + timedelta(days=1))
+
+    return date_ranges
+
+
+def get_yesterday_end_ist() -> str:
+    """Yesterday 23:59:59 IST as an ISO 8601 string."""
+    yesterday = datetime.now(IST_OFFSET) - timedelta(days=1)
+    return yesterday.replace(hour=23, minute=59, second=59, microsecond=0).isoformat()
+
+
+def compute_table_watermark(cursor, table_name: str,
+                            date_columns: Sequence[str] = ('date_created', 'date_modified'),
+                            min_start_date: str = DEFAULT_START_DATE) -> str:
+    """
+    Return GREATEST(MAX(col) for col in date_columns) as an IST ISO string.
+
+    Values before min_start_date are ignored; an empty table (or no usable
+    dates) yields min_start_date.
+    """
+    min_start_dt = parse_iso_date(min_start_date)
+    floor = min_start_dt.strftime('%Y-%m-%d')
+    greatest = ", ".join(
+        f"COALESCE(MAX(CASE WHEN {col} >= '{floor}'::timestamp THEN {col} END), '{floor}'::timestamp)"
+        for col in date_columns
+    )
+    cursor.execute(f"SELECT GREATEST({greatest}) AS max_date FROM {table_name}")
+    row = cursor.fetchone()
+    max_date = row[0] if row else None
+
+    if isinstance(max_date, datetime):
+        if max_date.tzinfo is None:
+            max_date = max_date.replace(tzinfo=IST_OFFSET)
+        else:
+            max_date = max_date.astimezone(IST_OFFSET)
+        if max_date > min_start_dt:
+            return max_date.isoformat()
+
+    return min_start_date
+
+
+# ============================================================================
+# BATCHING
+# ============================================================================
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most size items."""
+    size = max(1, int(size))
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================================================
+# FETCH -> LOAD PIPELINE
+# ============================================================================
+
+_PIPELINE_DONE = object()
+
+
+def run_chunk_pipeline(
+    date_ranges: Sequence[Tuple[str, str]],
+    fetch: Callable[[str, str], Optional[List[Dict]]],
+    load: Callable[[str, str, Optional[List[Dict]]], Any],
+    prefetch_depth: int = 2,
+    fetch_workers: int = 1,
+    load_workers: int = 1,
+    on_chunk_done: Optional[Callable[[str, str], None]] = None,
+) -> Dict[str, int]:
+    """
+    Run fetch(from, to) and load(from, to, records) for every date range with the
+    two stages overlapped.
+
+    fetch_workers threads pull date ranges and push fetched chunks into a queue
+    bounded by prefetch_depth; load_workers threads drain it. At most
+    prefetch_depth + fetch_workers + load_workers chunks are held in memory.
+    A fetch that raises is passed to load as None (the module's "API fetch
+    failed" path); a load that raises is logged and counted, and the pipeline
+    carries on. Chunks may complete out of order.
+
+    Returns {'chunks', 'fetch_errors', 'load_errors'}.
+    """
+    prefetch_depth = max(1, int(prefetch_depth))
+    fetch_workers = max(1, int(fetch_workers))
+    load_workers = max(1, int(load_workers))
+
+    pending: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+    for date_range in date_ranges:
+        pending.put(date_range)
+
+    fetched: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch_depth)
+    stop = threading.Event()
+    counters = {'chunks': 0, 'fetch_errors': 0, 'load_errors': 0}
+    counters_lock = threading.Lock()
+
+    def _count(key: str) -> None:
+        with counters_lock:
+            counters[key] += 1
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                fetched.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetcher() -> None:
+        while not stop.is_set():
+            try:
+                from_date, to_date = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                records = fetch(from_date, to_date)
+            except Exception as exc:
+                logger.error(f"❌ Fetch failed for {from_date} to {to_date}: {exc}")
+                _count('fetch_errors')
+                records = None
+            if not _put((from_date, to_date, records)):
+                return
+
+    def _loader() -> None:
+        while True:
+            try:
+                item = fetched.get(timeout=0.5)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if item is _PIPELINE_DONE:
+                return
+            from_date, to_date, records = item
+            try:
+                load(from_date, to_date, records)
+            except Exception as exc:
+                logger.error(f"❌ Load failed for {from_date} to {to_date}: {exc}")
+                _count('load_errors')
+            finally:
+                _count('chunks')
+                if on_chunk_done is not None:
+                    on_chunk_done(from_date, to_date)
+
+    fetchers = [
+        threading.Thread(target=_fetcher, name=f"etl-fetch-{i}", daemon=True)
+        for i in range(min(fetch_workers, max(1, len(date_ranges))))
+    ]
+    loaders = [
+        threading.Thread(target=_loader, name=f"etl-load-{i}", daemon=True)
+        for i in range(load_workers)
+    ]
+    for thread in fetchers + loaders:
+        thread.start()
+
+    try:
+        for thread in fetchers:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+        for _ in loaders:
+            _put(_PIPELINE_DONE)
+        for thread in loaders:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        raise
+
+    return counters
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class IncrementalETLEngine:
+    """
+    Base class for the date-range incremental loaders.
+
+    Subclasses set the class attributes below and implement the record hooks:
+
+        fetch_chunk(from_date, to_date)     API records, [] for no data, None if the fetch failed
+        transform(raw)                      API record -> DB row dict
+        key(record)                         natural key; a record without one is rejected
+        validate(record)                    failure reason, or None to write the record
+        upsert(records, conn)               one batch -> {key: operation} (bulk path, may raise)
+        upsert_record(record, chunk_range)  one record -> operation (per-record path and fallback)
+
+    The engine owns the rest: the watermark and etl_run_state checkpoint, chunking,
+    fetch/load pipelining, schema evolution, collapsing records repeated within a
+    chunk (the last occurrence is written), batching, the shared stats counters and
+    the API / DB / failed / duplicates chunk logs. An operation is 'inserted',
+    'updated', 'no_change' or a failure reason.
+    """
+
+    module_name: str = ''           # etl_run_state key and log file prefix
+    display_name: str = ''          # log file headers
+    table_name: str = ''
+    record_label: str = 'records'   # stats keys: total_<record_label>_fetched, _inserted, ...
+    key_name: str = 'id'            # column returned by key()
+    api_id_field: str = 'ID'        # API field listed in the API chunk log
+    duplicate_fields: Sequence[str] = ()
+    field_mapping: Dict[str, str] = {}                      # API field -> column (schema evolution)
+    nested_field_mappings: Dict[str, Dict[str, str]] = {}   # API object -> {API field: column}
+    column_types: Dict[str, str] = {}                       # explicit types for new columns
+    date_columns: Sequence[str] = ('date_created', 'date_modified')
+    min_start_date: str = DEFAULT_START_DATE
+    chunk_days: int = 5
+    overlap_days: int = 1
+    batch_size: int = 500
+    prefetch_depth: int = 2
+    fetch_workers: int = 1
+    load_workers: int = 1
+    record_workers: int = 1
+    bulk_upsert: bool = True
+    use_run_checkpoint: bool = False
+
+    def __init__(self, db_pool=None, **options):
+        for name, value in options.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown engine option: {name}")
+            setattr(self, name, value)
+        self.db_pool = db_pool
+        self.stats_lock = threading.Lock()
+        self.schema_lock = threading.Lock()
+        self.log_lock = threading.Lock()
+        label = self.record_label
+        self.stats = {
+            'total_api_calls': 0,
+            f'total_{label}_fetched': 0,
+            f'total_{label}_inserted': 0,
+            f'total_{label}_updated': 0,
+            f'total_{label}_no_change': 0,
+            f'total_{label}_failed': 0,
+            'total_duplicates': 0,
+            'failed_api_calls': 0,
+            'failed_chunks': 0,
+            'errors': []
+        }
+        self.run_state_enabled = True
+        self.table_columns: Optional[Set[str]] = None
+        self.setup_chunk_loggers()
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+
+    def fetch_chunk(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
+        """Return API records for the range, [] for no data, None if the fetch failed."""
+        raise NotImplementedError
+
+    def transform(self, raw: Dict) -> Dict:
+        """Map one API record to a DB row."""
+        return raw
+
+    def key(self, record: Dict) -> Hashable:
+        """Natural key used to collapse repeated records within a chunk."""
+        return record.get(self.key_name)
+
+    def validate(self, record: Dict) -> Optional[str]:
+        """Failure reason for a record that must not be written, else None."""
+        return None
+
+    def upsert(self, records: List[Dict], conn) -> Dict[Hashable, str]:
+        """Write one batch on conn and return {key: operation}; the engine commits."""
+        raise NotImplementedError
+
+    def upsert_record(self, record: Dict, chunk_range: str) -> str:
+        """Write one record (own connection and commit) and return its operation."""
+        raise NotImplementedError
+
+    def after_chunk(self, from_date: str, to_date: str, records: Dict[Hashable, Dict],
+                    operations: Dict[Hashable, str]) -> None:
+        """Called once a chunk is written, with the records that were sent and their operations."""
+
+    def log_header_lines(self) -> List[str]:
+        """Extra header lines for the API and DB chunk logs."""
+        return []
+
+    def describe_api_record(self, raw: Dict) -> str:
+        """One line of the API chunk log."""
+        return str(raw.get(self.api_id_field))
+
+    # ------------------------------------------------------------------
+    # Chunk logs
+    # ------------------------------------------------------------------
+
+    def open_chunk_log(self, kind: str, title: str, header_lines: Sequence[str] = ()) -> Tuple[str, Any]:
+        """Open logs/<module_name>_<kind>_<timestamp>.log with a header; closed by close_chunk_loggers()"""
+        path = f'logs/{self.module_name}_{kind}_{self._log_timestamp}.log'
+        handle = open(path, 'w', encoding='utf-8')
+        handle.write(f"# {title}\n")
+        handle.write(f"# Generated: {datetime.now().isoformat()}\n")
+        for line in header_lines:
+            handle.write(f"# {line}\n")
+        handle.write(f"{'='*80}\n\n")
+        self._chunk_logs.append(handle)
+        return path, handle
+
+    def setup_chunk_loggers(self):
+        """Setup the API, DB operations, failed records and duplicates log files"""
+        self._log_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._chunk_logs = []
+        os.makedirs('logs', exist_ok=True)
+
+        header = self.log_header_lines() + [
+            f"Chunk Size: {self.chunk_days} days (overlap: {self.overlap_days} day(s) between chunks)"
+        ]
+        self.api_log_file, self.api_log = self.open_chunk_log(
+            'api_chunks', f"{self.display_name} API Chunk-wise Log", header)
+        self.db_log_file, self.db_log = self.open_chunk_log(
+            'db_chunks', f"{self.display_name} Database Operations Chunk-wise Log", header)
+        self.failed_log_file, self.failed_log = self.open_chunk_log(
+            'failed', f"{self.display_name} Failed Records Log",
+            ["Records that failed to insert or update with reasons"])
+        self.duplicates_log_file, self.duplicates_log = self.open_chunk_log(
+            'duplicates', f"{self.display_name} Duplicates Log",
+            [f"Duplicate {self.key_name.upper()}s found within the same chunk"])
+
+        logger.info(f"📝 API chunk log: {self.api_log_file}")
+        logger.info(f"📝 DB chunk log: {self.db_log_file}")
+        logger.info(f"📝 Failed records log: {self.failed_log_file}")
+        logger.info(f"📝 Duplicates log: {self.duplicates_log_file}")
+
+    def close_chunk_loggers(self):
+        """Close every chunk log file"""
+        for handle in self._chunk_logs:
+            if not handle.closed:
+                handle.close()
+
+    def log_api_chunk(self, from_date: str, to_date: str, records: List[Dict], error: Optional[str] = None):
+        """Log the API response for a chunk"""
+        ids = [record.get(self.api_id_field) for record in records]
+        chunk_info = {
+            'chunk': f"{from_date} to {to_date}",
+            'timestamp': datetime.now().isoformat(),
+            'count': len(records),
+            f'{self.key_name}s': ids,
+            'error': error
+        }
+
+        with self.log_lock:
+            self.api_log.write(f"\n{'='*80}\n")
+            self.api_log.write(f"CHUNK: {from_date} to {to_date}\n")
+            self.api_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
+            self.api_log.write(f"{'-'*80}\n")
+
+            if error:
+                self.api_log.write(f"ERROR: {error}\n")
+                self.api_log.write("Count: 0\n")
+            else:
+                self.api_log.write(f"Count: {len(records)}\n")
+                self.api_log.write(f"{self.api_id_field}s ({len(ids)}):\n")
+                for i, record in enumerate(records, 1):
+                    self.api_log.write(f"  {i}. {self.describe_api_record(record)}\n")
+
+            self.api_log.write("\nJSON Format:\n")
+            self.api_log.write(json.dumps(chunk_info, indent=2, ensure_ascii=False, default=str))
+            self.api_log.write("\n")
+            self.api_log.flush()
+
+    def log_db_chunk(self, from_date: str, to_date: str, total_fetched: int,
+                     inserted_ids: List, updated_ids: List, no_change_ids: List,
+                     failed_ids: List, failed_reasons: Dict, error: Optional[str] = None):
+        """Log database operations for a chunk"""
+        chunk_info = {
+            'chunk': f"{from_date} to {to_date}",
+            'timestamp': datetime.now().isoformat(),
+            'total_fetched': total_fetched,
+            'inserted_count': len(inserted_ids),
+            'inserted_ids': inserted_ids,
+            'updated_count': len(updated_ids),
+            'updated_ids': updated_ids,
+            'no_change_count': len(no_change_ids),
+            'no_change_ids': no_change_ids,
+            'failed_count': len(failed_ids),
+            'failed_ids': failed_ids,
+            'failed_reasons': failed_reasons,
+            'error': error
+        }
+
+        with self.log_lock:
+            self.db_log.write(f"\n{'='*80}\n")
+            self.db_log.write(f"CHUNK: {from_date} to {to_date}\n")
+            self.db_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
+            self.db_log.write(f"{'-'*80}\n")
+
+            if error:
+                self.db_log.write(f"ERROR: {error}\n")
+            else:
+                self.db_log.write(f"Total Fetched from API: {total_fetched}\n")
+                for title, ids in (('INSERTED', inserted_ids), ('UPDATED', updated_ids), ('NO CHANGE', no_change_ids)):
+                    self.db_log.write(f"\n{title}: {len(ids)}\n")
+                    for i, record_id in enumerate(ids, 1):
+                        self.db_log.write(f"  {i}. {record_id}\n")
+
+                self.db_log.write(f"\nFAILED: {len(failed_ids)}\n")
+                for reason, ids in failed_reasons.items():
+                    self.db_log.write(f"  Reason: {reason} ({len(ids)})\n")
+                    for i, record_id in enumerate(ids[:20], 1):  # Show first 20
+                        self.db_log.write(f"    {i}. {record_id}\n")
+                    if len(ids) > 20:
+                        self.db_log.write(f"    ... and {len(ids) - 20} more\n")
+
+                self.db_log.write("\nJSON Format:\n")
+                self.db_log.write(json.dumps(chunk_info, indent=2, ensure_ascii=False, default=str))
+                self.db_log.write("\n")
+
+            self.db_log.flush()
+
+    def log_duplicates_chunk(self, from_date: str, to_date: str, duplicates: List[Dict]):
+        """Log records that appeared more than once in a chunk"""
+        chunk_info = {
+            'chunk': f"{from_date} to {to_date}",
+            'timestamp': datetime.now().isoformat(),
+            'duplicate_count': len(duplicates),
+            'duplicates': duplicates
+        }
+
+        with self.log_lock:
+            self.duplicates_log.write(f"\n{'='*80}\n")
+            self.duplicates_log.write(f"CHUNK: {from_date} to {to_date}\n")
+            self.duplicates_log.write(f"Timestamp: {datetime.now().isoformat()}\n")
+            self.duplicates_log.write(f"{'-'*80}\n")
+            self.duplicates_log.write(f"Duplicate Count: {len(duplicates)}\n")
+            self.duplicates_log.write("Note: The last occurrence of each record was written\n")
+            self.duplicates_log.write("\nDuplicates:\n")
+            for i, dup in enumerate(duplicates, 1):
+                self.duplicates_log.write(f"  {i}. {self.key_name.upper()}: {dup[self.key_name]}\n")
+                for field in self.duplicate_fields:
+                    self.duplicates_log.write(f"     {field.upper()}: {dup.get(field, 'N/A')}\n")
+                self.duplicates_log.write(f"     Occurrence: #{dup['occurrence']}\n")
+
+            self.duplicates_log.write("\nJSON Format:\n")
+            self.duplicates_log.write(json.dumps(chunk_info, indent=2, ensure_ascii=False, default=str))
+            self.duplicates_log.write("\n")
+            self.duplicates_log.flush()
+
+    # ------------------------------------------------------------------
+    # Watermark / run state
+    # ------------------------------------------------------------------
+
+    def ensure_run_state_table(self):
+        """Ensure the etl_run_state table exists (checkpointing is disabled if it cannot be created)."""
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS etl_run_state (
+                        module_name TEXT PRIMARY KEY,
+                        last_successful_end TIMESTAMPTZ NOT NULL,
+                        updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                conn.commit()
+            self.run_state_enabled = True
+        except Exception as e:
+            self.run_state_enabled = False
+            logger.warning(f"⚠️  Could not initialize etl_run_state (continuing without checkpoint persistence): {e}")
+
+    def get_run_checkpoint(self) -> Optional[datetime]:
+        """Last successful end boundary recorded for module_name."""
+        if not self.run_state_enabled:
+            return None
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT last_successful_end FROM etl_run_state WHERE module_name = %s",
+                    (self.module_name,)
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            self.run_state_enabled = False
+            logger.warning(f"⚠️  Could not read etl_run_state checkpoint (continuing without checkpoint read): {e}")
+            return None
+
+    def update_run_checkpoint(self, end_date_iso: str):
+        """Persist the successful run boundary for module_name."""
+        if not self.run_state_enabled:
+            return
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO etl_run_state (module_name, last_successful_end, updated_at)
+                    VALUES (%s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (module_name) DO UPDATE SET
+                        last_successful_end = EXCLUDED.last_successful_end,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (self.module_name, parse_iso_date(end_date_iso)))
+                conn.commit()
+        except Exception as e:
+            self.run_state_enabled = False
+            logger.warning(f"⚠️  Could not persist etl_run_state checkpoint (continuing): {e}")
+
+    def get_effective_start_date(self) -> str:
+        """
+        Resume point: the table watermark (see compute_table_watermark), or the
+        etl_run_state checkpoint when use_run_checkpoint is set and it is later.
+        """
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                start_date = compute_table_watermark(
+                    conn.cursor(), self.table_name, self.date_columns, self.min_start_date
+                )
+        except Exception as e:
+            logger.error(f"❌ Error getting effective start date: {e}")
+            logger.warning(f"⚠️  Using default start date: {self.min_start_date}")
+            return self.min_start_date
+
+        if start_date == self.min_start_date:
+            logger.info(f"📊 No data after {self.min_start_date} in {self.table_name}, starting from it")
+        else:
+            logger.info(f"📊 Table has data, starting from: {start_date}")
+
+        if self.use_run_checkpoint:
+            self.ensure_run_state_table()
+            checkpoint = self.get_run_checkpoint()
+            if checkpoint is not None:
+                checkpoint_iso = checkpoint.astimezone(IST_OFFSET).isoformat()
+                if parse_iso_date(checkpoint_iso) > parse_iso_date(start_date):
+                    logger.info(f"📊 etl_run_state checkpoint is later, starting from: {checkpoint_iso}")
+                    start_date = checkpoint_iso
+        return start_date
+
+    def generate_date_ranges(self, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        return generate_date_ranges(start_date, end_date, self.chunk_days, self.overlap_days)
+
+    # ------------------------------------------------------------------
+    # Schema evolution
+    # ------------------------------------------------------------------
+
+    def get_table_columns(self, table_name: Optional[str] = None) -> Set[str]:
+        """Get all column names from a table (default: table_name)."""
+        table_name = table_name or self.table_name
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_name = %s
+                """, (table_name,))
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error getting table columns for {table_name}: {e}")
+            return set()
+
+    def detect_new_fields(self, api_record: Dict, table_columns: Set[str]) -> Dict[str, str]:
+        """
+        Detect mapped API fields that have no column yet.
+        Returns {API field: column}; nested fields are named '<OBJECT>.<FIELD>'.
+        """
+        new_fields = {
+            api_field: db_column
+            for api_field, db_column in self.field_mapping.items()
+            if api_field in api_record and db_column not in table_columns
+        }
+        for parent, mapping in self.nested_field_mappings.items():
+            nested = api_record.get(parent)
+            if isinstance(nested, dict):
+                for api_field, db_column in mapping.items():
+                    if api_field in nested and db_column not in table_columns:
+                        new_fields[f'{parent}.{api_field}'] = db_column
+        return new_fields
+
+    def infer_column_type(self, column_name: str) -> str:
+        """column_types entry, else TIMESTAMP for dates, VARCHAR(50) for ids/codes, VARCHAR(255)."""
+        if column_name in self.column_types:
+            return self.column_types[column_name]
+        name = column_name.lower()
+        if 'date' in name:
+            return 'TIMESTAMP'
+        if 'id' in name or 'code' in name:
+            return 'VARCHAR(50)'
+        return 'VARCHAR(255)'
+
+    def add_column_to_table(self, column_name: str, column_type: Optional[str] = None) -> bool:
+        """Add a new column to table_name."""
+        column_type = column_type or self.infer_column_type(column_name)
+        try:
+            with self.db_pool.get_connection_context() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS {column_name} {column_type}")
+                conn.commit()
+            logger.info(f"✅ Added column {column_name} ({column_type}) to {self.table_name}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error adding column {column_name}: {e}")
+            return False
+
+    def evolve_schema(self, api_record: Dict):
+        """Add columns for mapped API fields the table does not have yet (once per new field)."""
+        if self.table_columns is None:
+            return
+        with self.schema_lock:
+            new_fields = self.detect_new_fields(api_record, self.table_columns)
+            if not new_fields:
+                return
+            logger.info(f"🔍 New fields detected in API response: {list(new_fields.keys())}")
+            for db_column in new_fields.values():
+                if self.add_column_to_table(db_column):
+                    self.table_columns.add(db_column)
+            logger.info("   Note: Existing records will be updated when processed in future ETL runs")
+            logger.info("   New fields are set to NULL for existing records until they are reprocessed")
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def fetch_and_log_chunk(self, from_date: str, to_date: str) -> Optional[List[Dict]]:
+        """fetch_chunk() plus the API chunk log entry."""
+        records = self.fetch_chunk(from_date, to_date)
+        if records is None:
+            self.log_api_chunk(from_date, to_date, [], error="API fetch failed")
+        else:
+            self.log_api_chunk(from_date, to_date, records)
+        return records
+
+    def process_date_range(self, from_date: str, to_date: str):
+        """Fetch and load one date range."""
+        self.load_chunk(from_date, to_date, self.fetch_and_log_chunk(from_date, to_date))
+
+    def load_chunk(self, from_date: str, to_date: str, raw_records: Optional[List[Dict]]):
+        """Transform, de-duplicate and write one fetched chunk (None means the API fetch failed)."""
+        chunk_range = f"{from_date} to {to_date}"
+        label = self.record_label
+        logger.info(f"📅 Processing: {chunk_range}")
+
+        if raw_records is None:
+            logger.error(f"❌ Failed to fetch {label} for {chunk_range}")
+            with self.stats_lock:
+                self.stats['failed_chunks'] += 1
+            self.log_db_chunk(from_date, to_date, 0, [], [], [], [], {}, error="API fetch failed")
+            return
+
+        if not raw_records:
+            logger.info(f"ℹ️  No {label} found for {chunk_range}")
+            self.log_db_chunk(from_date, to_date, 0, [], [], [], [], {}, error=f"No {label} in API response")
+            return
+
+        self.evolve_schema(raw_records[0])
+        with self.stats_lock:
+            self.stats[f'total_{label}_fetched'] += len(raw_records)
+        logger.debug(f"Processing {len(raw_records)} {label} for chunk {chunk_range}")
+
+        failed_ids = []
+        failed_reasons = {}
+        duplicates = []
+        occurrences = {}
+        records = {}
+        for raw in raw_records:
+            record = self.transform(raw)
+            record_key = self.key(record)
+            if not record_key:
+                reason = f'missing_{self.key_name}'
+                logger.warning(f"⚠️  Record missing {self.key_name.upper()}, skipping")
+                failed_ids.append(None)
+                failed_reasons.setdefault(reason, []).append(None)
+                continue
+
+            occurrences[record_key] = occurrences.get(record_key, 0) + 1
+            if occurrences[record_key] > 1:
+                duplicates.append({
+                    self.key_name: record_key,
+                    **{field: record.get(field) for field in self.duplicate_fields},
+                    'occurrence': occurrences[record_key],
+                })
+                logger.info(f"⚠️  Duplicate {self.key_name.upper()} {record_key} found in chunk {chunk_range} "
+                            f"(occurrence #{occurrences[record_key]}) - the last occurrence is written")
+
+            # Later occurrences win, matching the order the API returned them in
+            records.pop(record_key, None)
+            reason = self.validate(record)
+            if reason:
+                failed_ids.append(record_key)
+                failed_reasons.setdefault(reason, []).append(record_key)
+                continue
+            records[record_key] = record
+
+        operations = {}
+        for batch in batched(records.values(), self.batch_size):
+            operations.update(self.write_batch(batch, chunk_range))
+
+        done = {operation: [] for operation in SUCCESS_OPERATIONS}
+        for record_key, operation in operations.items():
+            if operation in done:
+                done[operation].append(record_key)
+            else:
+                failed_ids.append(record_key)
+                failed_reasons.setdefault(operation, []).append(record_key)
+
+        with self.stats_lock:
+            for operation, ids in done.items():
+                self.stats[f'total_{label}_{operation}'] += len(ids)
+            self.stats[f'total_{label}_failed'] += len(failed_ids)
+            self.stats['total_duplicates'] += len(duplicates)
+
+        if duplicates:
+            logger.info(f"📊 Found {len(duplicates)} duplicate occurrences in chunk {chunk_range}")
+            self.log_duplicates_chunk(from_date, to_date, duplicates)
+
+        self.log_db_chunk(from_date, to_date, len(raw_records), done['inserted'], done['updated'],
+                          done['no_change'], failed_ids, failed_reasons)
+        self.after_chunk(from_date, to_date, records, operations)
+
+        logger.info(f"✅ Completed: {chunk_range} - Inserted: {len(done['inserted'])}, Updated: {len(done['updated'])}, "
+                    f"No Change: {len(done['no_change'])}, Failed: {len(failed_ids)}, Duplicates: {len(duplicates)}")
+
+    def write_batch(self, records: List[Dict], chunk_range: str) -> Dict[Hashable, str]:
+        """upsert() the batch in one transaction; record by record if it fails or bulk_upsert is off."""
+        if self.bulk_upsert:
+            try:
+                # A failed statement is rolled back when the pool takes the connection back
+                with self.db_pool.get_connection_context() as conn:
+                    operations = self.upsert(records, conn)
+                    conn.commit()
+                return operations
+            except Exception as e:
+                logger.warning(f"⚠️  Bulk upsert failed for {len(records)} {self.record_label} in {chunk_range}, "
+                               f"falling back to per-record mode: {e}")
+        return self.upsert_records(records, chunk_range)
+
+    def upsert_records(self, records: List[Dict], chunk_range: str) -> Dict[Hashable, str]:
+        """upsert_record() for each record, on up to record_workers threads."""
+        def _write(record: Dict) -> str:
+            try:
+                return self.upsert_record(record, chunk_range)
+            except Exception as e:
+                logger.error(f"❌ Error writing {self.key_name} {self.key(record)}: {e}")
+                return 'error'
+
+        keys = [self.key(record) for record in records]
+        workers = min(max(1, int(self.record_workers)), len(records))
+        if workers <= 1:
+            return {record_key: _write(record) for record_key, record in zip(keys, records)}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(keys, executor.map(_write, records)))
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    def run_chunks(self, end_date: Optional[str] = None, start_date: Optional[str] = None) -> Dict[str, int]:
+        """
+        Load [start_date or the watermark, end_date or yesterday 23:59:59 IST] chunk by
+        chunk. The etl_run_state checkpoint (use_run_checkpoint) only advances when no
+        chunk failed. Returns the run_chunk_pipeline counters plus 'failed_chunks'.
+        """
+        end_date = end_date or get_yesterday_end_ist()
+        start_date = start_date or self.get_effective_start_date()
+        if self.table_columns is None:
+            self.table_columns = self.get_table_columns()
+
+        date_ranges = self.generate_date_ranges(start_date, end_date)
+        logger.info(f"Date Range: {start_date} to {end_date}")
+        logger.info(f"Chunk Size: {self.chunk_days} days (overlap: {self.overlap_days} day(s) to ensure no data loss)")
+        logger.info(f"📊 Total date ranges to process: {len(date_ranges)}")
+        logger.info(f"🚀 Starting pipelined processing: {self.fetch_workers} fetch worker(s), "
+                    f"{self.load_workers} load workers, prefetch depth {self.prefetch_depth}")
+
+        # The API fetch of the next chunk(s) overlaps the DB load of the current one;
+        # the bounded queue keeps at most prefetch_depth fetched chunks in memory.
+        with tqdm(total=len(date_ranges), desc="Processing date ranges", unit="range") as pbar:
+            result = run_chunk_pipeline(
+                date_ranges,
+                fetch=self.fetch_and_log_chunk,
+                load=self.load_chunk,
+                prefetch_depth=self.prefetch_depth,
+                fetch_workers=self.fetch_workers,
+                load_workers=self.load_workers,
+                on_chunk_done=lambda from_date, to_date: pbar.update(1),
+            )
+
+        with self.stats_lock:
+            result['failed_chunks'] = self.stats['failed_chunks']
+            if result['load_errors']:
+                self.stats['errors'].append(f"{result['load_errors']} chunk(s) failed to load")
+        if result['load_errors']:
+            logger.error(f"❌ {result['load_errors']} chunk(s) failed to load")
+
+        if self.use_run_checkpoint:
+            if result['failed_chunks'] or result['load_errors']:
+                logger.warning("⚠️  Some chunks failed; etl_run_state checkpoint not advanced")
+            else:
+                self.update_run_checkpoint(end_date)
+        return result
@@ -6,6 +6,7 @@ import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
 os.environ["TZ"] = "Asia/Kolkata"
@@ -17,7 +18,14 @@ project_root = os.path.dirname(script_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from env_utils import build_subprocess_env, first_env, get_loaded_env_file, is_strict_env_mode, load_repo_environment
+from env_utils import (
+    build_subprocess_env,
+    first_env,
+    get_int_env,
+    get_loaded_env_file,
+    is_strict_env_mode,
+    load_repo_environment,
+)
 
 load_repo_environment(extra_candidates=[os.path.join(script_dir, ".env.server"), os.path.join(script_dir, ".env")])
 
@@ -378,6 +386,135 @@ def run_process_with_retry(process, process_index, max_retries=2):
     return False
 
 
+def resolve_dependencies(processes):
+    """Map each process index to the indexes it must wait for.
+
+    Blocks with an explicit depends_on wait only for those orders; dependencies on
+    orders that are not part of this run (filtered out or de-duplicated refresh
+    steps) count as satisfied. Blocks without depends_on wait for every earlier
+    block, which preserves the historical strictly-sequential behaviour.
+    """
+    index_by_order = {}
+    for idx, process in enumerate(processes):
+        index_by_order.setdefault(int(process["order"]), []).append(idx)
+
+    dependencies = {}
+    for idx, process in enumerate(processes):
+        declared = process.get("depends_on")
+        if declared is None:
+            dependencies[idx] = set(range(idx))
+            continue
+
+        resolved = set()
+        for order in declared:
+            for dep_idx in index_by_order.get(int(order), []):
+                if dep_idx < idx:
+                    resolved.add(dep_idx)
+        dependencies[idx] = resolved
+
+    return dependencies
+
+
+def run_processes_dag(processes, max_parallel=1, db_connection_budget=0, max_retries=2):
+    """Run process blocks as a dependency graph.
+
+    Ready blocks are started in file order while fewer than ``max_parallel`` are
+    running and their ``db_connections`` weight fits in the remaining
+    ``db_connection_budget`` (0 disables the budget). A block heavier than the
+    whole budget only runs alone. After a failure no new blocks are started;
+    in-flight blocks are allowed to finish. Returns True when every block succeeded.
+    """
+    max_parallel = max(1, int(max_parallel))
+    dependencies = resolve_dependencies(processes)
+    pending = list(range(len(processes)))
+    completed = set()
+    running = {}
+    connections_in_use = 0
+    failed = False
+
+    def connection_weight(idx):
+        weight = int(processes[idx].get("db_connections", 1) or 0)
+        if db_connection_budget > 0:
+            weight = min(weight, db_connection_budget)
+        return weight
+
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="etl-step") as executor:
+        while pending or running:
+            if not failed:
+                for idx in list(pending):
+                    if len(running) >= max_parallel:
+                        break
+                    if not dependencies[idx] <= completed:
+                        continue
+                    weight = connection_weight(idx)
+                    if db_connection_budget > 0 and connections_in_use + weight > db_connection_budget:
+                        continue
+
+                    process = processes[idx]
+                    pending.remove(idx)
+                    connections_in_use += weight
+                    if max_parallel > 1:
+                        logger.info(
+                            "Scheduling [Order %s: %s] | running=%d db_connections=%d/%s",
+                            process.get("order"),
+                            process.get("name"),
+                            len(running) + 1,
+                            connections_in_use,
+                            db_connection_budget or "unlimited",
+                        )
+                    future = executor.submit(
+                        run_process_with_retry,
+                        process,
+                        process_index=idx + 1,
+                        max_retries=max_retries,
+                    )
+                    running[future] = idx
+
+            if not running:
+                if pending and not failed:
+                    # Unreachable after validate_dependencies, kept as a guard against deadlock.
+                    logger.error(
+                        "No runnable ETL step remains; unresolved dependencies for orders: %s",
+                        ", ".join(str(processes[idx].get("order")) for idx in pending),
+                    )
+                    failed = True
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                connections_in_use -= connection_weight(idx)
+                try:
+                    succeeded = future.result()
+                except Exception as exc:
+                    logger.error(
+                        "[Order %s: %s] scheduler error: %s",
+                        processes[idx].get("order"),
+                        processes[idx].get("name"),
+                        str(exc),
+                    )
+                    succeeded = False
+
+                if succeeded:
+                    completed.add(idx)
+                elif not failed:
+                    failed = True
+                    if running:
+                        logger.error(
+                            "Step failure detected; waiting for %d in-flight step(s) before stopping",
+                            len(running),
+                        )
+
+    if failed and pending:
+        logger.error(
+            "Skipped %d step(s) after failure: %s",
+            len(pending),
+            ", ".join(f"[Order {processes[idx].get('order')}: {processes[idx].get('name')}]" for idx in pending),
+        )
+
+    return not failed
+
+
 def resolve_config_path(args):
     """Prefer --config, but keep --input-file as backward-compatible alias.
     Falls back to searching in the script directory if the file is not in CWD.
@@ -431,6 +568,18 @@ def main():
     parser.add_argument("--env", default="prod", help="Runtime environment name, e.g., prod")
     parser.add_argument("--start-order", type=int, default=None, help="Optional first order to execute")
     parser.add_argument("--end-order", type=int, default=None, help="Optional last order to execute")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=get_int_env("MASTER_ETL_MAX_PARALLEL", 1),
+        help="Maximum number of independent blocks to run at once (default 1 = sequential)",
+    )
+    parser.add_argument(
+        "--db-connection-budget",
+        type=int,
+        default=get_int_env("MASTER_ETL_DB_CONNECTION_BUDGET", 0),
+        help="Global cap on the summed db_connections of running blocks (0 = unlimited)",
+    )
     args = parser.parse_args()
 
     config_path = resolve_config_path(args)
@@ -447,11 +596,13 @@ def main():
 
     logger.info("Starting Master ETL Orchestrator")
     logger.info(
-        "Using config=%s env=%s start_order=%s end_order=%s",
+        "Using config=%s env=%s start_order=%s end_order=%s max_parallel=%s db_connection_budget=%s",
         config_path,
         args.env,
         args.start_order,
         args.end_order,
+        args.max_parallel,
+        args.db_connection_budget or "unlimited",
     )
 
     try:
@@ -480,10 +631,14 @@ def main():
     
     pipeline_start_time = time.time()
 
-    for process_index, process in enumerate(processes, start=1):
-        if not run_process_with_retry(process, process_index=process_index, max_retries=2):
-            logger.error("Master ETL execution stopped due to step failure.")
-            sys.exit(1)
+    if not run_processes_dag(
+        processes,
+        max_parallel=args.max_parallel,
+        db_connection_budget=args.db_connection_budget,
+        max_retries=2,
+    ):
+        logger.error("Master ETL execution stopped due to step failure.")
+        sys.exit(1)
 
     total_time = time.time() - pipeline_start_time
     logger.info("All ETL processes finished successfully. Total execution time: %.2fs", total_time)
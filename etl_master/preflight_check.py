@@ -24,6 +24,8 @@ class ProcessBlock:
     order: int
     name: Optional[str]
     commands: List[str]
+    depends_on: Optional[List[int]] = None
+    db_connections: int = 1
 
 
 REQUIRED_TABLES = [
@@ -35,6 +37,12 @@ REQUIRED_TABLES = [
     "etl_crime_processing_log",
 ]
 
+# Optional per-block scheduling directives, e.g.
+#   depends_on: 2, 5, 6
+#   db_connections: 3
+# Blocks without depends_on wait for every earlier block (serial semantics).
+DIRECTIVE_PATTERN = re.compile(r"^(depends_on|db_connections)\s*:\s*(.*)$", re.IGNORECASE)
+
 
 def parse_input_file(file_path: str) -> List[Dict[str, object]]:
     if not os.path.exists(file_path):
@@ -67,6 +75,11 @@ def parse_input_file(file_path: str) -> List[Dict[str, object]]:
         if current_block is None:
             continue
 
+        directive_match = DIRECTIVE_PATTERN.match(line)
+        if directive_match:
+            _apply_directive(current_block, directive_match.group(1).lower(), directive_match.group(2))
+            continue
+
         if current_block.name is None and _looks_like_name(line):
             current_block.name = line
             continue
@@ -81,11 +94,38 @@ def parse_input_file(file_path: str) -> List[Dict[str, object]]:
             "order": str(block.order),
             "name": block.name,
             "commands": block.commands,
+            "depends_on": (
+                [str(order) for order in block.depends_on]
+                if block.depends_on is not None
+                else None
+            ),
+            "db_connections": block.db_connections,
         }
         for block in processes
     ]
 
 
+def _apply_directive(block: ProcessBlock, key: str, raw_value: str) -> None:
+    if key == "depends_on":
+        tokens = [token for token in re.split(r"[,\s]+", raw_value.strip()) if token]
+        try:
+            block.depends_on = sorted({int(token) for token in tokens})
+        except ValueError as exc:
+            raise PreflightError(
+                f"[Order {block.order}] has an invalid depends_on value: {raw_value!r}"
+            ) from exc
+        return
+
+    try:
+        block.db_connections = int(raw_value.strip())
+    except ValueError as exc:
+        raise PreflightError(
+            f"[Order {block.order}] has an invalid db_connections value: {raw_value!r}"
+        ) from exc
+    if block.db_connections < 0:
+        raise PreflightError(f"[Order {block.order}] db_connections cannot be negative")
+
+
 def validate_execution_order(processes: List[Dict[str, object]]) -> None:
     orders = [int(process["order"]) for process in processes]
 
@@ -109,6 +149,26 @@ def validate_execution_order(processes: List[Dict[str, object]]) -> None:
         )
 
 
+def validate_dependencies(processes: List[Dict[str, object]]) -> None:
+    """Dependencies must point at earlier blocks, so file order stays a valid topological order."""
+    orders = {int(process["order"]) for process in processes}
+    problems = []
+
+    for process in processes:
+        order = int(process["order"])
+        for dependency in process.get("depends_on") or []:
+            dependency = int(dependency)
+            if dependency not in orders:
+                problems.append(f"[Order {order}] depends on unknown [Order {dependency}]")
+            elif dependency >= order:
+                problems.append(
+                    f"[Order {order}] depends on [Order {dependency}], which is not an earlier block"
+                )
+
+    if problems:
+        raise PreflightError("Invalid depends_on configuration: " + "; ".join(problems))
+
+
 def validate_directories(processes: List[Dict[str, object]]) -> None:
     missing_directories = []
 
@@ -207,6 +267,7 @@ def run_preflight(config_path: str, env_name: str) -> None:
 
     processes = parse_input_file(config_path)
     validate_execution_order(processes)
+    validate_dependencies(processes)
     validate_directories(processes)
     validate_scripts(processes)
 
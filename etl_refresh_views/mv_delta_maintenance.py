@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Delta-Maintained Summary Tables
+===============================
+
+Incremental alternative to a full REFRESH of criminal_profiles_mv / accuseds_mv.
+
+A full refresh recomputes every profile on every pipeline run although a daily
+incremental run only touches a few thousand crimes. In delta mode:
+
+- Statement-level triggers on the ETL tables (crimes, persons, accused, arrests,
+  brief_facts_ai, disposal, files) append the crime_ids / person_ids / accused_ids
+  each statement touched to profile_change_log (one INSERT ... SELECT per statement,
+  from the transition table - no per-row trigger overhead)
+- Each summary table (criminal_profiles_summary, accuseds_summary) is a regular
+  indexed table with exactly the MV's columns; its rows are computed by a plain
+  view created from the MV's own definition (pg_get_viewdef), so the two cannot drift
+- run() resolves the logged entities to the affected summary keys and
+  deletes + re-inserts only those rows, then removes the consumed log rows - all in
+  one transaction, so readers see either the old or the new rows
+- The MVs themselves are still refreshed; readers can move to the summary tables
+- disable() drops the triggers and empties the log when delta mode is switched off,
+  so the log cannot grow unconsumed; the next run() reinstalls them and rebuilds
+  the summary tables, since changes made in between were not captured
+
+Not tracked: hierarchy (unit / ps names). Run with full=True (--delta-full) after
+hierarchy changes or to rebuild from scratch.
+
+Usage:
+
+    from mv_delta_maintenance import DeltaMaintenance
+
+    DeltaMaintenance(db_config).run()           # install if needed, then apply changes
+    DeltaMaintenance(db_config).disable()       # delta mode off: stop capturing changes
+"""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_TABLE = 'profile_change_log'
+
+# table -> 'entity_type:column' pairs logged by its triggers
+CHANGE_SOURCES: Dict[str, Tuple[str, ...]] = {
+    'crimes': ('crime:crime_id',),
+    'persons': ('person:person_id',),
+    'accused': ('crime:crime_id', 'person:person_id', 'accused:accused_id'),
+    'arrests': ('crime:crime_id', 'person:person_id'),
+    'brief_facts_ai': ('crime:crime_id', 'person:person_id'),
+    'disposal': ('crime:crime_id',),
+    # person documents / identity files; parent_id of other source types simply matches nothing
+    'files': ('person:parent_id',),
+}
+
+_CHANGE_LOG_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        id BIGSERIAL PRIMARY KEY,
+        entity_type TEXT NOT NULL,
+        entity_id TEXT NOT NULL,
+        changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+_TRIGGER_FUNCTION_DDL = f"""
+    CREATE OR REPLACE FUNCTION public.log_profile_changes() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        arg TEXT;
+        entity TEXT;
+        col TEXT;
+    BEGIN
+        FOREACH arg IN ARRAY TG_ARGV LOOP
+            entity := split_part(arg, ':', 1);
+            col := split_part(arg, ':', 2);
+            EXECUTE format(
+                'INSERT INTO public.{CHANGE_LOG_TABLE} (entity_type, entity_id)
+                 SELECT DISTINCT %L, %I::text FROM changed_rows WHERE %I IS NOT NULL',
+                entity, col, col);
+            IF TG_OP = 'UPDATE' THEN
+                -- Keys moved away from (e.g. accused re-linked to another person)
+                EXECUTE format(
+                    'INSERT INTO public.{CHANGE_LOG_TABLE} (entity_type, entity_id)
+                     SELECT %L, k FROM (SELECT %I::text AS k FROM old_rows
+                                        EXCEPT SELECT %I::text FROM changed_rows) moved
+                     WHERE k IS NOT NULL',
+                    entity, col, col);
+            END IF;
+        END LOOP;
+        RETURN NULL;
+    END
+    $$
+"""
+
+# trigger suffix -> (event, REFERENCING clause)
+_TRIGGER_EVENTS = {
+    'ins': ('INSERT', 'NEW TABLE AS changed_rows'),
+    'upd': ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS changed_rows'),
+    'del': ('DELETE', 'OLD TABLE AS changed_rows'),
+}
+
+
+@dataclass
+class SummaryTarget:
+    """A summary table kept in sync with the rows of source_mv."""
+
+    table: str
+    source_mv: str
+    key: str
+    affected_sql: str   # SELECT key FROM ... over the captured_changes temp table
+
+    @property
+    def source_view(self) -> str:
+        return f"{self.table}_source"
+
+
+SUMMARY_TARGETS: List[SummaryTarget] = [
+    SummaryTarget(
+        table='criminal_profiles_summary',
+        source_mv='criminal_profiles_mv',
+        key='id',
+        affected_sql="""
+            SELECT entity_id AS key FROM captured_changes WHERE entity_type = 'person'
+            UNION
+            SELECT a.person_id
+            FROM captured_changes ch
+            JOIN public.accused a ON a.crime_id = ch.entity_id
+            WHERE ch.entity_type = 'crime' AND a.person_id IS NOT NULL
+        """,
+    ),
+    SummaryTarget(
+        table='accuseds_summary',
+        source_mv='accuseds_mv',
+        key='id',
+        # Rows carry crime-level aggregates (co-accused details) and person-level ones
+        # (previously involved cases): every accused of a touched crime or person is affected.
+        affected_sql="""
+            WITH crimes AS (
+                SELECT entity_id AS crime_id FROM captured_changes WHERE entity_type = 'crime'
+                UNION
+                SELECT a.crime_id
+                FROM captured_changes ch
+                JOIN public.accused a ON a.person_id = ch.entity_id
+                WHERE ch.entity_type = 'person'
+            )
+            SELECT a.accused_id AS key FROM public.accused a JOIN crimes c ON a.crime_id = c.crime_id
+            UNION
+            SELECT entity_id FROM captured_changes WHERE entity_type = 'accused'
+        """,
+    ),
+]
+
+
+class DeltaMaintenance:
+    """Installs change capture and applies logged changes to the summary tables."""
+
+    def __init__(self, db_config: Dict, targets: Sequence[SummaryTarget] = SUMMARY_TARGETS):
+        self.db_config = db_config
+        self.targets = list(targets)
+        self.conn = None
+        self.cursor = None
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def _existing_triggers(self) -> List[Tuple[str, str]]:
+        self.cursor.execute("""
+            SELECT c.relname, t.tgname
+            FROM pg_trigger t
+            JOIN pg_class c ON c.oid = t.tgrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND t.tgname LIKE 'trg_profile_changes_%'
+        """)
+        return self.cursor.fetchall()
+
+    def install_change_capture(self) -> bool:
+        """
+        Change log, trigger function and any missing triggers (idempotent).
+        Returns True when a trigger was created, i.e. earlier changes to that table were not captured.
+        """
+        self.cursor.execute(_CHANGE_LOG_DDL)
+        self.cursor.execute(_TRIGGER_FUNCTION_DDL)
+        existing = set(self._existing_triggers())
+        created = False
+
+        for table, columns in CHANGE_SOURCES.items():
+            self.cursor.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+            if self.cursor.fetchone()[0] is None:
+                logger.warning(f"⚠️  Change capture: table public.{table} not found, skipping")
+                continue
+            for suffix, (event, referencing) in _TRIGGER_EVENTS.items():
+                trigger = f"trg_profile_changes_{suffix}"
+                if (table, trigger) in existing:
+                    continue
+                self.cursor.execute(
+                    sql.SQL(
+                        "CREATE TRIGGER {} AFTER " + event + " ON {} REFERENCING " + referencing
+                        + " FOR EACH STATEMENT EXECUTE FUNCTION public.log_profile_changes({})"
+                    ).format(
+                        sql.Identifier(trigger),
+                        sql.Identifier('public', table),
+                        sql.SQL(', ').join(sql.Literal(col) for col in columns),
+                    )
+                )
+                logger.info(f"  ✓ Change capture trigger {trigger} on {table}")
+                created = True
+        return created
+
+    def disable(self) -> int:
+        """Drop the change capture triggers and empty the change log. Returns the triggers dropped."""
+        self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor()
+        try:
+            triggers = self._existing_triggers()
+            for table, trigger in triggers:
+                self.cursor.execute(
+                    sql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(
+                        sql.Identifier(trigger), sql.Identifier('public', table)
+                    )
+                )
+            self.cursor.execute("SELECT to_regclass(%s)", (f"public.{CHANGE_LOG_TABLE}",))
+            if self.cursor.fetchone()[0] is not None:
+                self.cursor.execute(f"TRUNCATE {CHANGE_LOG_TABLE}")
+            self.conn.commit()
+            if triggers:
+                logger.info(f"🧹 Change capture disabled: dropped {len(triggers)} trigger(s), emptied {CHANGE_LOG_TABLE}")
+            return len(triggers)
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.cursor.close()
+            self.conn.close()
+
+    def install_target(self, target: SummaryTarget) -> bool:
+        """
+        (Re)create the source view from the MV definition and create the summary table if missing.
+        Returns True when the table was just created and needs a full load.
+        """
+        self.cursor.execute("SELECT pg_get_viewdef(to_regclass(%s))", (f"public.{target.source_mv}",))
+        definition = self.cursor.fetchone()[0]
+        if not definition:
+            raise RuntimeError(f"materialized view public.{target.source_mv} not found")
+        definition = definition.strip().rstrip(';')
+
+        view = sql.Identifier('public', target.source_view)
+        table = sql.Identifier('public', target.table)
+        self.cursor.execute(sql.SQL("DROP VIEW IF EXISTS {}").format(view))
+        self.cursor.execute(sql.SQL("CREATE VIEW {} AS ").format(view) + sql.SQL(definition))
+
+        table_columns = self._columns(target.table)
+        if table_columns:
+            if table_columns == self._columns(target.source_view):
+                return False
+            # The MV definition changed since the table was built: rebuild it
+            logger.warning(f"⚠️  {target.source_mv} columns changed; rebuilding {target.table}")
+            self.cursor.execute(sql.SQL("DROP TABLE {}").format(table))
+
+        logger.info(f"📝 Creating summary table {target.table} (columns and indexes of {target.source_mv})")
+        self.cursor.execute(sql.SQL("CREATE TABLE {} AS SELECT * FROM {} WITH NO DATA").format(table, view))
+        self.cursor.execute(
+            sql.SQL("CREATE UNIQUE INDEX {} ON {} ({})").format(
+                sql.Identifier(f"{target.table}_{target.key}_key"), table, sql.Identifier(target.key)
+            )
+        )
+        self.cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = 'public' AND tablename = %s",
+            (target.source_mv,),
+        )
+        for index_name, index_def in self.cursor.fetchall():
+            match = re.match(r'CREATE (UNIQUE )?INDEX \S+ ON (\S+) (.*)$', index_def)
+            if not match or match.group(3) == f"USING btree ({target.key})":
+                continue
+            new_name = (index_name.replace(target.source_mv, target.table)
+                        if target.source_mv in index_name else f"{target.table}_{index_name}")
+            self.cursor.execute(
+                sql.SQL("CREATE {}INDEX IF NOT EXISTS {} ON {} ").format(
+                    sql.SQL(match.group(1) or ''), sql.Identifier(new_name[:63]), table
+                ) + sql.SQL(match.group(3))
+            )
+        return True
+
+    def _columns(self, relname: str) -> List[Tuple[str, str]]:
+        self.cursor.execute("""
+            SELECT attname, format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum
+        """, (f"public.{relname}",))
+        return self.cursor.fetchall()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def full_load(self, target: SummaryTarget) -> int:
+        table = sql.Identifier('public', target.table)
+        self.cursor.execute(sql.SQL("DELETE FROM {}").format(table))
+        self.cursor.execute(
+            sql.SQL("INSERT INTO {} SELECT * FROM {}").format(table, sql.Identifier('public', target.source_view))
+        )
+        return self.cursor.rowcount
+
+    def apply_target(self, target: SummaryTarget) -> Tuple[int, int]:
+        """Recompute the rows of target affected by captured_changes. Returns (keys, rows written)."""
+        table = sql.Identifier('public', target.table)
+        key = sql.Identifier(target.key)
+        self.cursor.execute(
+            sql.SQL("SELECT DISTINCT key::text FROM (") + sql.SQL(target.affected_sql)
+            + sql.SQL(") k WHERE key IS NOT NULL")
+        )
+        keys = [row[0] for row in self.cursor.fetchall()]
+        if not keys:
+            return 0, 0
+
+        # Compare the key column uncast against a typed array so the filter can be pushed
+        # down into the view (and use the summary table's unique index)
+        key_type = dict(self._columns(target.table))[target.key]
+        matches_keys = sql.SQL("{} = ANY(%s::{}[])").format(key, sql.SQL(key_type))
+        self.cursor.execute(sql.SQL("DELETE FROM {} WHERE ").format(table) + matches_keys, (keys,))
+        self.cursor.execute(
+            sql.SQL("INSERT INTO {} SELECT * FROM {} WHERE ").format(table, sql.Identifier('public', target.source_view))
+            + matches_keys,
+            (keys,),
+        )
+        return len(keys), self.cursor.rowcount
+
+    def run(self, full: bool = False) -> Dict[str, Dict[str, float]]:
+        """Install change capture / summary tables as needed, then apply pending changes."""
+        results: Dict[str, Dict[str, float]] = {}
+        self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor()
+        try:
+            # Changes made while capture was off were lost: rebuild every summary table
+            full = self.install_change_capture() or full
+            needs_full = {t.table for t in self.targets if self.install_target(t) or full}
+            self.conn.commit()
+
+            # Snapshot the log rows visible now; rows committed meanwhile stay for the next run
+            self.cursor.execute(f"""
+                CREATE TEMP TABLE captured_changes ON COMMIT DROP AS
+                SELECT id, entity_type, entity_id FROM {CHANGE_LOG_TABLE}
+            """)
+            captured = self.cursor.rowcount
+            self.cursor.execute("CREATE INDEX ON captured_changes (entity_type, entity_id)")
+            self.cursor.execute("ANALYZE captured_changes")
+            logger.info(f"📒 {captured} logged change(s) to apply")
+
+            for target in self.targets:
+                start = time.time()
+                if target.table in needs_full:
+                    written = self.full_load(target)
+                    logger.info(f"✅ {target.table}: full load, {written} rows in {time.time() - start:.1f}s")
+                    results[target.table] = {'keys': written, 'rows': written, 'seconds': time.time() - start}
+                    continue
+                keys, written = self.apply_target(target)
+                logger.info(f"✅ {target.table}: {keys} affected key(s), {written} row(s) rewritten "
+                            f"in {time.time() - start:.1f}s")
+                results[target.table] = {'keys': keys, 'rows': written, 'seconds': time.time() - start}
+
+            self.cursor.execute(f"""
+                DELETE FROM {CHANGE_LOG_TABLE} l USING captured_changes c WHERE l.id = c.id
+            """)
+            self.conn.commit()
+            return results
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.cursor.close()
+            self.conn.close()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Materialized View Refresh Engine
+================================
+
+Refreshes the DOPAMAS materialized views (firs_mv, accuseds_mv, criminal_profiles_mv,
+advanced_search_accuseds_mv, advanced_search_firs_mv) instead of running
+refresh_materialized_views.sql one statement at a time.
+
+This module provides:
+- The MV dependency graph, read from the catalog (pg_rewrite / pg_depend, looking
+  through plain views): an MV built on another MV refreshes after it, independent
+  MVs refresh in parallel on separate connections
+- REFRESH ... CONCURRENTLY when the MV is populated and has a usable unique index
+  (readers are not blocked); a plain REFRESH otherwise
+- Change detection: an MV is skipped only when, since its last successful refresh,
+  its base tables show no inserts / updates / deletes (pg_stat_user_tables counters)
+  AND their data watermark is unchanged, and no upstream MV was refreshed in this run.
+  The counters alone are not trusted (they are flushed asynchronously and can be
+  reset); the watermark is MAX(date_created, date_modified) per base table, and the
+  latest etl_run_state update for base tables without those columns. When either
+  cannot be determined the MV is refreshed
+- mv_refresh_log: one row per MV per run (refreshed / skipped / failed / missing)
+  with its duration
+
+Usage:
+
+    from mv_refresh_engine import MVRefreshEngine
+
+    results = MVRefreshEngine(db_config, ['firs_mv', 'accuseds_mv'], max_workers=3).run()
+"""
+
+import hashlib
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE for "cannot refresh materialized view concurrently" (no usable unique index / not populated)
+OBJECT_NOT_IN_PREREQUISITE_STATE = '55000'
+
+# Relation kinds that hold data of their own (table, partitioned table, foreign table, MV)
+BASE_RELKINDS = frozenset({'r', 'p', 'f', 'm'})
+
+# Columns whose MAX() moves with every write the ETLs make to a base table
+WATERMARK_COLUMNS = ('date_created', 'date_modified')
+
+_REFRESH_LOG_DDL = """
+    CREATE TABLE IF NOT EXISTS mv_refresh_log (
+        id BIGSERIAL PRIMARY KEY,
+        mv_name TEXT NOT NULL,
+        started_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        duration_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+        mode TEXT,
+        status TEXT NOT NULL,
+        base_fingerprint BIGINT,
+        error TEXT
+    );
+    ALTER TABLE mv_refresh_log ADD COLUMN IF NOT EXISTS base_watermark TEXT;
+    CREATE INDEX IF NOT EXISTS idx_mv_refresh_log_mv_started
+        ON mv_refresh_log (mv_name, started_at DESC)
+"""
+
+
+@dataclass
+class MaterializedView:
+    """One refresh target as resolved from the catalog."""
+
+    name: str                                           # schema-qualified
+    schema: str
+    relname: str
+    oid: int
+    populated: bool
+    has_unique_index: bool = False
+    base_tables: Set[int] = field(default_factory=set)  # relation oids read (through plain views)
+    upstream: Set[str] = field(default_factory=set)     # other targets this MV reads from
+    fingerprint: Optional[int] = None
+    watermark: Optional[str] = None
+
+    @property
+    def concurrent(self) -> bool:
+        return self.populated and self.has_unique_index
+
+
+@dataclass
+class RefreshResult:
+    status: str                 # refreshed | skipped | failed | missing | upstream_failed
+    mode: Optional[str] = None  # concurrent | blocking
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+def parse_refresh_targets(sql_content: str) -> List[str]:
+    """MV names from 'REFRESH MATERIALIZED VIEW [CONCURRENTLY] name;' statements, in file order."""
+    targets = []
+    for statement in sql_content.split(';'):
+        words = statement.split()
+        lowered = [w.lower() for w in words]
+        if lowered[:3] != ['refresh', 'materialized', 'view']:
+            if words:
+                logger.warning(f"⚠️  Ignoring non-refresh statement: {' '.join(words)[:60]}")
+            continue
+        rest = words[3:]
+        if rest and rest[0].lower() == 'concurrently':
+            rest = rest[1:]
+        if rest and rest[0] not in targets:
+            targets.append(rest[0])
+    return targets
+
+
+class MVRefreshEngine:
+    """
+    Dependency-ordered, parallel, change-aware refresh of a set of materialized views.
+
+    The control connection (catalog reads, mv_refresh_log writes) is only used from the
+    calling thread; every REFRESH runs on its own autocommit connection in a worker.
+    """
+
+    def __init__(self, db_config: Dict, mv_names: Sequence[str], max_workers: int = 3, force: bool = False):
+        self.db_config = db_config
+        self.mv_names = list(mv_names)
+        self.max_workers = max(1, int(max_workers))
+        self.force = force
+        self.conn = None
+        self.cursor = None
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
+
+    def resolve_views(self) -> Tuple[Dict[str, MaterializedView], List[str]]:
+        """Resolve target names to MVs; returns (views by qualified name, missing names)."""
+        views, missing = {}, []
+        for name in self.mv_names:
+            self.cursor.execute("""
+                SELECT c.oid, n.nspname, c.relname, c.relispopulated
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.oid = to_regclass(%s) AND c.relkind = 'm'
+            """, (name,))
+            row = self.cursor.fetchone()
+            if not row:
+                missing.append(name)
+                continue
+            oid, schema, relname, populated = row
+            qualified = f"{schema}.{relname}"
+            views[qualified] = MaterializedView(qualified, schema, relname, oid, populated)
+        return views, missing
+
+    def load_dependencies(self, views: Dict[str, MaterializedView]) -> None:
+        """Fill base_tables / upstream for each MV from pg_depend, looking through plain views."""
+        self.cursor.execute("""
+            SELECT DISTINCT r.ev_class, d.refobjid, c.relkind
+            FROM pg_rewrite r
+            JOIN pg_depend d
+              ON d.classid = 'pg_rewrite'::regclass
+             AND d.objid = r.oid
+             AND d.refclassid = 'pg_class'::regclass
+            JOIN pg_class c ON c.oid = d.refobjid
+            WHERE d.refobjid <> r.ev_class
+        """)
+        depends_on: Dict[int, List[Tuple[int, str]]] = {}
+        for view_oid, dep_oid, relkind in self.cursor.fetchall():
+            depends_on.setdefault(view_oid, []).append((dep_oid, relkind))
+
+        by_oid = {mv.oid: mv.name for mv in views.values()}
+        for mv in views.values():
+            seen: Set[int] = set()
+            stack = [mv.oid]
+            while stack:
+                for dep_oid, relkind in depends_on.get(stack.pop(), ()):
+                    if dep_oid in seen:
+                        continue
+                    seen.add(dep_oid)
+                    if dep_oid in by_oid:
+                        mv.upstream.add(by_oid[dep_oid])
+                    elif relkind in BASE_RELKINDS:
+                        mv.base_tables.add(dep_oid)
+                    elif relkind == 'v':
+                        stack.append(dep_oid)
+
+        self.cursor.execute("""
+            SELECT DISTINCT i.indrelid
+            FROM pg_index i
+            WHERE i.indrelid = ANY(%s::oid[])
+              AND i.indisunique
+              AND i.indisvalid
+              AND i.indpred IS NULL
+              AND i.indexprs IS NULL
+        """, (list(by_oid),))
+        for (oid,) in self.cursor.fetchall():
+            views[by_oid[oid]].has_unique_index = True
+
+    def load_fingerprints(self, views: Dict[str, MaterializedView]) -> None:
+        """Sum of insert/update/delete counters over each MV's base tables (None = unknown)."""
+        all_tables = set().union(*(mv.base_tables for mv in views.values())) if views else set()
+        if not all_tables:
+            return
+        self.cursor.execute("""
+            SELECT relid, n_tup_ins + n_tup_upd + n_tup_del
+            FROM pg_stat_user_tables
+            WHERE relid = ANY(%s::oid[])
+        """, (list(all_tables),))
+        counters = dict(self.cursor.fetchall())
+        for mv in views.values():
+            if mv.base_tables and mv.base_tables <= counters.keys():
+                mv.fingerprint = sum(counters[oid] for oid in mv.base_tables)
+
+    def etl_run_marker(self) -> Optional[str]:
+        """Latest etl_run_state update (any ETL module), None when there is none."""
+        self.cursor.execute("SELECT to_regclass('etl_run_state')")
+        if self.cursor.fetchone()[0] is None:
+            return None
+        self.cursor.execute("SELECT MAX(updated_at) FROM etl_run_state")
+        marker = self.cursor.fetchone()[0]
+        return None if marker is None else str(marker)
+
+    def load_watermarks(self, views: Dict[str, MaterializedView]) -> None:
+        """
+        Hash of each MV's base data watermarks (None = unknown): MAX(date_created,
+        date_modified) of every base table that has them, plus the etl_run_state marker
+        when some base table has neither.
+        """
+        all_tables = set().union(*(mv.base_tables for mv in views.values())) if views else set()
+        if not all_tables:
+            return
+        try:
+            self.cursor.execute("""
+                SELECT a.attrelid, n.nspname, c.relname, array_agg(a.attname::text ORDER BY a.attname)
+                FROM pg_attribute a
+                JOIN pg_class c ON c.oid = a.attrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE a.attrelid = ANY(%s::oid[])
+                  AND a.attname = ANY(%s::name[])
+                  AND a.attnum > 0
+                  AND NOT a.attisdropped
+                GROUP BY a.attrelid, n.nspname, c.relname
+            """, (list(all_tables), list(WATERMARK_COLUMNS)))
+            table_marks = {}
+            for oid, schema, relname, columns in self.cursor.fetchall():
+                self.cursor.execute(
+                    sql.SQL("SELECT GREATEST({}) FROM {}").format(
+                        sql.SQL(', ').join(sql.SQL("MAX({})").format(sql.Identifier(col)) for col in columns),
+                        sql.Identifier(schema, relname),
+                    )
+                )
+                table_marks[oid] = str(self.cursor.fetchone()[0])
+            run_marker = self.etl_run_marker()
+        except psycopg2.Error as exc:
+            logger.warning(f"⚠️  Could not read base table watermarks, refreshing unconditionally: {exc}")
+            self.conn.rollback()
+            return
+
+        for mv in views.values():
+            if not mv.base_tables:
+                continue
+            parts = [f"{oid}:{table_marks[oid]}" for oid in sorted(mv.base_tables) if oid in table_marks]
+            if not mv.base_tables <= table_marks.keys():
+                if run_marker is None:
+                    continue
+                parts.append(f"etl_run_state:{run_marker}")
+            mv.watermark = hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+    def last_refresh_state(self, names: Sequence[str]) -> Dict[str, Tuple[Optional[int], Optional[str]]]:
+        """(base_fingerprint, base_watermark) of each MV's last successful refresh."""
+        self.cursor.execute("""
+            SELECT DISTINCT ON (mv_name) mv_name, base_fingerprint, base_watermark
+            FROM mv_refresh_log
+            WHERE status = 'refreshed' AND mv_name = ANY(%s)
+            ORDER BY mv_name, started_at DESC
+        """, (list(names),))
+        return {name: (fingerprint, watermark) for name, fingerprint, watermark in self.cursor.fetchall()}
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh_one(self, mv: MaterializedView) -> RefreshResult:
+        """Runs in a worker thread on its own connection."""
+        mode = 'concurrent' if mv.concurrent else 'blocking'
+        start = time.time()
+        conn = None
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                target = sql.Identifier(mv.schema, mv.relname)
+                try:
+                    if mv.concurrent:
+                        cursor.execute(sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(target))
+                    else:
+                        cursor.execute(sql.SQL("REFRESH MATERIALIZED VIEW {}").format(target))
+                except psycopg2.Error as exc:
+                    if not mv.concurrent or exc.pgcode != OBJECT_NOT_IN_PREREQUISITE_STATE:
+                        raise
+                    logger.warning(f"⚠️  {mv.name}: concurrent refresh not possible ({exc.pgerror or exc}); "
+                                   f"falling back to blocking refresh")
+                    mode = 'blocking'
+                    cursor.execute(sql.SQL("REFRESH MATERIALIZED VIEW {}").format(target))
+            return RefreshResult('refreshed', mode, time.time() - start)
+        except Exception as exc:
+            return RefreshResult('failed', mode, time.time() - start, str(exc).strip())
+        finally:
+            if conn:
+                conn.close()
+
+    def needs_refresh(self, mv: MaterializedView, last_state: Tuple[Optional[int], Optional[str]],
+                      results: Dict[str, RefreshResult]) -> Optional[str]:
+        """Reason to refresh, or None when the MV can be skipped (both change signals agree)."""
+        if self.force:
+            return 'forced'
+        if not mv.populated:
+            return 'not populated'
+        if any(results[up].status == 'refreshed' for up in mv.upstream):
+            return 'upstream refreshed'
+        last_fingerprint, last_watermark = last_state
+        if mv.fingerprint is None or last_fingerprint is None:
+            return 'no change history'
+        if mv.watermark is None or last_watermark is None:
+            return 'no watermark'
+        if mv.fingerprint != last_fingerprint:
+            return 'base tables changed'
+        if mv.watermark != last_watermark:
+            return 'base data watermark moved'
+        return None
+
+    def record(self, name: str, result: RefreshResult, mv: Optional[MaterializedView] = None) -> None:
+        fingerprint, watermark = (mv.fingerprint, mv.watermark) if mv else (None, None)
+        try:
+            self.cursor.execute("""
+                INSERT INTO mv_refresh_log
+                    (mv_name, started_at, duration_seconds, mode, status, base_fingerprint, base_watermark, error)
+                VALUES (%s, CURRENT_TIMESTAMP - make_interval(secs => %s), %s, %s, %s, %s, %s, %s)
+            """, (name, result.duration, result.duration, result.mode, result.status,
+                  fingerprint, watermark, result.error))
+            self.conn.commit()
+        except Exception as exc:
+            logger.warning(f"⚠️  Could not record refresh of {name} in mv_refresh_log: {exc}")
+            self.conn.rollback()
+
+    def run(self) -> Dict[str, RefreshResult]:
+        """Refresh every target in dependency order; returns results keyed by MV name."""
+        self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor()
+        results: Dict[str, RefreshResult] = {}
+        try:
+            self.cursor.execute(_REFRESH_LOG_DDL)
+            self.conn.commit()
+
+            views, missing = self.resolve_views()
+            for name in missing:
+                logger.error(f"❌ Materialized view not found: {name}")
+                results[name] = RefreshResult('missing', error='materialized view not found')
+                self.record(name, results[name])
+
+            self.load_dependencies(views)
+            self.load_fingerprints(views)
+            self.load_watermarks(views)
+            last = self.last_refresh_state(list(views))
+            self.conn.commit()
+
+            for mv in views.values():
+                deps = f" after {', '.join(sorted(mv.upstream))}" if mv.upstream else ""
+                mode = 'CONCURRENTLY' if mv.concurrent else 'blocking'
+                logger.info(f"📋 {mv.name}: {mode}, {len(mv.base_tables)} base relation(s){deps}")
+
+            pending = dict(views)
+            running = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='mv-refresh') as executor:
+                while pending or running:
+                    dispatched = False
+                    for name, mv in list(pending.items()):
+                        if not mv.upstream <= results.keys():
+                            continue
+                        del pending[name]
+                        dispatched = True
+                        failed_up = [up for up in mv.upstream if results[up].status in ('failed', 'upstream_failed')]
+                        if failed_up:
+                            logger.error(f"❌ {name}: not refreshed, upstream failed ({', '.join(failed_up)})")
+                            results[name] = RefreshResult('upstream_failed', error=f"upstream failed: {', '.join(failed_up)}")
+                            self.record(name, results[name], mv)
+                            continue
+                        reason = self.needs_refresh(mv, last.get(name, (None, None)), results)
+                        if reason is None:
+                            logger.info(f"⏭️  {name}: base tables unchanged since last refresh, skipping")
+                            results[name] = RefreshResult('skipped')
+                            self.record(name, results[name], mv)
+                            continue
+                        logger.info(f"🔄 Refreshing {name} ({reason})")
+                        running[executor.submit(self.refresh_one, mv)] = mv
+
+                    if not running:
+                        if not dispatched:
+                            # Defensive: unresolved dependencies would otherwise spin forever
+                            for name in pending:
+                                results[name] = RefreshResult('failed', error='unresolvable dependency order')
+                                self.record(name, results[name])
+                            pending.clear()
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        mv = running.pop(future)
+                        result = future.result()
+                        results[mv.name] = result
+                        if result.status == 'refreshed':
+                            logger.info(f"✅ {mv.name} refreshed ({result.mode}) in {result.duration:.1f}s")
+                        else:
+                            logger.error(f"❌ {mv.name} refresh failed after {result.duration:.1f}s: {result.error}")
+                        self.record(mv.name, result, mv)
+            return results
+        finally:
+            self.cursor.close()
+            self.conn.close()
@@ -1,6 +1,17 @@
+import argparse
+import logging
+import os
+import sys
+
 import psycopg2
 from psycopg2 import sql
-from env_utils import load_repo_environment, resolve_db_config
+from env_utils import get_bool_env, get_int_env, load_repo_environment, resolve_db_config
+from mv_delta_maintenance import SUMMARY_TARGETS, DeltaMaintenance
+from mv_refresh_engine import MVRefreshEngine, parse_refresh_targets
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 def execute_sql_from_file(sql_file_path):
     """
@@ -74,8 +85,76 @@ def execute_sql_from_file(sql_file_path):
             connection.close()
             print("\nDatabase connection closed.")
 
+def refresh_materialized_views(sql_file_path, max_workers=None, force=False, delta=None, delta_full=False):
+    """
+    Refresh the materialized views listed in sql_file_path with MVRefreshEngine
+    (dependency order, parallel, CONCURRENTLY where possible, unchanged MVs skipped).
+
+    In delta mode (--delta or MV_DELTA_MAINTENANCE=true) the summary tables backing
+    criminal_profiles_mv and accuseds_mv are also updated for the logged changes (see
+    mv_delta_maintenance); the MVs themselves are still refreshed. With delta mode off the
+    change capture triggers are dropped and the change log emptied.
+
+    Returns True when no MV failed or was missing.
+    """
+    load_repo_environment()
+    if delta is None:
+        delta = get_bool_env('MV_DELTA_MAINTENANCE', False)
+    try:
+        with open(sql_file_path, 'r') as file:
+            targets = parse_refresh_targets(file.read())
+    except FileNotFoundError:
+        logger.error(f"❌ SQL file '{sql_file_path}' not found")
+        return False
+
+    delta_ok = True
+    if delta or delta_full:
+        summary_tables = sorted(target.table for target in SUMMARY_TARGETS)
+        logger.info(f"🔁 Delta mode: maintaining summary tables {', '.join(summary_tables)}")
+        try:
+            DeltaMaintenance(resolve_db_config()).run(full=delta_full)
+        except Exception as exc:
+            logger.error(f"❌ Summary table maintenance failed: {exc}")
+            delta_ok = False
+    else:
+        # Nothing consumes profile_change_log without delta mode: stop it from growing
+        try:
+            DeltaMaintenance(resolve_db_config()).disable()
+        except Exception as exc:
+            logger.warning(f"⚠️  Could not disable change capture: {exc}")
+
+    if not targets:
+        logger.warning(f"⚠️  No materialized views left to refresh from {sql_file_path}")
+        return delta_ok
+
+    if max_workers is None:
+        max_workers = get_int_env('MV_REFRESH_WORKERS', 3)
+    logger.info(f"🚀 Refreshing {len(targets)} materialized view(s) with up to {max_workers} parallel connection(s)")
+
+    results = MVRefreshEngine(resolve_db_config(), targets, max_workers=max_workers, force=force).run()
+
+    counts = {}
+    for result in results.values():
+        counts[result.status] = counts.get(result.status, 0) + 1
+    total_seconds = sum(result.duration for result in results.values())
+    logger.info(f"📊 Refresh summary: {counts} (refresh time {total_seconds:.1f}s)")
+    return delta_ok and not any(result.status in ('failed', 'missing', 'upstream_failed') for result in results.values())
+
+
 if __name__ == "__main__":
-    # Specify your SQL file path
-    sql_file = "refresh_materialized_views.sql"
-    
-    execute_sql_from_file(sql_file)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Refresh DOPAMAS materialized views")
+    parser.add_argument("sql_file", nargs="?", default=os.path.join(SCRIPT_DIR, "refresh_materialized_views.sql"))
+    parser.add_argument("--workers", type=int, default=None, help="Parallel refresh connections (default: MV_REFRESH_WORKERS or 3)")
+    parser.add_argument("--force", action="store_true", help="Refresh even if base tables are unchanged")
+    parser.add_argument("--delta", action="store_true", default=None,
+                        help="Also maintain the summary tables from logged changes")
+    parser.add_argument("--delta-full", action="store_true", help="Rebuild the summary tables from scratch")
+    parser.add_argument("--raw", action="store_true", help="Execute the SQL file statement by statement (legacy mode)")
+    args = parser.parse_args()
+
+    if args.raw:
+        execute_sql_from_file(args.sql_file)
+    else:
+        sys.exit(0 if refresh_materialized_views(args.sql_file, args.workers, args.force,
+                                                 args.delta, args.delta_full) else 1)
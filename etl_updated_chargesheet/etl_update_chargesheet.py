@@ -25,6 +25,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import DB_CONFIG, API_CONFIG, ETL_CONFIG, LOG_CONFIG, TABLE_CONFIG
+from api_client import get_api_client
 
 try:
     from etl_fk_retry_queue import push_fk_failure, drain_fk_queue as _drain_fk_queue
@@ -560,7 +561,7 @@ class UpdatedChargesheetETL:
             try:
                 logger.debug(f"Fetching updated chargesheet: {from_date} to {to_date} (Attempt {attempt + 1})")
                 logger.trace(f"API Request - URL: {url}, Params: {params}, Headers: {headers}")
-                response = requests.get(
+                response = get_api_client().get(
                     url,
                     params=params,
                     headers=headers,
@@ -1466,7 +1467,8 @@ class UpdatedChargesheetETL:
             try:
                 with self.db_pool.get_connection_context() as _drain_conn:
                     _drain_fk_queue(_drain_conn, 'updated_chargesheet',
-                                    self._retry_updated_chargesheet_record)
+                                    self._retry_updated_chargesheet_record,
+                                    references={'crime_id': CRIMES_TABLE})
                     _drain_conn.commit()
             except Exception as _de:
                 logger.warning("FK queue drain failed at startup: %s (non-fatal)", _de)